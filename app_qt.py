@@ -7,6 +7,7 @@ Khởi động ứng dụng với giao diện Desktop Windows-like
 import sys
 import os
 import logging
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
 
@@ -14,6 +15,9 @@ from datetime import datetime
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Import profiler trước PySide6 để timeline tính cả thời gian import Qt
+from ui_qt.windows.dashboard_window_qt.utils.startup_profiler import startup_timeline
+
 from PySide6.QtWidgets import QApplication, QMessageBox, QSplashScreen
 from PySide6.QtCore import Qt, QTimer, QTranslator, QLocale, QSettings
 from PySide6.QtGui import QPixmap, QIcon, QFont, QPalette, QColor
@@ -21,6 +25,8 @@ from PySide6.QtGui import QPixmap, QIcon, QFont, QPalette, QColor
 # Import database
 from database import DatabaseManager
 
+startup_timeline.mark("imports")
+
 
 # ========== LOGGING SETUP ==========
 def setup_logging():
@@ -299,12 +305,11 @@ def initialize_services(window, splash=None):
         if splash:
             splash.show_message("Đang khởi tạo services...", 90)
 
-        # Initialize App Launcher Service
-        from ui_qt.windows.dashboard_window_qt.services.app_launcher_service import AppLauncherService
-        if hasattr(window, 'db'):
+        # Initialize App Launcher Service (MainDashboard tự tạo launcher riêng)
+        if hasattr(window, 'db') and hasattr(window, 'set_launcher_service'):
+            from ui_qt.windows.dashboard_window_qt.services.app_launcher_service import AppLauncherService
             launcher = AppLauncherService(window.db)
-            if hasattr(window, 'set_launcher_service'):
-                window.set_launcher_service(launcher)
+            window.set_launcher_service(launcher)
 
         logger.info("All services initialized successfully")
 
@@ -314,8 +319,14 @@ def initialize_services(window, splash=None):
 
 
 # ========== MAIN FUNCTION ==========
-def main():
-    """Main entry point của ứng dụng"""
+def main(startup_bench=False):
+    """
+    Main entry point của ứng dụng
+
+    Args:
+        startup_bench: True = thoát ngay khi dashboard tương tác được
+            và in time-to-interactive (dùng cho benchmark_startup.py)
+    """
     # Setup logging
     logger = setup_logging()
     logger.info("=" * 70)
@@ -324,23 +335,27 @@ def main():
 
     try:
         # Create QApplication
-        app = setup_application()
+        with startup_timeline.phase("qapplication"):
+            app = setup_application()
         logger.info("✓ Application initialized")
 
         # Create and show splash screen
-        splash = SplashScreen()
-        splash.show()
-        splash.show_message("Đang khởi động Dashboard Desktop...", 10)
+        with startup_timeline.phase("splash"):
+            splash = SplashScreen()
+            splash.show()
+            splash.show_message("Đang khởi động Dashboard Desktop...", 10)
 
         # Check and create directory structure
         splash.show_message("Đang kiểm tra cấu trúc...", 20)
-        dashboard_mode = check_and_create_structure()
+        with startup_timeline.phase("structure"):
+            dashboard_mode = check_and_create_structure()
         logger.info(f"✓ Directory structure ready (mode: {dashboard_mode})")
 
         # Initialize database
         splash.show_message("Đang kết nối database...", 30)
         try:
-            db = DatabaseManager()
+            with startup_timeline.phase("database"):
+                db = DatabaseManager()
             logger.info("✓ Database connected")
         except Exception as e:
             splash.close()
@@ -359,7 +374,8 @@ def main():
         # Load main dashboard
         splash.show_message("Đang tải giao diện chính...", 50)
         try:
-            window, window_type = load_dashboard(db, dashboard_mode)
+            with startup_timeline.phase("dashboard"):
+                window, window_type = load_dashboard(db, dashboard_mode)
             logger.info(f"✓ Dashboard loaded ({window_type})")
         except Exception as e:
             splash.close()
@@ -380,14 +396,31 @@ def main():
             return 1
 
         # Initialize services
-        initialize_services(window, splash)
+        with startup_timeline.phase("services"):
+            initialize_services(window, splash)
 
         # Final preparation
         splash.show_message("Hoàn tất khởi động...", 100)
 
-        # Schedule splash close and window show
-        QTimer.singleShot(1500, splash.close)
-        QTimer.singleShot(1600, lambda: show_main_window(window))
+        # Hiện cửa sổ chính ngay, splash đóng khi window đã hiện
+        with startup_timeline.phase("show"):
+            show_main_window(window)
+            splash.finish(window)
+
+        # Frame đầu tiên được vẽ khi event loop chạy lượt đầu
+        def on_first_frame():
+            startup_timeline.mark("first_frame")
+            # Các widget ẩn được dựng sau frame đầu; xong thì mới tính là tương tác được
+            QTimer.singleShot(0, on_interactive)
+
+        def on_interactive():
+            startup_timeline.mark("interactive")
+            startup_timeline.log_summary()
+            if startup_bench:
+                print(f"STARTUP_TTI_MS={startup_timeline.time_to_interactive():.1f}", flush=True)
+                app.quit()
+
+        QTimer.singleShot(0, on_first_frame)
 
         # Setup shutdown handler
         def on_shutdown():
@@ -487,13 +520,20 @@ def main_dev():
 
 # ========== ENTRY POINT ==========
 if __name__ == "__main__":
+    # Bản đóng gói (PyInstaller): process con của process pool xuất đề
+    # chỉ chạy worker, không mở lại giao diện
+    multiprocessing.freeze_support()
+
     # Check command line arguments
     if "--dev" in sys.argv:
         sys.exit(main_dev())
+    elif "--startup-bench" in sys.argv:
+        sys.exit(main(startup_bench=True))
     elif "--help" in sys.argv:
         print("Dashboard Desktop - Phần mềm Quản lý Gia sư")
         print("\nOptions:")
         print("  --dev        Development mode (no splash, verbose logging)")
+        print("  --startup-bench  Đo time-to-interactive rồi thoát (xem benchmark_startup.py)")
         print("  --help       Show this help message")
         sys.exit(0)
     else:
@@ -0,0 +1,164 @@
+# BENCHMARK SCRIPT - benchmark_app_search.py
+# Đo độ trễ mỗi phím gõ trong ô tìm kiếm taskbar (mặc định 5000 apps tổng hợp):
+#   - Cách cũ: search_apps quét mọi app, so chuỗi con trên name / display_name / description / tags
+#     (ở đây đã bỏ phần đọc lại JSON / DB mỗi lần gọi, chỉ tính vòng quét)
+#   - AppSearchIndex: token bỏ dấu, prefix trie, trigram, xếp hạng theo mức khớp + usage
+# Mỗi truy vấn được "gõ" từng ký tự; mỗi ký tự là một lần tìm (trước debounce).
+# Kiểm tra thêm: gõ không dấu / sai chính tả vẫn ra app đúng, chi phí cập nhật khi
+# update_usage_stats / thêm app, bộ nhớ của index.
+#
+# Cách dùng:
+#   python benchmark_app_search.py
+#   python benchmark_app_search.py --apps 20000 --limit 20
+
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+
+from ui_qt.windows.dashboard_window_qt.repositories.app_repository import AppCatalog, AppModel
+from ui_qt.windows.dashboard_window_qt.repositories.app_search_index import AppSearchIndex, fold_text
+
+SUBJECTS = ["toán", "ngữ văn", "tiếng anh", "vật lý", "hóa học", "sinh học", "lịch sử", "địa lý", "tin học"]
+FEATURES = ["quản lý", "báo cáo", "điểm danh", "bài tập", "đề kiểm tra", "ngân hàng câu hỏi",
+            "thời khóa biểu", "học phí", "nhận xét", "xếp nhóm", "tiến độ", "thống kê"]
+OBJECTS = ["học sinh", "giáo viên", "lớp học", "phụ huynh", "buổi học", "gói học", "kỹ năng"]
+
+# Gõ có dấu và không dấu
+QUERIES = [
+    "quản lý học sinh toán",
+    "bao cao hoc phi",
+    "diem danh lop hoc",
+    "ngan hang cau hoi hoa",
+    "thoi khoa bieu",
+]
+
+
+def make_apps(count: int, rng: random.Random):
+    apps = []
+    for i in range(count):
+        feature = rng.choice(FEATURES)
+        obj = rng.choice(OBJECTS)
+        subject = rng.choice(SUBJECTS)
+        display_name = f"{feature.capitalize()} {obj} {subject} {i}"
+        apps.append(AppModel(
+            id=f"app_{i:05d}",
+            name=f"{feature.capitalize()} {obj}",
+            display_name=display_name,
+            description=f"Công cụ {feature} cho {obj} môn {subject}, khối {rng.randint(6, 12)}",
+            tags=[subject, obj, feature.split()[0]],
+            usage_count=rng.choice([0, 0, 0, 1, 3, 10, 40]),
+            last_used=datetime.now() - timedelta(days=rng.randint(0, 60)) if rng.random() < 0.3 else None,
+        ))
+    return apps
+
+
+def legacy_search(apps, keyword: str):
+    """search_apps bản cũ (không tính phần đọc lại storage)"""
+    keyword = keyword.lower()
+    results = []
+    for app in apps:
+        searchable = [app.name.lower(), app.display_name.lower(), app.description.lower()] \
+            + [tag.lower() for tag in app.tags]
+        if any(keyword in s for s in searchable):
+            results.append(app)
+    return results
+
+
+def keystrokes(search, queries):
+    """Gõ từng ký tự của mỗi truy vấn, trả về thời gian (ms) từng phím"""
+    times = []
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            search(query[:end])
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summary(times):
+    ordered = sorted(times)
+    return (sum(times) / len(times), ordered[int(len(ordered) * 0.95) - 1], ordered[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AppSearchIndex so với quét chuỗi")
+    parser.add_argument("--apps", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20, help="Số kết quả hiển thị trong popup")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    apps = make_apps(args.apps, rng)
+
+    # Dựng catalog + index, rồi dựng lại riêng index dưới tracemalloc để đo bộ nhớ
+    catalog = AppCatalog(lambda changed, deleted, snapshot: None)
+    start = time.perf_counter()
+    catalog.load(apps)
+    build_ms = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    measured = AppSearchIndex()
+    for order, app in enumerate(apps):
+        measured.add(app, order)
+    index_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    tracemalloc.stop()
+    del measured
+    n_keys = sum(len(q) for q in QUERIES)
+    print(f"🔎 {args.apps} apps, {len(QUERIES)} truy vấn / {n_keys} phím, popup {args.limit} kết quả")
+    print(f"🏗️ Dựng catalog + index: {build_ms:.0f} ms, index ~{index_mb:.1f} MB")
+
+    old = summary(keystrokes(lambda q: legacy_search(apps, q), QUERIES))
+    new = summary(keystrokes(lambda q: catalog.search(q, args.limit), QUERIES))
+    print("\nĐộ trễ mỗi phím (trung bình / p95 / max):")
+    print(f"  🐢 Quét chuỗi:     {old[0]:.2f} / {old[1]:.2f} / {old[2]:.2f} ms")
+    print(f"  ⚡ AppSearchIndex: {new[0]:.2f} / {new[1]:.2f} / {new[2]:.2f} ms  -> x{old[0] / max(new[0], 1e-6):.0f}")
+
+    # Chất lượng: gõ có dấu, không dấu, sai chính tả (đảo hai ký tự của từ dài nhất)
+    target = apps[rng.randrange(len(apps))]
+    unaccented = fold_text(target.display_name)
+    words = unaccented.split()
+    longest = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[longest]
+    words[longest] = word[0] + word[2] + word[1] + word[3:]
+    checks = [
+        ("Có dấu", target.display_name),
+        ("Không dấu", unaccented),
+        ("Sai chính tả", ' '.join(words)),
+    ]
+    print(f"\nTìm '{target.display_name}':")
+    for title, query in checks:
+        old_hits = [a.id for a in legacy_search(apps, query)]
+        new_hits = [a.id for a in catalog.search(query, 5)]
+        print(f"  {title:13} '{query}': cũ {'✅' if target.id in old_hits else '❌'} "
+              f"({len(old_hits)} kết quả), mới {'✅ #' + str(new_hits.index(target.id) + 1) if target.id in new_hits else '❌'}")
+
+    # Cập nhật từng phần
+    repeat = 500
+    start = time.perf_counter()
+    for i in range(repeat):
+        app = apps[i]
+        catalog.update(app.id, {'usage_count': app.usage_count + 1, 'last_used': datetime.now()})
+    usage_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    extra = make_apps(repeat, random.Random(args.seed + 1))
+    for i, app in enumerate(extra):
+        app.id = f"new_{i}"
+    start = time.perf_counter()
+    for app in extra:
+        catalog.put(app)
+    add_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    rebuilt = AppSearchIndex()
+    for order, app in enumerate(catalog.all()):
+        rebuilt.add(app, order)
+    rebuild_ms = (time.perf_counter() - start) * 1000
+    print(f"\n✏️ update_usage_stats: {usage_ms:.3f} ms/app, thêm app: {add_ms:.3f} ms/app "
+          f"(dựng lại toàn bộ index: {rebuild_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# BENCHMARK SCRIPT - benchmark_desktop_icons.py
+# Đo chi phí đặt / tìm icons trên desktop (mặc định 2.000 icons, desktop 50 x 41 slot):
+#   - Cách cũ: DesktopIconManager quét mọi slot, mỗi slot so với mọi icon (O(slot x icon))
+#   - IconGridIndex: spatial hash theo ô lưới + con trỏ slot trống
+# Các kịch bản: đặt lần lượt (position=None), xoá 25% rồi lấp lại (auto-arrange),
+# rubber band, thả 200 file một lần.
+#
+# Cách dùng:
+#   python benchmark_desktop_icons.py
+#   python benchmark_desktop_icons.py --icons 3000 --legacy-icons 400
+#   (cách cũ tăng theo bậc ba nên mặc định chỉ chạy --legacy-icons 300)
+
+import os
+import sys
+import time
+import random
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QRect, QSize
+
+from ui_qt.windows.dashboard_window_qt.utils.constants import (
+    DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT, DESKTOP_ICON_SPACING, DESKTOP_GRID_SIZE
+)
+from ui_qt.windows.dashboard_window_qt.views.desktop.icon_grid_index import IconGridIndex
+
+ICON_SIZE = QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT)
+
+
+class LegacyPlacement:
+    """_find_empty_position / select_icons_in_rect giống DesktopIconManager bản cũ"""
+
+    def __init__(self, width: int, height: int):
+        self.rect = QRect(0, 0, width, height)
+        self.icons = {}  # icon_id -> geometry
+
+    def find_empty_position(self) -> QPoint:
+        x = y = DESKTOP_ICON_SPACING
+        while y < self.rect.height() - DESKTOP_ICON_HEIGHT:
+            while x < self.rect.width() - DESKTOP_ICON_WIDTH:
+                pos = QPoint(x, y)
+                if self.is_position_empty(pos):
+                    return pos
+                x += DESKTOP_GRID_SIZE
+            x = DESKTOP_ICON_SPACING
+            y += DESKTOP_GRID_SIZE
+        return QPoint(DESKTOP_ICON_SPACING, DESKTOP_ICON_SPACING)
+
+    def is_position_empty(self, position: QPoint) -> bool:
+        test_rect = QRect(position, ICON_SIZE)
+        for geometry in self.icons.values():
+            if test_rect.intersects(geometry):
+                return False
+        return True
+
+    def add(self, icon_id: str):
+        position = self.find_empty_position()
+        self.icons[icon_id] = QRect(position, ICON_SIZE)
+        return position
+
+    def remove(self, icon_id: str):
+        del self.icons[icon_id]
+
+    def select(self, rect: QRect):
+        return [icon_id for icon_id, geometry in self.icons.items() if rect.intersects(geometry)]
+
+
+class IndexedPlacement:
+    """Cùng thao tác nhưng qua IconGridIndex (như DesktopIconManager bản mới)"""
+
+    def __init__(self, width: int, height: int):
+        self.index = IconGridIndex(DESKTOP_GRID_SIZE, DESKTOP_ICON_SPACING, ICON_SIZE)
+        self.index.set_bounds(width, height)
+
+    def add(self, icon_id: str, position: QPoint = None):
+        if position is None:
+            position = self.index.find_free_slot() or QPoint(DESKTOP_ICON_SPACING, DESKTOP_ICON_SPACING)
+        self.index.add(icon_id, QRect(position, ICON_SIZE))
+        return position
+
+    def remove(self, icon_id: str):
+        self.index.remove(icon_id)
+
+    def select(self, rect: QRect):
+        return self.index.query_rect(rect)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run_scenarios(placement, n_icons: int, seed: int, batch: int, selections: int, width: int, height: int):
+    """Chạy các kịch bản trên một placement, trả về (thời gian ms, vị trí để đối chiếu)"""
+    rng = random.Random(seed)
+    times = {}
+    ids = [f"icon_{i:05d}" for i in range(n_icons)]
+
+    times["place"], positions = timed(lambda: [placement.add(i) for i in ids])
+
+    removed = rng.sample(ids, n_icons // 4)
+    for icon_id in removed:
+        placement.remove(icon_id)
+    times["refill"], refill = timed(lambda: [placement.add(i) for i in removed])
+
+    rects = [QRect(rng.randrange(width), rng.randrange(height), 300, 300) for _ in range(selections)]
+    times["select"], selected = timed(lambda: [sorted(placement.select(r)) for r in rects])
+
+    # Thả nhiều file: cách cũ tìm từng chỗ từ góc trái, bản mới lấy slot gần điểm thả
+    drop = [f"drop_{i:04d}" for i in range(batch)]
+    for icon_id in rng.sample(ids, batch):
+        placement.remove(icon_id)
+    if isinstance(placement, IndexedPlacement):
+        def drop_batch():
+            slots = placement.index.free_slots(batch, QPoint(width // 2, height // 2))
+            return [placement.add(i, p) for i, p in zip(drop, slots)]
+    else:
+        def drop_batch():
+            return [placement.add(i) for i in drop]
+    times["drop"], _ = timed(drop_batch)
+
+    return times, (positions, refill, selected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IconGridIndex cho desktop icons")
+    parser.add_argument("--icons", type=int, default=2000)
+    parser.add_argument("--legacy-icons", type=int, default=300, help="Số icons cho cách cũ")
+    parser.add_argument("--batch", type=int, default=200, help="Số file thả một lần")
+    parser.add_argument("--selections", type=int, default=1000, help="Số lần rubber band")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Desktop đủ chỗ cho --icons (50 cột slot)
+    cols = 50
+    rows = -(-args.icons // cols) + 1
+    width = DESKTOP_ICON_SPACING + cols * DESKTOP_GRID_SIZE - 20
+    height = DESKTOP_ICON_SPACING + rows * DESKTOP_GRID_SIZE - 10
+    print(f"🖥️ Desktop {width}x{height}, {cols} x {rows} slot, "
+          f"thả {args.batch} file, {args.selections} lần rubber band 300x300")
+
+    small = min(args.legacy_icons, args.icons)
+    batch = min(args.batch, small // 2)
+    legacy_times, legacy_out = run_scenarios(
+        LegacyPlacement(width, height), small, args.seed, batch, args.selections, width, height)
+    indexed_times, indexed_out = run_scenarios(
+        IndexedPlacement(width, height), small, args.seed, batch, args.selections, width, height)
+
+    same = legacy_out[0] == indexed_out[0] and legacy_out[1] == indexed_out[1] and legacy_out[2] == indexed_out[2]
+    print(f"\n🐢 Cách cũ ({small} icons): đặt {legacy_times['place']:.0f} ms, "
+          f"lấp lại {legacy_times['refill']:.0f} ms, thả {batch} file {legacy_times['drop']:.0f} ms, "
+          f"rubber band {legacy_times['select']:.0f} ms")
+    print(f"⚡ IconGridIndex ({small} icons): đặt {indexed_times['place']:.1f} ms, "
+          f"lấp lại {indexed_times['refill']:.1f} ms, thả {batch} file {indexed_times['drop']:.1f} ms, "
+          f"rubber band {indexed_times['select']:.1f} ms")
+    print(f"   Vị trí / kết quả chọn giống cách cũ: {'có' if same else 'KHÔNG'}")
+
+    full_times, _ = run_scenarios(
+        IndexedPlacement(width, height), args.icons, args.seed, args.batch, args.selections, width, height)
+    print(f"\n⚡ IconGridIndex ({args.icons} icons): đặt {full_times['place']:.0f} ms, "
+          f"lấp lại {args.icons // 4} icons {full_times['refill']:.0f} ms, "
+          f"thả {args.batch} file {full_times['drop']:.1f} ms, rubber band {full_times['select']:.0f} ms")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
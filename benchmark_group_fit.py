@@ -0,0 +1,119 @@
+# BENCHMARK SCRIPT - benchmark_group_fit.py
+# Đo GroupFitEngine trên database giả lập (mặc định 2.000 học sinh, 50 nhóm, 12 chủ đề)
+# và so với cách cũ: một truy vấn AVG(diem) cho mỗi cặp (nhóm × chủ đề).
+#
+# Cách dùng:
+#   python benchmark_group_fit.py
+#   python benchmark_group_fit.py --students 5000 --groups 80
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+from database import DatabaseManager
+from ui_qt.core.group_fit_engine import GroupFitEngine, NUMPY_AVAILABLE
+
+
+def build_database(path: str, n_students: int, n_groups: int, n_topics: int, seed: int) -> DatabaseManager:
+    """Tạo database tạm với dữ liệu ngẫu nhiên"""
+    rng = random.Random(seed)
+    db = DatabaseManager(path)
+    conn = db.conn
+    topics = [f"Chủ đề {i + 1}" for i in range(n_topics)]
+
+    conn.executemany(
+        "INSERT INTO groups (id, name, grade) VALUES (?, ?, ?)",
+        [(g + 1, f"Nhóm {g + 1:03d}", str(6 + g % 7)) for g in range(n_groups)]
+    )
+    conn.executemany(
+        "INSERT INTO students (id, name, grade, start_date, status, group_id) VALUES (?, ?, ?, ?, ?, ?)",
+        [(s + 1, f"Học sinh {s + 1:05d}", "10", "2025-01-01", "Đang học", rng.randint(1, n_groups))
+         for s in range(n_students)]
+    )
+
+    skills = []
+    for sid in range(1, n_students + 1):
+        level = rng.uniform(3, 9)
+        for topic in rng.sample(topics, k=max(1, n_topics * 2 // 3)):
+            for _ in range(rng.randint(1, 6)):
+                score = min(10.0, max(0.0, rng.gauss(level, 1.2)))
+                skills.append((sid, topic, "2025-03-01", round(score, 1), ""))
+    conn.executemany(
+        "INSERT INTO student_skills (student_id, chu_de, ngay_danh_gia, diem, nhan_xet) VALUES (?, ?, ?, ?, ?)",
+        skills
+    )
+    conn.commit()
+    print(f"📦 {n_students} học sinh, {n_groups} nhóm, {n_topics} chủ đề, {len(skills)} lượt đánh giá")
+    return db
+
+
+def legacy_analyze(db: DatabaseManager, student_id: int, topics) -> int:
+    """Cách cũ của GroupSuggestionWindowQt.analyze, trả về số truy vấn đã chạy"""
+    queries = 0
+    for topic in topics:
+        db.execute_query(
+            "SELECT ROUND(AVG(diem), 1) FROM student_skills WHERE student_id = ? AND chu_de = ?",
+            (student_id, topic), fetch='one'
+        )
+        queries += 1
+    groups = db.execute_query("SELECT id, name FROM groups ORDER BY name", fetch='all') or []
+    queries += 1
+    for group in groups:
+        for topic in topics:
+            db.execute_query(
+                """
+                SELECT ROUND(AVG(diem), 1)
+                FROM student_skills
+                WHERE student_id IN (SELECT id FROM students WHERE group_id = ?)
+                  AND chu_de = ?
+                """,
+                (group['id'], topic), fetch='one'
+            )
+            queries += 1
+    return queries
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GroupFitEngine")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--topics", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"NumPy: {'có' if NUMPY_AVAILABLE else 'KHÔNG (dùng bản Python thuần)'}")
+    tmp_dir = tempfile.mkdtemp(prefix="group_fit_bench_")
+    db = build_database(os.path.join(tmp_dir, "bench.db"), args.students, args.groups, args.topics, args.seed)
+
+    engine = GroupFitEngine(db)
+    topics = [f"Chủ đề {i + 1}" for i in range(min(3, args.topics))]
+
+    queries, legacy_ms = timed(lambda: legacy_analyze(db, 1, topics))
+    print(f"\n🐢 Cách cũ (1 học sinh, {len(topics)} chủ đề): {legacy_ms:.0f} ms, {queries} truy vấn")
+
+    _, load_ms = timed(engine.load)
+    _, one_ms = timed(lambda: engine.rank_student(1, topics))
+    print(f"⚡ Engine load: {load_ms:.0f} ms (3 truy vấn)")
+    print(f"⚡ Engine rank_student: {one_ms:.1f} ms")
+
+    ranked, all_ms = timed(engine.rank_all)
+    print(f"⚡ Engine rank_all ({len(ranked)} học sinh × {args.groups} nhóm × {args.topics} chủ đề): {all_ms:.0f} ms")
+
+    report, report_ms = timed(engine.suggest_regrouping)
+    print(f"⚡ suggest_regrouping: {report_ms:.0f} ms, {len(report)} gợi ý chuyển nhóm")
+
+    db.conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
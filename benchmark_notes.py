@@ -0,0 +1,171 @@
+# BENCHMARK SCRIPT - benchmark_notes.py
+# Đo chi phí lưu Quick Notes (mặc định 500 notes, mỗi note ~1.5 KB text + HTML):
+#   - Cách cũ: mỗi lần lưu serialize TẤT CẢ notes rồi ghi đè notes.json
+#   - NotesRepository: đánh dấu note đã đổi, một flush chỉ ghi các dòng đó trong một transaction
+# Kịch bản: gõ liên tục vào một note (mỗi lần lưu = một flush), sửa 10 notes rồi flush một lần,
+# nạp lại toàn bộ notes khi mở app, tìm kiếm (FTS5 so với quét chuỗi trong Python).
+#
+# Cách dùng:
+#   python benchmark_notes.py
+#   python benchmark_notes.py --notes 2000 --saves 100
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+from ui_qt.windows.dashboard_window_qt.repositories.notes_repository import NotesRepository
+
+WORDS = ("họp phụ huynh chấm bài tập chuẩn bị bài giảng kiểm tra 15 phút lớp toán văn "
+         "anh lý hóa sinh sử địa ôn thi học kỳ gọi điện nhắc học sinh nộp bài").split()
+
+
+def make_note(index: int, rng: random.Random, version: int = 0) -> dict:
+    """Dict giống NoteData.to_dict()"""
+    text = ' '.join(rng.choice(WORDS) for _ in range(250))
+    return {
+        'id': f"note-{index:05d}",
+        'title': f"Ghi chú {index}",
+        'content': f"{text} v{version}",
+        'html_content': f"<html><body><p>{text} v{version}</p></body></html>",
+        'color': "#FFEB3B",
+        'custom_color': None,
+        'position': {'x': 100 + index % 40 * 10, 'y': 100 + index % 30 * 10},
+        'size': {'width': 200, 'height': 250},
+        'font_family': "Segoe UI",
+        'font_size': 11,
+        'is_bold': False,
+        'is_italic': False,
+        'is_pinned': False,
+        'is_minimized': False,
+        'opacity': 1.0,
+        'created_at': "2024-01-01T08:00:00",
+        'modified_at': f"2024-01-01T08:00:{version % 60:02d}",
+        'tags': []
+    }
+
+
+def legacy_save(path: str, notes: dict):
+    """save_all_notes bản cũ: ghi đè cả file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(list(notes.values()), f, indent=2, ensure_ascii=False)
+
+
+def timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NotesRepository so với notes.json")
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--saves", type=int, default=50, help="Số lần lưu trong mỗi kịch bản")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    notes = {n['id']: n for n in (make_note(i, rng) for i in range(args.notes))}
+    ids = list(notes)
+    workdir = tempfile.mkdtemp(prefix="bench_notes_")
+    json_path = os.path.join(workdir, "notes.json")
+    legacy_save(json_path, notes)
+    size_kb = os.path.getsize(json_path) / 1024
+    print(f"📝 {args.notes} notes, notes.json {size_kb:.0f} KB, {args.saves} lần lưu mỗi kịch bản")
+
+    # Migration một lần từ notes.json
+    start = time.perf_counter()
+    repo = NotesRepository(os.path.join(workdir, "notes.db"), legacy_json_path=json_path)
+    migrate_ms = (time.perf_counter() - start) * 1000
+    print(f"🔁 Migration notes.json -> SQLite: {migrate_ms:.0f} ms ({repo.count()} notes, "
+          f"FTS5 {'bật' if repo.fts_enabled else 'không có'})")
+
+    # 1. Gõ vào một note: mỗi lần lưu chỉ một note đổi
+    version = 0
+    target = ids[len(ids) // 2]
+
+    def edit_one():
+        nonlocal version
+        version += 1
+        notes[target] = make_note(int(target.split('-')[1]), rng, version)
+
+    def legacy_one():
+        edit_one()
+        legacy_save(json_path, notes)
+
+    def repo_one():
+        edit_one()
+        repo.mark_dirty(target)
+        repo.flush(notes.get)
+
+    old = timed(legacy_one, args.saves)
+    new = timed(repo_one, args.saves)
+    print("\nSửa 1 note / lần lưu:")
+    print(f"  🐢 Ghi lại notes.json:  {old:.2f} ms")
+    print(f"  ⚡ NotesRepository:     {new:.2f} ms  -> x{old / max(new, 1e-6):.0f}")
+
+    # 2. Sửa 10 notes rồi lưu một lần
+    def edit_batch():
+        nonlocal version
+        version += 1
+        changed = rng.sample(ids, 10)
+        for note_id in changed:
+            notes[note_id] = make_note(int(note_id.split('-')[1]), rng, version)
+        return changed
+
+    def legacy_batch():
+        edit_batch()
+        legacy_save(json_path, notes)
+
+    def repo_batch():
+        for note_id in edit_batch():
+            repo.mark_dirty(note_id)
+        repo.flush(notes.get)
+
+    old = timed(legacy_batch, args.saves)
+    new = timed(repo_batch, args.saves)
+    print("\nSửa 10 notes / lần lưu:")
+    print(f"  🐢 Ghi lại notes.json:  {old:.2f} ms")
+    print(f"  ⚡ NotesRepository:     {new:.2f} ms  -> x{old / max(new, 1e-6):.0f}")
+
+    # 3. Nạp lại khi mở app
+    def legacy_load():
+        with open(json_path, 'r', encoding='utf-8') as f:
+            json.load(f)
+
+    old = timed(legacy_load, 5)
+    new = timed(repo.load_all, 5)
+    print(f"\nNạp {args.notes} notes:")
+    print(f"  🐢 json.load:           {old:.1f} ms")
+    print(f"  ⚡ load_all():          {new:.1f} ms")
+
+    # 4. Tìm kiếm
+    queries = ["họp phụ", "kiểm tra", "ôn thi", "nộp"]
+
+    def legacy_search():
+        for query in queries:
+            words = query.lower().split()
+            [n['id'] for n in notes.values()
+             if all(w in (n['title'] + ' ' + n['content']).lower() for w in words)]
+
+    def repo_search():
+        for query in queries:
+            repo.search(query)
+
+    old = timed(legacy_search, 5) / len(queries)
+    new = timed(repo_search, 5) / len(queries)
+    print("\nTìm kiếm (trung bình / truy vấn):")
+    print(f"  🐢 Quét chuỗi trong Python: {old:.2f} ms")
+    print(f"  ⚡ {'FTS5' if repo.fts_enabled else 'LIKE'}:                     {new:.2f} ms")
+
+    print(f"\n📦 {repo.stats['flushes']} flush, {repo.stats['rows_written']} dòng đã ghi")
+    repo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
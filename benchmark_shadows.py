@@ -0,0 +1,248 @@
+# BENCHMARK SCRIPT - benchmark_shadows.py
+# Đo thời gian một frame animation khi các widget có bóng (mặc định 12 widget trên desktop 1280x720):
+#   - none:   không bóng (mốc so sánh)
+#   - effect: QGraphicsDropShadowEffect -> mỗi lần repaint render widget ra pixmap rồi blur lại
+#   - frame:  ShadowFrame -> nine-patch blur sẵn, bóng ghép sẵn theo kích thước, vẽ trong paintEvent của frame
+#   - parent: card không bóng, desktop vẽ draw_shadow(card.geometry()) trong paintEvent của chính nó
+# Kịch bản:
+#   - slide: widget con trên desktop, mọi widget dịch 2 px mỗi frame
+#   - hover: widget con đổi nội dung tại chỗ
+#   - popup: cửa sổ top-level (note / notification / preview) đổi nội dung tại chỗ (không có "parent")
+#
+# Cách dùng:
+#   python benchmark_shadows.py
+#   python benchmark_shadows.py --widgets 30 --frames 200 --size 350x80
+#   QT_SCALE_FACTOR=2 python benchmark_shadows.py      # giả lập màn hình HiDPI
+#
+# Kết quả (offscreen QPA, raster, 12 card 250x150, 240 frame, ms/frame trung bình):
+#                 none   effect  frame  parent
+#   dpr 1 slide   2.48   2.16    3.41   3.08
+#         hover   2.46   2.09    3.80   4.71
+#         popup   0.54   0.55    3.18   -
+#   dpr 2 slide   7.14   7.09    10.19  8.54
+#         hover   6.50   6.40    9.15   10.02
+#         popup   0.97   0.96    7.34   -
+# Trên offscreen, effect tốn gần như bằng không bóng, nên cache không có gì để tiết kiệm;
+# phần thêm của frame / parent là một lần blend pixmap bán trong suốt + paintEvent Python
+# mỗi lần repaint (popup: cửa sổ trong suốt lớn hơn vì chừa lề bóng). Vì vậy các widget
+# vẫn dùng QGraphicsDropShadowEffect; đo lại trên màn hình thật trước khi chuyển.
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import (
+    QApplication, QFrame, QGraphicsDropShadowEffect, QLabel, QVBoxLayout, QWidget
+)
+
+from ui_qt.windows.dashboard_window_qt.utils.shadows import (
+    ShadowFrame, ShadowSpec, cache_stats, draw_shadow, frame_cache_stats
+)
+
+SHADOW = dict(blur_radius=20, offset=(0, 5), color=QColor(0, 0, 0, 100), corner_radius=10)
+SPEC = ShadowSpec.create(**SHADOW)
+MODES = ("none", "effect", "frame", "parent")
+
+CARD_STYLE = """
+    #Card { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+            border-radius: 10px; }
+    QLabel { color: white; font-size: 14px; }
+"""
+
+
+class ShadowDesktop(QWidget):
+    """Desktop giả tự vẽ bóng cho các card con (chế độ parent)"""
+
+    def __init__(self):
+        super().__init__()
+        self.shadowed = []
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor("#2d3e50"))
+        for card in self.shadowed:
+            if card.isVisible():
+                draw_shadow(painter, card.geometry(), SPEC, exposed=event.rect())
+        painter.end()
+
+
+def make_card(index: int, size, mode: str, parent=None):
+    """
+    Card giống weather / clock widget, có bóng
+
+    Returns:
+        (widget để move / show, card đổi nội dung, label)
+    """
+    top_level = parent is None
+    if mode == "frame":
+        flags = Qt.FramelessWindowHint | Qt.Tool if top_level else Qt.WindowType(0)
+        holder = ShadowFrame(SPEC, parent, flags)
+        card = holder.panel
+    else:
+        card = QFrame(parent)
+        holder = card
+        if top_level:
+            card.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool)
+            card.setAttribute(Qt.WA_TranslucentBackground)
+    card.setObjectName("Card")
+    card.setStyleSheet(CARD_STYLE)
+
+    layout = QVBoxLayout(card)
+    label = QLabel(f"Widget {index + 1}")
+    layout.addWidget(label)
+    layout.addWidget(QLabel("28°C - Hà Nội"))
+    if mode == "frame":
+        margins = holder.shadow_margins()
+        holder.resize(size[0] + margins.left() + margins.right(),
+                      size[1] + margins.top() + margins.bottom())
+    else:
+        card.resize(*size)
+
+    if mode == "effect":
+        effect = QGraphicsDropShadowEffect()
+        effect.setBlurRadius(SHADOW["blur_radius"])
+        effect.setOffset(*SHADOW["offset"])
+        effect.setColor(SHADOW["color"])
+        card.setGraphicsEffect(effect)
+    elif mode == "parent":
+        parent.shadowed.append(card)
+    return holder, card, label
+
+
+def grid_pos(index: int, size):
+    """Xếp card theo lưới trên desktop 1280x720"""
+    columns = max(1, 1200 // (size[0] + 20))
+    return 40 + (index % columns) * (size[0] + 20), 40 + (index // columns) * (size[1] + 30)
+
+
+def build_desktop(n_widgets: int, size, mode: str):
+    """Desktop giả: n card con có bóng"""
+    if mode == "parent":
+        desktop = ShadowDesktop()
+    else:
+        desktop = QWidget()
+        desktop.setStyleSheet("background: #2d3e50;")
+    desktop.resize(1280, 720)
+    cards = []
+    for i in range(n_widgets):
+        holder, card, label = make_card(i, size, mode, desktop)
+        x, y = grid_pos(i, size)
+        if mode == "frame":
+            margins = holder.shadow_margins()
+            x, y = x - margins.left(), y - margins.top()
+        holder.move(x, y)
+        cards.append((holder, card, label))
+    desktop.show()
+    QApplication.processEvents()
+    return desktop, cards
+
+
+def hover_frames(app, cards, frames: int):
+    """Nội dung card đổi (hover highlight) - card repaint tại chỗ"""
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        for i, (_, card, label) in enumerate(cards):
+            label.setText(f"Widget {i + 1} {'•' if frame % 2 else ''}")
+            card.repaint()
+        app.processEvents()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run(app, n_widgets: int, frames: int, size, mode: str):
+    desktop, cards = build_desktop(n_widgets, size, mode)
+    results = {}
+
+    # Slide: mọi card dịch 2 px / frame (như slide-in / kéo widget)
+    times = []
+    for frame in range(frames):
+        dx = 2 if (frame // 20) % 2 == 0 else -2
+        start = time.perf_counter()
+        for holder, _, _ in cards:
+            holder.move(holder.x() + dx, holder.y())
+        desktop.repaint()
+        app.processEvents()
+        times.append((time.perf_counter() - start) * 1000)
+    results["slide"] = times
+
+    results["hover"] = hover_frames(app, cards, frames)
+
+    desktop.close()
+    desktop.deleteLater()
+    app.processEvents()
+
+    if mode == "parent":
+        return results
+
+    # Popup: card là cửa sổ top-level (quick note / notification / window preview)
+    popups = []
+    for i in range(n_widgets):
+        holder, card, label = make_card(i, size, mode)
+        holder.move(20 + i * 8, 20 + i * 8)  # xếp chồng: cửa sổ ra ngoài màn hình không được vẽ
+        holder.show()
+        popups.append((holder, card, label))
+    app.processEvents()
+    results["popup"] = hover_frames(app, popups, frames)
+    for holder, _, _ in popups:
+        holder.close()
+        holder.deleteLater()
+    app.processEvents()
+    return results
+
+
+def summary(times):
+    ordered = sorted(times)
+    return sum(times) / len(times), ordered[int(len(ordered) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bóng nine-patch so với QGraphicsDropShadowEffect")
+    parser.add_argument("--widgets", type=int, default=12)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--size", default="250x150", help="Kích thước card WxH (mặc định = weather widget)")
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    dpr = app.primaryScreen().devicePixelRatio()
+    print(f"🖥️ {args.widgets} widget {size[0]}x{size[1]} (dpr {dpr:g}), blur {SHADOW['blur_radius']}, "
+          f"{args.frames} frame mỗi kịch bản")
+
+    # Chạy nháp một lượt để lượt đo không tính lần dựng font / style / nine-patch đầu tiên
+    for mode in MODES:
+        run(app, 2, 5, size, mode)
+    results = {mode: run(app, args.widgets, args.frames, size, mode) for mode in MODES}
+
+    labels = {
+        "none": "   Không bóng                ",
+        "effect": "🐢 QGraphicsDropShadowEffect",
+        "frame": "⚡ ShadowFrame             ",
+        "parent": "⚡ Parent paintEvent       ",
+    }
+    for name in ("slide", "hover", "popup"):
+        print(f"\n{name}:")
+        base_avg, _ = summary(results["effect"][name])
+        for mode in MODES:
+            if name not in results[mode]:
+                continue
+            avg, p95 = summary(results[mode][name])
+            ratio = f"  -> x{base_avg / max(avg, 1e-6):.2f}" if mode != "effect" else ""
+            print(f"  {labels[mode]}: {avg:.2f} ms/frame (p95 {p95:.2f} ms){ratio}")
+
+    stats = cache_stats()
+    frames_stats = frame_cache_stats()
+    print(f"\n📦 Nine-patch cache: {stats['entries']} entry, {stats['bytes'] / 1024:.1f} KB, "
+          f"hits {stats['hits']}, misses {stats['misses']}")
+    print(f"📦 Bóng ghép sẵn:    {frames_stats['entries']} entry, {frames_stats['bytes'] / 1024:.1f} KB, "
+          f"hits {frames_stats['hits']}, misses {frames_stats['misses']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
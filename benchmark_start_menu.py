@@ -0,0 +1,208 @@
+# BENCHMARK SCRIPT - benchmark_start_menu.py
+# Đo thời gian mở Start Menu khi có nhiều app được ghim (mặc định 1000 tiles):
+#   - Cách cũ: mỗi tile là một QFrame (layout, 2 QLabel, style sheet, hover animation,
+#     QGraphicsOpacityEffect) trong QGridLayout, tìm chỗ trống bằng cách quét từng ô với mọi tile
+#   - StartMenuTiles: lưới vẽ trực tiếp, bitmap ô đã chiếm, delegate chỉ cho tile đang hiển thị
+# Mỗi cách chạy trong một tiến trình riêng để đo bộ nhớ (RSS) không lẫn nhau.
+# Số đo: thời gian đăng ký tiles, time-to-first-paint (đăng ký + show + vẽ frame đầu),
+# thời gian một frame khi cuộn, RSS tăng thêm.
+#
+# Cách dùng:
+#   python benchmark_start_menu.py
+#   python benchmark_start_menu.py --tiles 3000 --scroll 100
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SIZES = ("small", "medium", "wide", "medium", "small", "small")
+
+
+def rss_mb() -> float:
+    """RSS hiện tại (MB), 0 nếu không đo được"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (OSError, ValueError):
+            return 0.0
+
+
+def build_legacy(count: int):
+    """Bản sao cách cũ: một Tile QFrame cho mỗi app, grid layout, quét ô tìm chỗ trống"""
+    from PySide6.QtCore import QEasingCurve, QPropertyAnimation, Qt
+    from PySide6.QtWidgets import (
+        QFrame, QGraphicsOpacityEffect, QGridLayout, QLabel, QScrollArea, QVBoxLayout, QWidget
+    )
+    from ui_qt.windows.dashboard_window_qt.utils.assets import get_app_icon
+    from ui_qt.windows.dashboard_window_qt.views.start_menu.start_menu_tiles import TILE_SPANS, TileSize
+
+    class LegacyTile(QFrame):
+        def __init__(self, app_id, name, size, parent=None):
+            super().__init__(parent)
+            self.setObjectName("StartMenuTile")
+            self.size_type = size
+            row_span, col_span = TILE_SPANS[size]
+            self.setFixedSize(col_span * 68 - 4, row_span * 68 - 4)
+            self.setMouseTracking(True)
+            self.setCursor(Qt.PointingHandCursor)
+            self.hover_animation = QPropertyAnimation(self, b"windowOpacity")
+            self.hover_animation.setDuration(150)
+            self.hover_animation.setEasingCurve(QEasingCurve.InOutQuad)
+
+            layout = QVBoxLayout(self)
+            layout.setContentsMargins(10, 10, 10, 10)
+            layout.setSpacing(5)
+            icon_label = QLabel()
+            icon_label.setAlignment(Qt.AlignCenter)
+            icon_label.setPixmap(get_app_icon(app_id).pixmap(48, 48))
+            layout.addWidget(icon_label, 1, Qt.AlignCenter)
+            text_label = QLabel(name)
+            text_label.setAlignment(Qt.AlignCenter)
+            text_label.setWordWrap(True)
+            text_label.setStyleSheet("color: white; font-size: 11px;")
+            layout.addWidget(text_label)
+            self.setStyleSheet("""
+                #StartMenuTile { background: #0078d4; border-radius: 4px; }
+                #StartMenuTile:hover { background: #1a8ae0; }
+            """)
+
+            # animate_in()
+            effect = QGraphicsOpacityEffect()
+            self.setGraphicsEffect(effect)
+            self.fade_in = QPropertyAnimation(effect, b"opacity")
+            self.fade_in.setDuration(250)
+            self.fade_in.setStartValue(0.0)
+            self.fade_in.setEndValue(1.0)
+            self.fade_in.start()
+
+    container = QWidget()
+    grid = QGridLayout(container)
+    grid.setContentsMargins(0, 0, 0, 0)
+    grid.setSpacing(4)
+    positions = {}
+
+    def is_position_empty(row, col, row_span, col_span):
+        for (tile_row, tile_col, tile_row_span, tile_col_span) in positions.values():
+            if not (row + row_span <= tile_row or row >= tile_row + tile_row_span or
+                    col + col_span <= tile_col or col >= tile_col + tile_col_span):
+                return False
+        return True
+
+    def find_empty_position(row_span, col_span):
+        row = 0
+        while True:
+            for col in range(4 - col_span + 1):
+                if is_position_empty(row, col, row_span, col_span):
+                    return row, col
+            row += 1
+
+    for i in range(count):
+        size = TileSize(SIZES[i % len(SIZES)])
+        row_span, col_span = TILE_SPANS[size]
+        row, col = find_empty_position(row_span, col_span)
+        tile = LegacyTile(f"app_{i}", f"Ứng dụng {i}", size, container)
+        grid.addWidget(tile, row, col, row_span, col_span)
+        positions[tile] = (row, col, row_span, col_span)
+
+    scroll = QScrollArea()
+    scroll.setWidget(container)
+    scroll.setWidgetResizable(True)
+    scroll.setFixedSize(4 * 68 + 20, 3 * 68)
+    return scroll, scroll.verticalScrollBar()
+
+
+def build_virtual(count: int):
+    from ui_qt.windows.dashboard_window_qt.views.start_menu.start_menu_tiles import StartMenuTiles, TileSize
+
+    tiles = StartMenuTiles()
+    for i in range(count):
+        tiles.add_tile(f"app_{i}", f"Ứng dụng {i}", size=TileSize(SIZES[i % len(SIZES)]))
+    return tiles, tiles.verticalScrollBar()
+
+
+def run_child(mode: str, count: int, scroll_frames: int):
+    """Chạy một cách trong tiến trình hiện tại, in kết quả JSON"""
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    # Nạp sẵn module / icon để chỉ đo phần tạo tiles
+    build_legacy(4) if mode == "legacy" else build_virtual(4)
+    app.processEvents()
+    rss_before = rss_mb()
+
+    start = time.perf_counter()
+    widget, scrollbar = (build_legacy if mode == "legacy" else build_virtual)(count)
+    built = time.perf_counter()
+    widget.show()
+    app.processEvents()
+    first_paint = time.perf_counter()
+
+    # Cuộn từng nửa trang
+    step = max(1, scrollbar.pageStep() // 2)
+    times = []
+    for frame in range(scroll_frames):
+        frame_start = time.perf_counter()
+        scrollbar.setValue((frame * step) % max(1, scrollbar.maximum()))
+        app.processEvents()
+        times.append((time.perf_counter() - frame_start) * 1000)
+
+    result = {
+        "build_ms": (built - start) * 1000,
+        "first_paint_ms": (first_paint - start) * 1000,
+        "scroll_ms": sum(times) / max(1, len(times)),
+        "rss_mb": rss_mb() - rss_before,
+        "widgets": len(widget.findChildren(object)),
+    }
+    if mode == "virtual":
+        result["delegates"] = len(widget._delegates)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StartMenuTiles so với một QFrame cho mỗi tile")
+    parser.add_argument("--tiles", type=int, default=1000)
+    parser.add_argument("--scroll", type=int, default=50, help="Số frame cuộn")
+    parser.add_argument("--child", choices=["legacy", "virtual"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.tiles, args.scroll)
+        return 0
+
+    print(f"🧱 {args.tiles} tiles ({', '.join(sorted(set(SIZES)))}), {args.scroll} frame cuộn")
+    results = {}
+    for mode in ("legacy", "virtual"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode,
+             "--tiles", str(args.tiles), "--scroll", str(args.scroll)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    old, new = results["legacy"], results["virtual"]
+    rows = [
+        ("Đăng ký tiles", "build_ms", "ms"),
+        ("Time-to-first-paint", "first_paint_ms", "ms"),
+        ("Một frame cuộn", "scroll_ms", "ms"),
+        ("RSS tăng thêm", "rss_mb", "MB"),
+    ]
+    for title, key, unit in rows:
+        print(f"\n{title}:")
+        print(f"  🐢 QFrame mỗi tile:  {old[key]:.1f} {unit}")
+        print(f"  ⚡ StartMenuTiles:   {new[key]:.1f} {unit}  -> x{old[key] / max(new[key], 1e-6):.1f}")
+
+    print(f"\n📦 QObject con: {old['widgets']} -> {new['widgets']}, delegate đang giữ: {new['delegates']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
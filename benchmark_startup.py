@@ -0,0 +1,72 @@
+# BENCHMARK SCRIPT - benchmark_startup.py
+# Đo time-to-interactive của Dashboard: chạy app_qt.py --startup-bench nhiều lần
+# (mỗi lần một process mới) và so với mục tiêu STARTUP_TARGET_MS.
+#
+# Cách dùng:
+#   python benchmark_startup.py              # 5 lần, hiện cửa sổ thật
+#   python benchmark_startup.py -n 10 --offscreen
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+from ui_qt.windows.dashboard_window_qt.utils.startup_profiler import STARTUP_TARGET_MS
+
+PROJECT_ROOT = Path(__file__).parent
+TTI_PATTERN = re.compile(r"STARTUP_TTI_MS=([\d.]+)")
+
+
+def run_once(offscreen: bool, timeout: int) -> float:
+    """Khởi động app một lần, trả về time-to-interactive (ms)"""
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    result = subprocess.run(
+        [sys.executable, "app_qt.py", "--startup-bench"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+        encoding="utf-8", errors="replace", timeout=timeout
+    )
+    match = TTI_PATTERN.search(result.stdout)
+    if not match:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+        raise RuntimeError(f"Không đọc được STARTUP_TTI_MS (exit code {result.returncode})")
+    return float(match.group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thời gian khởi động Dashboard")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Số lần chạy")
+    parser.add_argument("--offscreen", action="store_true", help="Dùng QT_QPA_PLATFORM=offscreen")
+    parser.add_argument("--timeout", type=int, default=60, help="Timeout mỗi lần chạy (giây)")
+    args = parser.parse_args()
+
+    # Lần đầu làm "ấm" ổ đĩa và chạy migration nếu cần, không tính
+    print("🔥 Warm-up run...")
+    run_once(args.offscreen, args.timeout)
+
+    timings = []
+    for i in range(args.runs):
+        tti = run_once(args.offscreen, args.timeout)
+        timings.append(tti)
+        print(f"  Run {i + 1}/{args.runs}: {tti:.0f} ms")
+
+    median = statistics.median(timings)
+    print(f"\n📊 Time-to-interactive: min {min(timings):.0f} ms, "
+          f"median {median:.0f} ms, max {max(timings):.0f} ms")
+
+    if median <= STARTUP_TARGET_MS:
+        print(f"✅ Đạt mục tiêu {STARTUP_TARGET_MS} ms")
+        return 0
+
+    print(f"❌ Vượt mục tiêu {STARTUP_TARGET_MS} ms (xem [startup] trong logs/ để biết phase chậm)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
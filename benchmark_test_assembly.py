@@ -0,0 +1,147 @@
+# BENCHMARK SCRIPT - benchmark_test_assembly.py
+# Đo TestAssemblyService trên ngân hàng câu hỏi giả lập (mặc định 100.000 câu)
+# và so với cách làm ngây thơ: nạp toàn bộ question_bank rồi lọc / random trong Python.
+#
+# Cách dùng:
+#   python benchmark_test_assembly.py
+#   python benchmark_test_assembly.py --questions 300000 --total 50 --budget 90
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+from database import DatabaseManager
+from ui_qt.windows.question_bank.services.assembly_service import (
+    AssemblyConstraints, DIFFICULTY_ALIASES, TestAssemblyError, TestAssemblyService,
+)
+
+
+def build_database(path: str, n_questions: int, seed: int):
+    """Tạo database tạm: cây Môn > Lớp > Chủ đề > Dạng và n_questions câu hỏi"""
+    rng = random.Random(seed)
+    db = DatabaseManager(path)
+    conn = db.conn
+
+    nodes, leaves = [], []
+    next_id = 1
+    for s in range(3):
+        subject_id = next_id
+        nodes.append((subject_id, None, f"Môn {s + 1}", "Môn"))
+        next_id += 1
+        for g in range(4):
+            grade_id = next_id
+            nodes.append((grade_id, subject_id, f"Lớp {10 + g}", "Lớp"))
+            next_id += 1
+            for t in range(8):
+                topic_id = next_id
+                nodes.append((topic_id, grade_id, f"Chủ đề {t + 1}", "Chủ đề"))
+                next_id += 1
+                for d in range(5):
+                    nodes.append((next_id, topic_id, f"Dạng {d + 1}", "Dạng"))
+                    leaves.append(next_id)
+                    next_id += 1
+    conn.executemany("INSERT INTO exercise_tree (id, parent_id, name, level) VALUES (?, ?, ?, ?)", nodes)
+
+    levels = [v for aliases in DIFFICULTY_ALIASES.values() for v in aliases]
+    conn.executemany(
+        """INSERT INTO question_bank (id, content_text, tree_id, difficulty_level, estimated_time, status)
+           VALUES (?, ?, ?, ?, ?, 'active')""",
+        ((i, f"Câu hỏi {i}", rng.choice(leaves), rng.choice(levels), rng.randint(1, 6))
+         for i in range(1, n_questions + 1))
+    )
+
+    today = datetime.now()
+    conn.executemany(
+        "INSERT INTO question_statistics (question_id, last_used_date) VALUES (?, ?)",
+        ((qid, (today - timedelta(days=rng.randint(0, 120))).strftime("%Y-%m-%d"))
+         for qid in rng.sample(range(1, n_questions + 1), n_questions // 3))
+    )
+    conn.commit()
+    print(f"📦 {len(nodes)} node cây, {n_questions} câu hỏi, {n_questions // 3} câu đã từng dùng")
+    return db, nodes[1][0]  # node "Lớp 10" của Môn 1
+
+
+def naive_assemble(db: DatabaseManager, root_id: int, constraints: AssemblyConstraints):
+    """Cách ngây thơ: SELECT * toàn bảng + cây + thống kê rồi lọc trong Python"""
+    tree = db.execute_query("SELECT id, parent_id FROM exercise_tree", fetch='all') or []
+    children = {}
+    for node in tree:
+        children.setdefault(node['parent_id'], []).append(node['id'])
+    subtree, stack = set(), [root_id]
+    while stack:
+        node_id = stack.pop()
+        subtree.add(node_id)
+        stack.extend(children.get(node_id, []))
+
+    since = (datetime.now() - timedelta(days=constraints.exclude_used_within_days)).strftime("%Y-%m-%d")
+    recent = {row['question_id'] for row in db.execute_query(
+        "SELECT question_id FROM question_statistics WHERE last_used_date >= ?", (since,), fetch='all') or []}
+
+    rng = random.Random(constraints.seed)
+    picked = []
+    questions = db.execute_query("SELECT * FROM question_bank", fetch='all') or []
+    for bucket, share in constraints.difficulty_mix.items():
+        pool = [q for q in questions
+                if q['tree_id'] in subtree and q['difficulty_level'] in DIFFICULTY_ALIASES[bucket]
+                and q['id'] not in recent]
+        picked.extend(rng.sample(pool, round(constraints.total * share)))
+    return picked
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TestAssemblyService")
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--total", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=90, help="Tổng thời gian tối đa (phút)")
+    parser.add_argument("--days", type=int, default=28, help="Loại câu đã dùng trong N ngày")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="test_assembly_bench_")
+    db, root_id = build_database(os.path.join(tmp_dir, "bench.db"), args.questions, args.seed)
+    service = TestAssemblyService(db)
+    constraints = AssemblyConstraints(
+        total=args.total,
+        tree_id=root_id,
+        exclude_used_within_days=args.days,
+        max_total_minutes=args.budget,
+        seed=args.seed,
+    )
+
+    picked, naive_ms = timed(lambda: naive_assemble(db, root_id, constraints))
+    print(f"\n🐢 Nạp toàn bảng rồi lọc: {naive_ms:.0f} ms ({len(picked)} câu, chưa xét thời gian)")
+
+    try:
+        result, service_ms = timed(lambda: service.assemble(constraints))
+    except TestAssemblyError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"⚡ TestAssemblyService: {service_ms:.0f} ms")
+    print(f"   {len(result.question_ids)} câu, {result.total_minutes} phút, theo độ khó {result.counts}")
+    print(f"   Câu hợp lệ: {result.candidates}")
+
+    again = service.assemble(constraints)
+    print(f"🔁 Cùng seed {result.seed} -> cùng đề: {'có' if again.question_ids == result.question_ids else 'KHÔNG'}")
+
+    plan = db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id, estimated_time FROM question_bank "
+        "WHERE difficulty_level IN ('easy', 'Dễ') AND tree_id IN (1, 2) AND COALESCE(status, 'active') = 'active'"
+    ).fetchall()
+    print("📋 Query plan:", "; ".join(row[-1] for row in plan))
+
+    db.conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
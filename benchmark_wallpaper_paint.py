@@ -0,0 +1,155 @@
+# BENCHMARK SCRIPT - benchmark_wallpaper_paint.py
+# Đo chi phí vẽ wallpaper của DesktopArea khi repaint từng phần (hover icon, khung chọn, kéo thả):
+#   - Cách cũ: scale ảnh gốc bằng SmoothTransformation trong mỗi paintEvent
+#   - WallpaperRenderer: dựng một lần theo (path, mode, size, dpr), paintEvent chỉ copy event.rect()
+# Chạy headless bằng offscreen QPA, đếm số lần scale và thời gian vẽ.
+#
+# Cách dùng:
+#   python benchmark_wallpaper_paint.py
+#   python benchmark_wallpaper_paint.py --repaints 1000 --source 6000x4000 --mode fill
+#   (cách cũ tốn ~45 ms mỗi lần vẽ nên mặc định chỉ chạy --legacy-repaints 100 lần)
+
+import os
+import sys
+import time
+import random
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt, QRect, QElapsedTimer
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication, QWidget
+
+from ui_qt.windows.dashboard_window_qt.views.desktop.wallpaper_renderer import WallpaperRenderer
+
+
+def make_source(width: int, height: int) -> QPixmap:
+    """Ảnh gốc giả lập (gradient + nhiễu để scale không bị tối ưu tầm thường)"""
+    image = QImage(width, height, QImage.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0.0, QColor(26, 42, 108))
+    gradient.setColorAt(1.0, QColor(216, 162, 221))
+    painter.fillRect(image.rect(), gradient)
+    rng = random.Random(1)
+    for _ in range(2000):
+        painter.fillRect(rng.randrange(width), rng.randrange(height), 40, 40,
+                         QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    painter.end()
+    return QPixmap.fromImage(image)
+
+
+class LegacyWallpaperWidget(QWidget):
+    """paintEvent giống DesktopArea._draw_wallpaper bản cũ (mode fill)"""
+
+    def __init__(self, source: QPixmap):
+        super().__init__()
+        self.source = source
+        self.scale_count = 0
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = self.rect()
+        scaled = self.source.scaled(rect.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        self.scale_count += 1
+        painter.drawPixmap((rect.width() - scaled.width()) // 2, (rect.height() - scaled.height()) // 2, scaled)
+
+
+class RendererWallpaperWidget(QWidget):
+    """paintEvent giống DesktopArea._draw_wallpaper bản mới"""
+
+    def __init__(self, source: QPixmap, mode: str):
+        super().__init__()
+        self.renderer = WallpaperRenderer(self)
+        self.renderer.set_source("benchmark", source, mode)
+        self.renderer.updated.connect(self.update)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.renderer.paint(painter, event.rect(), self.size(), self.devicePixelRatioF())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.renderer.resize(self.size(), self.devicePixelRatioF(), live=True)
+
+
+def partial_repaints(widget: QWidget, count: int, seed: int) -> float:
+    """count lần repaint vùng nhỏ (như hover một icon), trả về tổng ms"""
+    rng = random.Random(seed)
+    timer = QElapsedTimer()
+    timer.start()
+    for _ in range(count):
+        x = rng.randrange(0, widget.width() - 120)
+        y = rng.randrange(0, widget.height() - 120)
+        widget.repaint(QRect(x, y, 120, 120))
+    return timer.nsecsElapsed() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vẽ wallpaper DesktopArea")
+    parser.add_argument("--repaints", type=int, default=1000)
+    parser.add_argument("--legacy-repaints", type=int, default=100, help="Số lần repaint cho cách cũ")
+    parser.add_argument("--source", default="5472x3648", help="Kích thước ảnh gốc WxH")
+    parser.add_argument("--size", default="1920x1080", help="Kích thước desktop WxH")
+    parser.add_argument("--mode", default="fill", choices=["fill", "fit", "stretch", "tile", "center"])
+    parser.add_argument("--resizes", type=int, default=30, help="Số bước resize liên tục")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    src_w, src_h = (int(v) for v in args.source.lower().split("x"))
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    source = make_source(src_w, src_h)
+    print(f"🖼️ Ảnh gốc {src_w}x{src_h}, desktop {width}x{height}, mode {args.mode}, "
+          f"{args.repaints} lần repaint 120x120")
+
+    # Cách cũ (chỉ có nhánh fill mới scale mỗi lần vẽ)
+    legacy = LegacyWallpaperWidget(source)
+    legacy.resize(width, height)
+    legacy.show()
+    app.processEvents()
+    legacy.scale_count = 0
+    legacy_ms = partial_repaints(legacy, args.legacy_repaints, seed=7)
+    per_paint = legacy_ms / max(1, args.legacy_repaints)
+    print(f"\n🐢 Scale trong paintEvent: {per_paint:.2f} ms/lần, {legacy.scale_count} lần scale "
+          f"/ {args.legacy_repaints} lần repaint (~{per_paint * args.repaints:.0f} ms cho {args.repaints} lần)")
+
+    # WallpaperRenderer
+    widget = RendererWallpaperWidget(source, args.mode)
+    widget.resize(width, height)
+    widget.show()
+    app.processEvents()
+    stats = widget.renderer.stats
+    before = dict(stats)
+    renderer_ms = partial_repaints(widget, args.repaints, seed=7)
+    scaled = sum(stats[k] - before[k] for k in ("smooth", "fast"))
+    print(f"⚡ WallpaperRenderer: {renderer_ms:.0f} ms "
+          f"({renderer_ms / args.repaints:.3f} ms/lần), {scaled} lần scale trong lúc repaint")
+    print(f"   Dựng lúc hiển thị: {before['smooth']} smooth")
+
+    # Resize liên tục: mỗi bước chỉ dựng preview fast, bản smooth chạy nền khi dừng
+    before = dict(stats)
+    timer = QElapsedTimer()
+    timer.start()
+    for step in range(args.resizes):
+        widget.resize(width - step * 8, height - step * 5)
+        app.processEvents()
+    resize_ms = timer.nsecsElapsed() / 1e6
+
+    deadline = time.perf_counter() + 5
+    while widget.renderer._is_preview and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    print(f"\n↔️ {args.resizes} bước resize: {resize_ms:.0f} ms, "
+          f"{stats['fast'] - before['fast']} preview fast, "
+          f"{stats['async'] - before['async']} job nền, "
+          f"{stats['smooth'] - before['smooth']} bản smooth")
+    print(f"   Bản smooth đã thay preview: {'có' if not widget.renderer._is_preview else 'KHÔNG'}")
+
+    legacy.close()
+    widget.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
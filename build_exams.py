@@ -0,0 +1,98 @@
+# BATCH SCRIPT - build_exams.py
+# Xuất bộ đề PDF (nhiều mã đề + đáp án) từ ngân hàng câu hỏi mà không cần mở giao diện.
+#
+# Cách dùng:
+#   python build_exams.py --ids 12,15,18,21 -n 4 -o output/de_giua_ky.pdf
+#   python build_exams.py --chu-de "Hàm số" -n 8 --seed 2025 -o output/hoc_ky_1.pdf
+#   python build_exams.py --ids-file cau_hoi.txt -n 24 --workers 8 -o output/thi_hk.pdf
+
+import os
+import sys
+import argparse
+import multiprocessing
+
+from database import DatabaseManager
+from ui_qt.windows.question_bank.services.exam_builder_service import ExamSpec, build_exam_set
+
+
+def parse_ids(text: str):
+    return [int(part) for part in text.replace("\n", ",").split(",") if part.strip()]
+
+
+def select_question_ids(db: DatabaseManager, args):
+    """ID câu hỏi theo --ids / --ids-file / --chu-de"""
+    if args.ids:
+        return parse_ids(args.ids)
+    if args.ids_file:
+        with open(args.ids_file, encoding="utf-8") as f:
+            return parse_ids(f.read())
+
+    sql = "SELECT id FROM question_bank WHERE chu_de = ?"
+    params = [args.chu_de]
+    if args.do_kho:
+        sql += " AND do_kho = ?"
+        params.append(args.do_kho)
+    sql += " ORDER BY id"
+    if args.limit:
+        sql += " LIMIT ?"
+        params.append(args.limit)
+    rows = db.execute_query(sql, tuple(params), fetch='all') or []
+    return [row["id"] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Xuất bộ đề thi PDF từ ngân hàng câu hỏi")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ids", help="Danh sách ID câu hỏi, ngăn cách bằng dấu phẩy")
+    source.add_argument("--ids-file", help="File chứa ID câu hỏi (mỗi dòng hoặc ngăn cách bằng dấu phẩy)")
+    source.add_argument("--chu-de", help="Lấy tất cả câu hỏi của chủ đề")
+    parser.add_argument("--do-kho", type=int, help="Lọc độ khó (dùng với --chu-de)")
+    parser.add_argument("--limit", type=int, help="Số câu tối đa (dùng với --chu-de)")
+
+    parser.add_argument("-o", "--output", required=True, help="File PDF đích")
+    parser.add_argument("-n", "--variants", type=int, default=1, help="Số mã đề")
+    parser.add_argument("--seed", type=int, help="Seed đảo đề (cùng seed -> cùng bộ đề; mặc định sinh mới)")
+    parser.add_argument("--title", default="BÀI KIỂM TRA")
+    parser.add_argument("--duration", default="45 phút")
+    parser.add_argument("--no-shuffle-questions", action="store_true", help="Giữ nguyên thứ tự câu hỏi")
+    parser.add_argument("--no-shuffle-options", action="store_true", help="Giữ nguyên thứ tự phương án")
+    parser.add_argument("--workers", type=int, help="Số process render (mặc định theo số CPU)")
+    parser.add_argument("--db", default="data/giasu_management.db", help="Đường dẫn database")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    question_ids = select_question_ids(db, args)
+    if not question_ids:
+        print("❌ Không có câu hỏi nào phù hợp")
+        return 1
+
+    spec = ExamSpec(
+        title=args.title,
+        duration=args.duration,
+        variants=args.variants,
+        shuffle_questions=not args.no_shuffle_questions,
+        shuffle_options=not args.no_shuffle_options,
+        seed=args.seed,
+    ).with_seed()
+
+    out_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(out_dir, exist_ok=True)
+
+    print(f"📝 {len(question_ids)} câu hỏi, {spec.variants} mã đề, seed {spec.seed}")
+
+    def report(done, total, path):
+        print(f"  [{done}/{total}] {path}")
+
+    try:
+        paths = build_exam_set(db, question_ids, spec, args.output, progress=report, max_workers=args.workers)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"✅ Đã tạo {len(paths)} file")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
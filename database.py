@@ -1,15 +1,21 @@
 import sqlite3
-from tkinter import messagebox
+import schema_migrations
+from constants import DAYS_OF_WEEK_VN
+
+
+# Trạng thái điểm danh khi giáo viên hủy buổi
+CANCELLED_ATTENDANCE_STATUS = "Nghỉ do GV bận"
+
+
 class DatabaseManager:
+    # Version mới nhất trong registry migration (schema_migrations.MIGRATIONS)
+    SCHEMA_VERSION = schema_migrations.LATEST_VERSION
+
     def __init__(self, db_name="data/giasu_management.db"):
         self.db_name = db_name
         self.conn = self.create_connection()
-        self._initialize_schema()
-        self.upgrade_database_schema()
-        self.upgrade_exercise_tree_schema()
-        if not hasattr(self, '_question_bank_upgraded'):
-            self.upgrade_question_bank_schema()
-            self._question_bank_upgraded = True
+        self._schema_checked = False
+        self.ensure_schema()
 
     def create_connection(self):
         try:
@@ -21,6 +27,32 @@ class DatabaseManager:
             print(f"Lỗi kết nối CSDL: {e}")
             return None
 
+    # ========== SCHEMA VERSION ==========
+
+    def get_schema_version(self):
+        """Version schema đã ghi trong bảng schema_version (0 nếu chưa migrate)"""
+        if not self.conn:
+            return 0
+        return schema_migrations.current_version(self.conn)
+
+    def is_schema_current(self):
+        """Database đã chạy hết các bước migration chưa"""
+        return self.get_schema_version() >= self.SCHEMA_VERSION
+
+    def ensure_schema(self):
+        """
+        Đảm bảo database đã được migrate tới version mới nhất
+
+        Gọi thoải mái khi mở cửa sổ: sau lần kiểm tra đầu tiên chỉ còn là
+        một phép so sánh trong bộ nhớ, database đã migrate không chạy DDL nào.
+        """
+        if self._schema_checked or not self.conn:
+            return
+        version = self.get_schema_version()
+        if version < self.SCHEMA_VERSION:
+            version = schema_migrations.migrate(self)
+        self._schema_checked = version >= self.SCHEMA_VERSION
+
     def _initialize_schema(self):
         c = self.conn.cursor()
         try:
@@ -413,6 +445,7 @@ class DatabaseManager:
             return None
         finally:
             c.close()
+    # student_topic_profile được trigger trên student_skills cập nhật sau mỗi thêm/sửa/xoá
     def add_student_skill(self, student_id, chu_de, ngay_danh_gia, diem, nhan_xet=""):
         query = "INSERT INTO student_skills (student_id, chu_de, ngay_danh_gia, diem, nhan_xet) VALUES (?, ?, ?, ?, ?)"
         return self.execute_query(query, (student_id, chu_de, ngay_danh_gia, diem, nhan_xet))
@@ -425,6 +458,49 @@ class DatabaseManager:
         query = "DELETE FROM student_skills WHERE id = ?"
         return self.execute_query(query, (skill_id,))
 
+    def get_student_topic_profile(self, student_id, max_mean=None):
+        """
+        Hồ sơ năng lực theo chủ đề của học sinh (đọc từ bảng tổng hợp)
+
+        Args:
+            student_id: ID học sinh
+            max_mean: Chỉ lấy chủ đề có điểm TB < max_mean (vd: 3 = chủ đề yếu)
+
+        Returns:
+            List dict: chu_de, assessment_count, mean_score, latest_score, latest_date, trend_slope
+        """
+        query = """
+            SELECT chu_de, assessment_count, score_sum, mean_score,
+                   latest_score, latest_date, trend_slope
+            FROM student_topic_profile
+            WHERE student_id = ?
+        """
+        params = [student_id]
+        if max_mean is not None:
+            query += " AND mean_score < ? ORDER BY mean_score ASC"
+            params.append(max_mean)
+        else:
+            query += " ORDER BY chu_de"
+        return self.execute_query(query, tuple(params), fetch='all') or []
+
+    def get_group_topic_profile(self, group_id=None):
+        """Điểm TB theo chủ đề của nhóm (tất cả nhóm nếu group_id=None)"""
+        if group_id is None:
+            return self.execute_query(
+                "SELECT * FROM group_topic_profile ORDER BY group_id, chu_de", fetch='all'
+            ) or []
+        return self.execute_query(
+            "SELECT * FROM group_topic_profile WHERE group_id = ? ORDER BY chu_de", (group_id,), fetch='all'
+        ) or []
+
+    def rebuild_student_topic_profile(self, commit=True):
+        """Tính lại toàn bộ student_topic_profile từ student_skills (dùng khi migrate / sửa dữ liệu tay)"""
+        c = self.conn.cursor()
+        c.execute("DELETE FROM student_topic_profile")
+        c.execute(schema_migrations.PROFILE_INSERT_SQL.format(where="1 = 1"))
+        if commit:
+            self.conn.commit()
+
     def delete_question(self, q_id):
         self.conn.execute("DELETE FROM question_bank WHERE id = ?;", (q_id,)); self.conn.commit()
 
@@ -532,42 +608,78 @@ class DatabaseManager:
         """Xóa một học sinh khỏi CSDL."""
         return self.execute_query("DELETE FROM students WHERE id=?", (student_id,))
 
-    def get_attendance_report(self, start_date, end_date, hide_completed):
-        """Lấy dữ liệu báo cáo chuyên cần đã xử lý."""
-        base_query = """
-            SELECT a.id, a.session_date, s.name, s.id as student_id, g.name as group_name, g.grade, a.status, a.make_up_status
-            FROM attendance a 
-            JOIN students s ON a.student_id = s.id 
-            JOIN groups g ON a.group_id = g.id
-            WHERE a.status LIKE 'Nghỉ%' AND a.session_date BETWEEN ? AND ? 
+    # Cột được phép sắp xếp trong báo cáo chuyên cần -> biểu thức SQL
+    ATTENDANCE_REPORT_ORDER = {
+        'session_date': "a.session_date",
+        'student_name': "s.name",
+        'group_name': "g.name",
+        'status': "a.status",
+        'detailed_status': "a.make_up_status",
+    }
+
+    @staticmethod
+    def _attendance_report_filter(hide_completed):
         """
-        params = [start_date, end_date]
+        Điều kiện WHERE của báo cáo chuyên cần
 
+        '%Nghỉ%' để bắt cả trạng thái có emoji ("❌ Nghỉ không phép"); với index
+        idx_attendance_report điều kiện được kiểm tra ngay trên index, không đọc bảng
+        """
+        where = "a.session_date BETWEEN ? AND ? AND a.status LIKE '%Nghỉ%'"
         if hide_completed:
-            base_query += " AND a.make_up_status != 'Đã dạy bù' "
+            where += " AND COALESCE(a.make_up_status, '') != 'Đã dạy bù'"
+        return where
+
+    def count_attendance_report(self, start_date, end_date, hide_completed):
+        """Số dòng của báo cáo chuyên cần (để phân trang)"""
+        row = self.execute_query(
+            f"SELECT COUNT(*) AS total FROM attendance a WHERE {self._attendance_report_filter(hide_completed)}",
+            (start_date, end_date), fetch='one'
+        )
+        return row['total'] if row else 0
 
-        base_query += " ORDER BY a.session_date DESC, s.name "
+    def get_attendance_report(self, start_date, end_date, hide_completed,
+                              order_by='session_date', descending=True, limit=None, offset=0):
+        """
+        Lấy dữ liệu báo cáo chuyên cần đã xử lý.
 
-        report_data = []
-        absent_sessions = self.execute_query(base_query, tuple(params), fetch='all') or []
+        Một truy vấn LEFT JOIN makeup_sessions (thay cho một truy vấn học bù mỗi dòng).
 
-        for row in absent_sessions:
-            att_id = row['id']
-            detailed_status = row['make_up_status']
-
-            makeup_info = self.execute_query(
-                "SELECT ms.session_date, ms.time_slot, host_g.name as host_group_name, ms.is_private, ms.host_group_id FROM makeup_sessions ms LEFT JOIN groups host_g ON ms.host_group_id = host_g.id WHERE ms.attendance_id = ?",
-                (att_id,), fetch='one')
+        Args:
+            order_by: khoá trong ATTENDANCE_REPORT_ORDER
+            limit, offset: phân trang (None = lấy hết)
+        """
+        order_expr = self.ATTENDANCE_REPORT_ORDER.get(order_by, "a.session_date")
+        direction = "DESC" if descending else "ASC"
+        query = f"""
+            SELECT a.id, a.session_date, s.name, s.id AS student_id, g.name AS group_name, g.grade,
+                   a.status, a.make_up_status,
+                   ms.session_date AS makeup_date, ms.time_slot AS makeup_time,
+                   ms.is_private, host_g.name AS host_group_name
+            FROM attendance a
+            JOIN students s ON a.student_id = s.id
+            JOIN groups g ON a.group_id = g.id
+            LEFT JOIN makeup_sessions ms ON ms.attendance_id = a.id
+            LEFT JOIN groups host_g ON ms.host_group_id = host_g.id
+            WHERE {self._attendance_report_filter(hide_completed)}
+            ORDER BY {order_expr} {direction}, s.name, a.id
+        """
+        params = [start_date, end_date]
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
 
-            if row['make_up_status'] == 'Đã lên lịch' and makeup_info:
-                m_date, m_time, m_group, is_private, host_group_id = makeup_info
-                if is_private == 1:
-                    detailed_status = f"Dạy bù riêng ({m_date}, {m_time})"
+        report_data = []
+        for row in self.execute_query(query, tuple(params), fetch='all') or []:
+            detailed_status = row['make_up_status']
+            if row['make_up_status'] == 'Đã lên lịch' and row['makeup_date']:
+                if row['is_private'] == 1:
+                    detailed_status = f"Dạy bù riêng ({row['makeup_date']}, {row['makeup_time']})"
                 else:
-                    detailed_status = f"Học bù với Nhóm {m_group} ({m_date})"
+                    detailed_status = f"Học bù với Nhóm {row['host_group_name']} ({row['makeup_date']})"
 
             report_data.append({
-                'id': att_id,
+                'id': row['id'],
                 'session_date': row['session_date'],
                 'student_name': row['name'],
                 'student_id': row['student_id'],
@@ -577,6 +689,113 @@ class DatabaseManager:
                 'detailed_status': detailed_status
             })
         return report_data
+
+    # ========== BULK CANCELLATION ==========
+
+    @staticmethod
+    def _scheduled_sessions_cte(start_date, end_date, group_ids=None):
+        """
+        CTE 'sessions(group_id, session_date)': các buổi có trong lịch (schedule) từ start_date đến end_date
+
+        Returns:
+            (sql, params) - phần WITH đặt ngay sau INSERT INTO ... (cột), trước SELECT
+            (câu lệnh phải bắt đầu bằng INSERT để sqlite3 mở transaction và trả rowcount)
+        """
+        # strftime('%w'): 0 = Chủ Nhật, 1 = Thứ Hai, ...
+        day_names = ", ".join("(?, ?)" for _ in DAYS_OF_WEEK_VN)
+        params = [start_date, end_date]
+        for idx, name in enumerate(DAYS_OF_WEEK_VN):
+            params.extend([str((idx + 1) % 7), name])
+
+        group_filter = ""
+        if group_ids is not None:
+            group_ids = list(group_ids)
+            group_filter = f"AND sc.group_id IN ({','.join('?' * len(group_ids))})"
+            params.extend(group_ids)
+
+        sql = f"""
+            WITH RECURSIVE days(d) AS (
+                SELECT date(?)
+                UNION ALL
+                SELECT date(d, '+1 day') FROM days WHERE d < date(?)
+            ),
+            day_names(dow, day_of_week) AS (VALUES {day_names}),
+            sessions(group_id, session_date) AS (
+                SELECT DISTINCT sc.group_id, days.d
+                FROM days
+                JOIN day_names n ON n.dow = strftime('%w', days.d)
+                JOIN schedule sc ON sc.day_of_week = n.day_of_week
+                WHERE 1 = 1 {group_filter}
+            )
+        """
+        return sql, params
+
+    def cancel_sessions(self, start_date, end_date, group_ids=None):
+        """
+        Hủy hàng loạt các buổi theo lịch trong khoảng ngày (vd: nghỉ lễ cả tuần)
+
+        Ghi cancelled_sessions và set 'Nghỉ do GV bận' cho toàn bộ học sinh của nhóm,
+        hai câu INSERT ... SELECT trong một transaction.
+
+        Args:
+            start_date, end_date: 'YYYY-MM-DD' (bao gồm cả hai đầu)
+            group_ids: chỉ hủy các nhóm này (None = tất cả nhóm)
+
+        Returns:
+            dict {'sessions': số buổi mới bị hủy, 'attendance': số dòng điểm danh được ghi}
+        """
+        if group_ids is not None and not group_ids:
+            return {'sessions': 0, 'attendance': 0}
+        cte, params = self._scheduled_sessions_cte(start_date, end_date, group_ids)
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO cancelled_sessions (group_id, cancelled_date)" + cte + """
+                SELECT group_id, session_date FROM sessions
+                """,
+                params
+            )
+            sessions = cur.rowcount
+            cur = self.conn.execute(
+                "INSERT INTO attendance (student_id, group_id, session_date, status, make_up_status)" + cte + """
+                SELECT st.id, ss.group_id, ss.session_date, ?, ''
+                FROM sessions ss
+                JOIN students st ON st.group_id = ss.group_id
+                WHERE 1 = 1
+                ON CONFLICT(student_id, group_id, session_date) DO UPDATE SET
+                    status = excluded.status, make_up_status = excluded.make_up_status
+                """,
+                params + [CANCELLED_ATTENDANCE_STATUS]
+            )
+            attendance = cur.rowcount
+        return {'sessions': sessions, 'attendance': attendance}
+
+    def restore_sessions(self, start_date, end_date, group_ids=None):
+        """
+        Phục hồi hàng loạt các buổi đã hủy trong khoảng ngày (ngược với cancel_sessions)
+
+        Returns:
+            dict {'sessions': số buổi được phục hồi, 'attendance': số dòng 'Nghỉ do GV bận' đã xoá}
+        """
+        if group_ids is not None and not group_ids:
+            return {'sessions': 0, 'attendance': 0}
+        group_filter, group_params = "", []
+        if group_ids is not None:
+            group_params = list(group_ids)
+            group_filter = f" AND group_id IN ({','.join('?' * len(group_params))})"
+
+        with self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM cancelled_sessions WHERE cancelled_date BETWEEN ? AND ?" + group_filter,
+                [start_date, end_date] + group_params
+            )
+            sessions = cur.rowcount
+            cur = self.conn.execute(
+                "DELETE FROM attendance WHERE session_date BETWEEN ? AND ? AND status = ?" + group_filter,
+                [start_date, end_date, CANCELLED_ATTENDANCE_STATUS] + group_params
+            )
+            attendance = cur.rowcount
+        return {'sessions': sessions, 'attendance': attendance}
+
     def get_students_for_salary_report(self):
         """Lấy danh sách học sinh có đăng ký gói học để tính lương."""
         query = """
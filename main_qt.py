@@ -1,10 +1,12 @@
 # main_qt.py
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from ui_qt.main_window import MainWindow
 from database import DatabaseManager  # dùng lại lớp DB hiện tại
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # process pool xuất đề trong bản đóng gói
     app = QApplication(sys.argv)
     db = DatabaseManager()  # khởi tạo như app cũ của bạn
     w = MainWindow(db)
@@ -0,0 +1,367 @@
+"""
+Registry migration cho database giasu_management.db
+
+Mỗi bước migration có version tăng dần, idempotent (chạy lại không hỏng dữ liệu)
+và được ghi vào bảng schema_version sau khi chạy xong. Database đã ở version
+mới nhất sẽ không chạy bất kỳ câu lệnh DDL / PRAGMA nào khi khởi động.
+
+Thêm thay đổi schema mới: viết hàm _migrate_xxx(db) và thêm Migration vào
+cuối MIGRATIONS với version = version cuối + 1. Không sửa các bước đã phát hành.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Một bước nâng cấp schema"""
+    version: int
+    name: str
+    apply: Callable  # apply(db: DatabaseManager) -> None
+
+
+# ========== MIGRATION STEPS ==========
+
+def _migrate_initial_schema(db):
+    """Các bảng gốc (settings, students, attendance, question_bank, ...)"""
+    db._initialize_schema()
+
+
+def _migrate_attendance_student_columns(db):
+    """attendance.make_up_status, students.package_id / cycle_start_date"""
+    db.upgrade_database_schema()
+
+
+def _migrate_exercise_tree_columns(db):
+    """exercise_tree.description / created_at"""
+    db.upgrade_exercise_tree_schema()
+
+
+def _migrate_question_bank_indexes(db):
+    """Cột question_bank.topic và indexes cho ngân hàng câu hỏi"""
+    db.upgrade_question_bank_schema()
+
+
+def _migrate_session_tables(db):
+    """Bảng buổi học bù và buổi nghỉ (trước đây tạo rải rác ở các cửa sổ)"""
+    c = db.conn.cursor()
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS makeup_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            attendance_id INTEGER UNIQUE NOT NULL,
+            student_id INTEGER NOT NULL,
+            session_date TEXT NOT NULL,
+            time_slot TEXT,
+            host_group_id INTEGER,
+            is_private INTEGER DEFAULT 1,
+            FOREIGN KEY (attendance_id) REFERENCES attendance(id) ON DELETE CASCADE,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (host_group_id) REFERENCES groups(id) ON DELETE CASCADE
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS cancelled_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_id INTEGER NOT NULL,
+            cancelled_date TEXT NOT NULL,
+            UNIQUE(group_id, cancelled_date),
+            FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
+        )
+    """)
+
+
+def _migrate_tree_support_tables(db):
+    """Bảng phụ trợ + indexes cho TreeRepository"""
+    c = db.conn.cursor()
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS tree_node_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            node_id INTEGER UNIQUE NOT NULL,
+            question_count INTEGER DEFAULT 0,
+            child_count INTEGER DEFAULT 0,
+            descendant_count INTEGER DEFAULT 0,
+            depth_level INTEGER DEFAULT 0,
+            last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (node_id) REFERENCES exercise_tree(id) ON DELETE CASCADE
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS tree_paths (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            node_id INTEGER NOT NULL,
+            ancestor_id INTEGER NOT NULL,
+            path_level INTEGER NOT NULL,
+            UNIQUE(node_id, ancestor_id),
+            FOREIGN KEY (node_id) REFERENCES exercise_tree(id) ON DELETE CASCADE,
+            FOREIGN KEY (ancestor_id) REFERENCES exercise_tree(id) ON DELETE CASCADE
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS tree_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            node_id INTEGER NOT NULL,
+            action_type TEXT NOT NULL,
+            old_parent_id INTEGER,
+            new_parent_id INTEGER,
+            old_name TEXT,
+            new_name TEXT,
+            old_level TEXT,
+            new_level TEXT,
+            changed_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            changed_by TEXT DEFAULT 'system',
+            reason TEXT,
+            FOREIGN KEY (node_id) REFERENCES exercise_tree(id) ON DELETE CASCADE
+        )
+    """)
+
+    indexes = [
+        "CREATE INDEX IF NOT EXISTS idx_tree_parent_id ON exercise_tree(parent_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_level ON exercise_tree(level)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_name ON exercise_tree(name)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_created_at ON exercise_tree(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_stats_node_id ON tree_node_stats(node_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_paths_node_id ON tree_paths(node_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_paths_ancestor_id ON tree_paths(ancestor_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_history_node_id ON tree_history(node_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tree_history_date ON tree_history(changed_date)",
+    ]
+    for sql in indexes:
+        c.execute(sql)
+
+
+def _migrate_question_fts(db):
+    """Bảng FTS5 cho SearchService (bỏ qua nếu SQLite không build kèm FTS5)"""
+    c = db.conn.cursor()
+    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='question_fts'")
+    if c.fetchone():
+        return
+    try:
+        c.execute("""
+            CREATE VIRTUAL TABLE question_fts USING fts5(
+                content_text,
+                answer_text,
+                tags,
+                content='question_bank'
+            )
+        """)
+        c.execute("INSERT INTO question_fts(question_fts) VALUES('rebuild')")
+    except sqlite3.OperationalError as e:
+        # SearchService tự chuyển sang tìm kiếm LIKE khi không có question_fts
+        print(f"⚠️ FTS không khả dụng: {e}")
+
+
+# Tổng hợp student_skills -> student_topic_profile cho các dòng thoả {where}.
+# trend_slope = hệ số góc hồi quy tuyến tính của điểm theo ngày, quy ra điểm / 30 ngày.
+PROFILE_INSERT_SQL = """
+    INSERT INTO student_topic_profile (
+        student_id, chu_de, assessment_count, score_sum, mean_score,
+        latest_score, latest_date, trend_slope, updated_at
+    )
+    SELECT src.student_id, src.chu_de, COUNT(*), SUM(src.diem), AVG(src.diem),
+           (SELECT l.diem FROM student_skills l
+            WHERE l.student_id = src.student_id AND l.chu_de = src.chu_de
+            ORDER BY l.ngay_danh_gia DESC, l.id DESC LIMIT 1),
+           MAX(src.ngay_danh_gia),
+           CASE WHEN COUNT(src.x) > 1 AND COUNT(src.x) * SUM(src.x * src.x) - SUM(src.x) * SUM(src.x) > 0
+                THEN 30.0 * (COUNT(src.x) * SUM(src.x * src.y) - SUM(src.x) * SUM(src.y))
+                     / (COUNT(src.x) * SUM(src.x * src.x) - SUM(src.x) * SUM(src.x))
+                ELSE 0 END,
+           CURRENT_TIMESTAMP
+    FROM (
+        SELECT student_id, chu_de, diem, ngay_danh_gia,
+               julianday(ngay_danh_gia) - 2451545 AS x,
+               CASE WHEN julianday(ngay_danh_gia) IS NOT NULL THEN diem END AS y
+        FROM student_skills
+        WHERE {where}
+    ) AS src
+    GROUP BY src.student_id, src.chu_de
+"""
+
+
+def _profile_refresh_sql(row: str) -> str:
+    """Câu lệnh trigger tính lại hồ sơ của cặp (học sinh, chủ đề) của dòng NEW / OLD"""
+    where = f"student_id = {row}.student_id AND chu_de = {row}.chu_de"
+    return (f"DELETE FROM student_topic_profile WHERE {where}; "
+            f"{PROFILE_INSERT_SQL.format(where=where)};")
+
+
+def _migrate_student_topic_profile(db):
+    """
+    Bảng tổng hợp student_topic_profile (giữ đúng bằng trigger trên student_skills)
+    và view group_topic_profile tổng hợp theo nhóm hiện tại của học sinh
+    """
+    c = db.conn.cursor()
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS student_topic_profile (
+            student_id INTEGER NOT NULL,
+            chu_de TEXT NOT NULL,
+            assessment_count INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            mean_score REAL,
+            latest_score REAL,
+            latest_date TEXT,
+            trend_slope REAL DEFAULT 0,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (student_id, chu_de),
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_student_skills_student_topic ON student_skills(student_id, chu_de)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_topic_profile_topic ON student_topic_profile(chu_de)")
+
+    refresh_new = _profile_refresh_sql("NEW")
+    refresh_old = _profile_refresh_sql("OLD")
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_student_skills_profile_insert
+        AFTER INSERT ON student_skills
+        BEGIN {refresh_new} END
+    """)
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_student_skills_profile_update
+        AFTER UPDATE OF student_id, chu_de, ngay_danh_gia, diem ON student_skills
+        BEGIN {refresh_old} {refresh_new} END
+    """)
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_student_skills_profile_delete
+        AFTER DELETE ON student_skills
+        BEGIN {refresh_old} END
+    """)
+
+    c.execute("""
+        CREATE VIEW IF NOT EXISTS group_topic_profile AS
+        SELECT s.group_id,
+               p.chu_de,
+               COUNT(*) AS student_count,
+               SUM(p.assessment_count) AS assessment_count,
+               SUM(p.score_sum) AS score_sum,
+               SUM(p.score_sum) / SUM(p.assessment_count) AS mean_score,
+               AVG(p.trend_slope) AS trend_slope
+        FROM student_topic_profile p
+        JOIN students s ON s.id = p.student_id
+        WHERE s.group_id IS NOT NULL
+        GROUP BY s.group_id, p.chu_de
+    """)
+
+    db.rebuild_student_topic_profile(commit=False)
+
+
+def _migrate_test_assembly_indexes(db):
+    """Covering indexes cho tạo đề ngẫu nhiên (TestAssemblyService)"""
+    c = db.conn.cursor()
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_question_assembly
+        ON question_bank(difficulty_level, tree_id, status, estimated_time)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_question_stats_last_used
+        ON question_statistics(question_id, last_used_date)
+    """)
+
+
+def _migrate_attendance_report_indexes(db):
+    """Covering indexes cho báo cáo chuyên cần (DatabaseManager.get_attendance_report)"""
+    c = db.conn.cursor()
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_attendance_report
+        ON attendance(session_date, status, make_up_status)
+    """)
+    # attendance_id đã có UNIQUE; index này phủ luôn các cột hiển thị để LEFT JOIN không đọc bảng
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_makeup_attendance_cover
+        ON makeup_sessions(attendance_id, session_date, time_slot, is_private, host_group_id)
+    """)
+
+
+def _migrate_exercise_tree_manager_columns(db):
+    """Cột hiển thị / sắp xếp mà ModernExerciseTreeManagerQt dùng (icon, màu, ẩn/hiện, thứ tự)"""
+    db.add_column_safely("exercise_tree", "icon", "TEXT DEFAULT ''")
+    db.add_column_safely("exercise_tree", "color", "TEXT DEFAULT '#2E86AB'")
+    db.add_column_safely("exercise_tree", "is_active", "INTEGER DEFAULT 1")
+    db.add_column_safely("exercise_tree", "sort_order", "INTEGER DEFAULT 0")
+    db.add_column_safely("exercise_tree", "metadata", "TEXT DEFAULT '{}'")
+    # ALTER TABLE không cho DEFAULT CURRENT_TIMESTAMP
+    db.add_column_safely("exercise_tree", "updated_at", "TEXT DEFAULT ''")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "initial_schema", _migrate_initial_schema),
+    Migration(2, "attendance_student_columns", _migrate_attendance_student_columns),
+    Migration(3, "exercise_tree_columns", _migrate_exercise_tree_columns),
+    Migration(4, "question_bank_indexes", _migrate_question_bank_indexes),
+    Migration(5, "session_tables", _migrate_session_tables),
+    Migration(6, "tree_support_tables", _migrate_tree_support_tables),
+    Migration(7, "question_fts", _migrate_question_fts),
+    Migration(8, "student_topic_profile", _migrate_student_topic_profile),
+    Migration(9, "test_assembly_indexes", _migrate_test_assembly_indexes),
+    Migration(10, "attendance_report_indexes", _migrate_attendance_report_indexes),
+    Migration(11, "exercise_tree_manager_columns", _migrate_exercise_tree_manager_columns),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ========== RUNNER ==========
+
+def current_version(conn) -> int:
+    """
+    Version schema đã ghi trong database (0 nếu chưa có bảng schema_version)
+
+    Chỉ là một câu SELECT - không chạy DDL
+    """
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def is_current(conn) -> bool:
+    """Database đã ở version mới nhất chưa"""
+    return current_version(conn) >= LATEST_VERSION
+
+
+def migrate(db) -> int:
+    """
+    Chạy các bước migration còn thiếu theo thứ tự
+
+    Args:
+        db: DatabaseManager (cần db.conn và các hàm upgrade_*)
+
+    Returns:
+        Version schema sau khi chạy (dừng ở bước lỗi đầu tiên)
+    """
+    conn = db.conn
+    version = current_version(conn)
+    if version >= LATEST_VERSION:
+        return version
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        try:
+            migration.apply(db)
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.name, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            conn.commit()
+            version = migration.version
+            print(f"✅ Migration {migration.version:03d} {migration.name}")
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"❌ Lỗi migration {migration.version:03d} {migration.name}: {e}")
+            break
+
+    return version
@@ -0,0 +1,61 @@
+# tests/conftest.py
+"""
+Cấu hình chung cho test
+
+- Chạy từ thư mục gốc dự án: python -m pytest -q
+- Test cần Qt dùng nền offscreen (không cần màn hình)
+- Thư mục cache / settings của người dùng được trỏ sang thư mục tạm
+- FakeClock / fixture clock: đồng hồ giả cho service nhận tham số clock
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+class FakeClock:
+    """Đồng hồ giả: gọi trả về now, test tự tăng / lùi now (đơn vị do service quy định)"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """QApplication dùng chung (bỏ qua test nếu thiếu PySide6)"""
+    widgets = pytest.importorskip("PySide6.QtWidgets")
+    app = widgets.QApplication.instance() or widgets.QApplication([])
+    yield app
+
+
+@pytest.fixture
+def clock():
+    """FakeClock bắt đầu từ 0 - fixture của từng module đặt mốc riêng nếu cần"""
+    return FakeClock()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_user_dirs(tmp_path_factory):
+    """Không để test ghi vào cache / settings thật (thumbnail, thời tiết, QSettings)"""
+    base = tmp_path_factory.mktemp("user")
+    saved = {}
+    for name in ("XDG_CACHE_HOME", "XDG_CONFIG_HOME", "XDG_DATA_HOME", "LOCALAPPDATA", "APPDATA"):
+        saved[name] = os.environ.get(name)
+        os.environ[name] = str(base / name.lower())
+    yield base
+    for name, value in saved.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
@@ -0,0 +1,80 @@
+# tests/test_app_repository.py
+"""
+AppRepository với storage tạo từ bản cũ (settings rỗng):
+- Mở lại storage -> apps mặc định được bổ sung settings còn thiếu (reusable), ghi xuống file
+- Giá trị người dùng đã đổi không bị ghi đè
+- dashboard_apps.json đi kèm đã có sẵn settings mặc định
+"""
+
+import json
+
+import pytest
+
+from tests.conftest import ROOT
+from ui_qt.windows.dashboard_window_qt.repositories.app_repository import AppRepository
+
+REUSABLE_IDS = {app.id for app in AppRepository._default_apps() if app.settings.get("reusable")}
+
+
+def legacy_apps(overrides=None):
+    """Apps mặc định như bản cũ đã lưu: settings rỗng"""
+    data = []
+    for app in AppRepository._default_apps():
+        item = app.to_dict()
+        item["settings"] = dict((overrides or {}).get(app.id, {}))
+        data.append(item)
+    return data
+
+
+def open_repo(storage_type, path):
+    AppRepository._catalogs.clear()
+    return AppRepository(storage_type, str(path))
+
+
+@pytest.fixture
+def json_storage(tmp_path):
+    path = tmp_path / "apps.json"
+    path.write_text(json.dumps(legacy_apps({"create_test": {"reusable": False}})), encoding="utf-8")
+    yield path
+    AppRepository._catalogs.clear()
+
+
+# ========== BACKFILL ==========
+
+def test_reusable_defaults_are_backfilled_into_stored_apps(json_storage):
+    assert REUSABLE_IDS == {"question_bank", "create_test"}
+
+    repo = open_repo("json", json_storage)
+    assert repo.get_app_by_id("question_bank").settings == {"reusable": True}
+    # Người dùng đã tắt -> giữ nguyên
+    assert repo.get_app_by_id("create_test").settings == {"reusable": False}
+    assert repo.backfill_default_settings() == 0
+    assert repo.flush()
+
+    stored = {item["id"]: item["settings"] for item in json.loads(json_storage.read_text(encoding="utf-8"))}
+    assert stored["question_bank"] == {"reusable": True}
+    assert stored["create_test"] == {"reusable": False}
+    assert stored["student_manager"] == {}
+
+
+def test_backfill_reaches_sqlite_storage(tmp_path):
+    path = tmp_path / "apps.db"
+    repo = open_repo("sqlite", path)
+    for app in AppRepository._default_apps():
+        app.settings = {}
+        repo.add_app(app)
+    assert repo.flush()
+
+    reopened = open_repo("sqlite", path)
+    try:
+        assert {app.id for app in reopened.get_all_apps() if app.settings.get("reusable")} == REUSABLE_IDS
+        assert reopened.flush()
+        assert {app.id for app in open_repo("sqlite", path).get_all_apps()
+                if app.settings.get("reusable")} == REUSABLE_IDS
+    finally:
+        AppRepository._catalogs.clear()
+
+
+def test_shipped_apps_file_has_default_settings():
+    shipped = json.loads((ROOT / "dashboard_apps.json").read_text(encoding="utf-8"))
+    assert {item["id"] for item in shipped if item["settings"].get("reusable")} == REUSABLE_IDS
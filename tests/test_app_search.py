@@ -0,0 +1,187 @@
+# tests/test_app_search.py
+"""
+AppSearchIndex / AppCatalog.search trên 5000 apps tổng hợp:
+- Độ trễ mỗi phím gõ (trước debounce) nằm trong một khung hình
+- Gõ không dấu, sai chính tả vẫn ra app đúng
+- Thêm / sửa / xóa từng app cho cùng kết quả với dựng lại toàn bộ index
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from ui_qt.windows.dashboard_window_qt.repositories.app_repository import AppCatalog, AppModel
+from ui_qt.windows.dashboard_window_qt.repositories.app_search_index import (
+    AppSearchIndex, MIN_TYPO_QUERY, fold_text
+)
+
+APP_COUNT = 5000
+FRAME_MS = 16
+
+SUBJECTS = ["toán", "ngữ văn", "tiếng anh", "vật lý", "hóa học", "sinh học", "lịch sử", "địa lý", "tin học"]
+FEATURES = ["quản lý", "báo cáo", "điểm danh", "bài tập", "đề kiểm tra", "ngân hàng câu hỏi",
+            "thời khóa biểu", "học phí", "nhận xét", "xếp nhóm", "tiến độ", "thống kê"]
+OBJECTS = ["học sinh", "giáo viên", "lớp học", "phụ huynh", "buổi học", "gói học", "kỹ năng"]
+
+# Gõ có dấu và không dấu
+QUERIES = [
+    "quản lý học sinh toán",
+    "bao cao lop hoc",
+    "diem danh lop hoc",
+    "ngan hang cau hoi hoa",
+    "thoi khoa bieu",
+]
+
+NOW = datetime(2025, 6, 1, 8, 0)
+
+
+def make_apps(count: int, rng: random.Random, prefix: str = "app"):
+    apps = []
+    for i in range(count):
+        feature = rng.choice(FEATURES)
+        obj = rng.choice(OBJECTS)
+        subject = rng.choice(SUBJECTS)
+        apps.append(AppModel(
+            id=f"{prefix}_{i:05d}",
+            name=f"{feature.capitalize()} {obj}",
+            display_name=f"{feature.capitalize()} {obj} {subject} {i}",
+            description=f"Công cụ {feature} cho {obj} môn {subject}, khối {rng.randint(6, 12)}",
+            tags=[subject, obj, feature.split()[0]],
+            usage_count=rng.choice([0, 0, 0, 1, 3, 10, 40]),
+            last_used=NOW - timedelta(days=rng.randint(0, 60)) if rng.random() < 0.3 else None,
+        ))
+    return apps
+
+
+def typo(text: str) -> str:
+    """Đảo hai ký tự liền nhau trong từ dài nhất (từ ngắn hơn MIN_TYPO_QUERY không xét typo)"""
+    words = text.split()
+    longest = max(range(len(words)), key=lambda i: len(words[i]) if words[i].isalpha() else 0)
+    word = words[longest]
+    assert len(word) >= MIN_TYPO_QUERY
+    words[longest] = word[0] + word[2] + word[1] + word[3:]
+    return ' '.join(words)
+
+
+@pytest.fixture(scope="module")
+def apps():
+    return make_apps(APP_COUNT, random.Random(11))
+
+
+@pytest.fixture(scope="module")
+def catalog(apps):
+    catalog = AppCatalog(lambda changed, deleted, snapshot: None)
+    catalog.load(apps)
+    return catalog
+
+
+# ========== LATENCY ==========
+
+def test_keystroke_latency_within_a_frame(catalog):
+    times = []
+    for query in QUERIES:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            results = catalog.search(query[:end], 20)
+            times.append((time.perf_counter() - start) * 1000)
+        assert results, query
+
+    ordered = sorted(times)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    assert p95 < FRAME_MS, f"p95 {p95:.2f} ms"
+    assert sum(times) / len(times) < FRAME_MS / 2
+
+
+# ========== QUALITY ==========
+
+def test_accent_folded_and_typo_queries_find_the_app(catalog, apps):
+    rng = random.Random(5)
+    long_names = [app for app in apps
+                  if max(len(word) for word in fold_text(app.name).split()) >= MIN_TYPO_QUERY]
+    for target in rng.sample(long_names, 25):
+        unaccented = fold_text(target.display_name)
+        for query in (target.display_name, unaccented, typo(unaccented)):
+            hits = [app.id for app in catalog.search(query, 5)]
+            assert hits[:1] == [target.id], query
+
+
+def test_typo_keeps_every_correct_match(catalog):
+    exact = {app.id for app in catalog.search("diem danh hoc sinh")}
+    assert exact
+    assert exact <= {app.id for app in catalog.search("diem dnah hoc sinh")}
+    assert exact <= {app.id for app in catalog.search("điểm danh học sinh")}
+    assert exact == {app.id for app in catalog.search("ĐIỂM DANH HỌC SINH")}
+
+
+def test_every_word_must_match(catalog):
+    for app in catalog.search("thoi khoa bieu ly"):
+        folded = fold_text(f"{app.display_name} {app.description} {' '.join(app.tags)}")
+        assert "thoi khoa bieu" in folded
+
+
+# ========== INCREMENTAL == REBUILD ==========
+
+def build(apps_with_order, clock):
+    index = AppSearchIndex(clock=clock)
+    for order, app in apps_with_order:
+        index.add(app, order)
+    return index
+
+
+def structure(index: AppSearchIndex):
+    """Từ vựng, trigram và trie (bỏ qua cache kết quả)"""
+    def trie(node):
+        return (dict(node.ids), {char: trie(child) for char, child in node.children.items()})
+    return (
+        {token: dict(ids) for token, ids in index._token_ids.items()},
+        {gram: set(tokens) for gram, tokens in index._gram_tokens.items()},
+        trie(index._root),
+    )
+
+
+def test_incremental_updates_equal_full_rebuild():
+    clock = lambda: NOW.timestamp()
+    rng = random.Random(23)
+    base = make_apps(1500, random.Random(11))
+    current = {app.id: (order, app) for order, app in enumerate(base)}
+    index = build(current.values(), clock)
+    next_order = len(base)
+    extra = iter(make_apps(400, random.Random(12), prefix="new"))
+
+    for step in range(600):
+        action = rng.random()
+        if action < 0.35:
+            # Thêm app mới
+            app = next(extra)
+            current[app.id] = (next_order, app)
+            index.add(app, next_order)
+            next_order += 1
+        elif action < 0.55:
+            # Đổi tên / tags / mô tả (index lại token)
+            order, app = current[rng.choice(list(current))]
+            donor = rng.choice(base)
+            app.name, app.display_name = donor.name, f"{donor.display_name} sửa {step}"
+            app.tags = list(donor.tags)
+            index.add(app, order)
+        elif action < 0.75:
+            # Chỉ đổi thống kê sử dụng
+            order, app = current[rng.choice(list(current))]
+            app.usage_count += 1
+            app.last_used = NOW - timedelta(hours=step)
+            index.add(app, order)
+        else:
+            app_id = rng.choice(list(current))
+            del current[app_id]
+            assert index.remove(app_id)
+
+    rebuilt = build(sorted(current.values(), key=lambda item: item[0]), clock)
+
+    assert len(index) == len(rebuilt) == len(current)
+    assert structure(index) == structure(rebuilt)
+
+    queries = QUERIES + ["sua", "diem dnah", "gv", "hoa hoc 12", "new_00", "ky nang"]
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            assert index.search(query[:end]) == rebuilt.search(query[:end]), query[:end]
@@ -0,0 +1,140 @@
+# tests/test_asset_cache.py
+"""ByteLRUCache (ngân sách byte, thứ tự LRU) và ThumbnailDiskCache (đổi file nguồn -> thumbnail cũ hết hiệu lực)"""
+
+import os
+import random
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("PySide6.QtGui")
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from ui_qt.windows.dashboard_window_qt.utils.asset_cache import ByteLRUCache, ThumbnailDiskCache, file_stamp
+
+
+# ========== BYTE LRU ==========
+
+def test_budget_never_exceeded_and_lru_evicted_first():
+    """So với mô hình LRU tham chiếu qua một chuỗi put / get ngẫu nhiên"""
+    budget = 10_000
+    cache = ByteLRUCache({"pixmap": budget})
+    model = OrderedDict()  # key -> cost, đầu = dùng lâu nhất
+    rng = random.Random(7)
+
+    for step in range(3000):
+        key = rng.randrange(60)
+        if rng.random() < 0.4:
+            value = cache.get("pixmap", key)
+            if key in model:
+                assert value == ("v", key)
+                model.move_to_end(key)
+            else:
+                assert value is None
+        else:
+            cost = rng.randint(1, 2500)
+            cache.put("pixmap", key, ("v", key), cost=cost)
+            model.pop(key, None)
+            model[key] = cost
+            while sum(model.values()) > budget:
+                model.popitem(last=False)
+
+        assert cache.usage("pixmap") <= budget
+        assert cache.usage("pixmap") == sum(model.values())
+        assert [k for k in model] == [k for k in cache._entries["pixmap"]]
+
+
+def test_eviction_order_and_refresh_on_get():
+    cache = ByteLRUCache({"icon": 300})
+    for key in "abc":
+        cache.put("icon", key, key, cost=100)
+    assert cache.get("icon", "a") == "a"  # a thành mới dùng nhất
+
+    cache.put("icon", "d", "d", cost=100)
+    assert ("icon", "b") not in cache
+    assert [("icon", k) in cache for k in "acd"] == [True, True, True]
+
+    cache.put("icon", "e", "e", cost=200)  # cần bỏ hai entry cũ nhất: c rồi a
+    assert ("icon", "c") not in cache and ("icon", "a") not in cache
+    assert cache.usage("icon") == 300
+    assert cache.stats()["icon"]["evictions"] == 3
+
+
+def test_oversized_entry_and_budget_shrink():
+    cache = ByteLRUCache({"wallpaper": 1000, "icon": 1000})
+    cache.put("wallpaper", "huge", object(), cost=1001)
+    assert ("wallpaper", "huge") not in cache and cache.usage("wallpaper") == 0
+
+    for key in range(5):
+        cache.put("wallpaper", key, key, cost=200)
+        cache.put("icon", key, key, cost=200)
+    cache.set_budget("wallpaper", 450)
+    assert cache.usage("wallpaper") == 400
+    assert [("wallpaper", k) in cache for k in range(5)] == [False, False, False, True, True]
+    assert cache.usage("icon") == 1000  # category khác không bị ảnh hưởng
+
+
+def test_stale_stamp_is_a_miss(tmp_path):
+    source = tmp_path / "icon.png"
+    source.write_bytes(b"x" * 10)
+    cache = ByteLRUCache({"pixmap": 1000})
+    cache.put("pixmap", "k", "old", cost=10, stamp=file_stamp(source))
+    assert cache.get("pixmap", "k", file_stamp(source)) == "old"
+
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 1_000_000_000))
+    assert cache.get("pixmap", "k", file_stamp(source)) is None
+    assert ("pixmap", "k") not in cache
+    assert cache.stats()["pixmap"]["invalidations"] == 1
+
+
+# ========== DISK THUMBNAILS ==========
+
+def _solid(color, size=16) -> QImage:
+    image = QImage(size, size, QImage.Format_ARGB32)
+    image.fill(QColor(color))
+    return image
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+def test_thumbnail_invalidated_when_source_mtime_changes(qapp, tmp_path):
+    thumbs = ThumbnailDiskCache(tmp_path / "thumbs")
+    source = tmp_path / "photo.bin"
+    source.write_bytes(b"A" * 256)
+
+    key = thumbs.key(source, "image:16x16:1")
+    assert thumbs.save(key, _solid("red"))
+    assert thumbs.load(key) is not None
+    assert thumbs.key(source, "image:16x16:1") == key  # chưa đổi -> cùng khóa, không đọc lại file
+
+    # Cùng kích thước, khác nội dung, mtime mới -> khóa mới, thumbnail cũ không được dùng
+    source.write_bytes(b"B" * 256)
+    _bump_mtime(source)
+    new_key = thumbs.key(source, "image:16x16:1")
+    assert new_key != key
+    assert thumbs.load(new_key) is None
+
+
+def test_load_image_rerenders_after_source_changes(qapp, tmp_path, monkeypatch):
+    from ui_qt.windows.dashboard_window_qt.utils import assets
+
+    manager = assets.AssetsManager()
+    monkeypatch.setattr(manager, "cache", ByteLRUCache({"pixmap": 1 << 20}))
+    monkeypatch.setattr(manager, "thumbnails", ThumbnailDiskCache(tmp_path / "thumbs"))
+
+    source = tmp_path / "photo.png"
+    assert _solid("red", 64).save(str(source))
+    first = assets.load_image(str(source), QSize(16, 16))
+    assert first.toImage().pixelColor(8, 8) == QColor("red")
+    assert manager.thumbnails.stats["writes"] == 1
+
+    assert _solid("blue", 64).save(str(source))
+    _bump_mtime(source)
+    second = assets.load_image(str(source), QSize(16, 16))
+    assert second.toImage().pixelColor(8, 8) == QColor("blue")
+    assert manager.cache.stats()["pixmap"]["invalidations"] == 1
@@ -0,0 +1,196 @@
+# tests/test_icon_grid_index.py
+"""
+IconGridIndex và DesktopArea dùng nó:
+- Chỗ trống: cùng kết quả với cách quét mọi ô x mọi icon, lấp lại slot vừa trống
+- Hit-test / rubber band: cùng kết quả với duyệt mọi icon
+- Thả nhiều file: mỗi file một slot riêng, bắt đầu gần điểm thả
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6.QtCore import QMimeData, QPoint, QPointF, QRect, QSize, Qt, QUrl
+from PySide6.QtGui import QDropEvent
+
+from ui_qt.windows.dashboard_window_qt.utils.constants import (
+    DESKTOP_GRID_SIZE, DESKTOP_GRID_SPACING,
+    DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT
+)
+from ui_qt.windows.dashboard_window_qt.views.desktop.icon_grid_index import IconGridIndex
+
+ICON = QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT)
+WIDTH, HEIGHT = 1280, 720
+
+
+def icon_rect(pos: QPoint) -> QRect:
+    return QRect(pos, ICON)
+
+
+def make_index() -> IconGridIndex:
+    index = IconGridIndex(DESKTOP_GRID_SIZE, DESKTOP_GRID_SPACING, ICON)
+    index.set_bounds(WIDTH, HEIGHT)
+    return index
+
+
+def scan_empty_position(positions) -> QPoint:
+    """Cách cũ: thử từng ô, so với mọi icon"""
+    for y in range(DESKTOP_GRID_SPACING, HEIGHT - DESKTOP_ICON_HEIGHT, DESKTOP_GRID_SIZE):
+        for x in range(DESKTOP_GRID_SPACING, WIDTH - DESKTOP_ICON_WIDTH, DESKTOP_GRID_SIZE):
+            candidate = icon_rect(QPoint(x, y))
+            if not any(candidate.intersects(icon_rect(p)) for p in positions):
+                return QPoint(x, y)
+    return None
+
+
+# ========== PLACEMENT ==========
+
+def test_find_free_slot_matches_full_scan():
+    rng = random.Random(3)
+    index = make_index()
+    positions = {}
+
+    for step in range(400):
+        if positions and rng.random() < 0.3:
+            key = rng.choice(list(positions))
+            del positions[key]
+            index.remove(key)
+        elif rng.random() < 0.2:
+            # Icon đặt lệch lưới (kéo thả tự do)
+            pos = QPoint(rng.randrange(0, WIDTH - 50), rng.randrange(0, HEIGHT - 50))
+            positions[step] = pos
+            index.add(step, icon_rect(pos))
+        else:
+            pos = index.find_free_slot()
+            assert pos == scan_empty_position(positions.values())
+            if pos is None:
+                continue
+            positions[step] = pos
+            index.add(step, icon_rect(pos))
+
+
+def test_full_desktop_has_no_free_slot_until_one_is_removed():
+    index = make_index()
+    placed = []
+    while (pos := index.find_free_slot()) is not None:
+        placed.append(pos)
+        index.add(len(placed), icon_rect(pos))
+
+    assert len(placed) == index.slot_count()
+    index.remove(7)
+    assert index.find_free_slot() == placed[6]
+
+
+def test_free_slots_are_distinct_and_start_near_drop_point():
+    index = make_index()
+    index.add("busy", icon_rect(index.slot_position(index.slot_index(QPoint(420, 220)) + 1)))
+
+    slots = index.free_slots(5, QPoint(420, 220))
+
+    assert len(slots) == len(set((p.x(), p.y()) for p in slots)) == 5
+    assert slots[0] == index.slot_position(index.slot_index(QPoint(420, 220)))
+    assert all(index.is_free(icon_rect(p)) for p in slots)
+    assert index.slot_position(index.slot_index(QPoint(420, 220)) + 1) not in slots
+
+
+# ========== HIT-TEST ==========
+
+def test_query_point_and_rect_match_brute_force():
+    rng = random.Random(5)
+    index = make_index()
+    rects = {}
+    for key in range(300):
+        rect = icon_rect(QPoint(rng.randrange(-40, WIDTH), rng.randrange(-40, HEIGHT)))
+        rects[key] = rect
+        index.add(key, rect)
+    for key in rng.sample(range(300), 60):
+        del rects[key]
+        index.remove(key)
+
+    for _ in range(500):
+        point = QPoint(rng.randrange(0, WIDTH), rng.randrange(0, HEIGHT))
+        expected = {k for k, r in rects.items() if r.contains(point)}
+        assert set(index.query_point(point)) == expected
+
+        band = QRect(point, QSize(rng.randrange(1, 400), rng.randrange(1, 300)))
+        expected = {k for k, r in rects.items() if r.intersects(band)}
+        assert set(index.query_rect(band)) == expected
+        assert index.is_free(band) == (not expected)
+
+
+def test_move_updates_hit_test():
+    index = make_index()
+    index.add("a", icon_rect(QPoint(10, 10)))
+    index.move("a", icon_rect(QPoint(510, 310)))
+
+    assert index.query_point(QPoint(20, 20)) == []
+    assert index.query_point(QPoint(520, 320)) == ["a"]
+    assert index.rect_of("a") == icon_rect(QPoint(510, 310))
+
+
+# ========== DESKTOP AREA ==========
+
+@pytest.fixture
+def desktop(qapp, tmp_path):
+    from ui_qt.windows.dashboard_window_qt.views.desktop.desktop_area import DesktopArea
+
+    area = DesktopArea()
+    area.resize(WIDTH, HEIGHT)
+    for icon_id in list(area.desktop_icons):
+        area.remove_desktop_icon(icon_id)
+    yield area
+    area.deleteLater()
+
+
+def make_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"file_{i}.txt"
+        path.write_text("x")
+        paths.append(str(path))
+    return paths
+
+
+def test_desktop_drop_gives_each_file_its_own_slot(desktop, tmp_path):
+    paths = make_files(tmp_path, 4)
+    mime = QMimeData()
+    mime.setUrls([QUrl.fromLocalFile(p) for p in paths])
+    event = QDropEvent(QPointF(420, 220), Qt.CopyAction, mime, Qt.LeftButton, Qt.NoModifier)
+
+    desktop.dropEvent(event)
+
+    positions = [desktop.icon_positions[p] for p in paths]
+    assert len(set((p.x(), p.y()) for p in positions)) == len(paths)
+    assert positions[0] == desktop.icon_index.slot_position(desktop.icon_index.slot_index(QPoint(420, 220)))
+    for path, pos in zip(paths, positions):
+        assert desktop.icon_at(pos + QPoint(5, 5)) == path
+
+
+def test_desktop_placement_skips_occupied_slots_and_reuses_removed(desktop, tmp_path):
+    paths = make_files(tmp_path, 3)
+    for path in paths:
+        desktop.add_file_icon(path)
+
+    first, second, third = (desktop.icon_positions[p] for p in paths)
+    assert first == QPoint(DESKTOP_GRID_SPACING, DESKTOP_GRID_SPACING)
+    assert second == QPoint(DESKTOP_GRID_SPACING + DESKTOP_GRID_SIZE, DESKTOP_GRID_SPACING)
+    assert third == QPoint(DESKTOP_GRID_SPACING + 2 * DESKTOP_GRID_SIZE, DESKTOP_GRID_SPACING)
+
+    desktop.remove_desktop_icon(paths[1])
+    assert desktop.icon_at(second + QPoint(5, 5)) is None
+    assert desktop._find_empty_position() == second
+
+
+def test_desktop_rubber_band_selects_only_covered_icons(desktop, tmp_path):
+    paths = make_files(tmp_path, 6)
+    desktop.add_file_icons(paths)
+
+    band = QRect(QPoint(0, 0), QSize(DESKTOP_GRID_SIZE + 30, 40))
+    desktop._select_icons_in_rect(band)
+    assert desktop.selected_icons == paths[:2]
+
+    desktop._select_icons_in_rect(QRect(QPoint(0, 0), QSize(30, 40)))
+    assert desktop.selected_icons == paths[:1]
+    assert not desktop.desktop_icons[paths[1]].is_selected
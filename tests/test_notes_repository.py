@@ -0,0 +1,164 @@
+# tests/test_notes_repository.py
+"""
+NotesRepository:
+- Tiến trình bị kill giữa lúc flush -> database vẫn nguyên vẹn, chứa trọn bộ dòng cũ
+  hoặc trọn bộ dòng mới (không lẫn)
+- notes.json đọc lỗi -> không ghi user_version, lần mở sau vẫn migrate được
+"""
+
+import json
+import random
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+
+from tests.conftest import ROOT
+from ui_qt.windows.dashboard_window_qt.repositories.notes_repository import (
+    NotesRepository, SCHEMA_VERSION
+)
+
+NOTE_COUNT = 2000
+
+# Mỗi vòng ghi lại MỌI note với nội dung "gen N" trong một flush, in N khi đã commit
+WRITER = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, {root!r})
+    from ui_qt.windows.dashboard_window_qt.repositories.notes_repository import NotesRepository
+
+    repo = NotesRepository({db!r})
+    ids = ["note_%05d" % i for i in range({count})]
+    first = repo.get(ids[0])
+    generation = int(first["modified_at"]) if first else 0
+    while True:
+        generation += 1
+        for note_id in ids:
+            repo.mark_dirty(note_id)
+        padding = "x" * 200
+        assert repo.flush(lambda note_id: {{
+            "id": note_id,
+            "title": "Note %s" % note_id,
+            "content": "gen %d %s" % (generation, padding),
+            "modified_at": str(generation),
+        }})
+        print(generation, flush=True)
+""")
+
+
+def user_version(db_path) -> int:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# ========== CRASH SAFETY ==========
+
+def test_kill_mid_flush_keeps_old_or_new_rows(tmp_path):
+    db_path = tmp_path / "notes.db"
+    script = WRITER.format(root=str(ROOT), db=str(db_path), count=NOTE_COUNT)
+    rng = random.Random(7)
+
+    for _ in range(5):
+        proc = subprocess.Popen([sys.executable, "-c", script],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        try:
+            # Chờ ít nhất một flush xong, rồi kill ở một thời điểm bất kỳ của flush sau
+            line = proc.stdout.readline()
+            assert line, proc.stderr.read()
+            time.sleep(rng.uniform(0.0, 0.1))
+        finally:
+            proc.kill()
+            proc.wait()
+        # Thế hệ cuối cùng đã commit xong (các dòng còn lại trong pipe)
+        printed = [line] + proc.stdout.read().split()
+        committed = int(printed[-1])
+        proc.stdout.close()
+        proc.stderr.close()
+
+        conn = sqlite3.connect(str(db_path))
+        try:
+            assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+            conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('integrity-check')")
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == NOTE_COUNT
+            generations = {row[0] for row in conn.execute("SELECT modified_at FROM notes")}
+        finally:
+            conn.close()
+
+        # Mọi dòng cùng một thế hệ: flush đang dở hoặc đã commit trọn (new),
+        # hoặc chưa để lại gì (old)
+        assert len(generations) == 1
+        assert int(generations.pop()) in (committed, committed + 1)
+
+        repo = NotesRepository(str(db_path))
+        try:
+            assert len(repo.search("gen")) == 50
+        finally:
+            repo.close()
+
+
+# ========== LEGACY MIGRATION ==========
+
+def write_legacy(path, notes):
+    path.write_text(json.dumps(notes, ensure_ascii=False), encoding="utf-8")
+
+
+def test_unreadable_legacy_json_is_retried_on_next_open(tmp_path):
+    db_path = tmp_path / "notes.db"
+    legacy = tmp_path / "notes.json"
+    legacy.write_text('[{"id": "a", "title": "Cũ"', encoding="utf-8")  # JSON bị cắt ngang
+
+    repo = NotesRepository(str(db_path))
+    assert repo.count() == 0
+    repo.close()
+    assert user_version(db_path) == 0
+    assert legacy.exists()
+
+    write_legacy(legacy, [{"id": "a", "title": "Cũ", "content": "ghi chú", "color": "#fff"}])
+    repo = NotesRepository(str(db_path))
+    try:
+        assert repo.get("a") == {"id": "a", "title": "Cũ", "content": "ghi chú",
+                                 "html_content": "", "color": "#fff"}
+    finally:
+        repo.close()
+    assert user_version(db_path) == SCHEMA_VERSION
+    assert not legacy.exists()
+    assert (tmp_path / "notes.json.migrated").exists()
+
+
+def test_legacy_json_not_a_list_is_not_marked_migrated(tmp_path):
+    db_path = tmp_path / "notes.db"
+    write_legacy(tmp_path / "notes.json", {"a": {"title": "sai định dạng"}})
+
+    NotesRepository(str(db_path)).close()
+
+    assert user_version(db_path) == 0
+    assert (tmp_path / "notes.json").exists()
+
+
+def test_migration_runs_once(tmp_path):
+    db_path = tmp_path / "notes.db"
+    legacy = tmp_path / "notes.json"
+    write_legacy(legacy, [{"id": "a", "title": "Một"}])
+
+    repo = NotesRepository(str(db_path))
+    repo.mark_deleted("a")
+    repo.flush(lambda note_id: None)
+    repo.close()
+
+    # notes.json xuất hiện lại (khôi phục backup cũ) -> không nhập lại
+    write_legacy(legacy, [{"id": "a", "title": "Một"}])
+    repo = NotesRepository(str(db_path))
+    try:
+        assert repo.count() == 0
+    finally:
+        repo.close()
+    assert legacy.exists()
+
+
+def test_no_legacy_json_sets_version(tmp_path):
+    db_path = tmp_path / "notes.db"
+    NotesRepository(str(db_path)).close()
+    assert user_version(db_path) == SCHEMA_VERSION
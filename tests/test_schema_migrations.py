@@ -0,0 +1,63 @@
+# tests/test_schema_migrations.py
+"""Registry migration: mở lại database đã migrate không chạy DDL nào"""
+
+import sqlite3
+
+import schema_migrations
+from database import DatabaseManager
+
+DDL_PREFIXES = ("CREATE", "ALTER", "DROP", "PRAGMA", "INSERT INTO SCHEMA_VERSION")
+
+
+class TracingDatabaseManager(DatabaseManager):
+    """DatabaseManager ghi lại mọi câu lệnh SQL chạy trên connection"""
+
+    def create_connection(self):
+        conn = super().create_connection()
+        self.statements = []
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+
+def _ddl(statements):
+    return [s for s in statements if s.lstrip().upper().startswith(DDL_PREFIXES)]
+
+
+def test_first_open_migrates_to_latest(tmp_path):
+    db = TracingDatabaseManager(str(tmp_path / "app.db"))
+    try:
+        assert db.get_schema_version() == schema_migrations.LATEST_VERSION
+        assert db.is_schema_current()
+        assert _ddl(db.statements)  # lần đầu có tạo bảng
+    finally:
+        db.conn.close()
+
+
+def test_reopen_migrated_database_runs_no_ddl(tmp_path):
+    path = str(tmp_path / "app.db")
+    DatabaseManager(path).conn.close()
+
+    db = TracingDatabaseManager(path)
+    try:
+        assert db.statements == ["SELECT MAX(version) FROM schema_version"]
+        assert db.is_schema_current()
+
+        # Gọi lại ensure_schema / migrate cũng không chạy thêm gì
+        db.statements.clear()
+        db.ensure_schema()
+        assert db.statements == []
+        assert schema_migrations.migrate(db) == schema_migrations.LATEST_VERSION
+        assert _ddl(db.statements) == []
+    finally:
+        db.conn.close()
+
+
+def test_versions_recorded_once_each(tmp_path):
+    path = str(tmp_path / "app.db")
+    DatabaseManager(path).conn.close()
+    DatabaseManager(path).conn.close()
+
+    with sqlite3.connect(path) as conn:
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+    assert versions == [m.version for m in schema_migrations.MIGRATIONS]
+    assert versions == list(range(1, schema_migrations.LATEST_VERSION + 1))
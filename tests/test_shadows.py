@@ -0,0 +1,143 @@
+# tests/test_shadows.py
+"""
+Bóng nine-patch (utils/shadows.py):
+- Cùng ảnh với QGraphicsDropShadowEffect (sai khác trung bình < 1 mức màu)
+- Nine-patch blur một lần cho mỗi (blur, màu, bo góc, dpr); offset / kích thước dùng chung
+- Vẽ từng phần (exposed) ghép lại bằng vẽ cả bóng
+- ShadowFrame chừa đúng lề cho bóng quanh .panel
+"""
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtWidgets import QFrame, QGraphicsDropShadowEffect, QWidget
+
+from ui_qt.windows.dashboard_window_qt.utils import shadows
+from ui_qt.windows.dashboard_window_qt.utils.shadows import (
+    ShadowFrame, ShadowSpec, draw_shadow, shadow_margins, shadow_rect
+)
+
+CARD = QRect(60, 60, 250, 150)
+CANVAS = (CARD.width() + 120, CARD.height() + 120)
+
+# Bóng của notification / weather / quick note / clock widget
+SPECS = [
+    ShadowSpec.create(20, (0, 5), QColor(0, 0, 0, 80), 8),
+    ShadowSpec.create(20, (0, 5), QColor(0, 0, 0, 100), 15),
+    ShadowSpec.create(10, (2, 2), QColor(0, 0, 0, 80), 4),
+    ShadowSpec.create(15, (0, 0), QColor(0, 255, 0, 100), 10),
+]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    shadows.clear_cache()
+    yield
+    shadows.clear_cache()
+
+
+def effect_image(qapp, spec: ShadowSpec) -> QImage:
+    host = QWidget()
+    host.resize(*CANVAS)
+    host.setStyleSheet("background: white;")
+    card = QFrame(host)
+    card.setGeometry(CARD)
+    card.setStyleSheet(f"background: white; border-radius: {spec.corner_radius}px;")
+    effect = QGraphicsDropShadowEffect()
+    effect.setBlurRadius(spec.blur_radius)
+    effect.setOffset(*spec.offset)
+    effect.setColor(QColor(*spec.color))
+    card.setGraphicsEffect(effect)
+    image = host.grab().toImage().convertToFormat(QImage.Format_ARGB32)
+    host.deleteLater()
+    return image
+
+
+def cached_image(spec: ShadowSpec, exposed_parts=None) -> QImage:
+    image = QImage(*CANVAS, QImage.Format_ARGB32)
+    image.fill(QColor("white"))
+    painter = QPainter(image)
+    for exposed in exposed_parts or [None]:
+        draw_shadow(painter, CARD, spec, exposed=exposed)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor("white"))
+    painter.drawRoundedRect(CARD, spec.corner_radius, spec.corner_radius)
+    painter.end()
+    return image
+
+
+def mean_difference(a: QImage, b: QImage) -> float:
+    total = 0
+    for y in range(a.height()):
+        for x in range(a.width()):
+            ca, cb = a.pixelColor(x, y), b.pixelColor(x, y)
+            total += (abs(ca.red() - cb.red()) + abs(ca.green() - cb.green())
+                      + abs(ca.blue() - cb.blue()))
+    return total / (3 * a.width() * a.height())
+
+
+# ========== OUTPUT ==========
+
+@pytest.mark.parametrize("spec", SPECS, ids=lambda s: f"blur{s.blur_radius}-r{s.corner_radius}")
+def test_matches_drop_shadow_effect(qapp, spec):
+    expected = effect_image(qapp, spec)
+    assert expected.pixelColor(CARD.center().x(), CARD.bottom() + spec.offset[1] + 2) != QColor("white")
+    assert mean_difference(expected, cached_image(spec)) < 1.0
+
+
+def test_exposed_parts_compose_full_shadow(qapp):
+    spec = SPECS[0]
+    outer = shadow_rect(CARD, spec)
+    half = outer.width() // 2
+    parts = [QRect(outer.left(), outer.top(), half, outer.height()),
+             QRect(outer.left() + half, outer.top(), outer.width() - half, outer.height())]
+
+    assert cached_image(spec, parts) == cached_image(spec)
+    assert cached_image(spec, [QRect(0, 0, 10, 10)]) == cached_image(spec, [QRect(0, 0, 0, 0)])
+
+
+# ========== CACHE ==========
+
+def test_nine_patch_is_built_once_per_style(qapp):
+    base = SPECS[1]
+    before, frames_before = shadows.cache_stats(), shadows.frame_cache_stats()
+    image = QImage(*CANVAS, QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    for offset in [(0, 5), (3, 3), (0, 0)]:
+        for width in (120, 250, 400):
+            spec = ShadowSpec(base.blur_radius, offset, base.color, base.corner_radius)
+            draw_shadow(painter, QRect(10, 10, width, 100), spec, dpr=1.0)
+            draw_shadow(painter, QRect(30, 40, width, 100), spec, dpr=1.0)
+    painter.end()
+
+    assert shadows.cache_stats()["misses"] - before["misses"] == 1
+    frames = shadows.frame_cache_stats()
+    assert frames["entries"] == frames["misses"] - frames_before["misses"] == 9
+    assert frames["hits"] - frames_before["hits"] == 9
+
+    shadows.shadow_pixmap(base, 250, 150, dpr=2.0)
+    assert shadows.cache_stats()["misses"] - before["misses"] == 2
+
+
+# ========== SHADOW FRAME ==========
+
+def test_shadow_frame_reserves_margins_around_panel(qapp):
+    spec = SPECS[0]
+    frame = ShadowFrame(spec)
+    frame.resize(300, 200)
+    frame.show()
+    qapp.processEvents()
+
+    margins = shadow_margins(spec)
+    assert frame.panel.geometry() == frame.rect().marginsRemoved(margins)
+    assert shadow_rect(frame.panel.geometry(), spec) == frame.rect()
+
+    frame.set_spec(SPECS[2])
+    frame.layout().activate()
+    assert frame.panel.geometry() == frame.rect().marginsRemoved(shadow_margins(SPECS[2]))
+    frame.close()
+    frame.deleteLater()
@@ -0,0 +1,155 @@
+# tests/test_system_status_monitor.py
+"""
+SystemStatusMonitor:
+- Probe mạng treo không làm GUI thread chờ (vòng lặp sự kiện vẫn chạy mỗi < 16 ms),
+  không chồng thêm probe
+- Offline: khoảng cách giữa các lần probe gấp đôi tới NETWORK_PROBE_MAX_BACKOFF,
+  có mạng lại thì về chu kỳ thường
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+pytest.importorskip("psutil")
+
+from PySide6.QtCore import QElapsedTimer, QThreadPool, QTimer, Qt
+
+from ui_qt.windows.dashboard_window_qt.services import system_status_monitor
+from ui_qt.windows.dashboard_window_qt.services.system_status_monitor import (
+    SystemStatusMonitor, NETWORK_CONNECTED, NETWORK_LIMITED
+)
+from ui_qt.windows.dashboard_window_qt.utils.constants import NETWORK_PROBE_MAX_BACKOFF
+
+FRAME_MS = 16
+INTERVAL_MS = 1000
+
+
+@pytest.fixture(autouse=True)
+def online_sensors(monkeypatch):
+    """Có interface up, không đọc psutil thật (kết quả không phụ thuộc máy chạy test)"""
+    monkeypatch.setattr(system_status_monitor, "read_sensors", lambda: {
+        'interfaces_up': True, 'battery': None, 'cpu': 5.0, 'memory': 40.0,
+    })
+
+
+@pytest.fixture
+def pool(qapp):
+    pool = QThreadPool()
+    yield pool
+    pool.waitForDone(2000)
+
+
+def wait_until(qapp, predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "hết thời gian chờ worker"
+        qapp.processEvents()
+        time.sleep(0.001)
+
+
+# ========== HANGING PROBE ==========
+
+def test_hanging_probe_never_blocks_gui_thread(qapp, pool):
+    release = threading.Event()
+    started = threading.Event()
+
+    def hanging_probe():
+        started.set()
+        release.wait(30)  # Như socket treo tới khi hết timeout
+        return False
+
+    monitor = SystemStatusMonitor(INTERVAL_MS, probe=hanging_probe, pool=pool)
+    refresh_ms = []
+    gaps_ms = []
+
+    def refresh():
+        timer = QElapsedTimer()
+        timer.start()
+        monitor.refresh()
+        refresh_ms.append(timer.nsecsElapsed() / 1e6)
+
+    # Nhịp tim 4 ms trên GUI thread: khoảng cách giữa hai nhịp = độ trễ GUI
+    clock = QElapsedTimer()
+    clock.start()
+    last = [clock.nsecsElapsed()]
+
+    def heartbeat():
+        now = clock.nsecsElapsed()
+        gaps_ms.append((now - last[0]) / 1e6)
+        last[0] = now
+
+    beat = QTimer()
+    beat.setTimerType(Qt.PreciseTimer)
+    beat.timeout.connect(heartbeat)
+    poll = QTimer()
+    poll.timeout.connect(refresh)
+    try:
+        beat.start(4)
+        poll.start(10)
+        wait_until(qapp, started.is_set)
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            qapp.processEvents()
+            time.sleep(0.001)
+    finally:
+        beat.stop()
+        poll.stop()
+        release.set()
+
+    assert monitor.stats["samples"] > 10
+    # Probe đang treo -> không mở thêm probe, các lượt đọc sau chỉ bỏ qua
+    assert monitor.stats["probes"] == 1
+    assert monitor.stats["skipped_probes"] > 0
+    assert max(refresh_ms) < FRAME_MS
+    assert len(gaps_ms) > 50
+    assert max(gaps_ms[1:]) < FRAME_MS
+
+    wait_until(qapp, lambda: not monitor._probing)
+    assert monitor.status.network == NETWORK_LIMITED
+
+
+# ========== BACKOFF ==========
+
+def sample(qapp, monitor):
+    """Một lượt refresh, chờ kết quả đọc và probe (nếu có) về GUI thread"""
+    samples = monitor.stats["samples"]
+    monitor.refresh()
+    wait_until(qapp, lambda: monitor.stats["samples"] > samples)
+    wait_until(qapp, lambda: not monitor._probing)
+
+
+def test_offline_backoff_doubles_up_to_max(qapp, pool, clock):
+    reachable = [False]
+    monitor = SystemStatusMonitor(INTERVAL_MS, probe=lambda: reachable[0], clock=clock, pool=pool)
+    changes = []
+    monitor.network_changed.connect(changes.append)
+
+    delays = []
+    for _ in range(15):
+        delay = monitor.probe_delay_ms
+        probes = monitor.stats["probes"]
+        sample(qapp, monitor)
+        assert monitor.stats["probes"] == probes + 1
+        delays.append(delay)
+
+        # Trước hạn backoff: không probe
+        clock.now += delay - 1
+        sample(qapp, monitor)
+        assert monitor.stats["probes"] == probes + 1
+        clock.now += 1
+
+    expected = [min(INTERVAL_MS * 2 ** i, NETWORK_PROBE_MAX_BACKOFF) for i in range(15)]
+    assert delays == expected
+    assert delays[-1] == NETWORK_PROBE_MAX_BACKOFF
+    assert monitor.probe_delay_ms == NETWORK_PROBE_MAX_BACKOFF
+    assert monitor.stats["probe_failures"] == 15
+    assert changes == [NETWORK_LIMITED]
+
+    # Có mạng lại -> về chu kỳ thường
+    reachable[0] = True
+    sample(qapp, monitor)
+    assert monitor.probe_delay_ms == INTERVAL_MS
+    assert changes == [NETWORK_LIMITED, NETWORK_CONNECTED]
@@ -0,0 +1,198 @@
+# tests/test_tick_scheduler.py
+"""
+TickScheduler với đồng hồ giả (không chờ thời gian thật):
+- Mốc chạy căn theo wall-clock, gộp các chu kỳ trong dung sai, bỏ qua mốc đã lỡ
+- Tạm dừng khi widget ẩn / cửa sổ minimize, hiện lại thì chạy ngay rồi về mốc căn
+"""
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from tests.conftest import FakeClock
+
+from ui_qt.windows.dashboard_window_qt.services.tick_scheduler import (
+    TickScheduler, CLOCK_TOLERANCE_MS, STATUS_TOLERANCE_MS, LIVE_TILE_TOLERANCE_MS
+)
+
+
+START_MS = 1_700_000_000_123.4
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(START_MS)
+
+
+@pytest.fixture
+def scheduler(qapp, clock):
+    sched = TickScheduler(clock)
+    yield sched
+    for sub in sched.subscriptions():
+        sub.cancel()
+    sched.deleteLater()
+
+
+def run_until(scheduler, clock, end):
+    """Nhảy đồng hồ tới từng lần thức của scheduler như QTimer sẽ làm"""
+    while True:
+        wake = scheduler.next_wakeup()
+        if wake is None or wake > end:
+            clock.now = end
+            return
+        clock.now = wake
+        scheduler.run_pending()
+
+
+# ========== WALL-CLOCK ALIGNMENT ==========
+
+def test_first_tick_lands_on_next_period_boundary(scheduler, clock):
+    calls = []
+    sub = scheduler.subscribe(lambda: calls.append(clock.now), 1000)
+
+    assert sub.due == 1_700_000_001_000
+    assert scheduler.next_wakeup() == sub.due
+
+    clock.now = sub.due - 10
+    assert scheduler.run_pending() == 0
+    clock.now = sub.due
+    assert scheduler.run_pending() == 1
+    assert calls == [1_700_000_001_000]
+    assert sub.due == 1_700_000_002_000
+
+
+def test_periods_fire_on_their_boundaries_and_coalesce(scheduler, clock):
+    fired = {1000: [], 5000: [], 30000: []}
+    tolerances = {1000: CLOCK_TOLERANCE_MS, 5000: STATUS_TOLERANCE_MS, 30000: LIVE_TILE_TOLERANCE_MS}
+    for period, tolerance in tolerances.items():
+        scheduler.subscribe(lambda p=period: fired[p].append(clock.now), period, tolerance)
+
+    start = clock.now
+    run_until(scheduler, clock, start + 60_000)
+
+    assert len(fired[1000]) == 60
+    assert len(fired[5000]) == 12
+    assert len(fired[30000]) == 2
+    for period, times in fired.items():
+        for t in times:
+            # Chạy trong cửa sổ [mốc, mốc + dung sai] của chính nó
+            assert 0 <= t % period <= tolerances[period]
+
+    # 5 s / 30 s đi nhờ các lần thức của đồng hồ 1 s
+    assert scheduler.total_wakeups == 60
+    assert set(fired[5000]) <= set(fired[1000])
+    assert set(fired[30000]) <= set(fired[1000])
+    assert scheduler.wakeups_per_minute() == 60
+
+
+def test_missed_boundaries_are_skipped_not_replayed(scheduler, clock):
+    calls = []
+    sub = scheduler.subscribe(lambda: calls.append(clock.now), 1000)
+
+    clock.now += 10_500  # Máy sleep 10 giây
+    assert scheduler.run_pending() == 1
+    assert len(calls) == 1
+    assert sub.due > clock.now
+    assert sub.due % 1000 == 0
+
+
+def test_clock_moving_backwards_realigns(scheduler, clock):
+    sub = scheduler.subscribe(lambda: None, 1000)
+
+    clock.now -= 3_600_000  # Chỉnh giờ lùi 1 tiếng
+    scheduler.subscribe(lambda: None, 60_000)  # Lần reschedule kế tiếp
+
+    assert clock.now < sub.due <= clock.now + 1000
+    assert sub.due % 1000 == 0
+
+
+def test_call_later_runs_once_after_delay(scheduler, clock):
+    calls = []
+    start = clock.now
+    scheduler.call_later(500, lambda: calls.append(clock.now))
+
+    run_until(scheduler, clock, start + 5000)
+
+    assert calls == [start + 500]
+    assert scheduler.subscriptions() == []
+    assert scheduler.next_wakeup() is None
+
+
+def test_cancel_stops_callbacks(scheduler, clock):
+    calls = []
+    sub = scheduler.subscribe(lambda: calls.append(clock.now), 1000)
+    sub.cancel()
+
+    run_until(scheduler, clock, clock.now + 5000)
+
+    assert calls == []
+    assert not sub.active
+
+
+# ========== PAUSE / RESUME ==========
+
+@pytest.fixture
+def window(qapp):
+    win = QWidget()
+    label = QLabel("12:00", win)
+    QVBoxLayout(win).addWidget(label)
+    win.show()
+    qapp.processEvents()
+    yield win, label
+    win.close()
+    win.deleteLater()
+
+
+def test_hidden_widget_pauses_and_resumes_immediately(scheduler, clock, window, qapp):
+    win, label = window
+    calls = []
+    sub = scheduler.subscribe(lambda: calls.append(clock.now), 1000, CLOCK_TOLERANCE_MS, widget=label)
+    assert not sub.paused
+
+    run_until(scheduler, clock, clock.now + 3000)
+    assert len(calls) == 3
+
+    label.hide()
+    assert sub.paused
+    assert scheduler.next_wakeup() is None
+
+    clock.now += 10_000
+    assert scheduler.run_pending() == 0
+    assert len(calls) == 3
+
+    label.show()
+    assert not sub.paused
+    # Hiện lại: chạy ngay ở lần thức tới, không chờ mốc giây kế tiếp
+    assert scheduler.next_wakeup() <= clock.now + CLOCK_TOLERANCE_MS
+    resumed_at = clock.now
+    assert scheduler.run_pending() == 1
+    assert calls[-1] == resumed_at
+    assert sub.due % 1000 == 0 and sub.due > resumed_at
+
+
+def test_minimized_window_pauses_widget_subscribers(scheduler, clock, window, qapp):
+    win, label = window
+    sub = scheduler.subscribe(lambda: None, 1000, widget=label)
+
+    win.showMinimized()
+    qapp.processEvents()
+    assert sub.paused
+
+    win.showNormal()
+    qapp.processEvents()
+    assert not sub.paused
+
+
+def test_subscribing_hidden_widget_starts_paused(scheduler, clock, qapp):
+    widget = QWidget()
+    sub = scheduler.subscribe(lambda: None, 1000, widget=widget)
+    assert sub.paused
+    assert scheduler.next_wakeup() is None
+
+    widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert not sub.active
+    assert scheduler.subscriptions() == []
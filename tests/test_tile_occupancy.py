@@ -0,0 +1,173 @@
+# tests/test_tile_occupancy.py
+"""
+TileOccupancyMap so với mô hình quét từng ô (dict key -> span):
+- place / move / release ngẫu nhiên: cùng kết quả hợp lệ, bitmask khớp tập ô đã chiếm
+- find_free, key_at, keys_in_rows: cùng kết quả với duyệt mọi tile
+"""
+
+import random
+
+import pytest
+
+from ui_qt.windows.dashboard_window_qt.views.start_menu.tile_occupancy import TileOccupancyMap
+
+COLUMNS = 6
+# Cỡ tile Start Menu: nhỏ, vừa, rộng, lớn (row_span, col_span)
+SIZES = [(1, 1), (2, 2), (2, 4), (4, 4)]
+
+
+def cells(span):
+    row, col, row_span, col_span = span
+    return {(r, c) for r in range(row, row + row_span) for c in range(col, col + col_span)}
+
+
+class BruteGrid:
+    """Cách cũ: mỗi truy vấn duyệt mọi tile"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.spans = {}
+
+    def occupied(self, exclude=None):
+        taken = set()
+        for key, span in self.spans.items():
+            if key != exclude:
+                taken |= cells(span)
+        return taken
+
+    def can_place(self, span, exclude=None, taken=None):
+        row, col, row_span, col_span = span
+        if row < 0 or col < 0 or col + col_span > self.columns or row_span < 1 or col_span < 1:
+            return False
+        return not cells(span) & (self.occupied(exclude) if taken is None else taken)
+
+    def row_count(self):
+        return max((s[0] + s[2] for s in self.spans.values()), default=0)
+
+    def find_free(self, row_span, col_span, start_row=0):
+        if col_span > self.columns:
+            return None
+        taken = self.occupied()
+        row = start_row
+        while True:
+            for col in range(self.columns - col_span + 1):
+                if self.can_place((row, col, row_span, col_span), taken=taken):
+                    return row, col
+            row += 1
+
+    def key_at(self, row, col):
+        for key, span in self.spans.items():
+            if (row, col) in cells(span):
+                return key
+        return None
+
+    def keys_in_rows(self, first_row, last_row):
+        return {key for key, (row, _, row_span, _) in self.spans.items()
+                if row <= last_row and row + row_span > first_row}
+
+
+def assert_same(grid: TileOccupancyMap, brute: BruteGrid):
+    assert len(grid) == len(brute.spans)
+    assert {key: grid.span_of(key) for key in brute.spans} == brute.spans
+    assert grid.row_count == brute.row_count()
+    taken = brute.occupied()
+    for row in range(grid.row_count + 1):
+        expected = sum(1 << c for c in range(COLUMNS) if (row, c) in taken)
+        assert grid.row_mask(row) == expected, row
+
+
+def random_span(rng, brute):
+    row_span, col_span = rng.choice(SIZES)
+    row = rng.randrange(-1, brute.row_count() + 3)
+    col = rng.randrange(-1, COLUMNS)
+    return row, col, row_span, col_span
+
+
+# ========== RANDOMIZED ==========
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_random_operations_match_brute_force(seed):
+    rng = random.Random(seed)
+    grid = TileOccupancyMap(COLUMNS)
+    brute = BruteGrid(COLUMNS)
+    next_key = 0
+
+    for _ in range(800):
+        action = rng.random()
+        if action < 0.25 or not brute.spans:
+            # Ghim tile mới vào chỗ trống đầu tiên (như pin_app)
+            row_span, col_span = rng.choice(SIZES)
+            start_row = rng.choice([0, 0, rng.randrange(0, brute.row_count() + 2)])
+            found = grid.find_free(row_span, col_span, start_row)
+            assert found == brute.find_free(row_span, col_span, start_row)
+            span = (*found, row_span, col_span)
+            assert grid.place(next_key, *span)
+            brute.spans[next_key] = span
+            next_key += 1
+        elif action < 0.4:
+            # Đặt tại vị trí bất kỳ: chỉ thành công khi không chồng / không ra ngoài lưới
+            span = random_span(rng, brute)
+            expected = brute.can_place(span)
+            assert grid.can_place(*span) == expected
+            assert grid.place(next_key, *span) == expected
+            if expected:
+                brute.spans[next_key] = span
+            next_key += 1
+        elif action < 0.65:
+            # Kéo thả / đổi cỡ: không hợp lệ thì giữ span cũ
+            key = rng.choice(list(brute.spans))
+            row, col, row_span, col_span = random_span(rng, brute)
+            if rng.random() < 0.5:
+                row_span, col_span = brute.spans[key][2:]
+                moved = grid.move(key, row, col)
+            else:
+                moved = grid.move(key, row, col, row_span, col_span)
+            span = (row, col, row_span, col_span)
+            assert moved == brute.can_place(span, exclude=key)
+            if moved:
+                brute.spans[key] = span
+        elif action < 0.9:
+            key = rng.choice(list(brute.spans))
+            assert grid.release(key) == brute.spans.pop(key)
+            assert grid.release(key) is None
+        else:
+            assert not grid.move(-1, 0, 0)
+
+        assert_same(grid, brute)
+
+        for _ in range(5):
+            row = rng.randrange(0, brute.row_count() + 2)
+            col = rng.randrange(0, COLUMNS)
+            assert grid.key_at(row, col) == brute.key_at(row, col)
+
+            first = rng.randrange(0, brute.row_count() + 2)
+            last = first + rng.randrange(0, 6)
+            keys = list(grid.keys_in_rows(first, last))
+            assert len(keys) == len(set(keys))
+            assert set(keys) == brute.keys_in_rows(first, last)
+
+
+def test_find_free_fills_holes_after_release():
+    grid = TileOccupancyMap(COLUMNS)
+    brute = BruteGrid(COLUMNS)
+    for key in range(COLUMNS * 8):
+        span = (*grid.find_free(1, 1), 1, 1)
+        grid.place(key, *span)
+        brute.spans[key] = span
+    assert grid.row_count == 8
+
+    # Hàng đầu đã kín: lỗ trống ở giữa vẫn được tìm thấy sau khi bỏ tile
+    for key in (3 * COLUMNS + 2, 3 * COLUMNS + 3, 5 * COLUMNS + 4):
+        del brute.spans[key]
+        grid.release(key)
+    assert grid.find_free(1, 1) == brute.find_free(1, 1) == (3, 2)
+    assert grid.find_free(1, 2) == brute.find_free(1, 2) == (3, 2)
+    assert grid.find_free(2, 2) == brute.find_free(2, 2) == (8, 0)
+    assert grid.find_free(1, 1, start_row=4) == (5, 4)
+
+
+def test_tile_wider_than_grid_has_no_slot():
+    grid = TileOccupancyMap(COLUMNS)
+    assert grid.find_free(1, COLUMNS + 1) is None
+    assert not grid.place("wide", 0, 0, 1, COLUMNS + 1)
+    assert grid.find_free(1, COLUMNS) == (0, 0)
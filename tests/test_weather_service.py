@@ -0,0 +1,299 @@
+# tests/test_weather_service.py
+"""
+WeatherService với FileWeatherProvider và đồng hồ giả (không gọi mạng):
+- process_forecast_data: chia ngày theo city.timezone, điều kiện gặp nhiều nhất,
+  bỏ qua mục hỏng
+- TTL: còn hạn thì không đọc provider
+- Provider lỗi: trả dữ liệu cũ (stale) kèm lỗi, backoff gấp đôi tới WEATHER_MAX_BACKOFF
+- File cache hỏng: coi như chưa có cache, lần lấy sau ghi lại file đúng
+"""
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from tests.conftest import FakeClock
+from ui_qt.windows.dashboard_window_qt.services.weather_service import (
+    WeatherService, WeatherCache, WeatherLocation, WeatherProvider, WeatherProviderError,
+    FileWeatherProvider, KIND_CURRENT, KIND_FORECAST, process_forecast_data
+)
+from ui_qt.windows.dashboard_window_qt.utils.constants import (
+    WEATHER_CACHE_TTL, WEATHER_RETRY_DELAY, WEATHER_MAX_BACKOFF
+)
+
+HANOI = WeatherLocation(city="Hà Nội")
+HANOI_OFFSET = 7 * 3600
+UNIT = "metric"
+START = 1_750_000_000.0
+
+
+def ts(year, month, day, hour, offset=HANOI_OFFSET) -> int:
+    """Epoch của giờ địa phương (giờ Hà Nội mặc định)"""
+    return int(datetime(year, month, day, hour, tzinfo=timezone.utc).timestamp()) - offset
+
+
+def item(dt, temp, condition="Clouds", humidity=70, wind=2.0, rain=None):
+    entry = {
+        "dt": dt,
+        "main": {"temp": temp, "humidity": humidity},
+        "weather": [{"main": condition}],
+        "wind": {"speed": wind},
+    }
+    if rain is not None:
+        entry["rain"] = {"3h": rain}
+    return entry
+
+
+def current_payload(temp):
+    return {"name": "Hà Nội", "main": {"temp": temp, "humidity": 80}, "weather": [{"main": "Rain"}]}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    directory = tmp_path / "weather"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(START)
+
+
+@pytest.fixture
+def service(data_dir, tmp_path, clock):
+    return WeatherService(FileWeatherProvider(data_dir), WeatherCache(tmp_path / "cache.json"),
+                          clock=clock)
+
+
+def write_current(data_dir, temp):
+    path = data_dir / "weather-ha-noi.json"
+    path.write_text(json.dumps(current_payload(temp), ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+# ========== FORECAST PROCESSING ==========
+
+def test_forecast_days_follow_city_timezone():
+    data = {
+        "city": {"timezone": HANOI_OFFSET},
+        "list": [
+            # 23:00 và 00:00 giờ Hà Nội: khác ngày dù cùng ngày theo UTC
+            item(ts(2025, 6, 1, 23), 27.0),
+            item(ts(2025, 6, 2, 0), 26.0),
+            item(ts(2025, 6, 2, 12), 34.0),
+        ],
+    }
+
+    days = process_forecast_data(data)
+
+    assert [d["date"] for d in days] == [date(2025, 6, 1), date(2025, 6, 2)]
+    assert (days[0]["temp_min"], days[0]["temp_max"]) == (27.0, 27.0)
+    assert (days[1]["temp_min"], days[1]["temp_max"]) == (26.0, 34.0)
+
+    # Cùng dữ liệu chia theo UTC: ba mục rơi vào ngày 1/6 (16:00, 17:00) và 2/6 (05:00)
+    utc_days = process_forecast_data(data, utc_offset=0)
+    assert [d["date"] for d in utc_days] == [date(2025, 6, 1), date(2025, 6, 2)]
+    assert (utc_days[0]["temp_min"], utc_days[0]["temp_max"]) == (26.0, 27.0)
+
+
+def test_forecast_condition_is_most_common_then_first_seen():
+    data = {
+        "city": {"timezone": HANOI_OFFSET},
+        "list": [
+            item(ts(2025, 6, 1, 6), 25, "Clear"),
+            item(ts(2025, 6, 1, 9), 28, "Rain"),
+            item(ts(2025, 6, 1, 12), 31, "Rain"),
+            item(ts(2025, 6, 1, 15), 30, "Clouds"),
+            # Ngày 2: hòa -> lấy cái xuất hiện trước
+            item(ts(2025, 6, 2, 6), 25, "Clouds"),
+            item(ts(2025, 6, 2, 9), 27, "Clear"),
+        ],
+    }
+
+    days = process_forecast_data(data)
+
+    assert [d["condition"] for d in days] == ["Rain", "Clouds"]
+
+
+def test_forecast_skips_malformed_items():
+    data = {
+        "city": {"timezone": HANOI_OFFSET},
+        "list": [
+            item(ts(2025, 6, 1, 9), 28, humidity=60, wind=3.0, rain=2),
+            {"main": {"temp": 40}},                        # thiếu dt
+            {"dt": ts(2025, 6, 1, 12)},                    # thiếu main
+            {"dt": "không phải số", "main": {"temp": 1}},
+            {"dt": ts(2025, 6, 1, 15), "main": None},
+            {"dt": 10 ** 20, "main": {"temp": 1}},         # tràn số
+            {"dt": ts(2025, 6, 1, 18), "main": {"temp": 30, "humidity": 80}, "weather": []},
+        ],
+    }
+
+    days = process_forecast_data(data)
+
+    assert len(days) == 1
+    day = days[0]
+    assert (day["temp_min"], day["temp_max"]) == (28, 30)
+    assert day["condition"] == "Clouds"
+    assert day["humidity"] == 70
+    assert day["wind_speed"] == 3.0
+    assert day["rain_chance"] == 20
+
+
+def test_forecast_limits_days():
+    data = {
+        "city": {"timezone": HANOI_OFFSET},
+        "list": [item(ts(2025, 6, d, 12), 30) for d in range(1, 9)],
+    }
+    assert len(process_forecast_data(data, days=5)) == 5
+    assert process_forecast_data({"list": []}) == []
+
+
+def test_forecast_from_file_provider(service, data_dir):
+    payload = {
+        "city": {"name": "Hà Nội", "timezone": HANOI_OFFSET},
+        "list": [item(ts(2025, 6, 1, h), 25 + h // 3) for h in range(0, 24, 3)],
+    }
+    (data_dir / "forecast.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    result = service.get(KIND_FORECAST, HANOI, UNIT)
+    days = process_forecast_data(result.payload)
+
+    assert [d["date"] for d in days] == [date(2025, 6, 1)]
+    assert (days[0]["temp_min"], days[0]["temp_max"]) == (25, 32)
+
+
+# ========== TTL ==========
+
+def test_fresh_cache_is_served_without_provider(service, data_dir, clock):
+    path = write_current(data_dir, 30)
+    first = service.get(KIND_CURRENT, HANOI, UNIT)
+    assert first.payload["main"]["temp"] == 30
+    assert not first.stale and first.error is None
+
+    # Provider đổi / biến mất: trong TTL vẫn dùng cache, không đọc lại
+    path.unlink()
+    clock.now += WEATHER_CACHE_TTL / 1000 - 1
+    hit = service.get(KIND_CURRENT, HANOI, UNIT)
+    assert hit.payload == first.payload
+    assert not hit.stale
+    assert service.stats["hits"] == 1
+    assert service.stats["fetches"] == 1
+
+    # Quá TTL -> gọi provider
+    write_current(data_dir, 31)
+    clock.now += 1
+    refreshed = service.get(KIND_CURRENT, HANOI, UNIT)
+    assert refreshed.payload["main"]["temp"] == 31
+    assert refreshed.fetched_at == clock.now
+    assert service.stats["fetches"] == 2
+
+
+def test_cache_survives_restart(service, data_dir, tmp_path, clock):
+    write_current(data_dir, 29)
+    service.get(KIND_CURRENT, HANOI, UNIT)
+
+    reopened = WeatherService(FileWeatherProvider(data_dir), WeatherCache(tmp_path / "cache.json"),
+                              clock=clock)
+    peeked = reopened.peek(KIND_CURRENT, HANOI, UNIT)
+    assert peeked.payload["main"]["temp"] == 29
+    assert not peeked.stale
+
+    assert reopened.get(KIND_CURRENT, HANOI, UNIT).payload["main"]["temp"] == 29
+    assert reopened.stats == {"hits": 1, "fetches": 0, "failures": 0, "stale": 0, "skipped": 0}
+
+
+# ========== ERRORS ==========
+
+def test_provider_error_returns_stale_data(service, data_dir, clock):
+    path = write_current(data_dir, 30)
+    fetched = service.get(KIND_CURRENT, HANOI, UNIT)
+
+    path.write_text("{hỏng", encoding="utf-8")
+    clock.now += WEATHER_CACHE_TTL / 1000 + 60
+    result = service.get(KIND_CURRENT, HANOI, UNIT)
+
+    assert result.payload == fetched.payload
+    assert result.fetched_at == fetched.fetched_at
+    assert result.stale
+    assert "weather-ha-noi.json" in result.error
+    assert service.stats["stale"] == 1
+
+
+def test_provider_error_without_cache_raises(service):
+    with pytest.raises(WeatherProviderError):
+        service.get(KIND_CURRENT, HANOI, UNIT)
+    # Đang backoff: không đọc provider nữa, vẫn báo lỗi
+    with pytest.raises(WeatherProviderError):
+        service.get(KIND_CURRENT, HANOI, UNIT)
+    assert service.stats["fetches"] == 1
+    assert service.stats["skipped"] == 1
+
+
+def test_backoff_doubles_up_to_max_and_resets_on_success(service, data_dir, clock):
+    write_current(data_dir, 30)
+    service.get(KIND_CURRENT, HANOI, UNIT)
+    (data_dir / "weather-ha-noi.json").unlink()
+    clock.now += WEATHER_CACHE_TTL / 1000
+
+    delays = []
+    for _ in range(10):
+        fetches = service.stats["fetches"]
+        result = service.get(KIND_CURRENT, HANOI, UNIT)
+        assert result.stale and result.error
+        assert service.stats["fetches"] == fetches + 1
+
+        delay = service.retry_delay_ms(KIND_CURRENT, HANOI, UNIT)
+        delays.append(delay)
+
+        # Trước hạn: trả dữ liệu cũ, không đọc provider
+        clock.now += delay / 1000 - 1
+        assert service.get(KIND_CURRENT, HANOI, UNIT).stale
+        assert service.stats["fetches"] == fetches + 1
+        clock.now += 1
+
+    expected = [min(WEATHER_RETRY_DELAY * 2 ** i, WEATHER_MAX_BACKOFF) for i in range(10)]
+    assert delays == expected
+    assert delays[-1] == WEATHER_MAX_BACKOFF
+
+    # force bỏ qua backoff; thành công thì xóa trạng thái lỗi
+    write_current(data_dir, 25)
+    result = service.get(KIND_CURRENT, HANOI, UNIT, force=True)
+    assert result.payload["main"]["temp"] == 25
+    assert result.error is None
+    assert service.retry_delay_ms(KIND_CURRENT, HANOI, UNIT) == 0
+
+
+# ========== CORRUPT CACHE ==========
+
+@pytest.mark.parametrize("content", ["{không phải json", "[1, 2, 3]", ""])
+def test_corrupt_cache_file_is_ignored_and_rewritten(data_dir, tmp_path, clock, content):
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text(content, encoding="utf-8")
+    service = WeatherService(FileWeatherProvider(data_dir), WeatherCache(cache_path), clock=clock)
+
+    assert service.peek(KIND_CURRENT, HANOI, UNIT) is None
+
+    write_current(data_dir, 30)
+    assert service.get(KIND_CURRENT, HANOI, UNIT).payload["main"]["temp"] == 30
+
+    stored = json.loads(cache_path.read_text(encoding="utf-8"))
+    key = WeatherService.cache_key(KIND_CURRENT, HANOI, UNIT)
+    assert stored[key]["payload"]["main"]["temp"] == 30
+    assert not cache_path.with_name("cache.json.tmp").exists()
+
+
+# ========== PROVIDER INTERFACE ==========
+
+def test_provider_without_fetch_fails_on_creation():
+    class NoFetchProvider(WeatherProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        NoFetchProvider()
+    with pytest.raises(TypeError):
+        WeatherProvider()
@@ -0,0 +1,282 @@
+# ui_qt/core/group_fit_engine.py
+"""
+Tính độ phù hợp giữa học sinh và nhóm học theo điểm kỹ năng (student_skills)
+
+Toàn bộ dữ liệu được lấy bằng MỘT truy vấn trên bảng tổng hợp student_topic_profile
+(student × chủ đề: tổng điểm, số lần đánh giá), sau đó điểm trung bình của mọi nhóm và độ lệch của mọi học sinh
+với mọi nhóm được tính cùng lúc bằng NumPy.
+
+Cách tính giữ nguyên như bản cũ của GroupSuggestionWindowQt:
+- Điểm HS / nhóm theo chủ đề = AVG(diem) làm tròn 1 chữ số
+- Độ lệch với nhóm = trung bình |điểm HS - điểm nhóm| trên các chủ đề cả hai đều có điểm
+
+NumPy là tùy chọn (requirements-optional.txt); thiếu NumPy thì tính bằng vòng lặp Python, cùng kết quả.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def round_score(value: float) -> float:
+    """Làm tròn 1 chữ số kiểu ROUND() của SQLite (nửa lên), giống truy vấn cũ"""
+    return math.floor(value * 10 + 0.5) / 10
+
+
+@dataclass
+class GroupFit:
+    """Độ lệch của một học sinh so với một nhóm"""
+    group_id: int
+    group_name: str
+    diff: float
+    topic_count: int
+
+
+@dataclass
+class RegroupSuggestion:
+    """Gợi ý chuyển nhóm cho một học sinh"""
+    student_id: int
+    student_name: str
+    current_group_id: Optional[int]
+    current_group_name: str
+    current_diff: Optional[float]
+    best_group_id: int
+    best_group_name: str
+    best_diff: float
+
+    @property
+    def improvement(self) -> Optional[float]:
+        if self.current_diff is None:
+            return None
+        return round(self.current_diff - self.best_diff, 2)
+
+
+class GroupFitEngine:
+    """
+    Engine chấm điểm độ phù hợp học sinh - nhóm
+
+    Usage:
+        engine = GroupFitEngine(db)
+        engine.load()
+        fits = engine.rank_student(student_id, ["Đại số", "Hình học"])
+        report = engine.suggest_regrouping()
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self.topics: List[str] = []
+        self.student_ids: List[int] = []
+        self.student_names: Dict[int, str] = {}
+        self.student_group: Dict[int, Optional[int]] = {}
+        self.group_ids: List[int] = []
+        self.group_names: Dict[int, str] = {}
+
+        # (student_id, topic) -> (tổng điểm, số lần đánh giá)
+        self._cells: Dict[Tuple[int, str], Tuple[float, int]] = {}
+        self._topic_index: Dict[str, int] = {}
+        self._student_index: Dict[int, int] = {}
+
+        # Ma trận NumPy (None nếu không có numpy hoặc chưa load)
+        self._student_scores = None  # (students × topics), NaN = chưa có điểm
+        self._group_scores = None    # (groups × topics), NaN = nhóm chưa có điểm
+        # {group_id: {topic: điểm TB}}
+        self._group_topic_scores: Dict[int, Dict[str, float]] = {}
+
+    # ========== LOADING ==========
+
+    def load(self) -> "GroupFitEngine":
+        """Nạp hồ sơ điểm (student_topic_profile) + danh sách nhóm/học sinh"""
+        rows = self.db.execute_query(
+            """
+            SELECT student_id, chu_de, score_sum AS total, assessment_count AS cnt
+            FROM student_topic_profile
+            """,
+            fetch='all'
+        ) or []
+        students = self.db.execute_query(
+            "SELECT id, name, group_id FROM students ORDER BY name", fetch='all'
+        ) or []
+        groups = self.db.execute_query(
+            "SELECT id, name FROM groups ORDER BY name", fetch='all'
+        ) or []
+
+        self.student_ids = [s['id'] for s in students]
+        self.student_names = {s['id']: s['name'] for s in students}
+        self.student_group = {s['id']: s['group_id'] for s in students}
+        self.group_ids = [g['id'] for g in groups]
+        self.group_names = {g['id']: g['name'] for g in groups}
+
+        self._cells = {(r['student_id'], r['chu_de']): (float(r['total']), int(r['cnt'])) for r in rows}
+        self.topics = sorted({topic for _, topic in self._cells})
+        self._topic_index = {t: i for i, t in enumerate(self.topics)}
+        self._student_index = {sid: i for i, sid in enumerate(self.student_ids)}
+
+        self._build_group_scores()
+        if NUMPY_AVAILABLE:
+            self._build_matrices()
+        return self
+
+    def _build_group_scores(self):
+        """Điểm TB của mọi nhóm theo chủ đề = tổng điểm các thành viên / tổng số lần đánh giá"""
+        totals: Dict[Tuple[int, str], List[float]] = {}
+        for (sid, topic), (total, cnt) in self._cells.items():
+            gid = self.student_group.get(sid)
+            if gid is None:
+                continue
+            acc = totals.setdefault((gid, topic), [0.0, 0])
+            acc[0] += total
+            acc[1] += cnt
+
+        self._group_topic_scores = {}
+        for (gid, topic), (total, cnt) in totals.items():
+            self._group_topic_scores.setdefault(gid, {})[topic] = round_score(total / cnt)
+
+    def _build_matrices(self):
+        """Dựng ma trận điểm học sinh (students × topics) và điểm nhóm (groups × topics)"""
+        self._student_scores = np.full((len(self.student_ids), len(self.topics)), np.nan)
+        for (sid, topic), (total, cnt) in self._cells.items():
+            i = self._student_index.get(sid)
+            if i is not None:
+                self._student_scores[i, self._topic_index[topic]] = round_score(total / cnt)
+
+        self._group_scores = np.full((len(self.group_ids), len(self.topics)), np.nan)
+        for k, gid in enumerate(self.group_ids):
+            for topic, score in self._group_topic_scores.get(gid, {}).items():
+                self._group_scores[k, self._topic_index[topic]] = score
+
+    # ========== SCORING ==========
+
+    def student_scores(self, student_id: int, topics: Sequence[str]) -> Dict[str, float]:
+        """Điểm TB của học sinh theo các chủ đề (bỏ chủ đề chưa được đánh giá)"""
+        scores = {}
+        for topic in topics:
+            cell = self._cells.get((student_id, topic))
+            if cell:
+                scores[topic] = round_score(cell[0] / cell[1])
+        return scores
+
+    def rank_student(self, student_id: int, topics: Sequence[str]) -> List[GroupFit]:
+        """
+        Xếp hạng tất cả các nhóm cho một học sinh theo các chủ đề được chọn
+
+        Returns:
+            Danh sách GroupFit tăng dần theo độ lệch (nhóm không có điểm chung bị bỏ)
+        """
+        scores = self.student_scores(student_id, topics)
+        if not scores:
+            return []
+
+        if NUMPY_AVAILABLE:
+            idx = [self._topic_index[t] for t in scores]
+            vector = np.array([scores[t] for t in scores])
+            diffs, valid = self._diff_matrix(vector[None, :], idx)
+            diffs, valid = diffs[0], valid[0]
+            fits = [
+                GroupFit(gid, self.group_names[gid], round(float(diffs[k]), 2), int(valid[k]))
+                for k, gid in enumerate(self.group_ids) if valid[k] > 0
+            ]
+        else:
+            fits = []
+            for gid in self.group_ids:
+                group_scores = self._group_topic_scores.get(gid, {})
+                common = [abs(scores[t] - group_scores[t]) for t in scores if t in group_scores]
+                if common:
+                    fits.append(GroupFit(gid, self.group_names[gid],
+                                         round(sum(common) / len(common), 2), len(common)))
+
+        fits.sort(key=lambda f: f.diff)
+        return fits
+
+    def rank_all(self, topics: Optional[Sequence[str]] = None) -> Dict[int, List[GroupFit]]:
+        """
+        Xếp hạng mọi nhóm cho mọi học sinh trong một lần tính
+
+        Args:
+            topics: Chủ đề dùng để so sánh (None = tất cả chủ đề có dữ liệu)
+
+        Returns:
+            {student_id: [GroupFit tăng dần theo độ lệch]}
+        """
+        topics = [t for t in (topics or self.topics) if t in self._topic_index]
+        if not topics:
+            return {}
+        if not NUMPY_AVAILABLE:
+            ranked = {sid: self.rank_student(sid, topics) for sid in self.student_ids}
+            return {sid: fits for sid, fits in ranked.items() if fits}
+
+        idx = [self._topic_index[t] for t in topics]
+        diffs, valid = self._diff_matrix(self._student_scores[:, idx], idx)
+        ranked = {}
+        for i, sid in enumerate(self.student_ids):
+            fits = [
+                GroupFit(gid, self.group_names[gid], round(float(diffs[i, k]), 2), int(valid[i, k]))
+                for k, gid in enumerate(self.group_ids) if valid[i, k] > 0
+            ]
+            if fits:
+                fits.sort(key=lambda f: f.diff)
+                ranked[sid] = fits
+        return ranked
+
+    def suggest_regrouping(self, topics: Optional[Sequence[str]] = None,
+                           min_improvement: float = 0.5) -> List[RegroupSuggestion]:
+        """
+        Báo cáo gợi ý xếp lại nhóm cho toàn trung tâm
+
+        Args:
+            topics: Chủ đề dùng để so sánh (None = tất cả)
+            min_improvement: Chỉ gợi ý khi độ lệch giảm ít nhất chừng này điểm
+
+        Returns:
+            Danh sách gợi ý, học sinh được lợi nhiều nhất đứng đầu
+        """
+        suggestions = []
+        for sid, fits in self.rank_all(topics).items():
+            best = fits[0]
+            current_gid = self.student_group.get(sid)
+            if best.group_id == current_gid:
+                continue
+            current = next((f for f in fits if f.group_id == current_gid), None)
+            current_diff = current.diff if current else None
+            if current_diff is not None and current_diff - best.diff < min_improvement:
+                continue
+            suggestions.append(RegroupSuggestion(
+                student_id=sid,
+                student_name=self.student_names.get(sid, ""),
+                current_group_id=current_gid,
+                current_group_name=self.group_names.get(current_gid, ""),
+                current_diff=current_diff,
+                best_group_id=best.group_id,
+                best_group_name=best.group_name,
+                best_diff=best.diff,
+            ))
+
+        # chưa có nhóm / chưa so sánh được -> xếp đầu, sau đó theo mức cải thiện
+        suggestions.sort(key=lambda s: (s.improvement is not None, -(s.improvement or 0)))
+        return suggestions
+
+    # ========== PRIVATE HELPERS ==========
+
+    def _diff_matrix(self, student_block, idx):
+        """
+        |điểm HS - điểm nhóm| trung bình trên các chủ đề chung
+
+        Args:
+            student_block: (students × k) điểm HS trên các cột idx
+            idx: chỉ số cột chủ đề trong ma trận nhóm
+
+        Returns:
+            (diffs, valid): (students × groups) độ lệch TB và số chủ đề chung
+        """
+        group_block = self._group_scores[:, idx]                      # (groups × k)
+        delta = np.abs(student_block[:, None, :] - group_block[None, :, :])
+        present = ~np.isnan(delta)
+        valid = present.sum(axis=2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            diffs = np.where(present, delta, 0.0).sum(axis=2) / valid
+        return diffs, valid
@@ -0,0 +1,294 @@
+"""
+Exercise Tree Model - Cây thư mục bài tập dạng QAbstractItemModel
+File: ui_qt/core/models/exercise_tree_model.py
+
+- ExerciseTreeIndex: toàn bộ cây trong bộ nhớ (parent/children map) + khóa tìm kiếm
+  đã chuẩn hoá (chữ thường, bỏ dấu) tính sẵn một lần khi nạp
+- filter(): một lượt duyệt trả về id khớp + toàn bộ tổ tiên của chúng
+- ExerciseTreeModel: chỉ tạo hàng con khi view mở node (canFetchMore / fetchMore)
+"""
+
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from PySide6 import QtGui
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+ROOT_ID = 0  # id ảo của gốc (parent_id IS NULL)
+DEFAULT_COLOR = "#2E86AB"
+
+
+def fold_text(text: Optional[str]) -> str:
+    """Chữ thường + bỏ dấu tiếng Việt: 'Phương trình Đạo hàm' -> 'phuong trinh dao ham'"""
+    text = (text or "").lower().replace("đ", "d")
+    return "".join(ch for ch in unicodedata.normalize("NFD", text) if not unicodedata.combining(ch))
+
+
+@dataclass
+class TreeNodeRecord:
+    """Một node trong ExerciseTreeIndex"""
+    id: int
+    parent_id: int
+    name: str
+    level: str
+    description: str = ""
+    icon: str = ""
+    color: str = DEFAULT_COLOR
+    is_active: bool = True
+    search_key: str = ""
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.icon} {self.name}" if self.icon else self.name
+
+    def refresh_search_key(self):
+        # \x00 ngăn một từ khoá khớp xuyên qua ranh giới tên / mô tả
+        self.search_key = f"{fold_text(self.name)}\x00{fold_text(self.description)}"
+
+
+class ExerciseTreeIndex:
+    """Cây exercise_tree trong bộ nhớ"""
+
+    def __init__(self, rows: Iterable[Dict] = ()):
+        self.nodes: Dict[int, TreeNodeRecord] = {}
+        self.children: Dict[int, List[int]] = {ROOT_ID: []}
+        for row in rows:
+            self._add(row)
+        self._link()
+
+    def _add(self, row: Dict):
+        # exercise_tree cũ chỉ có id/parent_id/name/level/description -> cột khác dùng mặc định
+        node = TreeNodeRecord(
+            id=int(row["id"]),
+            parent_id=int(row.get("parent_id") or ROOT_ID),
+            name=row.get("name") or "",
+            level=row.get("level") or "",
+            description=row.get("description") or "",
+            icon=row.get("icon") or "",
+            color=row.get("color") or DEFAULT_COLOR,
+            is_active=bool(row.get("is_active", 1)),
+        )
+        node.refresh_search_key()
+        self.nodes[node.id] = node
+
+    def _link(self):
+        """Dựng children map theo thứ tự nạp; node mồ côi (cha đã xoá) treo ở gốc"""
+        for node in self.nodes.values():
+            if node.parent_id not in self.nodes:
+                node.parent_id = ROOT_ID
+            self.children.setdefault(node.parent_id, []).append(node.id)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def is_ancestor(self, ancestor_id: int, node_id: int) -> bool:
+        """ancestor_id có phải tổ tiên (hoặc chính) node_id không"""
+        current = node_id
+        while current != ROOT_ID:
+            if current == ancestor_id:
+                return True
+            current = self.nodes[current].parent_id if current in self.nodes else ROOT_ID
+        return False
+
+    def path_to(self, node_id: int) -> List[int]:
+        """Danh sách id từ node cấp cao nhất xuống node_id"""
+        path = []
+        while node_id in self.nodes:
+            path.append(node_id)
+            node_id = self.nodes[node_id].parent_id
+        return path[::-1]
+
+    def filter(self, text: str = "", level: Optional[str] = None,
+               active: Optional[bool] = None):
+        """
+        Lọc cây trong một lượt
+
+        Returns:
+            (matches, visible): id khớp điều kiện và tập id cần hiển thị
+            (matches + tất cả tổ tiên); (None, None) nếu không có điều kiện nào
+        """
+        needle = fold_text(text.strip())
+        if not needle and level is None and active is None:
+            return None, None
+
+        matches: List[int] = []
+        visible: Set[int] = set()
+        nodes = self.nodes
+        for node in nodes.values():
+            if needle and needle not in node.search_key:
+                continue
+            if level is not None and node.level != level:
+                continue
+            if active is not None and node.is_active != active:
+                continue
+            matches.append(node.id)
+            # Bao đóng tổ tiên: dừng khi gặp node đã có -> mỗi node chỉ thêm một lần
+            current = node.id
+            while current != ROOT_ID and current not in visible:
+                visible.add(current)
+                current = nodes[current].parent_id
+        return matches, visible
+
+
+class ExerciseTreeModel(QAbstractItemModel):
+    """
+    Model cây trên ExerciseTreeIndex
+
+    internalId của QModelIndex = id node. Con của một node chỉ được "nạp" khi view
+    mở node đó (fetchMore), nên cây 20k node cũng chỉ tạo vài chục hàng lúc đầu.
+    """
+    HEADERS = ["Tên", "Cấp độ", "Trạng thái", "Mô tả"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = ExerciseTreeIndex()
+        self._visible: Optional[Set[int]] = None     # None = không lọc
+        self._fetched: Set[int] = {ROOT_ID}
+        self._child_cache: Dict[int, List[int]] = {}
+        self._row_of: Dict[int, int] = {}
+
+    # ---------- Data source ----------
+    def set_tree(self, tree: ExerciseTreeIndex):
+        self.beginResetModel()
+        self.tree = tree
+        self._visible = None
+        self._reset_cache()
+        self.endResetModel()
+
+    def set_visible(self, visible: Optional[Set[int]], fetch_all: bool = False):
+        """
+        Áp tập id hiển thị (kết quả ExerciseTreeIndex.filter), None = hiện tất cả
+
+        fetch_all=True: nạp sẵn mọi node con (dùng khi kết quả ít và view sẽ expandAll)
+        """
+        self.beginResetModel()
+        self._visible = visible
+        self._reset_cache()
+        if fetch_all:
+            self._fetched.update(self.tree.children)
+        self.endResetModel()
+
+    def fetch_all(self):
+        """Nạp toàn bộ node (trước khi view.expandAll)"""
+        self.set_visible(self._visible, fetch_all=True)
+
+    def _reset_cache(self):
+        self._fetched = {ROOT_ID}
+        self._child_cache.clear()
+        self._row_of.clear()
+
+    def _visible_children(self, parent_id: int) -> List[int]:
+        cached = self._child_cache.get(parent_id)
+        if cached is None:
+            ids = self.tree.children.get(parent_id, [])
+            if self._visible is not None:
+                ids = [i for i in ids if i in self._visible]
+            cached = self._child_cache[parent_id] = ids
+            for row, node_id in enumerate(ids):
+                self._row_of[node_id] = row
+        return cached
+
+    @staticmethod
+    def node_id(index: QModelIndex) -> int:
+        return index.internalId() if index.isValid() else ROOT_ID
+
+    def node_at(self, index: QModelIndex) -> Optional[TreeNodeRecord]:
+        return self.tree.nodes.get(self.node_id(index))
+
+    def index_for_id(self, node_id: int, column: int = 0) -> QModelIndex:
+        """QModelIndex của node (nạp dần các node cha nếu chưa nạp)"""
+        if node_id not in self.tree.nodes:
+            return QModelIndex()
+        for ancestor_id in self.tree.path_to(node_id)[:-1]:
+            self.fetchMore(self.index_for_id(ancestor_id))
+        parent_id = self.tree.nodes[node_id].parent_id
+        if node_id not in self._visible_children(parent_id):
+            return QModelIndex()
+        return self.createIndex(self._row_of[node_id], column, node_id)
+
+    def node_changed(self, node_id: int):
+        left = self.index_for_id(node_id, 0)
+        if left.isValid():
+            self.dataChanged.emit(left, left.siblingAtColumn(len(self.HEADERS) - 1))
+
+    # ---------- QAbstractItemModel ----------
+    def index(self, row, column, parent=QModelIndex()):
+        children = self._visible_children(self.node_id(parent))
+        if not (0 <= row < len(children)) or not (0 <= column < len(self.HEADERS)):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        node = self.tree.nodes.get(index.internalId())
+        if node is None or node.parent_id == ROOT_ID:
+            return QModelIndex()
+        grand_id = self.tree.nodes[node.parent_id].parent_id
+        self._visible_children(grand_id)
+        return self.createIndex(self._row_of[node.parent_id], 0, node.parent_id)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        parent_id = self.node_id(parent)
+        if parent_id not in self._fetched:
+            return 0
+        return len(self._visible_children(parent_id))
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        return bool(self._visible_children(self.node_id(parent)))
+
+    def canFetchMore(self, parent):
+        parent_id = self.node_id(parent)
+        return parent_id not in self._fetched and bool(self._visible_children(parent_id))
+
+    def fetchMore(self, parent):
+        parent_id = self.node_id(parent)
+        if parent_id in self._fetched:
+            return
+        children = self._visible_children(parent_id)
+        if not children:
+            self._fetched.add(parent_id)
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        self._fetched.add(parent_id)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        node = self.node_at(index)
+        if node is None:
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return node.display_name
+            if column == 1:
+                return node.level
+            if column == 2:
+                return "✓" if node.is_active else "✗"
+            return node.description
+        if role == Qt.ForegroundRole and column == 0:
+            return QtGui.QBrush(QtGui.QColor(node.color))
+        if role == Qt.UserRole:
+            return node.id
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
@@ -1,6 +1,6 @@
 # ui_qt/main_window.py
 from __future__ import annotations
-import sys, datetime
+import sys, datetime, sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, Tuple
 
@@ -12,6 +12,32 @@ from ui_qt.windows.session_detail_window_qt import SessionDetailWindowQt
 from PySide6.QtWidgets import QMenu, QMessageBox
 
 
+# Style dùng chung cho lưới lịch tuần (theo objectName + property "state")
+WEEK_GRID_STYLE = """
+QLabel#hourLabel{
+    font-weight:600;color:#555;padding:4px 6px;border:1px solid #e2e4e8;border-radius:6px;background:#fafafa;
+}
+QPushButton#scheduleCell[state="empty"]{
+    background:#f7f9fb;border:1px dashed #e3e6ea;border-radius:8px;
+}
+QPushButton#scheduleCell[state="active"]{
+    background:#eaf2ff;border:1px solid #bcd3ff;border-radius:10px;
+    padding:8px;font-weight:600;color:#284b7b;
+}
+QPushButton#scheduleCell[state="active"]:hover{ background:#deebff; }
+QPushButton#scheduleCell[state="cancelled"]{
+    background:#f0f0f0;border:1px dashed #c8c8c8;border-radius:10px;
+    padding:8px;color:#666;
+}
+QPushButton#scheduleCell[state="cancelled"]:hover{ background:#eaeaea; }
+"""
+
+DAY_HEADER_STYLE = """
+QToolButton#dayHeader{background:#f4f6f8;border:1px solid #d6d9dd;border-radius:6px;}
+QToolButton#dayHeader[today="true"]{background:#e7f1ff;border:1px solid #a5c8ff;font-weight:700;}
+"""
+
+
 def monday_of(date: datetime) -> datetime:
     return date - timedelta(days=(date.weekday() % 7))  # 0=Mon
 
@@ -122,7 +148,8 @@ class MainWindow(QtWidgets.QMainWindow):
             b = QtWidgets.QToolButton()
             b.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
             b.setMinimumHeight(48)
-            b.setStyleSheet("QToolButton{background:#f4f6f8;border:1px solid #d6d9dd;border-radius:6px;}")
+            b.setObjectName("dayHeader")
+            b.setStyleSheet(DAY_HEADER_STYLE)
             # ✅ bật context menu (chuột phải)
             b.setContextMenuPolicy(Qt.CustomContextMenu)
             b.customContextMenuRequested.connect(lambda pos, idx=i, w=b: self._show_day_menu(pos, idx, w))
@@ -136,18 +163,19 @@ class MainWindow(QtWidgets.QMainWindow):
         r.addWidget(self.scroll, 1)
 
         self.grid_host = QtWidgets.QWidget()
+        self.grid_host.setStyleSheet(WEEK_GRID_STYLE)
         self.scroll.setWidget(self.grid_host)
         g = QtWidgets.QGridLayout(self.grid_host)
         g.setContentsMargins(0, 8, 0, 8)
         g.setHorizontalSpacing(6)
         g.setVerticalSpacing(12)
         self.grid: QtWidgets.QGridLayout = g
+        # (row, col) -> nút ô lịch, tạo một lần và tái sử dụng khi đổi tuần
+        self._cells: Dict[Tuple[int, int], QtWidgets.QPushButton] = {}
+        self._build_grid_cells()
 
         root.addWidget(right, 1)
 
-        # style nhỏ cho nhãn giờ
-        self._hour_label_style = "font-weight:600;color:#555;padding:4px 6px;border:1px solid #e2e4e8;border-radius:6px;background:#fafafa;"
-
     def _section_title(self, text: str) -> QtWidgets.QLabel:
         lab = QtWidgets.QLabel(text)
         lab.setStyleSheet("font-weight:600;margin-top:12px;")
@@ -204,152 +232,132 @@ class MainWindow(QtWidgets.QMainWindow):
             btn = self.day_header_btns[i]
             btn.setText(f"{wd}\n({fmt_date(d)})")
             # highlight hôm nay
-            if d.date() == datetime.now().date():
-                btn.setStyleSheet("QToolButton{background:#e7f1ff;border:1px solid #a5c8ff;border-radius:6px;font-weight:700;}")
-            else:
-                btn.setStyleSheet("QToolButton{background:#f4f6f8;border:1px solid #d6d9dd;border-radius:6px;}")
+            self._set_style_property(btn, "today", d.date() == datetime.now().date())
 
     # ============== Grid render =============
-    def _clear_grid(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
+    @staticmethod
+    def _set_style_property(widget: QtWidgets.QWidget, name: str, value):
+        """Đổi dynamic property dùng trong stylesheet, chỉ re-polish khi giá trị thay đổi"""
+        if widget.property(name) == value:
+            return
+        widget.setProperty(name, value)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
 
-    def _render_grid(self):
-        self._clear_grid()
+    def _build_grid_cells(self):
+        """Tạo nhãn giờ + 7×N ô lịch một lần duy nhất"""
+        # header cột trống (hàng 0) - đã có thanh header phía trên
+        for c in range(8):
+            self.grid.addWidget(QtWidgets.QLabel(""), 0, c)
 
         # cột 0 là nhãn giờ cố định
         for r, t in enumerate(FIXED_TIME_SLOTS):
             lab = QtWidgets.QLabel(t)
+            lab.setObjectName("hourLabel")
             lab.setAlignment(Qt.AlignCenter)
-            lab.setStyleSheet(self._hour_label_style)
             self.grid.addWidget(lab, r + 1, 0)
 
-        # header cột trống (ô [0,0])
-        self.grid.addWidget(QtWidgets.QLabel(""), 0, 0)
-
-        # vẽ block lịch: tra bảng schedule
-        mon = self.week_monday
-        # tạo map: (date_str, time_slot) -> [(group_id, name)]
-        items: Dict[Tuple[str, str], list[tuple[int, str]]] = {}
-
-        # lấy tất cả lịch cố định rồi phân phối về từng ngày trong tuần
-        schedules = self.db.execute_query(
-            "SELECT s.group_id, g.name, s.day_of_week, s.time_slot "
-            "FROM schedule s JOIN groups g ON s.group_id=g.id", fetch="all"
-        ) or []
-
-        day_map = {DAYS_OF_WEEK_VN[(mon + timedelta(days=i)).weekday()]: (mon + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)}
-        for row in schedules:
-            gid  = row["group_id"] if isinstance(row, dict) else row[0]
-            name = row["name"]      if isinstance(row, dict) else row[1]
-            dow  = row["day_of_week"] if isinstance(row, dict) else row[2]
-            slot = row["time_slot"] if isinstance(row, dict) else row[3]
-            if dow in day_map:
-                dstr = day_map[dow]
-                items.setdefault((dstr, slot), []).append((gid, name))
-
-        # thêm (tuỳ chọn) các buổi bù riêng đã lên lịch trong tuần để bạn nhìn thấy khung đã bận
-        makeups = self.db.execute_query(
-            "SELECT session_date, time_slot, student_id FROM makeup_sessions "
-            "WHERE session_date BETWEEN ? AND ? AND is_private=1",
-            ((mon).strftime("%Y-%m-%d"), (mon + timedelta(days=6)).strftime("%Y-%m-%d")),
-            fetch="all"
-        ) or []
-        for r in makeups:
-            dstr = r["session_date"] if isinstance(r, dict) else r[0]
-            slot = r["time_slot"] if isinstance(r, dict) else r[1]
-            items.setdefault((dstr, slot), []).append((-1, "Buổi bù riêng"))
-
-        # vẽ theo ngày x cột
         for c in range(7):
-            day = mon + timedelta(days=c)
-            day_str = day.strftime("%Y-%m-%d")
-            # header cột (ô [0, c+1])
-            header = QtWidgets.QLabel("")  # đã có thanh header phía trên
-            self.grid.addWidget(header, 0, c + 1)
-
-            for r, slot in enumerate(FIXED_TIME_SLOTS):
-                key = (day_str, slot)
-                cell_items = items.get(key, [])
-
-                if not cell_items:
-                    # ô trống -> khung mờ
-                    placeholder = QtWidgets.QFrame()
-                    placeholder.setStyleSheet("background:#f7f9fb;border:1px dashed #e3e6ea;border-radius:8px;")
-                    self.grid.addWidget(placeholder, r + 1, c + 1)
-                    continue
-
-                # nếu nhiều nhóm trùng slot -> hiển thị chồng trong một card
-                txt_lines = []
-                first_gid = None
-                first_name = ""
-                for gid, name in cell_items:
-                    txt_lines.append(name)
-                    if first_gid is None and gid != -1:
-                        first_gid = gid
-                        first_name = name
-                text = "\n".join(txt_lines)
-
-                btn = QtWidgets.QPushButton(text)
-                btn.setMinimumHeight(72)
-                btn.setStyleSheet("""
-                    QPushButton{
-                        background:#eaf2ff;border:1px solid #bcd3ff;border-radius:10px;
-                        padding:8px;font-weight:600;color:#284b7b;
-                    }
-                    QPushButton:hover{ background:#deebff; }
-                """)
-                is_cancelled = False
-                if first_gid:
-                    row = self.db.execute_query(
-                        "SELECT 1 FROM cancelled_sessions WHERE group_id=? AND cancelled_date=?",
-                        (first_gid, day_str), fetch="one"
-                    )
-                    is_cancelled = bool(row)
-
-                btn = QtWidgets.QPushButton(text)
-                btn.setMinimumHeight(72)
-
-                # style theo trạng thái
-                if is_cancelled:
-                    btn.setStyleSheet("""
-                        QPushButton{
-                            background:#f0f0f0;border:1px dashed #c8c8c8;border-radius:10px;
-                            padding:8px;color:#666;
-                        }
-                        QPushButton:hover{ background:#eaeaea; }
-                    """)
-                else:
-                    btn.setStyleSheet("""
-                        QPushButton{
-                            background:#eaf2ff;border:1px solid #bcd3ff;border-radius:10px;
-                            padding:8px;font-weight:600;color:#284b7b;
-                        }
-                        QPushButton:hover{ background:#deebff; }
-                    """)
-
-                # click trái: mở chi tiết nếu chưa hủy
-                if first_gid and not is_cancelled:
-                    btn.clicked.connect(lambda _=False, d=day_str, gid=first_gid, name=first_name:
-                                        self._open_session_detail(d, gid, name))
-
-                # ✅ gắn thông tin để xử lý menu chuột phải
-                btn.setProperty("session_info", {
-                    "group_id": first_gid, "group_name": first_name,
-                    "date": day_str, "is_cancelled": is_cancelled
-                })
+            for r in range(len(FIXED_TIME_SLOTS)):
+                btn = QtWidgets.QPushButton()
+                btn.setObjectName("scheduleCell")
                 btn.setContextMenuPolicy(Qt.CustomContextMenu)
+                btn.clicked.connect(self._on_cell_clicked)
                 btn.customContextMenuRequested.connect(self._show_session_menu)
-
+                self._cells[(r, c)] = btn
                 self.grid.addWidget(btn, r + 1, c + 1)
 
         # làm các cột bằng nhau
         for c in range(0, 8):
             self.grid.setColumnStretch(c, 1)
 
+    def _fetch_week_items(self, mon: datetime) -> Dict[Tuple[str, str], list]:
+        """
+        Lấy lịch cố định + trạng thái hủy + buổi bù riêng của cả tuần trong một truy vấn
+
+        Returns:
+            {(date_str, time_slot): [(group_id, name, is_cancelled), ...]}
+            buổi bù riêng có group_id = -1
+        """
+        days = [mon + timedelta(days=i) for i in range(7)]
+        week_values = ", ".join(["(?, ?)"] * 7)
+        params = []
+        for d in days:
+            params.extend([DAYS_OF_WEEK_VN[d.weekday()], d.strftime("%Y-%m-%d")])
+        params.extend([days[0].strftime("%Y-%m-%d"), days[-1].strftime("%Y-%m-%d")])
+
+        rows = self.db.execute_query(
+            f"WITH week(day_of_week, session_date) AS (VALUES {week_values}) "
+            "SELECT w.session_date, s.time_slot, s.group_id, g.name, "
+            "       c.group_id IS NOT NULL AS is_cancelled, 0 AS is_makeup, s.id AS sort_id "
+            "FROM schedule s "
+            "JOIN groups g ON s.group_id=g.id "
+            "JOIN week w ON w.day_of_week=s.day_of_week "
+            "LEFT JOIN cancelled_sessions c ON c.group_id=s.group_id AND c.cancelled_date=w.session_date "
+            "UNION ALL "
+            # các buổi bù riêng trong tuần để thấy khung giờ đã bận
+            "SELECT m.session_date, m.time_slot, -1, 'Buổi bù riêng', 0, 1, m.id "
+            "FROM makeup_sessions m "
+            "WHERE m.session_date BETWEEN ? AND ? AND m.is_private=1 "
+            "ORDER BY is_makeup, sort_id",
+            tuple(params), fetch="all"
+        ) or []
+
+        items: Dict[Tuple[str, str], list] = {}
+        for row in rows:
+            items.setdefault((row["session_date"], row["time_slot"]), []).append(
+                (row["group_id"], row["name"], bool(row["is_cancelled"]))
+            )
+        return items
+
+    def _render_grid(self):
+        mon = self.week_monday
+        items = self._fetch_week_items(mon)
+
+        self.grid_host.setUpdatesEnabled(False)
+        try:
+            for c in range(7):
+                day_str = (mon + timedelta(days=c)).strftime("%Y-%m-%d")
+                for r, slot in enumerate(FIXED_TIME_SLOTS):
+                    self._update_cell(self._cells[(r, c)], day_str, items.get((day_str, slot), []))
+        finally:
+            self.grid_host.setUpdatesEnabled(True)
+
+    def _update_cell(self, btn: QtWidgets.QPushButton, day_str: str, cell_items: list):
+        """Gán nội dung + trạng thái cho một ô lịch đã có sẵn"""
+        if not cell_items:
+            # ô trống -> khung mờ
+            btn.setText("")
+            btn.setMinimumHeight(0)
+            btn.setProperty("session_info", None)
+            self._set_style_property(btn, "state", "empty")
+            return
+
+        # nếu nhiều nhóm trùng slot -> hiển thị chồng trong một card
+        first_gid = None
+        first_name = ""
+        is_cancelled = False
+        for gid, name, cancelled in cell_items:
+            if first_gid is None and gid != -1:
+                first_gid = gid
+                first_name = name
+                is_cancelled = cancelled
+
+        btn.setText("\n".join(name for _, name, _ in cell_items))
+        btn.setMinimumHeight(72)
+        # ✅ gắn thông tin để xử lý click + menu chuột phải
+        btn.setProperty("session_info", {
+            "group_id": first_gid, "group_name": first_name,
+            "date": day_str, "is_cancelled": is_cancelled
+        })
+        self._set_style_property(btn, "state", "cancelled" if is_cancelled else "active")
+
+    def _on_cell_clicked(self):
+        # click trái: mở chi tiết nếu chưa hủy
+        info = self.sender().property("session_info") or {}
+        if info.get("group_id") and not info.get("is_cancelled"):
+            self._open_session_detail(info["date"], info["group_id"], info["group_name"])
+
     # ============== Navigation =============
     def _prev_week(self):
         self.week_monday -= timedelta(days=7)
@@ -380,6 +388,9 @@ class MainWindow(QtWidgets.QMainWindow):
         menu = QMenu(self)
         menu.addAction("Hủy tất cả buổi học trong ngày",
                        lambda: self._cancel_day_sessions_by_index(day_index))
+        menu.addSeparator()
+        menu.addAction("Hủy tất cả buổi học trong tuần", self._cancel_week_sessions)
+        menu.addAction("Phục hồi tất cả buổi học trong tuần", self._restore_week_sessions)
         menu.exec(widget.mapToGlobal(pos))
 
     def _cancel_day_sessions_by_index(self, day_index: int):
@@ -406,11 +417,49 @@ class MainWindow(QtWidgets.QMainWindow):
         ) != QMessageBox.Yes:
             return
 
-        for r in rows:
-            gid = r["id"] if isinstance(r, dict) else r[0]
-            self._perform_cancellation(gid, date_str)
+        group_ids = [r["id"] if isinstance(r, dict) else r[0] for r in rows]
+        self.db.cancel_sessions(date_str, date_str, group_ids)
+        self.update_all_schedules()
 
+    def _week_range(self) -> Tuple[str, str]:
+        sunday = self.week_monday + timedelta(days=6)
+        return self.week_monday.strftime("%Y-%m-%d"), sunday.strftime("%Y-%m-%d")
+
+    def _cancel_week_sessions(self):
+        start, end = self._week_range()
+        if QMessageBox.question(
+                self, "Xác nhận",
+                f"Bạn có chắc muốn HỦY TẤT CẢ buổi học của mọi nhóm từ {start} đến {end}?"
+        ) != QMessageBox.Yes:
+            return
+        try:
+            summary = self.db.cancel_sessions(start, end)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Lỗi", f"Không thể hủy buổi học:\n{e}")
+            return
         self.update_all_schedules()
+        QMessageBox.information(
+            self, "Đã hủy",
+            f"Đã hủy {summary['sessions']} buổi học, cập nhật {summary['attendance']} lượt điểm danh."
+        )
+
+    def _restore_week_sessions(self):
+        start, end = self._week_range()
+        if QMessageBox.question(
+                self, "Xác nhận",
+                f"Phục hồi tất cả buổi học đã hủy từ {start} đến {end}?"
+        ) != QMessageBox.Yes:
+            return
+        try:
+            summary = self.db.restore_sessions(start, end)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Lỗi", f"Không thể phục hồi buổi học:\n{e}")
+            return
+        self.update_all_schedules()
+        QMessageBox.information(
+            self, "Đã phục hồi",
+            f"Đã phục hồi {summary['sessions']} buổi học, xoá {summary['attendance']} lượt 'Nghỉ do GV bận'."
+        )
 
     def _show_session_menu(self, pos):
         w = self.sender()
@@ -443,41 +492,16 @@ class MainWindow(QtWidgets.QMainWindow):
                                 f"Phục hồi buổi học của Nhóm {gname} ngày {date_str}?") != QMessageBox.Yes:
             return
         # gỡ trạng thái hủy + xoá điểm danh 'Nghỉ do GV bận'
-        self.db.execute_query("DELETE FROM cancelled_sessions WHERE group_id=? AND cancelled_date=?",
-                              (gid, date_str))
-        self.db.execute_query(
-            "DELETE FROM attendance WHERE group_id=? AND session_date=? AND status='Nghỉ do GV bận'",
-            (gid, date_str)
-        )
+        self.db.restore_sessions(date_str, date_str, [gid])
         self.update_all_schedules()
 
     def _perform_cancellation(self, group_id: int, date_str: str):
-        # Ghi vào bảng hủy buổi + set 'Nghỉ do GV bận' cho tất cả HS của nhóm
-        self.db.execute_query(
-            "INSERT OR IGNORE INTO cancelled_sessions(group_id, cancelled_date) VALUES (?, ?)",
-            (group_id, date_str)
-        )
-        students = self.db.execute_query(
-            "SELECT id FROM students WHERE group_id=?", (group_id,), fetch="all"
-        ) or []
-        for row in students:
-            sid = row["id"] if isinstance(row, dict) else row[0]
-            self.db.execute_query(
-                "INSERT INTO attendance(student_id, group_id, session_date, status, make_up_status) "
-                "VALUES (?, ?, ?, 'Nghỉ do GV bận', '') "
-                "ON CONFLICT(student_id, group_id, session_date) DO UPDATE SET "
-                "status=excluded.status, make_up_status=excluded.make_up_status",
-                (sid, group_id, date_str)
-            )
+        # Ghi vào bảng hủy buổi + set 'Nghỉ do GV bận' cho tất cả HS của nhóm (một transaction)
+        self.db.cancel_sessions(date_str, date_str, [group_id])
 
     def _ensure_cancel_table(self):
-        self.db.execute_query("""
-            CREATE TABLE IF NOT EXISTS cancelled_sessions(
-                group_id INTEGER,
-                cancelled_date TEXT,
-                PRIMARY KEY(group_id, cancelled_date)
-            )
-        """)
+        # cancelled_sessions được tạo trong schema_migrations
+        self.db.ensure_schema()
 
 # Chạy độc lập để test nhanh
 if __name__ == "__main__":
@@ -13,14 +13,25 @@ except Exception:
 
 
 class AttendanceTableModel(QAbstractTableModel):
+    """
+    Model báo cáo chuyên cần phân trang: chỉ nạp PAGE_SIZE dòng mỗi lần (canFetchMore/fetchMore),
+    sắp xếp bằng ORDER BY trong SQL.
+    """
     HEADERS = ["Ngày", "Học sinh", "Nhóm", "Lý do", "Dạy bù"]
+    KEYS = ["session_date", "student_name", "group_name", "status", "detailed_status"]
+    PAGE_SIZE = 200
 
-    def __init__(self, rows=None):
+    def __init__(self, db_manager=None, rows=None):
         super().__init__()
+        self.db = db_manager
         self._rows = rows or []   # mỗi row: dict như item của db.get_attendance_report
+        self._total = len(self._rows)
+        self._query = None        # (start, end, hide_completed)
+        self._order_by = "session_date"
+        self._descending = True
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._rows)
+        return 0 if parent.isValid() else len(self._rows)
 
     def columnCount(self, parent=QModelIndex()):
         return len(self.HEADERS)
@@ -35,16 +46,55 @@ class AttendanceTableModel(QAbstractTableModel):
             return None
         r = self._rows[index.row()]
         if role in (Qt.DisplayRole, Qt.EditRole):
-            mapping = [
-                r.get("session_date", ""),
-                r.get("student_name", ""),
-                r.get("group_name", ""),
-                r.get("status", ""),
-                r.get("detailed_status", ""),
-            ]
-            return mapping[index.column()]
+            return r.get(self.KEYS[index.column()], "")
         return None
 
+    # ---------- Paging ----------
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._query is not None and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = self._fetch_page(len(self._rows))
+        if not page:
+            self._total = len(self._rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not 0 <= column < len(self.KEYS):
+            return
+        self._order_by = self.KEYS[column]
+        self._descending = order == Qt.DescendingOrder
+        if self._query is not None:
+            self._reload()
+
+    def set_query(self, start: str, end: str, hide_completed: bool):
+        self._query = (start, end, hide_completed)
+        self._reload()
+
+    def total_count(self) -> int:
+        return self._total
+
+    def _fetch_page(self, offset: int):
+        start, end, hide_completed = self._query
+        return self.db.get_attendance_report(
+            start, end, hide_completed,
+            order_by=self._order_by, descending=self._descending,
+            limit=self.PAGE_SIZE, offset=offset
+        ) or []
+
+    def _reload(self):
+        start, end, hide_completed = self._query
+        self.beginResetModel()
+        self._total = self.db.count_attendance_report(start, end, hide_completed)
+        self._rows = self._fetch_page(0) if self._total else []
+        self.endResetModel()
+
+    # ---------- Access ----------
     def id_at(self, row: int):
         if 0 <= row < len(self._rows):
             return self._rows[row].get("id")
@@ -57,7 +107,9 @@ class AttendanceTableModel(QAbstractTableModel):
 
     def set_rows(self, rows):
         self.beginResetModel()
+        self._query = None
         self._rows = rows or []
+        self._total = len(self._rows)
         self.endResetModel()
 
 
@@ -108,12 +160,18 @@ class AttendanceReportWindowQt(QWidget):
         filter_bar.addWidget(btn_view)
 
         filter_bar.addStretch(1)
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("color:#666;")
+        filter_bar.addWidget(self.summary_label)
         root.addLayout(filter_bar)
 
         # Bảng kết quả
         self.table = QTableView()
-        self.model = AttendanceTableModel([])
+        self.model = AttendanceTableModel(self.db)
         self.table.setModel(self.model)
+        # Mặc định: ngày mới nhất trước (sắp xếp do SQL thực hiện qua model.sort)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.DescendingOrder)
+        self.table.setSortingEnabled(True)
         self.table.setSelectionBehavior(QTableView.SelectRows)
         self.table.setSelectionMode(QTableView.ExtendedSelection)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -127,10 +185,10 @@ class AttendanceReportWindowQt(QWidget):
         end = self.end_date.date().toString("yyyy-MM-dd")
         hide_completed = self.cb_hide_completed.isChecked()
 
-        report_items = self.db.get_attendance_report(start, end, hide_completed) or []
-        # Kỳ vọng mỗi item: id, session_date, student_name, student_id, group_name, group_grade, status, detailed_status
-        self.model.set_rows(report_items)
-        if report_items:
+        # Mỗi item: id, session_date, student_name, student_id, group_name, group_grade, status, detailed_status
+        self.model.set_query(start, end, hide_completed)
+        self.summary_label.setText(f"{self.model.total_count()} buổi nghỉ")
+        if self.model.rowCount():
             self.table.selectRow(0)
 
     # -------------------- Context menu --------------------
@@ -1,27 +1,49 @@
 # ui_qt/windows/create_test_window_qt.py
 from __future__ import annotations
-import os, json, re, sys
+import os, sys
 from typing import List
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QGroupBox, QGridLayout, QLabel,
     QComboBox, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
-    QFileDialog, QLineEdit, QMessageBox, QSizePolicy
+    QFileDialog, QLineEdit, QMessageBox, QSizePolicy, QSpinBox, QCheckBox,
+    QProgressDialog
 )
 
-# ReportLab
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from ui_qt.windows.question_bank.services.exam_builder_service import (
+    ExamSpec, load_questions, render_exam_set
+)
+from ui_qt.windows.question_bank.services.assembly_service import (
+    AssemblyConstraints, DIFFICULTY_LABELS, TestAssemblyError, TestAssemblyService
+)
+
+
+class ExamBuildThread(QThread):
+    """Render bộ đề ngoài GUI thread (bên trong dùng process pool cho nhiều mã đề)"""
+    progress = Signal(int, int, str)
+    succeeded = Signal(list)
+    failed = Signal(str)
+
+    def __init__(self, questions, spec: ExamSpec, output_path: str, parent=None):
+        super().__init__(parent)
+        self.questions = questions
+        self.spec = spec
+        self.output_path = output_path
+
+    def run(self):
+        try:
+            paths = render_exam_set(self.questions, self.spec, self.output_path,
+                                    progress=self.progress.emit)
+            self.succeeded.emit(paths)
+        except Exception as e:
+            self.failed.emit(str(e))
 
 class CreateTestWindowQt(QWidget):
     """
     Port PySide6 của CreateTestWindow (Tkinter).
     - Lọc câu hỏi theo chủ đề/độ khó
+    - Tạo đề ngẫu nhiên theo nhánh cây / tỉ lệ độ khó / thời gian
     - Chọn câu hỏi và xuất PDF + trang đáp án
     """
     def __init__(self, db_manager, parent=None):
@@ -54,6 +76,53 @@ class CreateTestWindowQt(QWidget):
 
         left_box.addWidget(filter_group)
 
+        assembly_group = QGroupBox("Tạo đề ngẫu nhiên")
+        grid_asm = QGridLayout(assembly_group)
+        grid_asm.addWidget(QLabel("Nhánh:"), 0, 0)
+        self.tree_combo = QComboBox()
+        grid_asm.addWidget(self.tree_combo, 0, 1, 1, 5)
+
+        grid_asm.addWidget(QLabel("Số câu:"), 1, 0)
+        self.total_spin = QSpinBox()
+        self.total_spin.setRange(1, 200)
+        self.total_spin.setValue(30)
+        grid_asm.addWidget(self.total_spin, 1, 1)
+        self.mix_spins = {}
+        for col, (bucket, share) in enumerate((("easy", 40), ("medium", 40), ("hard", 20))):
+            spin = QSpinBox()
+            spin.setRange(0, 100)
+            spin.setSuffix("%")
+            spin.setPrefix(f"{DIFFICULTY_LABELS[bucket]} ")
+            spin.setValue(share)
+            self.mix_spins[bucket] = spin
+            grid_asm.addWidget(spin, 1, 2 + col)
+
+        grid_asm.addWidget(QLabel("Không dùng lại trong:"), 2, 0)
+        self.exclude_days_spin = QSpinBox()
+        self.exclude_days_spin.setRange(0, 365)
+        self.exclude_days_spin.setValue(28)
+        self.exclude_days_spin.setSuffix(" ngày")
+        grid_asm.addWidget(self.exclude_days_spin, 2, 1)
+        grid_asm.addWidget(QLabel("Tổng thời gian ≤"), 2, 2)
+        self.max_minutes_spin = QSpinBox()
+        self.max_minutes_spin.setRange(0, 600)
+        self.max_minutes_spin.setSpecialValueText("Không giới hạn")
+        self.max_minutes_spin.setSuffix(" phút")
+        grid_asm.addWidget(self.max_minutes_spin, 2, 3)
+
+        grid_asm.addWidget(QLabel("Seed:"), 3, 0)
+        self.seed_edit = QLineEdit()
+        self.seed_edit.setPlaceholderText("Để trống = ngẫu nhiên")
+        grid_asm.addWidget(self.seed_edit, 3, 1)
+        btn_assemble = QPushButton("Chọn ngẫu nhiên")
+        btn_assemble.clicked.connect(self.assemble_random)
+        grid_asm.addWidget(btn_assemble, 3, 2, 1, 2)
+        self.assembly_seed_label = QLabel()
+        self.assembly_seed_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        grid_asm.addWidget(self.assembly_seed_label, 4, 0, 1, 4)
+
+        left_box.addWidget(assembly_group)
+
         available_group = QGroupBox("Câu hỏi có sẵn")
         vbox_avail = QVBoxLayout(available_group)
         self.available_table = QTableWidget(0, 3)
@@ -90,6 +159,25 @@ class CreateTestWindowQt(QWidget):
         self.time_edit = QLineEdit("45 phút")
         self.time_edit.setFixedWidth(120)
         grid_info.addWidget(self.time_edit, 1, 1)
+        grid_info.addWidget(QLabel("Số mã đề:"), 2, 0)
+        self.variants_spin = QSpinBox()
+        self.variants_spin.setRange(1, 99)
+        self.variants_spin.setValue(1)
+        self.variants_spin.setFixedWidth(120)
+        grid_info.addWidget(self.variants_spin, 2, 1)
+        self.shuffle_questions_cb = QCheckBox("Đảo thứ tự câu hỏi")
+        self.shuffle_options_cb = QCheckBox("Đảo thứ tự phương án")
+        grid_info.addWidget(self.shuffle_questions_cb, 3, 0, 1, 2)
+        grid_info.addWidget(self.shuffle_options_cb, 4, 0, 1, 2)
+        grid_info.addWidget(QLabel("Seed đảo đề:"), 5, 0)
+        self.shuffle_seed_edit = QLineEdit()
+        self.shuffle_seed_edit.setPlaceholderText("Để trống = ngẫu nhiên")
+        self.shuffle_seed_edit.setFixedWidth(120)
+        grid_info.addWidget(self.shuffle_seed_edit, 5, 1)
+        # Seed của lần xuất gần nhất (chỉ hiển thị) - nhập lại vào ô trên để tạo đúng bộ đề đó
+        self.export_seed_label = QLabel()
+        self.export_seed_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        grid_info.addWidget(self.export_seed_label, 6, 0, 1, 2)
         right_box.addWidget(info_group)
 
         selected_group = QGroupBox("Câu hỏi đã chọn")
@@ -104,6 +192,7 @@ class CreateTestWindowQt(QWidget):
         right_box.addWidget(selected_group, 1)
 
         btn_export = QPushButton("TẠO VÀ XUẤT FILE PDF")
+        self.btn_export = btn_export
         btn_export.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         btn_export.clicked.connect(self.generate_pdf)
         right_box.addWidget(btn_export)
@@ -113,8 +202,14 @@ class CreateTestWindowQt(QWidget):
         root.addLayout(mid_box)
         root.addLayout(right_box, 1)
 
+        self._build_thread: ExamBuildThread | None = None
+        self._build_ids: List[int] = []
+        self._build_seed: int | None = None
+        self.assembly_service = TestAssemblyService(self.db)
+
         # Data
         self.load_subjects()
+        self.load_tree_nodes()
         self.apply_filter()
 
     # ---------- Data helpers ----------
@@ -127,6 +222,29 @@ class CreateTestWindowQt(QWidget):
         for r in rows:
             self.subject_combo.addItem(r['chu_de'])
 
+    def load_tree_nodes(self, max_depth: int = 2):
+        """Các nhánh cây (Môn / Lớp / Chủ đề) để giới hạn phạm vi tạo đề, bỏ qua gốc rỗng"""
+        rows = self.db.execute_query(
+            """
+            WITH RECURSIVE nodes(id, name, depth, path) AS (
+                SELECT r.id, r.name, 0, printf('%08d', r.id) FROM exercise_tree r
+                WHERE r.parent_id IS NULL
+                  AND (EXISTS (SELECT 1 FROM exercise_tree c WHERE c.parent_id = r.id)
+                       OR EXISTS (SELECT 1 FROM question_bank q WHERE q.tree_id = r.id))
+                UNION ALL
+                SELECT t.id, t.name, n.depth + 1, n.path || '/' || printf('%08d', t.id)
+                FROM exercise_tree t JOIN nodes n ON t.parent_id = n.id
+                WHERE n.depth < ?
+            )
+            SELECT id, name, depth FROM nodes ORDER BY path
+            """,
+            (max_depth,), fetch='all'
+        ) or []
+        self.tree_combo.clear()
+        self.tree_combo.addItem("(Toàn bộ ngân hàng)", None)
+        for r in rows:
+            self.tree_combo.addItem("    " * r['depth'] + r['name'], r['id'])
+
     def apply_filter(self):
         sql = "SELECT id, chu_de, do_kho FROM question_bank WHERE 1=1"
         params: List[object] = []
@@ -175,8 +293,57 @@ class CreateTestWindowQt(QWidget):
         for r in reversed(rows):
             self.selected_table.removeRow(r)
 
+    def assemble_random(self):
+        """Chọn câu hỏi ngẫu nhiên theo ràng buộc và thay thế danh sách đã chọn"""
+        seed_text = self.seed_edit.text().strip()
+        if seed_text and not seed_text.isdigit():
+            QMessageBox.warning(self, "Thông báo", "Seed phải là số nguyên dương.")
+            return
+
+        constraints = AssemblyConstraints(
+            total=self.total_spin.value(),
+            tree_id=self.tree_combo.currentData(),
+            difficulty_mix={bucket: spin.value() for bucket, spin in self.mix_spins.items()},
+            exclude_used_within_days=self.exclude_days_spin.value(),
+            max_total_minutes=self.max_minutes_spin.value() or None,
+            seed=int(seed_text) if seed_text else None,
+        )
+        try:
+            result = self.assembly_service.assemble(constraints)
+        except TestAssemblyError as e:
+            QMessageBox.warning(self, "Không thể tạo đề", str(e))
+            return
+
+        placeholders = ",".join("?" * len(result.question_ids))
+        rows = self.db.execute_query(
+            f"SELECT id, chu_de FROM question_bank WHERE id IN ({placeholders})",
+            tuple(result.question_ids), fetch='all'
+        ) or []
+        topics = {r['id']: r['chu_de'] for r in rows}
+
+        self.selected_table.setRowCount(0)
+        for qid in result.question_ids:
+            rr = self.selected_table.rowCount()
+            self.selected_table.insertRow(rr)
+            self.selected_table.setItem(rr, 0, QTableWidgetItem(str(qid)))
+            self.selected_table.setItem(rr, 1, QTableWidgetItem(topics.get(qid) or ""))
+
+        # Hiện seed (chỉ đọc) để có thể tạo lại đúng đề này; ô seed giữ trống -> lần sau vẫn ngẫu nhiên
+        counts = ", ".join(f"{DIFFICULTY_LABELS[b]}: {n}" for b, n in sorted(result.counts.items()))
+        self.assembly_seed_label.setText(f"Seed: {result.seed}")
+        self.assembly_seed_label.setToolTip(f"{counts} - {result.total_minutes} phút")
+        self.selected_table.setToolTip(f"Seed {result.seed} - {counts} - {result.total_minutes} phút")
+
     # ---------- Export PDF ----------
     def generate_pdf(self):
+        if self._build_thread is not None:
+            return
+
+        seed_text = self.shuffle_seed_edit.text().strip()
+        if seed_text and not seed_text.isdigit():
+            QMessageBox.warning(self, "Thông báo", "Seed đảo đề phải là số nguyên dương.")
+            return
+
         ids: List[str] = []
         for r in range(self.selected_table.rowCount()):
             ids.append(self.selected_table.item(r, 0).text())
@@ -190,116 +357,62 @@ class CreateTestWindowQt(QWidget):
         if not save_path:
             return
 
-        try:
-            # 1) Định vị font DejaVu
-            # file này nằm ở ui_qt/windows/..., project_dir là 1 cấp trên thư mục ui_qt
-            ui_qt_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            project_dir = os.path.dirname(ui_qt_dir)
-            font_dir = os.path.join(project_dir, "assets", "fonts")
-            font_reg = os.path.join(font_dir, "DejaVuSans.ttf")
-            font_bold = os.path.join(font_dir, "DejaVuSans-Bold.ttf")
-            if not (os.path.exists(font_reg) and os.path.exists(font_bold)):
-                QMessageBox.critical(self, "Lỗi", f"Không tìm thấy font tại:\n{font_dir}")
-                return
-
-            pdfmetrics.registerFont(TTFont("DejaVu", font_reg))
-            pdfmetrics.registerFont(TTFont("DejaVu-Bold", font_bold))
-
-            # 2) Khởi tạo tài liệu
-            doc = SimpleDocTemplate(
-                save_path, pagesize=A4,
-                rightMargin=40, leftMargin=40, topMargin=60, bottomMargin=40
-            )
-            styles = getSampleStyleSheet()
-            styles.add(ParagraphStyle(
-                name="ExamTitle", fontName="DejaVu-Bold", fontSize=18, alignment=1, spaceAfter=12
-            ))
-            styles.add(ParagraphStyle(
-                name="Normal_DejaVu", fontName="DejaVu", fontSize=12, leading=15
-            ))
-            styles.add(ParagraphStyle(
-                name="QuestionNum", fontName="DejaVu-Bold", fontSize=12, spaceBefore=8, leading=14
-            ))
-
-            flowables = []
-            # 3) Tiêu đề
-            flowables.append(Paragraph(self.title_edit.text(), styles["ExamTitle"]))
-            flowables.append(Paragraph(f"Thời gian làm bài: {self.time_edit.text()}", styles["Normal_DejaVu"]))
-            flowables.append(Spacer(1, 12))
-
-            answer_key = []
-
-            # 4) Duyệt câu hỏi
-            for idx, qid in enumerate(ids, start=1):
-                row = self.db.execute_query(
-                    "SELECT * FROM question_bank WHERE id=?", (qid,), fetch='one'
-                )
-                if not row:
-                    continue
-
-                # Nội dung câu hỏi (text hoặc ảnh)
-                content_text = row["content_text"] or ""
-                content_img = row["content_image"] or ""
-                if content_text.strip():
-                    body = re.sub(r"^Câu\s*\d+\s*:\s*", "", content_text).strip()
-                    flowables.append(Paragraph(f"<b>Câu {idx}:</b> {body}", styles["Normal_DejaVu"]))
-                    flowables.append(Spacer(1, 6))
-                elif content_img and os.path.exists(content_img):
-                    flowables.append(Image(content_img, width=400, height=0))
-
-                # Phương án
-                opts = json.loads(row["options"] or "[]")
-                table_data = []
-                labels = ["A", "B", "C", "D", "E"]
-                for j, opt in enumerate(opts):
-                    lbl = labels[j]
-                    txt = (opt.get("text") or "").strip()
-                    img = opt.get("image_path") or ""
-
-                    cell_label = Paragraph(f"<b>{lbl}.</b>", styles["Normal_DejaVu"])
-                    if txt:
-                        cell_content = Paragraph(txt, styles["Normal_DejaVu"])
-                    elif img and os.path.exists(img):
-                        cell_content = Image(img, width=200, height=0)
-                    else:
-                        cell_content = Paragraph("(Không có nội dung)", styles["Normal_DejaVu"])
-
-                    table_data.append([cell_label, cell_content])
-                    if opt.get("is_correct"):
-                        answer_key.append((idx, lbl))
-
-                tbl = Table(table_data, colWidths=[20, 420])
-                tbl.setStyle(TableStyle([
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                ]))
-                flowables.append(tbl)
-                flowables.append(Spacer(1, 12))
-
-            # 5) Trang ĐÁP ÁN
-            flowables.append(PageBreak())
-            flowables.append(Paragraph("ĐÁP ÁN", styles["ExamTitle"]))
-            ans_cells = [Paragraph(f"{num}-{lbl}", styles["Normal_DejaVu"]) for num, lbl in answer_key]
-            rows = [ans_cells[i:i+5] for i in range(0, len(ans_cells), 5)]
-            if not rows:
-                rows = [[Paragraph("(Chưa có đáp án)", styles["Normal_DejaVu"])]]
-            ans_tbl = Table(rows, colWidths=[80]*max(1, len(rows[0])))
-            ans_tbl.setStyle(TableStyle([
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ]))
-            flowables.append(ans_tbl)
-
-            # 6) Build
-            doc.build(flowables)
-
-            QMessageBox.information(self, "Thành công", f"Đã xuất file PDF:\n{save_path}")
-            # mở file (Windows)
-            try:
-                os.startfile(save_path)
-            except Exception:
-                pass
+        # Nạp câu hỏi bằng một truy vấn (kết nối DB thuộc GUI thread), render ở thread riêng
+        questions = load_questions(self.db, ids)
+        if not questions:
+            QMessageBox.warning(self, "Thông báo", "Không tìm thấy câu hỏi đã chọn trong ngân hàng.")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Lỗi", f"Không thể tạo file PDF:\n{e}")
+        spec = ExamSpec(
+            title=self.title_edit.text(),
+            duration=self.time_edit.text(),
+            variants=self.variants_spin.value(),
+            shuffle_questions=self.shuffle_questions_cb.isChecked(),
+            shuffle_options=self.shuffle_options_cb.isChecked(),
+            seed=int(seed_text) if seed_text else None,
+        ).with_seed()  # mỗi lần xuất một seed mới, ghi vào PDF để tái lập
+        self._build_seed = spec.seed
+
+        self._progress_dialog = QProgressDialog("Đang tạo đề thi...", None, 0, spec.variants, self)
+        self._progress_dialog.setWindowTitle("Xuất PDF")
+        self._progress_dialog.setWindowModality(Qt.WindowModal)
+        self._progress_dialog.setMinimumDuration(0)
+        self._progress_dialog.setValue(0)
+
+        self.btn_export.setEnabled(False)
+        self._build_ids = [q.id for q in questions]
+        self._build_thread = ExamBuildThread(questions, spec, save_path, self)
+        self._build_thread.progress.connect(self._on_build_progress)
+        self._build_thread.succeeded.connect(self._on_build_succeeded)
+        self._build_thread.failed.connect(self._on_build_failed)
+        self._build_thread.finished.connect(self._on_build_finished)
+        self._build_thread.start()
+
+    def _on_build_progress(self, done: int, total: int, path: str):
+        self._progress_dialog.setMaximum(total)
+        self._progress_dialog.setValue(done)
+        self._progress_dialog.setLabelText(f"Đã tạo {done}/{total} mã đề\n{os.path.basename(path)}")
+
+    def _on_build_succeeded(self, paths: List[str]):
+        self._progress_dialog.close()
+        # Ghi nhận ngày dùng để lần tạo đề sau có thể loại các câu vừa ra
+        self.assembly_service.mark_used(self._build_ids)
+        self.export_seed_label.setText(f"Seed lần xuất gần nhất: {self._build_seed}")
+        QMessageBox.information(
+            self, "Thành công",
+            "Đã xuất file PDF:\n" + "\n".join(paths) + f"\n\nSeed đảo đề: {self._build_seed}"
+        )
+        # mở file (Windows)
+        try:
+            os.startfile(paths[0])
+        except Exception:
+            pass
+
+    def _on_build_failed(self, message: str):
+        self._progress_dialog.close()
+        QMessageBox.critical(self, "Lỗi", f"Không thể tạo file PDF:\n{message}")
+
+    def _on_build_finished(self):
+        self.btn_export.setEnabled(True)
+        self._build_thread.deleteLater()
+        self._build_thread = None
@@ -4,15 +4,21 @@ Repository layer để quản lý dữ liệu apps trong Dashboard
 Bao gồm: CRUD operations, data models, database/JSON storage
 """
 
+import atexit
 import json
+import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Set, Callable
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 import logging
 
+from .app_search_index import AppSearchIndex
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
@@ -136,14 +142,250 @@ class AppModel:
         return cls(**data)
 
 
+# ========== IN-MEMORY CATALOG ==========
+
+class AppCatalog:
+    """
+    Catalog apps nạp một lần vào bộ nhớ, dùng chung cho mọi AppRepository
+    trỏ tới cùng một storage.
+
+    Giữ index theo id, category, permission, pinned và AppSearchIndex cho
+    tìm kiếm ở taskbar / start menu. Mọi thay đổi cập nhật RAM ngay, còn việc ghi
+    xuống storage được gom lại và chạy ở thread nền (write-behind).
+    """
+
+    WRITE_DELAY = 0.2  # Gom các thay đổi liên tiếp trong khoảng này (seconds)
+
+    def __init__(self, writer: Callable[[List[Dict[str, Any]], List[str], Optional[List[Dict[str, Any]]]], None],
+                 full_snapshot: bool = False):
+        """
+        Args:
+            writer: Hàm ghi xuống storage (changed_rows, deleted_ids, snapshot)
+            full_snapshot: True nếu storage cần ghi lại toàn bộ (JSON)
+        """
+        self._writer = writer
+        self._full_snapshot = full_snapshot
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self.loaded = False
+
+        # Dữ liệu & index
+        self._apps: Dict[str, AppModel] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._by_category: Dict[AppCategory, Set[str]] = {}
+        self._by_permission: Dict[AppPermission, Set[str]] = {}
+        self._pinned: Set[str] = set()
+        self._search_index = AppSearchIndex()
+
+        # Write-behind state
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._wakeup = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
+
+    # ---------- Load & index ----------
+
+    def load(self, apps: List[AppModel]):
+        """Nạp toàn bộ apps từ storage và dựng lại index"""
+        with self._lock:
+            self._apps.clear()
+            self._order.clear()
+            self._by_category.clear()
+            self._by_permission.clear()
+            self._pinned.clear()
+            self._search_index.clear()
+            self._next_order = 0
+
+            for app in apps:
+                self._index(app)
+
+            self.loaded = True
+
+    def _index(self, app: AppModel):
+        """Thêm app vào các index"""
+        if app.id not in self._order:
+            self._order[app.id] = self._next_order
+            self._next_order += 1
+
+        self._apps[app.id] = app
+        self._by_category.setdefault(app.category, set()).add(app.id)
+        self._by_permission.setdefault(app.permission, set()).add(app.id)
+        if app.pinned:
+            self._pinned.add(app.id)
+
+        # Thêm mới / cập nhật; chỉ đổi thống kê sử dụng thì không tách token lại
+        self._search_index.add(app, self._order[app.id])
+
+    def _unindex(self, app_id: str):
+        """Gỡ app khỏi các index (giữ nguyên thứ tự; search index được _index() cập nhật)"""
+        app = self._apps.pop(app_id, None)
+        if not app:
+            return
+
+        self._by_category.get(app.category, set()).discard(app_id)
+        self._by_permission.get(app.permission, set()).discard(app_id)
+        self._pinned.discard(app_id)
+
+    def _sorted(self, ids) -> List[AppModel]:
+        """Trả về apps theo thứ tự trong storage"""
+        return [self._apps[i] for i in sorted(ids, key=self._order.__getitem__)]
+
+    # ---------- Queries ----------
+
+    def all(self) -> List[AppModel]:
+        with self._lock:
+            return list(self._apps.values())
+
+    def get(self, app_id: str) -> Optional[AppModel]:
+        with self._lock:
+            return self._apps.get(app_id)
+
+    def by_category(self, category: AppCategory) -> List[AppModel]:
+        with self._lock:
+            return self._sorted(self._by_category.get(category, ()))
+
+    def by_permission(self, *permissions: AppPermission) -> List[AppModel]:
+        with self._lock:
+            ids = set()
+            for permission in permissions:
+                ids.update(self._by_permission.get(permission, ()))
+            return self._sorted(ids)
+
+    def pinned(self) -> List[AppModel]:
+        with self._lock:
+            return self._sorted(self._pinned)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._apps)
+
+    def search(self, keyword: str, limit: Optional[int] = None) -> List[AppModel]:
+        """
+        Tìm apps (không phân biệt dấu), xếp theo mức khớp rồi mức độ sử dụng
+
+        Args:
+            keyword: Một hoặc nhiều từ, mọi từ đều phải khớp
+            limit: Số kết quả tối đa (None = tất cả)
+        """
+        with self._lock:
+            return [self._apps[app_id] for app_id, _ in self._search_index.search(keyword, limit)]
+
+    def search_ranked(self, keyword: str, limit: Optional[int] = None) -> List[Tuple[AppModel, float]]:
+        """Như search() nhưng kèm điểm xếp hạng"""
+        with self._lock:
+            return [(self._apps[app_id], score) for app_id, score in self._search_index.search(keyword, limit)]
+
+    # ---------- Mutations ----------
+
+    def put(self, app: AppModel):
+        """Thêm mới hoặc thay thế app, đánh dấu cần ghi"""
+        with self._lock:
+            self._unindex(app.id)
+            self._index(app)
+            self._deleted.discard(app.id)
+            self._dirty.add(app.id)
+        self._schedule_write()
+
+    def update(self, app_id: str, update_data: Dict[str, Any]) -> Optional[AppModel]:
+        """Cập nhật fields của app trong cache, trả về app đã cập nhật"""
+        with self._lock:
+            app = self._apps.get(app_id)
+            if not app:
+                return None
+
+            self._unindex(app_id)
+            for key, value in update_data.items():
+                if hasattr(app, key):
+                    setattr(app, key, value)
+            app.updated_at = datetime.now()
+            self._index(app)
+            self._dirty.add(app_id)
+        self._schedule_write()
+        return app
+
+    def remove(self, app_id: str) -> bool:
+        """Xóa app khỏi cache, đánh dấu cần xóa trong storage"""
+        with self._lock:
+            if app_id not in self._apps:
+                return False
+            self._unindex(app_id)
+            self._search_index.remove(app_id)
+            self._order.pop(app_id, None)
+            self._dirty.discard(app_id)
+            self._deleted.add(app_id)
+        self._schedule_write()
+        return True
+
+    # ---------- Write-behind ----------
+
+    def _schedule_write(self):
+        """Đánh thức writer thread (tạo mới nếu chưa có)"""
+        with self._lock:
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="AppCatalogWriter", daemon=True
+                )
+                self._writer_thread.start()
+        self._wakeup.set()
+
+    def _writer_loop(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.WRITE_DELAY)
+            self._wakeup.clear()
+            self.flush()
+
+    def has_pending_writes(self) -> bool:
+        with self._lock:
+            return bool(self._dirty or self._deleted)
+
+    def flush(self) -> bool:
+        """
+        Ghi các thay đổi đang chờ xuống storage
+
+        Returns:
+            True nếu không còn thay đổi nào đang chờ
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty and not self._deleted:
+                    return True
+
+                dirty, deleted = self._dirty, self._deleted
+                self._dirty, self._deleted = set(), set()
+                changed = [self._apps[i].to_dict() for i in dirty if i in self._apps]
+                snapshot = None
+                if self._full_snapshot:
+                    snapshot = [a.to_dict() for a in self._sorted(self._apps.keys())]
+
+            try:
+                self._writer(changed, sorted(deleted), snapshot)
+                return True
+            except Exception as e:
+                logger.error(f"Lỗi ghi apps xuống storage: {e}")
+                # Giữ lại để lần sau ghi tiếp
+                with self._lock:
+                    self._dirty |= {i for i in dirty if i in self._apps}
+                    self._deleted |= {i for i in deleted if i not in self._apps}
+                return False
+
+
 # ========== REPOSITORY CLASS ==========
 
 class AppRepository:
     """
     Repository để quản lý CRUD operations cho apps
     Có thể dùng SQLite hoặc JSON storage
+
+    Dữ liệu được nạp một lần vào AppCatalog dùng chung theo storage,
+    mọi truy vấn chạy trên RAM; thay đổi được ghi xuống storage ở nền.
     """
 
+    # Catalog dùng chung: (storage_type, resolved path) -> AppCatalog
+    _catalogs: Dict[Tuple[str, str], AppCatalog] = {}
+    _catalogs_lock = threading.Lock()
+
     def update_all_apps_pinned(self):
         """Force update tất cả apps thành pinned=True"""
         apps = self.get_all_apps()
@@ -151,7 +393,6 @@ class AppRepository:
 
         for app in apps:
             if not app.pinned:
-                app.pinned = True
                 self.update_app(app.id, {'pinned': True})
                 updated_count += 1
                 logger.info(f"Updated {app.id} to pinned=True")
@@ -177,15 +418,34 @@ class AppRepository:
             else:
                 self.storage_path = Path("dashboard.db")
 
-        # Ensure storage exists
+        self._catalog = self._get_catalog()
+        if self._catalog.loaded:
+            return
+
+        # Lần đầu mở storage này: tạo file/tables và nạp vào RAM
         self._init_storage()
+        self._catalog.load(self._read_all_apps())
 
         # Load default apps if empty
-        if self.get_all_apps():
-            pinned_count = len([a for a in self.get_all_apps() if a.pinned])
+        if self._catalog.count():
+            pinned_count = len(self._catalog.pinned())
             if pinned_count < 10:  # Nếu ít hơn 10 apps được pinned
                 logger.info("Updating apps to pinned=True...")
                 self.update_all_apps_pinned()
+            # Storage tạo từ bản cũ thiếu settings mặc định (vd. reusable)
+            self.backfill_default_settings()
+
+    def _get_catalog(self) -> AppCatalog:
+        """Lấy (hoặc tạo) catalog dùng chung cho storage hiện tại"""
+        key = (self.storage_type, str(self.storage_path.resolve()))
+        with AppRepository._catalogs_lock:
+            catalog = AppRepository._catalogs.get(key)
+            if catalog is None:
+                catalog = AppCatalog(self._write_changes,
+                                     full_snapshot=self.storage_type == "json")
+                AppRepository._catalogs[key] = catalog
+                atexit.register(catalog.flush)
+            return catalog
 
     def _init_storage(self):
         """Initialize storage (create file/tables if not exist)"""
@@ -241,9 +501,43 @@ class AppRepository:
         conn.commit()
         conn.close()
 
+    def backfill_default_settings(self) -> int:
+        """
+        Bổ sung các key settings mặc định còn thiếu vào apps đã lưu
+
+        Chỉ thêm key chưa có, không ghi đè giá trị người dùng đã đổi
+        -> sau lần đầu không còn gì để ghi.
+
+        Returns:
+            Số apps được cập nhật
+        """
+        updated_count = 0
+        for default in self._default_apps():
+            app = self.get_app_by_id(default.id)
+            if app is None or not default.settings:
+                continue
+            missing = {key: value for key, value in default.settings.items()
+                       if key not in app.settings}
+            if missing:
+                self.update_app(app.id, {'settings': {**app.settings, **missing}})
+                updated_count += 1
+                logger.info(f"Added default settings {sorted(missing)} to {app.id}")
+        return updated_count
+
     def _load_default_apps(self):
         """Load danh sách apps mặc định"""
-        default_apps = [
+        default_apps = self._default_apps()
+
+        # Save all default apps
+        for app in default_apps:
+            self.add_app(app)
+
+        logger.info(f"Đã load {len(default_apps)} apps mặc định")
+
+    @staticmethod
+    def _default_apps() -> List[AppModel]:
+        """Danh sách apps mặc định (chưa ghi vào storage)"""
+        return [
             # === HỌC TẬP ===
             AppModel(
                 id="student_manager",
@@ -379,7 +673,8 @@ class AppRepository:
                 permission=AppPermission.TEACHER,
                 pinned=True,
                 favorite_rank=9,
-                default_size=(1200, 800)
+                default_size=(1200, 800),
+                settings={"reusable": True}  # Giữ instance ẩn để mở lại ngay
             ),
 
             AppModel(
@@ -409,7 +704,8 @@ class AppRepository:
                 icon_name="test",
                 permission=AppPermission.TEACHER,
                 pinned=True,
-                favorite_rank=11
+                favorite_rank=11,
+                settings={"reusable": True}
             ),
 
             AppModel(
@@ -504,21 +800,11 @@ class AppRepository:
             )
         ]
 
-        # Save all default apps
-        for app in default_apps:
-            self.add_app(app)
 
-        logger.info(f"Đã load {len(default_apps)} apps mặc định")
+    # ========== STORAGE I/O ==========
 
-    # ========== CRUD OPERATIONS ==========
-
-    def get_all_apps(self) -> List[AppModel]:
-        """
-        Lấy tất cả apps
-
-        Returns:
-            List các AppModel
-        """
+    def _read_all_apps(self) -> List[AppModel]:
+        """Đọc toàn bộ apps trực tiếp từ storage"""
         if self.storage_type == "json":
             return self._get_all_apps_json()
         else:
@@ -570,6 +856,84 @@ class AppRepository:
 
         return apps
 
+    def _write_changes(self, changed: List[Dict[str, Any]], deleted: List[str],
+                       snapshot: Optional[List[Dict[str, Any]]]):
+        """
+        Ghi các thay đổi xuống storage (chạy ở writer thread của catalog)
+
+        Args:
+            changed: Các app (dạng dict) đã thêm/sửa
+            deleted: ID các app đã xóa
+            snapshot: Toàn bộ apps (chỉ có với JSON storage)
+        """
+        if self.storage_type == "json":
+            self._write_all_apps_json(snapshot or [])
+        else:
+            self._write_changes_db(changed, deleted)
+
+    def _write_all_apps_json(self, data: List[Dict[str, Any]]):
+        """Ghi lại file JSON qua file tạm để không bao giờ để lại file hỏng"""
+        tmp_path = self.storage_path.with_name(self.storage_path.name + '.tmp')
+        tmp_path.write_text(
+            json.dumps(data, indent=2, ensure_ascii=False),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.storage_path)
+
+    @staticmethod
+    def _to_db_row(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert dict của AppModel sang dạng cột của bảng apps"""
+        data = dict(data)
+        # Convert complex types to JSON
+        data['tags'] = json.dumps(data.get('tags', []))
+        data['settings'] = json.dumps(data.get('settings', {}))
+        data['shortcuts'] = json.dumps(data.get('shortcuts', []))
+        data['dependencies'] = json.dumps(data.get('dependencies', []))
+        # Split tuple
+        if 'default_size' in data:
+            data['default_width'] = data['default_size'][0]
+            data['default_height'] = data['default_size'][1]
+            del data['default_size']
+        return data
+
+    def _write_changes_db(self, changed: List[Dict[str, Any]], deleted: List[str]):
+        """Upsert/xóa các app thay đổi trong một transaction"""
+        conn = sqlite3.connect(str(self.storage_path))
+        try:
+            with conn:
+                rows = [self._to_db_row(item) for item in changed]
+                if rows:
+                    columns = list(rows[0].keys())
+                    placeholders = ', '.join(['?' for _ in columns])
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO apps ({', '.join(columns)}) VALUES ({placeholders})",
+                        [[row[c] for c in columns] for row in rows]
+                    )
+                if deleted:
+                    conn.executemany("DELETE FROM apps WHERE id = ?", [(app_id,) for app_id in deleted])
+        finally:
+            conn.close()
+
+    def flush(self) -> bool:
+        """Ghi ngay các thay đổi đang chờ xuống storage"""
+        return self._catalog.flush()
+
+    def reload(self):
+        """Bỏ cache và nạp lại từ storage (khi file bị sửa từ bên ngoài)"""
+        self._catalog.flush()
+        self._catalog.load(self._read_all_apps())
+
+    # ========== CRUD OPERATIONS ==========
+
+    def get_all_apps(self) -> List[AppModel]:
+        """
+        Lấy tất cả apps
+
+        Returns:
+            List các AppModel
+        """
+        return self._catalog.all()
+
     def get_app_by_id(self, app_id: str) -> Optional[AppModel]:
         """
         Lấy app theo ID
@@ -580,11 +944,7 @@ class AppRepository:
         Returns:
             AppModel hoặc None
         """
-        apps = self.get_all_apps()
-        for app in apps:
-            if app.id == app_id:
-                return app
-        return None
+        return self._catalog.get(app_id)
 
     def add_app(self, app: AppModel) -> bool:
         """
@@ -602,56 +962,13 @@ class AppRepository:
                 logger.warning(f"App {app.id} đã tồn tại")
                 return False
 
-            if self.storage_type == "json":
-                return self._add_app_json(app)
-            else:
-                return self._add_app_db(app)
+            self._catalog.put(app)
+            return True
 
         except Exception as e:
             logger.error(f"Lỗi thêm app: {e}")
             return False
 
-    def _add_app_json(self, app: AppModel) -> bool:
-        """Add app to JSON"""
-        apps = self.get_all_apps()
-        apps.append(app)
-
-        data = [a.to_dict() for a in apps]
-        self.storage_path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding='utf-8'
-        )
-        return True
-
-    def _add_app_db(self, app: AppModel) -> bool:
-        """Add app to database"""
-        conn = sqlite3.connect(str(self.storage_path))
-        cursor = conn.cursor()
-
-        data = app.to_dict()
-        # Convert complex types to JSON
-        data['tags'] = json.dumps(data.get('tags', []))
-        data['settings'] = json.dumps(data.get('settings', {}))
-        data['shortcuts'] = json.dumps(data.get('shortcuts', []))
-        data['dependencies'] = json.dumps(data.get('dependencies', []))
-        # Split tuple
-        if 'default_size' in data:
-            data['default_width'] = data['default_size'][0]
-            data['default_height'] = data['default_size'][1]
-            del data['default_size']
-
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-
-        cursor.execute(
-            f"INSERT INTO apps ({columns}) VALUES ({placeholders})",
-            list(data.values())
-        )
-
-        conn.commit()
-        conn.close()
-        return True
-
     def update_app(self, app_id: str, update_data: Dict[str, Any]) -> bool:
         """
         Cập nhật thông tin app
@@ -664,74 +981,15 @@ class AppRepository:
             True nếu thành công
         """
         try:
-            app = self.get_app_by_id(app_id)
-            if not app:
+            if not self._catalog.update(app_id, update_data):
                 logger.warning(f"Không tìm thấy app {app_id}")
                 return False
-
-            # Update fields
-            for key, value in update_data.items():
-                if hasattr(app, key):
-                    setattr(app, key, value)
-
-            app.updated_at = datetime.now()
-
-            if self.storage_type == "json":
-                return self._update_app_json(app_id, app)
-            else:
-                return self._update_app_db(app_id, app)
+            return True
 
         except Exception as e:
             logger.error(f"Lỗi update app: {e}")
             return False
 
-    def _update_app_json(self, app_id: str, app: AppModel) -> bool:
-        """Update app in JSON"""
-        apps = self.get_all_apps()
-
-        for i, a in enumerate(apps):
-            if a.id == app_id:
-                apps[i] = app
-                break
-
-        data = [a.to_dict() for a in apps]
-        self.storage_path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding='utf-8'
-        )
-        return True
-
-    def _update_app_db(self, app_id: str, app: AppModel) -> bool:
-        """Update app in database"""
-        conn = sqlite3.connect(str(self.storage_path))
-        cursor = conn.cursor()
-
-        data = app.to_dict()
-        # Convert complex types
-        data['tags'] = json.dumps(data.get('tags', []))
-        data['settings'] = json.dumps(data.get('settings', {}))
-        data['shortcuts'] = json.dumps(data.get('shortcuts', []))
-        data['dependencies'] = json.dumps(data.get('dependencies', []))
-        # Split tuple
-        if 'default_size' in data:
-            data['default_width'] = data['default_size'][0]
-            data['default_height'] = data['default_size'][1]
-            del data['default_size']
-
-        # Remove id from update
-        del data['id']
-
-        set_clause = ', '.join([f"{k} = ?" for k in data.keys()])
-
-        cursor.execute(
-            f"UPDATE apps SET {set_clause} WHERE id = ?",
-            list(data.values()) + [app_id]
-        )
-
-        conn.commit()
-        conn.close()
-        return True
-
     def delete_app(self, app_id: str) -> bool:
         """
         Xóa app
@@ -743,42 +1001,15 @@ class AppRepository:
             True nếu thành công
         """
         try:
-            if not self.get_app_by_id(app_id):
+            if not self._catalog.remove(app_id):
                 logger.warning(f"Không tìm thấy app {app_id}")
                 return False
-
-            if self.storage_type == "json":
-                return self._delete_app_json(app_id)
-            else:
-                return self._delete_app_db(app_id)
+            return True
 
         except Exception as e:
             logger.error(f"Lỗi xóa app: {e}")
             return False
 
-    def _delete_app_json(self, app_id: str) -> bool:
-        """Delete app from JSON"""
-        apps = self.get_all_apps()
-        apps = [a for a in apps if a.id != app_id]
-
-        data = [a.to_dict() for a in apps]
-        self.storage_path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding='utf-8'
-        )
-        return True
-
-    def _delete_app_db(self, app_id: str) -> bool:
-        """Delete app from database"""
-        conn = sqlite3.connect(str(self.storage_path))
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM apps WHERE id = ?", (app_id,))
-
-        conn.commit()
-        conn.close()
-        return True
-
     # ========== QUERY METHODS ==========
 
     def get_apps_by_category(self, category: AppCategory) -> List[AppModel]:
@@ -791,8 +1022,7 @@ class AppRepository:
         Returns:
             List các AppModel
         """
-        apps = self.get_all_apps()
-        return [a for a in apps if a.category == category]
+        return self._catalog.by_category(category)
 
     def get_pinned_apps(self) -> List[AppModel]:
         """
@@ -801,23 +1031,15 @@ class AppRepository:
         Returns:
             List các AppModel được ghim, sắp xếp theo favorite_rank tăng dần
         """
-        # Debug: Kiểm tra storage
-        logger.info(f"Storage path: {self.storage_path}")
-        logger.info(f"Storage exists: {self.storage_path.exists()}")
-
-        # Lấy tất cả apps
-        all_apps = self.get_all_apps()
-        logger.info(f"Total apps in storage: {len(all_apps)}")
-
         # KIỂM TRA: Nếu ít hơn expected, reload
-        if len(all_apps) < 17:  # Biết có 17 apps mặc định
-            logger.warning(f"Only {len(all_apps)} apps found, reloading defaults...")
+        total = self._catalog.count()
+        if total < 17:  # Biết có 17 apps mặc định
+            logger.warning(f"Only {total} apps found, reloading defaults...")
             self._load_default_apps()
-            all_apps = self.get_all_apps()
-            logger.info(f"After reload: {len(all_apps)} apps")
+            logger.info(f"After reload: {self._catalog.count()} apps")
 
         # Lọc apps có pinned=True
-        pinned = [a for a in all_apps if a.pinned]
+        pinned = self._catalog.pinned()
         # Sắp xếp theo favorite_rank
         pinned.sort(key=lambda x: x.favorite_rank if x.favorite_rank > 0 else 999)
 
@@ -871,32 +1093,18 @@ class AppRepository:
         favorites.sort(key=lambda x: x.favorite_rank, reverse=True)
         return favorites[:limit]
 
-    def search_apps(self, keyword: str) -> List[AppModel]:
+    def search_apps(self, keyword: str, limit: Optional[int] = None) -> List[AppModel]:
         """
         Tìm kiếm apps theo từ khóa
 
         Args:
-            keyword: Từ khóa tìm kiếm
+            keyword: Từ khóa tìm kiếm (có dấu hoặc không dấu, cho phép gõ sai nhẹ)
+            limit: Số kết quả tối đa (None = tất cả)
 
         Returns:
-            List các AppModel khớp
+            List các AppModel khớp, khớp tốt hơn / dùng nhiều hơn xếp trước
         """
-        keyword = keyword.lower()
-        apps = self.get_all_apps()
-        results = []
-
-        for app in apps:
-            # Search in name, display_name, description, tags
-            searchable = [
-                             app.name.lower(),
-                             app.display_name.lower(),
-                             app.description.lower()
-                         ] + [tag.lower() for tag in app.tags]
-
-            if any(keyword in s for s in searchable):
-                results.append(app)
-
-        return results
+        return self._catalog.search(keyword, limit)
 
     def get_apps_by_permission(self, permission: AppPermission) -> List[AppModel]:
         """
@@ -908,8 +1116,7 @@ class AppRepository:
         Returns:
             List các AppModel
         """
-        apps = self.get_all_apps()
-        return [a for a in apps if a.permission == permission or a.permission == AppPermission.PUBLIC]
+        return self._catalog.by_permission(permission, AppPermission.PUBLIC)
 
     # ========== STATISTICS METHODS ==========
 
@@ -924,10 +1131,15 @@ class AppRepository:
         Returns:
             True nếu thành công
         """
+        app = self.get_app_by_id(app_id)
+        if not app:
+            logger.warning(f"Không tìm thấy app {app_id}")
+            return False
+
         return self.update_app(app_id, {
-            'usage_count': self.get_app_by_id(app_id).usage_count + 1,
+            'usage_count': app.usage_count + 1,
             'last_used': datetime.now(),
-            'total_time': self.get_app_by_id(app_id).total_time + session_time
+            'total_time': app.total_time + session_time
         })
 
     def get_usage_statistics(self) -> Dict[str, Any]:
@@ -942,7 +1154,7 @@ class AppRepository:
         stats = {
             'total_apps': len(apps),
             'active_apps': len([a for a in apps if a.status == AppStatus.ACTIVE]),
-            'pinned_apps': len([a for a in apps if a.pinned]),
+            'pinned_apps': len(self._catalog.pinned()),
             'total_usage': sum(a.usage_count for a in apps),
             'total_time': sum(a.total_time for a in apps),
             'by_category': {},
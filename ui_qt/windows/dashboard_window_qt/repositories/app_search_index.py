@@ -0,0 +1,349 @@
+# ui_qt/windows/dashboard_window_qt/repositories/app_search_index.py
+"""
+App Search Index - Chỉ mục tìm kiếm apps trong bộ nhớ (taskbar search, start menu)
+- Token bỏ dấu tiếng Việt ("quản lý" == "quan ly", "đ" -> "d")
+- Prefix trie: mỗi node giữ các app có token đi qua node đó -> gõ từng ký tự chỉ đi thêm một node
+- Trigram trên từ vựng: khớp chuỗi con (>= 3 ký tự); khi không từ nào bắt đầu bằng từ gõ
+  thì khớp gần đúng (sai chính tả, đảo ký tự)
+- Xếp hạng = chất lượng khớp (trường nào, khớp đủ / đầu từ / gần đúng) + mức độ sử dụng
+- Cập nhật từng app khi thêm / sửa / xoá; chỉ đổi thống kê sử dụng thì không tách token lại
+- Gõ thêm ký tự chỉ tính lại từ cuối: kết quả khớp của các từ đã gõ xong được cache
+"""
+
+import heapq
+import math
+import re
+import time
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Trọng số theo trường (khớp ở tên quan trọng hơn ở mô tả)
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "display_name": 1.0,
+    "id": 0.8,
+    "tags": 0.7,
+    "description": 0.4,
+}
+
+# Chất lượng khớp của một từ trong truy vấn
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+SUBSTRING_MATCH = 0.45
+FUZZY_MATCH = 0.5  # nhân với độ giống (Dice trên trigram)
+TYPO_MATCH = 0.35  # sai một ký tự / đảo hai ký tự liền nhau (từ ngắn ít trigram chung)
+NAME_PREFIX_BONUS = 0.5  # Tên app bắt đầu bằng cả truy vấn
+
+MIN_GRAM_QUERY = 3  # Từ ngắn hơn chỉ khớp đủ / đầu từ
+MIN_TYPO_QUERY = 4  # Từ ngắn hơn không xét sai chính tả một ký tự
+FUZZY_THRESHOLD = 0.45
+MATCH_CACHE_SIZE = 64  # Số từ gần đây giữ kết quả match_token
+
+# Điểm sử dụng (cộng thêm, nhỏ hơn chênh lệch giữa các mức khớp)
+USAGE_WEIGHT = 0.08  # x log(1 + usage_count)
+RECENT_WEIGHT = 0.15  # giảm một nửa sau mỗi RECENT_HALF_LIFE_DAYS
+RECENT_HALF_LIFE_DAYS = 7
+FAVORITE_WEIGHT = 0.02  # x favorite_rank (0-10)
+PINNED_BONUS = 0.05
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold_text(text: str) -> str:
+    """Chữ thường, bỏ dấu tiếng Việt"""
+    text = text.lower().replace('đ', 'd')
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """Tách từ sau khi bỏ dấu ("student_window" -> ["student", "window"])"""
+    return _WORD_RE.findall(fold_text(text))
+
+
+def trigrams(token: str, padded: bool = True) -> Set[str]:
+    """Trigram của một từ; padded thêm biên để từ ngắn / đầu từ cũng có trigram"""
+    if padded:
+        token = f"  {token} "
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """a và b khác nhau tối đa một thao tác: thêm / xoá / thay một ký tự, đảo hai ký tự liền nhau"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return a[i:i + 2] == b[i + 1:i + 2] + b[i:i + 1] and a[i + 2:] == b[i + 2:]
+    if len(a) > len(b):
+        a, b = b, a
+    return a[i:] == b[i + 1:]
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Dict[str, float] = {}  # app_id -> trọng số trường tốt nhất của token qua node
+
+
+class _Doc:
+    __slots__ = ("app_id", "order", "signature", "tokens", "names", "usage", "last_used")
+
+    def __init__(self, app_id: str, order: int):
+        self.app_id = app_id
+        self.order = order
+        self.signature: Tuple = ()
+        self.tokens: Dict[str, float] = {}  # token -> trọng số trường tốt nhất
+        self.names: Tuple[str, ...] = ()  # name / display_name đã bỏ dấu
+        self.usage = 0.0  # Phần điểm sử dụng không phụ thuộc thời gian
+        self.last_used = 0.0
+
+
+class AppSearchIndex:
+    """
+    Chỉ mục tìm kiếm apps (không thread-safe - AppCatalog giữ lock khi gọi)
+
+    search() trả về [(app_id, score)] đã xếp hạng; mọi từ trong truy vấn đều phải khớp
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._docs: Dict[str, _Doc] = {}
+        self._root = _TrieNode()
+        self._token_ids: Dict[str, Dict[str, float]] = {}  # từ vựng: token -> {app_id: trọng số trường}
+        self._gram_tokens: Dict[str, Set[str]] = {}  # trigram -> tokens
+        self._match_cache: Dict[str, Dict[str, float]] = {}  # từ -> kết quả match_token
+
+    # ========== UPDATES ==========
+
+    def add(self, app, order: int = 0):
+        """Thêm hoặc cập nhật một app (AppModel); chỉ đổi thống kê thì không index lại"""
+        signature = (app.id, app.name, app.display_name, tuple(app.tags), app.description)
+        doc = self._docs.get(app.id)
+        if doc is None or doc.signature != signature:
+            if doc is not None:
+                self._unindex(doc)
+            doc = _Doc(app.id, order)
+            doc.signature = signature
+            self._index(doc, app)
+            self._docs[app.id] = doc
+        doc.order = order
+        self.update_usage(app)
+
+    def update_usage(self, app):
+        """Cập nhật thống kê dùng cho xếp hạng (usage_count, last_used, favorite_rank, pinned)"""
+        doc = self._docs.get(app.id)
+        if doc is None:
+            return
+        doc.usage = (USAGE_WEIGHT * math.log1p(max(0, app.usage_count or 0))
+                     + FAVORITE_WEIGHT * (app.favorite_rank or 0)
+                     + (PINNED_BONUS if app.pinned else 0.0))
+        last_used = app.last_used
+        doc.last_used = last_used.timestamp() if isinstance(last_used, datetime) else float(last_used or 0)
+
+    def remove(self, app_id: str) -> bool:
+        doc = self._docs.pop(app_id, None)
+        if doc is None:
+            return False
+        self._unindex(doc)
+        return True
+
+    def clear(self):
+        self._docs.clear()
+        self._root = _TrieNode()
+        self._token_ids.clear()
+        self._gram_tokens.clear()
+        self._match_cache.clear()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, app_id: str):
+        return app_id in self._docs
+
+    def _index(self, doc: _Doc, app):
+        self._match_cache.clear()
+        fields = (
+            ("id", [app.id]),
+            ("name", [app.name]),
+            ("display_name", [app.display_name]),
+            ("tags", list(app.tags)),
+            ("description", [app.description]),
+        )
+        tokens: Dict[str, float] = {}
+        for field_name, texts in fields:
+            weight = FIELD_WEIGHTS[field_name]
+            for text in texts:
+                for token in tokenize(text or ""):
+                    if weight > tokens.get(token, 0.0):
+                        tokens[token] = weight
+        doc.tokens = tokens
+        doc.names = tuple(' '.join(tokenize(text)) for text in (app.name, app.display_name) if text)
+
+        for token, weight in tokens.items():
+            node = self._root
+            for char in token:
+                node = node.children.setdefault(char, _TrieNode())
+                if weight > node.ids.get(doc.app_id, 0.0):
+                    node.ids[doc.app_id] = weight
+
+            ids = self._token_ids.get(token)
+            if ids is None:
+                ids = self._token_ids[token] = {}
+                for gram in trigrams(token):
+                    self._gram_tokens.setdefault(gram, set()).add(token)
+            ids[doc.app_id] = weight
+
+    def _unindex(self, doc: _Doc):
+        self._match_cache.clear()
+        for token in doc.tokens:
+            # Trie: bỏ app khỏi các node trên đường đi, tỉa nhánh rỗng
+            path = [self._root]
+            for char in token:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                node.ids.pop(doc.app_id, None)
+                path.append(node)
+            for depth in range(len(path) - 1, 0, -1):
+                node = path[depth]
+                if node.ids or node.children:
+                    break
+                del path[depth - 1].children[token[depth - 1]]
+
+            ids = self._token_ids.get(token)
+            if ids is not None:
+                ids.pop(doc.app_id, None)
+                if not ids:
+                    del self._token_ids[token]
+                    for gram in trigrams(token):
+                        tokens = self._gram_tokens.get(gram)
+                        if tokens is not None:
+                            tokens.discard(token)
+                            if not tokens:
+                                del self._gram_tokens[gram]
+
+    # ========== SEARCH ==========
+
+    def _prefix_node(self, prefix: str) -> Optional[_TrieNode]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _offer(self, found: Dict[str, float], tokens: Iterable[Tuple[str, float]]):
+        """Ghi nhận các token khớp với chất lượng tương ứng (giữ mức tốt nhất mỗi app)"""
+        for token, quality in tokens:
+            for app_id, weight in self._token_ids.get(token, {}).items():
+                score = quality * weight
+                if score > found.get(app_id, 0.0):
+                    found[app_id] = score
+
+    def match_token(self, word: str) -> Dict[str, float]:
+        """app_id -> chất lượng khớp tốt nhất của một từ (đã bỏ dấu); kết quả dùng chung, không sửa"""
+        found = self._match_cache.get(word)
+        if found is None:
+            found = self._match_token(word)
+            if len(self._match_cache) >= MATCH_CACHE_SIZE:
+                del self._match_cache[next(iter(self._match_cache))]
+            self._match_cache[word] = found
+        return found
+
+    def _match_token(self, word: str) -> Dict[str, float]:
+        found: Dict[str, float] = {}
+
+        # Đầu từ (trie), rồi nâng lên khớp đủ
+        node = self._prefix_node(word)
+        if node is not None:
+            found = {app_id: PREFIX_MATCH * weight for app_id, weight in node.ids.items()}
+            self._offer(found, [(word, EXACT_MATCH)])
+
+        if len(word) < MIN_GRAM_QUERY:
+            return found
+
+        # Chuỗi con qua trigram của từ vựng; gần đúng chỉ khi không từ nào bắt đầu bằng từ gõ
+        query_grams = trigrams(word)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._gram_tokens.get(gram, ()))
+
+        inner = trigrams(word, padded=False)
+        fuzzy = node is None
+        typos = fuzzy and len(word) >= MIN_TYPO_QUERY
+        candidates = []
+        for token, count in shared.items():
+            if token.startswith(word):
+                continue  # đã có từ trie
+            if count >= len(inner) and word in token:
+                candidates.append((token, SUBSTRING_MATCH))
+                continue
+            if not fuzzy:
+                continue
+            similarity = 2 * count / (len(query_grams) + len(token) + 1)  # từ n ký tự có n + 1 trigram
+            if similarity >= FUZZY_THRESHOLD:
+                candidates.append((token, FUZZY_MATCH * similarity))
+            elif typos and within_one_edit(word, token):
+                candidates.append((token, TYPO_MATCH))
+        self._offer(found, candidates)
+        return found
+
+    def usage_score(self, app_id: str, now: Optional[float] = None) -> float:
+        """Điểm cộng theo mức độ sử dụng"""
+        doc = self._docs[app_id]
+        score = doc.usage
+        if doc.last_used:
+            age_days = max(0.0, ((now or self._clock()) - doc.last_used) / 86400)
+            score += RECENT_WEIGHT * 0.5 ** (age_days / RECENT_HALF_LIFE_DAYS)
+        return score
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Tìm apps khớp mọi từ trong query
+
+        Returns:
+            [(app_id, score)] điểm giảm dần, cùng điểm thì theo thứ tự trong catalog
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+
+        matches = []
+        for word in words:
+            found = self.match_token(word)
+            if not found:
+                return []
+            matches.append(found)
+        matches.sort(key=len)
+
+        phrase = ' '.join(words)
+        now = self._clock()
+        scored = []
+        for app_id, quality in matches[0].items():
+            total = quality
+            for other in matches[1:]:
+                value = other.get(app_id)
+                if value is None:
+                    break
+                total += value
+            else:
+                doc = self._docs[app_id]
+                score = total / len(words)
+                if any(name.startswith(phrase) for name in doc.names):
+                    score += NAME_PREFIX_BONUS
+                score += self.usage_score(app_id, now)
+                scored.append((-score, doc.order, app_id))
+
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored)
+        else:
+            scored.sort()
+        return [(app_id, -negative) for negative, _, app_id in scored]
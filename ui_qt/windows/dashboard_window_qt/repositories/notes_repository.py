@@ -0,0 +1,327 @@
+# ui_qt/windows/dashboard_window_qt/repositories/notes_repository.py
+"""
+Notes Repository - Lưu sticky notes (Quick Notes) trong SQLite
+- Mỗi note một dòng (bảng notes), WAL: ghi không chặn đọc, crash giữa chừng không hỏng file
+- Dirty tracking theo note: mark_dirty() chỉ ghi nhận id, flush() mới lấy dữ liệu
+  của các note đã đổi và ghi trong MỘT transaction
+- Tìm kiếm FTS5 trên tiêu đề + nội dung (tự lùi về LIKE nếu SQLite không có FTS5)
+- Lần đầu mở: chuyển dữ liệu từ notes.json cũ sang (file cũ đổi tên thành .migrated)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import logging
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Các field của NoteData.to_dict() có cột riêng, phần còn lại nằm trong cột data (JSON)
+_COLUMNS = ('id', 'title', 'content', 'html_content', 'created_at', 'modified_at')
+
+
+class NotesRepository:
+    """
+    Kho notes trên SQLite
+
+    Dùng:
+        repo = NotesRepository()
+        notes = repo.load_all()              # list dict (NoteData.to_dict())
+        repo.mark_dirty(note_id)             # mỗi lần note đổi - rẻ, không I/O
+        repo.flush(lambda nid: ...to_dict()) # ghi các note đã đổi trong một transaction
+    """
+
+    def __init__(self, db_path: Optional[str] = None, legacy_json_path: Optional[str] = None,
+                 use_fts: bool = True):
+        """
+        Args:
+            db_path: File database, mặc định ~/.tutor_app/notes.db
+            legacy_json_path: notes.json cũ cần chuyển sang, mặc định cùng thư mục với db
+            use_fts: Dùng FTS5 cho search() nếu SQLite hỗ trợ
+        """
+        self.db_path = Path(db_path) if db_path else Path.home() / ".tutor_app" / "notes.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.legacy_json_path = (Path(legacy_json_path) if legacy_json_path
+                                 else self.db_path.with_name("notes.json"))
+
+        self._lock = threading.RLock()
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self.fts_enabled = False
+        self.stats = {"flushes": 0, "rows_written": 0, "rows_deleted": 0}
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL: commit vẫn nguyên vẹn khi app crash
+        self._init_database(use_fts)
+
+    # ========== SCHEMA & MIGRATION ==========
+
+    def _init_database(self, use_fts: bool):
+        """Tạo bảng, FTS index và chuyển dữ liệu JSON cũ (một lần)"""
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL DEFAULT '',
+                    content TEXT NOT NULL DEFAULT '',
+                    html_content TEXT NOT NULL DEFAULT '',
+                    created_at TEXT,
+                    modified_at TEXT,
+                    data TEXT NOT NULL DEFAULT '{}'
+                )
+            """)
+
+        if use_fts:
+            self.fts_enabled = self._init_fts()
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._migrate_legacy_json()
+
+    def _init_fts(self) -> bool:
+        """FTS5 external-content index trên notes, giữ đồng bộ bằng trigger"""
+        try:
+            with self._conn:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'notes_fts'"
+                ).fetchone()
+                self._conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                        title, content, content='notes', content_rowid='rowid',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+                self._conn.executescript("""
+                    CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+                        INSERT INTO notes_fts(rowid, title, content)
+                        VALUES (new.rowid, new.title, new.content);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+                        INSERT INTO notes_fts(notes_fts, rowid, title, content)
+                        VALUES ('delete', old.rowid, old.title, old.content);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+                        INSERT INTO notes_fts(notes_fts, rowid, title, content)
+                        VALUES ('delete', old.rowid, old.title, old.content);
+                        INSERT INTO notes_fts(rowid, title, content)
+                        VALUES (new.rowid, new.title, new.content);
+                    END;
+                """)
+                if not exists:
+                    # Index các note đã có trước khi bật FTS
+                    self._conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.info(f"SQLite không hỗ trợ FTS5, tìm notes bằng LIKE: {e}")
+            return False
+
+    def _migrate_legacy_json(self):
+        """
+        Chép notes từ notes.json cũ vào bảng
+
+        user_version được ghi cùng transaction với các dòng; notes.json đọc lỗi thì
+        giữ nguyên version (và file) để lần mở sau thử lại, không mất notes cũ
+        """
+        legacy_exists = self.legacy_json_path.exists()
+        rows = []
+        if legacy_exists:
+            try:
+                with open(self.legacy_json_path, 'r', encoding='utf-8') as f:
+                    notes_list = json.load(f)
+                if not isinstance(notes_list, list):
+                    raise ValueError("notes.json không phải danh sách notes")
+            except (OSError, ValueError) as e:
+                logger.error(f"Không đọc được {self.legacy_json_path}, để lần mở sau thử lại: {e}")
+                return
+            rows = [self._to_db_row(note) for note in notes_list if isinstance(note, dict) and note.get('id')]
+
+        with self._conn:
+            if rows:
+                self._upsert(rows)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        if legacy_exists:
+            logger.info(f"Đã chuyển {len(rows)} notes từ {self.legacy_json_path.name} sang SQLite")
+            self._retire_legacy_json()
+
+    def _retire_legacy_json(self):
+        """Đổi tên notes.json cũ (giữ lại làm bản sao lưu, không migrate lần hai)"""
+        target = self.legacy_json_path.with_name(self.legacy_json_path.name + ".migrated")
+        try:
+            os.replace(self.legacy_json_path, target)
+        except OSError as e:
+            logger.warning(f"Không đổi tên được {self.legacy_json_path}: {e}")
+
+    # ========== ROW CONVERSION ==========
+
+    @staticmethod
+    def _to_db_row(note: Dict[str, Any]) -> tuple:
+        """dict NoteData -> tuple theo thứ tự _COLUMNS + data"""
+        extra = {key: value for key, value in note.items() if key not in _COLUMNS}
+        return (
+            note['id'],
+            note.get('title') or '',
+            note.get('content') or '',
+            note.get('html_content') or '',
+            note.get('created_at'),
+            note.get('modified_at'),
+            json.dumps(extra, ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _from_db_row(row: sqlite3.Row) -> Dict[str, Any]:
+        try:
+            note = json.loads(row['data'] or '{}')
+        except ValueError:
+            note = {}
+        for column in _COLUMNS:
+            if row[column] is not None:
+                note[column] = row[column]
+        return note
+
+    def _upsert(self, rows: List[tuple]):
+        # ON CONFLICT giữ nguyên rowid -> giữ thứ tự note và FTS không phải đánh lại id
+        self._conn.executemany("""
+            INSERT INTO notes (id, title, content, html_content, created_at, modified_at, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                content = excluded.content,
+                html_content = excluded.html_content,
+                created_at = excluded.created_at,
+                modified_at = excluded.modified_at,
+                data = excluded.data
+        """, rows)
+
+    # ========== READ ==========
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Toàn bộ notes (dạng NoteData.to_dict()) theo thứ tự tạo"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM notes ORDER BY rowid").fetchall()
+        return [self._from_db_row(row) for row in rows]
+
+    def get(self, note_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return self._from_db_row(row) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def search(self, text: str, limit: int = 50) -> List[str]:
+        """
+        Tìm notes theo tiêu đề / nội dung (chỉ thấy dữ liệu đã flush)
+
+        Returns:
+            ID các note khớp, liên quan nhất trước
+        """
+        words = [word for word in text.split() if word]
+        if not words:
+            return []
+        with self._lock:
+            if self.fts_enabled:
+                # Mỗi từ là một prefix query, bỏ dấu nháy để không thành cú pháp FTS
+                query = ' '.join('"{}"*'.format(word.replace('"', '')) for word in words)
+                rows = self._conn.execute("""
+                    SELECT notes.id FROM notes_fts
+                    JOIN notes ON notes.rowid = notes_fts.rowid
+                    WHERE notes_fts MATCH ?
+                    ORDER BY bm25(notes_fts, 2.0, 1.0)
+                    LIMIT ?
+                """, (query, limit)).fetchall()
+            else:
+                conditions = ' AND '.join(["(title || ' ' || content) LIKE ?"] * len(words))
+                rows = self._conn.execute(
+                    f"SELECT id FROM notes WHERE {conditions} ORDER BY modified_at DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + [limit]
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    # ========== WRITE ==========
+
+    def mark_dirty(self, note_id: str):
+        """Ghi nhận note đã đổi (chưa ghi gì xuống đĩa)"""
+        with self._lock:
+            self._deleted.discard(note_id)
+            self._dirty.add(note_id)
+
+    def mark_deleted(self, note_id: str):
+        with self._lock:
+            self._dirty.discard(note_id)
+            self._deleted.add(note_id)
+
+    def has_pending_writes(self) -> bool:
+        with self._lock:
+            return bool(self._dirty or self._deleted)
+
+    def pending_ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._dirty)
+
+    def flush(self, snapshot: Callable[[str], Optional[Dict[str, Any]]]) -> bool:
+        """
+        Ghi các note đã đổi / đã xóa trong một transaction
+
+        Args:
+            snapshot: note_id -> dict hiện tại của note (None = note không còn)
+
+        Returns:
+            True nếu không còn thay đổi nào đang chờ
+        """
+        with self._lock:
+            if not self._dirty and not self._deleted:
+                return True
+            dirty, deleted = self._dirty, self._deleted
+            self._dirty, self._deleted = set(), set()
+
+            try:
+                rows = []
+                for note_id in dirty:
+                    note = snapshot(note_id)
+                    if note is None:
+                        deleted.add(note_id)
+                    else:
+                        rows.append(self._to_db_row(note))
+                with self._conn:
+                    if rows:
+                        self._upsert(rows)
+                    if deleted:
+                        self._conn.executemany("DELETE FROM notes WHERE id = ?",
+                                               [(note_id,) for note_id in deleted])
+            except Exception as e:
+                logger.error(f"Lỗi ghi notes: {e}")
+                # Giữ lại để lần flush sau ghi tiếp (transaction đã rollback)
+                self._dirty |= dirty - deleted
+                self._deleted |= deleted
+                return False
+
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += len(rows)
+            self.stats["rows_deleted"] += len(deleted)
+            return True
+
+    def replace_all(self, notes: Iterable[Dict[str, Any]]):
+        """Ghi đè toàn bộ notes (import / khôi phục) trong một transaction"""
+        rows = [self._to_db_row(note) for note in notes]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM notes")
+                self._upsert(rows)
+            self._dirty.clear()
+            self._deleted.clear()
+
+    def close(self):
+        with self._lock:
+            if self._dirty or self._deleted:
+                logger.warning(f"Đóng NotesRepository khi còn {len(self._dirty) + len(self._deleted)} "
+                               f"note chưa flush")
+            self._conn.close()
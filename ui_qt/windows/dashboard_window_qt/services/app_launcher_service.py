@@ -8,10 +8,13 @@ import os
 import sys
 import subprocess
 import importlib
+import threading
+import time
 import traceback
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple, Callable
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
@@ -21,7 +24,7 @@ from PySide6.QtWidgets import (
     QMainWindow, QDialog, QWidget, QMdiSubWindow,
     QMessageBox, QProgressDialog, QApplication
 )
-
+from shiboken6 import isValid
 
 
 # Import repositories
@@ -53,6 +56,24 @@ class WindowMode(Enum):
     MDI = "mdi"  # Multiple Document Interface
 
 
+PREWARM_DELAY_MS = 3000  # Chờ sau khi dashboard hiện rồi mới pre-warm
+PREWARM_MOST_USED = 5  # Số app dùng nhiều nhất được pre-warm thêm
+REUSABLE_SETTING = "reusable"  # app.settings[REUSABLE_SETTING] = True -> giữ instance ẩn để mở lại
+
+
+# ========== LAUNCH TIMING ==========
+
+@dataclass
+class LaunchTiming:
+    """Thời gian một lần mở app (milliseconds)"""
+    app_id: str
+    import_ms: float = 0.0
+    construct_ms: float = 0.0
+    total_ms: float = 0.0
+    warm: bool = False  # True nếu module đã import sẵn hoặc lấy instance từ pool
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
 # ========== EXCEPTIONS ==========
 
 class AppLaunchError(Exception):
@@ -88,6 +109,7 @@ class AppLauncherService(QObject):
     app_closed = Signal(str)  # app_id
     app_error = Signal(str, str)  # app_id, error_message
     launch_progress = Signal(int)  # progress percentage
+    _modules_prewarmed = Signal(list)  # app_ids (từ prewarm thread về GUI thread)
 
     def __init__(self, db_manager=None, parent=None):
         """
@@ -115,6 +137,18 @@ class AppLauncherService(QObject):
 
         # Cache loaded modules
         self._module_cache: Dict[str, Any] = {}
+        self._module_lock = threading.Lock()
+
+        # Pre-warm & pool instance ẩn cho các app reusable
+        self._prewarm_thread: Optional[threading.Thread] = None
+        self._prewarm_queue: List[str] = []  # app_ids chờ dựng instance
+        self._instance_pool: Dict[str, QWidget] = {}  # app_id -> window ẩn
+        self._reusable_apps: Dict[str, AppModel] = {}
+
+        # Thống kê thời gian mở app
+        self._launch_timings: Dict[str, List[LaunchTiming]] = {}
+        self._current_timing: Optional[LaunchTiming] = None
+        self._modules_prewarmed.connect(self._on_modules_prewarmed)
 
         # Setup cleanup on app quit
         app = QApplication.instance()
@@ -147,6 +181,8 @@ class AppLauncherService(QObject):
         """
         try:
             logger.info(f"Đang khởi chạy app: {app.id}")
+            started = time.perf_counter()
+            self._current_timing = LaunchTiming(app.id)
 
             # 1. Validate app
             validation_result = self._validate_app(app)
@@ -185,7 +221,9 @@ class AppLauncherService(QObject):
                 return LaunchResult.FAILED, None
 
             # 6. Configure window
-            self._configure_window(window, app, window_mode)
+            if not getattr(window, '_launcher_configured', False):
+                self._configure_window(window, app, window_mode)
+                window._launcher_configured = True
 
             # 7. Track running app
             self.running_apps[app.id] = window
@@ -199,6 +237,7 @@ class AppLauncherService(QObject):
             self._show_window(window, window_mode)
 
             # 10. Update statistics
+            self._record_launch_timing(started)
             self._update_app_statistics(app)
 
             # Complete
@@ -331,14 +370,21 @@ class AppLauncherService(QObject):
         """
         try:
             self.launch_progress.emit(40)
+            timing = self._current_timing or LaunchTiming(app.id)
+
+            # Instance dựng sẵn trong pool -> mở ngay
+            window = self._take_pooled_instance(app.id)
+            if window is not None:
+                timing.warm = True
+                if parent_window is not None and window.parentWidget() is not parent_window:
+                    window.setParent(parent_window, window.windowFlags())
+                self._remember_reusable(app)
+                return window
 
             # Import module
-            if app.module_path not in self._module_cache:
-                logger.info(f"Importing module: {app.module_path}")
-                module = importlib.import_module(app.module_path)
-                self._module_cache[app.module_path] = module
-            else:
-                module = self._module_cache[app.module_path]
+            module, import_ms = self._import_module(app.module_path)
+            timing.import_ms = import_ms
+            timing.warm = import_ms == 0.0
 
             self.launch_progress.emit(60)
 
@@ -351,19 +397,15 @@ class AppLauncherService(QObject):
             self.launch_progress.emit(80)
 
             # Create window instance
-            if self.db:
-                # Pass db_manager if constructor needs it
-                try:
-                    window = WindowClass(self.db, parent=parent_window)
-                except:
-                    window = WindowClass(parent=parent_window)
-            else:
-                window = WindowClass(parent=parent_window)
+            constructed = time.perf_counter()
+            window = self._construct_window(WindowClass, parent_window)
+            timing.construct_ms = (time.perf_counter() - constructed) * 1000
 
             # Set window properties
             if hasattr(window, 'setWindowTitle'):
                 window.setWindowTitle(app.display_name)
 
+            self._remember_reusable(app)
             return window
 
         except ImportError as e:
@@ -373,6 +415,38 @@ class AppLauncherService(QObject):
             logger.error(f"Lỗi tạo window cho {app.id}: {e}")
             raise AppLaunchError(f"Không thể tạo window: {e}")
 
+    def _import_module(self, module_path: str) -> Tuple[Any, float]:
+        """
+        Import module (có cache), an toàn khi gọi từ prewarm thread
+
+        Returns:
+            Tuple (module, thời gian import ms; 0 nếu đã có trong cache)
+        """
+        with self._module_lock:
+            module = self._module_cache.get(module_path)
+        if module is not None:
+            return module, 0.0
+
+        logger.info(f"Importing module: {module_path}")
+        started = time.perf_counter()
+        module = importlib.import_module(module_path)
+        import_ms = (time.perf_counter() - started) * 1000
+
+        with self._module_lock:
+            self._module_cache[module_path] = module
+        logger.info(f"Imported {module_path} in {import_ms:.0f} ms")
+        return module, import_ms
+
+    def _construct_window(self, WindowClass, parent_window: QWidget = None) -> QWidget:
+        """Tạo instance window, truyền db_manager nếu constructor cần"""
+        if self.db:
+            # Pass db_manager if constructor needs it
+            try:
+                return WindowClass(self.db, parent=parent_window)
+            except:
+                return WindowClass(parent=parent_window)
+        return WindowClass(parent=parent_window)
+
     def _launch_external_app(self, app: AppModel) -> Optional[QWidget]:
         """
         Launch external executable app
@@ -554,6 +628,11 @@ class AppLauncherService(QObject):
         """
         # For QMainWindow and QDialog
         if isinstance(window, (QMainWindow, QDialog)):
+            # Window lấy lại từ pool đã được hook từ lần mở trước
+            if getattr(window, '_launcher_close_hooked', False):
+                return
+            window._launcher_close_hooked = True
+
             # Override closeEvent
             original_close = window.closeEvent
 
@@ -573,7 +652,8 @@ class AppLauncherService(QObject):
 
         # Remove from tracking
         if app_id in self.running_apps:
-            del self.running_apps[app_id]
+            window = self.running_apps.pop(app_id)
+            self._return_to_pool(app_id, window)
 
         if app_id in self.app_processes:
             self.app_processes[app_id].terminate()
@@ -624,6 +704,174 @@ class AppLauncherService(QObject):
         except Exception as e:
             logger.error(f"Lỗi update statistics: {e}")
 
+    def _record_launch_timing(self, started: float):
+        """Lưu thời gian của lần mở app hiện tại"""
+        timing = self._current_timing
+        self._current_timing = None
+        if not timing:
+            return
+
+        timing.total_ms = (time.perf_counter() - started) * 1000
+        self._launch_timings.setdefault(timing.app_id, []).append(timing)
+        logger.info(
+            f"Launch {timing.app_id}: {timing.total_ms:.0f} ms "
+            f"({'warm' if timing.warm else 'cold'}, import {timing.import_ms:.0f} ms, "
+            f"construct {timing.construct_ms:.0f} ms)"
+        )
+
+    def get_usage_statistics(self) -> Dict[str, Any]:
+        """
+        Thống kê sử dụng apps kèm độ trễ mở app cold/warm
+
+        Returns:
+            Dictionary thống kê của repository, thêm key 'launch_latency'
+        """
+        from ..repositories.app_repository import AppRepository
+        stats = AppRepository().get_usage_statistics()
+
+        def summarize(timings: List[LaunchTiming]) -> Dict[str, Any]:
+            if not timings:
+                return {'count': 0, 'avg_ms': 0.0, 'max_ms': 0.0}
+            totals = [t.total_ms for t in timings]
+            return {
+                'count': len(timings),
+                'avg_ms': sum(totals) / len(totals),
+                'max_ms': max(totals),
+                'avg_import_ms': sum(t.import_ms for t in timings) / len(timings),
+                'avg_construct_ms': sum(t.construct_ms for t in timings) / len(timings)
+            }
+
+        all_timings = [t for timings in self._launch_timings.values() for t in timings]
+        stats['launch_latency'] = {
+            'cold': summarize([t for t in all_timings if not t.warm]),
+            'warm': summarize([t for t in all_timings if t.warm]),
+            'by_app': {
+                app_id: {
+                    'cold': summarize([t for t in timings if not t.warm]),
+                    'warm': summarize([t for t in timings if t.warm])
+                }
+                for app_id, timings in self._launch_timings.items()
+            },
+            'pooled_instances': list(self._instance_pool.keys())
+        }
+        return stats
+
+    # ========== PRE-WARM & INSTANCE POOL ==========
+
+    def schedule_prewarm(self, delay_ms: int = PREWARM_DELAY_MS):
+        """Hẹn pre-warm khi app đã rảnh sau khởi động"""
+        QTimer.singleShot(delay_ms, self.prewarm)
+
+    def prewarm(self, apps: Optional[List[AppModel]] = None):
+        """
+        Import trước module của các app ghim và dùng nhiều nhất ở thread nền,
+        sau đó dựng sẵn instance ẩn cho các app reusable trên GUI thread
+
+        Args:
+            apps: Danh sách app cần pre-warm (mặc định: pinned + most used)
+        """
+        if self._prewarm_thread and self._prewarm_thread.is_alive():
+            return
+
+        if apps is None:
+            from ..repositories.app_repository import AppRepository
+            repo = AppRepository()
+            apps = repo.get_pinned_apps() + repo.get_most_used_apps(PREWARM_MOST_USED)
+
+        candidates: Dict[str, AppModel] = {}
+        for app in apps:
+            if app.module_path and not app.exe_path and self._validate_app(app) == LaunchResult.SUCCESS:
+                candidates.setdefault(app.id, app)
+        if not candidates:
+            return
+
+        for app in candidates.values():
+            if app.settings.get(REUSABLE_SETTING):
+                self._reusable_apps[app.id] = app
+
+        self._prewarm_thread = threading.Thread(
+            target=self._prewarm_modules,
+            args=(list(candidates.values()),),
+            name="AppPrewarm",
+            daemon=True
+        )
+        self._prewarm_thread.start()
+
+    def _prewarm_modules(self, apps: List[AppModel]):
+        """Chạy ở thread nền: chỉ import module, không tạo widget"""
+        warmed = []
+        for app in apps:
+            try:
+                self._import_module(app.module_path)
+                warmed.append(app.id)
+            except Exception as e:
+                logger.warning(f"Pre-warm {app.module_path} thất bại: {e}")
+
+        logger.info(f"Pre-warmed {len(warmed)}/{len(apps)} app modules")
+        self._modules_prewarmed.emit(warmed)
+
+    def _on_modules_prewarmed(self, app_ids: List[str]):
+        """Về GUI thread: xếp hàng dựng instance cho app reusable"""
+        self._prewarm_queue.extend(
+            app_id for app_id in app_ids
+            if app_id in self._reusable_apps and app_id not in self._prewarm_queue
+        )
+        QTimer.singleShot(0, self._prebuild_next_instance)
+
+    def _prebuild_next_instance(self):
+        """Dựng một instance mỗi lượt event loop để GUI không bị khựng"""
+        while self._prewarm_queue:
+            app_id = self._prewarm_queue.pop(0)
+            if app_id in self._instance_pool or app_id in self.running_apps:
+                continue
+
+            app = self._reusable_apps[app_id]
+            try:
+                module, _ = self._import_module(app.module_path)
+                started = time.perf_counter()
+                window = self._construct_window(getattr(module, app.class_name))
+                window.setWindowTitle(app.display_name)
+                window.hide()
+                self._instance_pool[app_id] = window
+                logger.info(f"Pooled {app_id} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            except Exception as e:
+                logger.warning(f"Không thể dựng sẵn {app_id}: {e}")
+            break
+
+        if self._prewarm_queue:
+            QTimer.singleShot(0, self._prebuild_next_instance)
+
+    def _remember_reusable(self, app: AppModel):
+        if app.settings.get(REUSABLE_SETTING):
+            self._reusable_apps[app.id] = app
+
+    def _take_pooled_instance(self, app_id: str) -> Optional[QWidget]:
+        """Lấy instance ẩn từ pool (bỏ qua nếu đã bị Qt xóa)"""
+        window = self._instance_pool.pop(app_id, None)
+        if window is not None and isValid(window):
+            return window
+        return None
+
+    def _return_to_pool(self, app_id: str, window: Optional[QWidget]):
+        """Giữ lại window của app reusable đã đóng để lần sau mở ngay"""
+        if app_id not in self._reusable_apps or window is None:
+            return
+        if not isValid(window) or window.testAttribute(Qt.WA_DeleteOnClose):
+            return
+        if not window.isWindow() or app_id in self._instance_pool:
+            return
+
+        window.hide()
+        self._instance_pool[app_id] = window
+
+    def clear_instance_pool(self):
+        """Hủy toàn bộ instance ẩn trong pool"""
+        for window in self._instance_pool.values():
+            if isValid(window):
+                window.deleteLater()
+        self._instance_pool.clear()
+        self._prewarm_queue.clear()
+
     # ========== PUBLIC METHODS ==========
 
     def launch_app_by_id(
@@ -741,6 +989,7 @@ class AppLauncherService(QObject):
         """Cleanup all resources on quit"""
         logger.info("Cleaning up app launcher service...")
         self.close_all_apps()
+        self.clear_instance_pool()
         self._module_cache.clear()
 
     # ========== ADMIN METHODS ==========
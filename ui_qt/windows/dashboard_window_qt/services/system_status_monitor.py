@@ -0,0 +1,315 @@
+# ui_qt/windows/dashboard_window_qt/services/system_status_monitor.py
+"""
+System Status Monitor - Đọc mạng / pin / CPU / RAM ngoài GUI thread cho System Tray
+- Mỗi tick (TickScheduler) đọc psutil trên QThreadPool, kết quả về GUI thread qua signal
+- Mạng: xem trạng thái interface (psutil.net_if_stats) trước; chỉ khi có interface up mới
+  thử kết nối ra ngoài (probe) - probe chạy trên daemon thread riêng (probe treo không chiếm
+  thread của pool, không giữ app khi thoát), đang chạy thì không chồng thêm
+- Offline: khoảng cách giữa các lần probe tăng gấp đôi tới NETWORK_PROBE_MAX_BACKOFF
+- Signal chỉ phát khi giá trị đổi
+"""
+
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+import psutil
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from .tick_scheduler import TickScheduler, STATUS_TOLERANCE_MS
+from ..utils.constants import (
+    SYSTEM_STATUS_INTERVAL, NETWORK_PROBE_TIMEOUT, NETWORK_PROBE_MAX_BACKOFF
+)
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Trạng thái mạng (trùng value với NetworkStatus của system tray)
+NETWORK_CONNECTED = "connected"
+NETWORK_LIMITED = "limited"          # Có interface nhưng không ra được ngoài
+NETWORK_DISCONNECTED = "disconnected"
+
+DEFAULT_PROBE_ADDRESS = ("8.8.8.8", 53)
+
+_UNSET = object()
+
+
+@dataclass(frozen=True)
+class BatteryInfo:
+    """Thông tin pin (None nếu máy không có pin)"""
+    percent: int
+    plugged: bool
+
+
+@dataclass(frozen=True)
+class SystemStatus:
+    """Snapshot trạng thái gần nhất"""
+    network: Optional[str] = None
+    battery: Optional[BatteryInfo] = None
+    cpu_percent: float = 0.0
+    memory_percent: float = 0.0
+
+
+# ========== PROBES (chạy trên worker) ==========
+
+def _is_loopback(name: str, stats) -> bool:
+    return name == "lo" or name.lower().startswith("loopback") or "loopback" in getattr(stats, "flags", "")
+
+
+def interfaces_up() -> Optional[bool]:
+    """Có interface mạng (không tính loopback) đang up; None nếu không đọc được"""
+    try:
+        stats = psutil.net_if_stats()
+    except Exception:
+        return None
+    return any(st.isup and not _is_loopback(name, st) for name, st in stats.items())
+
+
+def tcp_probe(address: Tuple[str, int] = DEFAULT_PROBE_ADDRESS,
+              timeout: float = NETWORK_PROBE_TIMEOUT) -> bool:
+    """Thử mở kết nối TCP ra ngoài (blocking tối đa timeout giây - chỉ gọi trên worker)"""
+    try:
+        with socket.create_connection(address, timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def read_battery() -> Optional[BatteryInfo]:
+    try:
+        battery = psutil.sensors_battery()
+    except Exception:
+        return None
+    if battery is None:
+        return None
+    return BatteryInfo(int(battery.percent), bool(battery.power_plugged))
+
+
+def read_sensors() -> Dict[str, Any]:
+    """Đọc một lượt các chỉ số rẻ (không I/O mạng)"""
+    result: Dict[str, Any] = {
+        'interfaces_up': interfaces_up(),
+        'battery': read_battery(),
+        'cpu': None,
+        'memory': None,
+    }
+    try:
+        result['cpu'] = psutil.cpu_percent(interval=None)  # so với lần gọi trước, không chờ
+        result['memory'] = psutil.virtual_memory().percent
+    except Exception as e:
+        logger.debug(f"Không đọc được CPU/RAM: {e}")
+    return result
+
+
+# ========== WORKER TASKS ==========
+
+class _MonitorSignals(QObject):
+    """Signal từ worker thread về GUI thread (queued connection)"""
+    sampled = Signal(object)  # dict từ read_sensors()
+    probed = Signal(bool)     # ra được ngoài hay không
+
+
+class _SampleTask(QRunnable):
+    def __init__(self, signals: _MonitorSignals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = read_sensors()
+        except Exception as e:
+            logger.error(f"Lỗi đọc trạng thái hệ thống: {e}")
+            result = {}
+        self.signals.sampled.emit(result)
+
+
+def _run_probe(probe: Callable[[], bool], signals: _MonitorSignals):
+    try:
+        reachable = bool(probe())
+    except Exception as e:
+        logger.debug(f"Network probe lỗi: {e}")
+        reachable = False
+    signals.probed.emit(reachable)
+
+
+# ========== MONITOR ==========
+
+class SystemStatusMonitor(QObject):
+    """
+    Theo dõi mạng / pin / tải hệ thống, GUI thread không bao giờ chờ I/O
+
+    Dùng:
+        monitor = SystemStatusMonitor(widget=tray)
+        monitor.network_changed.connect(...)
+        monitor.start()
+    """
+
+    # Signals (chỉ phát khi đổi)
+    network_changed = Signal(str)        # NETWORK_CONNECTED / LIMITED / DISCONNECTED
+    battery_changed = Signal(object)     # BatteryInfo hoặc None
+    load_changed = Signal(float, float)  # cpu %, memory %
+    status_changed = Signal(object)      # SystemStatus
+
+    def __init__(
+            self,
+            interval_ms: int = SYSTEM_STATUS_INTERVAL,
+            probe: Optional[Callable[[], bool]] = tcp_probe,
+            widget=None,
+            clock: Callable[[], float] = None,
+            pool: QThreadPool = None,
+            parent=None
+    ):
+        """
+        Args:
+            interval_ms: Chu kỳ đọc psutil
+            probe: Hàm thử kết nối ra ngoài (chạy trên worker); None = chỉ xem interface
+            widget: Widget hiển thị - ẩn thì ngừng đọc (xem TickScheduler)
+            clock: Thời gian hiện tại (ms) cho backoff, mặc định monotonic
+            pool: QThreadPool đọc psutil, mặc định global
+        """
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.probe = probe
+        self.widget = widget
+        self._clock = clock or (lambda: time.monotonic() * 1000.0)
+        self._pool = pool or QThreadPool.globalInstance()
+
+        self._signals = _MonitorSignals()
+        self._signals.sampled.connect(self._on_sampled)
+        self._signals.probed.connect(self._on_probed)
+
+        self._tick = None
+        self._sampling = False
+        self._probing = False
+        self._interfaces_up: Optional[bool] = None
+
+        # Backoff cho probe khi offline
+        self._probe_delay = interval_ms
+        self._next_probe_at = 0.0
+
+        # Giá trị đã phát (so sánh change-only)
+        self._network: Any = _UNSET
+        self._battery: Any = _UNSET
+        self._load: Any = _UNSET
+        self.status = SystemStatus()
+
+        self.stats = {"samples": 0, "probes": 0, "probe_failures": 0, "skipped_probes": 0}
+
+    # ========== CONTROL ==========
+
+    def start(self):
+        """Bắt đầu theo dõi (đọc ngay một lượt)"""
+        if self._tick is None:
+            self._tick = TickScheduler.instance().subscribe(
+                self.refresh, self.interval_ms, STATUS_TOLERANCE_MS,
+                widget=self.widget, name="SystemStatusMonitor")
+        self.refresh()
+
+    def stop(self):
+        if self._tick is not None:
+            self._tick.cancel()
+            self._tick = None
+
+    def refresh(self):
+        """Yêu cầu đọc một lượt (bỏ qua nếu lượt trước chưa xong)"""
+        if self._sampling:
+            return
+        self._sampling = True
+        self._pool.start(_SampleTask(self._signals))
+
+    @property
+    def probe_delay_ms(self) -> int:
+        """Khoảng cách hiện tại giữa hai lần probe"""
+        return self._probe_delay
+
+    # ========== RESULTS (GUI thread) ==========
+
+    def _on_sampled(self, result: Dict[str, Any]):
+        self._sampling = False
+        self.stats["samples"] += 1
+        changed = False
+
+        # Network
+        up = result.get('interfaces_up')
+        was_up = self._interfaces_up
+        self._interfaces_up = up
+        if up is False:
+            changed |= self._set_network(NETWORK_DISCONNECTED)
+        elif self.probe is None:
+            changed |= self._set_network(NETWORK_CONNECTED)
+        else:
+            if was_up is False:
+                # Vừa có lại interface -> probe ngay, bỏ backoff
+                self._reset_backoff()
+            self._maybe_probe()
+
+        # Battery
+        if 'battery' in result and result['battery'] != self._battery:
+            self._battery = result['battery']
+            self.battery_changed.emit(self._battery)
+            changed = True
+
+        # CPU / RAM (làm tròn -> không phát vì dao động nhỏ)
+        if result.get('cpu') is not None and result.get('memory') is not None:
+            load = (float(round(result['cpu'])), float(round(result['memory'])))
+            if load != self._load:
+                self._load = load
+                self.load_changed.emit(*load)
+                changed = True
+
+        if changed:
+            self._publish()
+
+    def _maybe_probe(self):
+        if self._probing:
+            self.stats["skipped_probes"] += 1
+            return
+        if self._clock() < self._next_probe_at:
+            return
+        self._probing = True
+        self.stats["probes"] += 1
+        threading.Thread(
+            target=_run_probe,
+            args=(self.probe, self._signals),
+            name="NetworkProbe",
+            daemon=True
+        ).start()
+
+    def _on_probed(self, reachable: bool):
+        self._probing = False
+        if reachable:
+            self._reset_backoff()
+            self._next_probe_at = self._clock() + self.interval_ms
+            network = NETWORK_CONNECTED
+        else:
+            self.stats["probe_failures"] += 1
+            self._next_probe_at = self._clock() + self._probe_delay
+            self._probe_delay = min(self._probe_delay * 2, NETWORK_PROBE_MAX_BACKOFF)
+            network = NETWORK_DISCONNECTED if self._interfaces_up is False else NETWORK_LIMITED
+
+        if self._set_network(network):
+            self._publish()
+
+    def _reset_backoff(self):
+        self._probe_delay = self.interval_ms
+        self._next_probe_at = 0.0
+
+    def _set_network(self, network: str) -> bool:
+        if network == self._network:
+            return False
+        self._network = network
+        self.network_changed.emit(network)
+        return True
+
+    def _publish(self):
+        cpu, memory = self._load if self._load is not _UNSET else (0.0, 0.0)
+        self.status = SystemStatus(
+            network=self._network if self._network is not _UNSET else None,
+            battery=self._battery if self._battery is not _UNSET else None,
+            cpu_percent=cpu,
+            memory_percent=memory,
+        )
+        self.status_changed.emit(self.status)
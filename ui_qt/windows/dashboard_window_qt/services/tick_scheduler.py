@@ -0,0 +1,306 @@
+# ui_qt/windows/dashboard_window_qt/services/tick_scheduler.py
+"""
+Tick Scheduler - Một QTimer dùng chung cho mọi cập nhật định kỳ của Dashboard
+- Subscriber đăng ký chu kỳ + dung sai pha; mốc chạy căn theo wall-clock
+  (chu kỳ 1 s chạy đúng đầu giây, 5 s / 30 s trùng các mốc giây đó)
+- Mỗi lần thức dậy gom mọi callback có cửa sổ [due, due + tolerance] chứa thời điểm đó
+- Subscriber gắn widget tự tạm dừng khi widget bị ẩn hoặc cửa sổ bị minimize
+- Đếm số lần thức dậy mỗi phút (wakeups_per_minute) để theo dõi
+"""
+
+import math
+import time
+from collections import deque
+from itertools import count
+from typing import Callable, Deque, Dict, List, Optional, Set
+import logging
+
+from PySide6.QtCore import Qt, QObject, QEvent, QTimer
+from PySide6.QtWidgets import QWidget
+from shiboken6 import isValid
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Timer có thể thức sớm vài ms -> coi như đã tới hạn
+EARLY_SLACK_MS = 2
+
+# Dung sai mặc định theo loại cập nhật (ms)
+CLOCK_TOLERANCE_MS = 50       # Đồng hồ hiển thị giây
+STATUS_TOLERANCE_MS = 1000    # Thông tin hệ thống, auto-save
+LIVE_TILE_TOLERANCE_MS = 5000  # Live tile
+
+
+def wall_clock_ms() -> float:
+    """Thời gian wall-clock hiện tại (ms)"""
+    return time.time() * 1000.0
+
+
+class TickSubscription:
+    """Một đăng ký trong TickScheduler (giữ lại để cancel())"""
+
+    def __init__(self, scheduler: "TickScheduler", sub_id: int, callback: Callable[[], None],
+                 period_ms: int, tolerance_ms: int, widget: Optional[QWidget],
+                 one_shot: bool, name: str):
+        self.scheduler = scheduler
+        self.id = sub_id
+        self.callback = callback
+        self.period_ms = max(1, int(period_ms))
+        self.tolerance_ms = max(0, int(tolerance_ms))
+        self.widget = widget
+        self.one_shot = one_shot
+        self.name = name or getattr(callback, "__qualname__", "tick")
+        self.due = 0.0
+        self.paused = False
+        self.active = True
+        self.fired = 0
+
+    @property
+    def deadline(self) -> float:
+        """Thời điểm muộn nhất được phép chạy"""
+        return self.due + self.tolerance_ms
+
+    def cancel(self):
+        self.scheduler.unsubscribe(self)
+
+    def __repr__(self):
+        state = "paused" if self.paused else ("active" if self.active else "cancelled")
+        return f"<TickSubscription {self.name} {self.period_ms}ms ±{self.tolerance_ms} {state}>"
+
+
+class TickScheduler(QObject):
+    """
+    Scheduler dùng chung (TickScheduler.instance())
+
+    Dùng:
+        self._tick = TickScheduler.instance().subscribe(self.update_time, 1000, CLOCK_TOLERANCE_MS, widget=self)
+        self._tick.cancel()
+        TickScheduler.instance().call_later(500, self._show_preview, 50, widget=self)
+    """
+
+    _shared: Optional["TickScheduler"] = None
+
+    def __init__(self, clock: Callable[[], float] = wall_clock_ms, parent=None):
+        """
+        Args:
+            clock: Hàm trả về thời gian hiện tại (ms) - thay bằng đồng hồ giả khi test
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._clock = clock
+        self._ids = count(1)
+        self._subs: Dict[int, TickSubscription] = {}
+        self._watched: Dict[QObject, Set[int]] = {}  # widget / cửa sổ -> id subscriber
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.run_pending)
+        self._next_wakeup: Optional[float] = None
+
+        # Metrics
+        self._wakeups: Deque[float] = deque()
+        self.total_wakeups = 0
+        self.total_callbacks = 0
+
+    @classmethod
+    def instance(cls) -> "TickScheduler":
+        """Scheduler dùng chung của tiến trình"""
+        if cls._shared is None or not isValid(cls._shared):
+            cls._shared = cls()
+        return cls._shared
+
+    # ========== SUBSCRIBE ==========
+
+    def subscribe(
+            self,
+            callback: Callable[[], None],
+            period_ms: int,
+            tolerance_ms: int = 0,
+            widget: QWidget = None,
+            name: str = ""
+    ) -> TickSubscription:
+        """
+        Gọi callback mỗi period_ms, tại các mốc wall-clock là bội số của period_ms
+
+        Args:
+            callback: Hàm không tham số
+            period_ms: Chu kỳ (ms)
+            tolerance_ms: Được phép chạy muộn tối đa bao nhiêu ms để gộp với lần thức khác
+            widget: Tạm dừng khi widget ẩn / cửa sổ minimize, tự huỷ khi widget bị xoá
+            name: Tên cho log / stats
+        """
+        sub = self._add(callback, period_ms, tolerance_ms, widget, False, name)
+        sub.due = self._aligned_after(self._clock(), sub.period_ms)
+        self._reschedule()
+        return sub
+
+    def call_later(
+            self,
+            delay_ms: int,
+            callback: Callable[[], None],
+            tolerance_ms: int = 0,
+            widget: QWidget = None,
+            name: str = ""
+    ) -> TickSubscription:
+        """Gọi callback một lần sau delay_ms (không căn mốc, vẫn được gộp trong tolerance_ms)"""
+        sub = self._add(callback, delay_ms, tolerance_ms, widget, True, name)
+        sub.due = self._clock() + sub.period_ms
+        self._reschedule()
+        return sub
+
+    def unsubscribe(self, sub: TickSubscription):
+        if not sub.active:
+            return
+        sub.active = False
+        self._subs.pop(sub.id, None)
+        for ids in self._watched.values():
+            ids.discard(sub.id)
+        self._reschedule()
+
+    def _add(self, callback, period_ms, tolerance_ms, widget, one_shot, name) -> TickSubscription:
+        sub = TickSubscription(self, next(self._ids), callback, period_ms, tolerance_ms,
+                               widget, one_shot, name)
+        self._subs[sub.id] = sub
+        if widget is not None:
+            self._watch(widget, sub)
+            widget.destroyed.connect(lambda *_, s=sub: self.unsubscribe(s))
+            sub.paused = self._is_hidden(widget)
+        return sub
+
+    # ========== VISIBILITY ==========
+
+    def _watch(self, widget: QWidget, sub: TickSubscription):
+        """Theo dõi Show/Hide của widget và WindowStateChange của cửa sổ chứa nó"""
+        for obj in {widget, widget.window()}:
+            if obj not in self._watched:
+                self._watched[obj] = set()
+                obj.installEventFilter(self)
+                obj.destroyed.connect(lambda *_, o=obj: self._watched.pop(o, None))
+            self._watched[obj].add(sub.id)
+
+    @staticmethod
+    def _is_hidden(widget: QWidget) -> bool:
+        if not isValid(widget):
+            return True
+        return not widget.isVisible() or widget.window().isMinimized()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        event_type = event.type()
+        if event_type in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.ParentChange):
+            ids = self._watched.get(obj)
+            if ids:
+                self._refresh([self._subs[i] for i in list(ids) if i in self._subs],
+                              rewatch=event_type == QEvent.ParentChange)
+        return False
+
+    def _refresh(self, subs: List[TickSubscription], rewatch: bool = False):
+        """Cập nhật trạng thái tạm dừng; subscriber vừa hiện lại chạy ngay ở lần thức tới"""
+        now = self._clock()
+        changed = False
+        for sub in subs:
+            if rewatch:
+                self._watch(sub.widget, sub)
+            paused = self._is_hidden(sub.widget)
+            if paused == sub.paused:
+                continue
+            sub.paused = paused
+            changed = True
+            if not paused and not sub.one_shot:
+                # Hiển thị lại: cập nhật ngay (đồng hồ không đứng ở giờ cũ), rồi về mốc căn
+                sub.due = min(sub.due, now)
+        if changed:
+            self._reschedule()
+
+    # ========== RUN ==========
+
+    @staticmethod
+    def _aligned_after(now: float, period_ms: int) -> float:
+        """Mốc bội số của period_ms ngay sau now"""
+        return (math.floor(now / period_ms) + 1) * period_ms
+
+    def _runnable(self) -> List[TickSubscription]:
+        return [s for s in self._subs.values() if not s.paused]
+
+    def next_wakeup(self) -> Optional[float]:
+        """
+        Thời điểm thức tiếp theo: deadline sớm nhất trong các subscriber đang chạy
+        (thức muộn nhất có thể -> gom được nhiều callback nhất)
+        """
+        runnable = self._runnable()
+        if not runnable:
+            return None
+        return min(s.deadline for s in runnable)
+
+    def _reschedule(self):
+        now = self._clock()
+        # Đồng hồ hệ thống lùi: mốc hẹn quá xa -> căn lại
+        for sub in self._runnable():
+            if not sub.one_shot and sub.due - now > sub.period_ms:
+                sub.due = self._aligned_after(now, sub.period_ms)
+
+        wake = self.next_wakeup()
+        self._next_wakeup = wake
+        if wake is None:
+            self._timer.stop()
+            return
+        self._timer.start(max(0, math.ceil(wake - now)))
+
+    def run_pending(self) -> int:
+        """
+        Chạy mọi subscriber đã tới hạn (due <= now), trả về số callback đã gọi
+
+        Được QTimer gọi; test có thể gọi trực tiếp sau khi tăng đồng hồ giả
+        """
+        now = self._clock()
+        due = [s for s in self._runnable() if s.due <= now + EARLY_SLACK_MS]
+        if due:
+            self._count_wakeup(now)
+
+        for sub in sorted(due, key=lambda s: s.due):
+            if not sub.active or sub.paused:
+                continue
+            if sub.one_shot:
+                self.unsubscribe(sub)
+            else:
+                # Mốc căn tiếp theo; bỏ qua các mốc đã lỡ (máy sleep, callback chậm)
+                sub.due = self._aligned_after(max(now, sub.due), sub.period_ms)
+            sub.fired += 1
+            self.total_callbacks += 1
+            try:
+                sub.callback()
+            except Exception as e:
+                logger.error(f"Lỗi tick {sub.name}: {e}")
+
+        self._reschedule()
+        return len(due)
+
+    # ========== METRICS ==========
+
+    def _count_wakeup(self, now: float):
+        self.total_wakeups += 1
+        self._wakeups.append(now)
+        while self._wakeups and self._wakeups[0] <= now - 60000:
+            self._wakeups.popleft()
+
+    def wakeups_per_minute(self) -> int:
+        """Số lần thức dậy (có chạy callback) trong 60 giây gần nhất"""
+        now = self._clock()
+        while self._wakeups and self._wakeups[0] <= now - 60000:
+            self._wakeups.popleft()
+        return len(self._wakeups)
+
+    def stats(self) -> Dict[str, object]:
+        subs = list(self._subs.values())
+        return {
+            'subscriptions': len(subs),
+            'paused': sum(1 for s in subs if s.paused),
+            'wakeups_per_minute': self.wakeups_per_minute(),
+            'total_wakeups': self.total_wakeups,
+            'total_callbacks': self.total_callbacks,
+            'next_wakeup_in_ms': None if self._next_wakeup is None
+            else max(0, round(self._next_wakeup - self._clock())),
+        }
+
+    def subscriptions(self) -> List[TickSubscription]:
+        return list(self._subs.values())
@@ -0,0 +1,404 @@
+# ui_qt/windows/dashboard_window_qt/services/weather_service.py
+"""
+Weather Service - Dữ liệu thời tiết offline-first cho WeatherWidget
+- WeatherProvider: nguồn dữ liệu (JSON cùng định dạng OpenWeatherMap)
+    + OpenWeatherMapProvider: gọi HTTP
+    + FileWeatherProvider: đọc file JSON có sẵn (chạy offline, dữ liệu mẫu)
+- WeatherCache: lưu response xuống đĩa -> mở app là có dữ liệu ngay, không gọi lại API
+- WeatherService: còn hạn (TTL) thì dùng cache; hết hạn thì gọi provider, lỗi thì trả dữ liệu cũ
+  (stale) và giãn lần thử tiếp theo (backoff tăng gấp đôi tới tối đa)
+- process_forecast_data: gộp forecast 3 giờ/lần thành từng ngày (hàm thuần, không Qt / I/O)
+"""
+
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+import threading
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+from ..utils.constants import (
+    WEATHER_CACHE_TTL, WEATHER_RETRY_DELAY, WEATHER_MAX_BACKOFF, WEATHER_REQUEST_TIMEOUT
+)
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Loại dữ liệu (trùng tên endpoint của OpenWeatherMap)
+KIND_CURRENT = "weather"
+KIND_FORECAST = "forecast"
+
+OPENWEATHERMAP_BASE_URL = "https://api.openweathermap.org/data/2.5"
+API_KEY_PLACEHOLDER = "YOUR_API_KEY_HERE"
+
+
+class WeatherProviderError(Exception):
+    """Không lấy được dữ liệu (mất mạng, lỗi API, thiếu file...)"""
+
+
+@dataclass(frozen=True)
+class WeatherLocation:
+    """Vị trí cần lấy thời tiết: ưu tiên tên thành phố, không có thì dùng tọa độ"""
+    city: str = ""
+    lat: float = 0.0
+    lon: float = 0.0
+
+    def key(self) -> str:
+        if self.city:
+            return self.city.strip().lower()
+        return f"{self.lat:.3f},{self.lon:.3f}"
+
+
+@dataclass(frozen=True)
+class WeatherResult:
+    """Kết quả của WeatherService.get()"""
+    payload: Dict[str, Any]
+    fetched_at: float          # epoch seconds lúc provider trả dữ liệu
+    stale: bool = False        # quá TTL (đang hiển thị dữ liệu cũ)
+    error: Optional[str] = None  # lỗi của lần làm mới gần nhất (nếu có)
+
+
+# ========== PROVIDERS ==========
+
+class WeatherProvider(ABC):
+    """
+    Nguồn dữ liệu thời tiết - trả về dict JSON dạng OpenWeatherMap
+
+    Lớp con thiếu fetch() báo lỗi ngay khi khởi tạo, không đợi lần làm mới đầu tiên
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def fetch(self, kind: str, location: WeatherLocation, unit: str) -> Dict[str, Any]:
+        """
+        Args:
+            kind: KIND_CURRENT hoặc KIND_FORECAST
+            location: Vị trí
+            unit: "metric" / "imperial" / "standard"
+
+        Raises:
+            WeatherProviderError: Không lấy được dữ liệu
+        """
+
+
+class OpenWeatherMapProvider(WeatherProvider):
+    """Gọi API OpenWeatherMap (chạy trên worker thread)"""
+
+    name = "openweathermap"
+
+    def __init__(self, api_key: str, base_url: str = OPENWEATHERMAP_BASE_URL,
+                 timeout: float = WEATHER_REQUEST_TIMEOUT, lang: str = "vi"):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.lang = lang
+
+    def fetch(self, kind: str, location: WeatherLocation, unit: str) -> Dict[str, Any]:
+        if not REQUESTS_AVAILABLE:
+            raise WeatherProviderError("Thiếu thư viện requests")
+        if not self.api_key or self.api_key == API_KEY_PLACEHOLDER:
+            raise WeatherProviderError("Chưa cấu hình API key")
+
+        params = {"appid": self.api_key, "units": unit, "lang": self.lang}
+        if location.city:
+            params["q"] = location.city
+        else:
+            params["lat"] = location.lat
+            params["lon"] = location.lon
+        if kind == KIND_FORECAST:
+            params["cnt"] = 40  # 5 days * 8 (3-hour intervals)
+
+        try:
+            response = requests.get(f"{self.base_url}/{kind}", params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise WeatherProviderError(f"Network error: {e}") from e
+
+        if response.status_code != 200:
+            raise WeatherProviderError(f"API Error: {response.status_code}")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise WeatherProviderError(f"Response không phải JSON: {e}") from e
+
+
+class FileWeatherProvider(WeatherProvider):
+    """
+    Đọc dữ liệu từ thư mục JSON (máy offline, demo, dữ liệu mẫu khi phát triển)
+
+    Tìm lần lượt: <kind>-<thành phố>.json rồi <kind>.json
+    (ví dụ weather-ha-noi.json, forecast.json) - nội dung giống response OpenWeatherMap
+    """
+
+    name = "file"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def slug(text: str) -> str:
+        text = text.strip().lower().replace('đ', 'd')
+        # Bỏ dấu tiếng Việt cho tên file
+        text = ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+        return re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+
+    def fetch(self, kind: str, location: WeatherLocation, unit: str) -> Dict[str, Any]:
+        candidates = []
+        if location.city:
+            candidates.append(self.directory / f"{kind}-{self.slug(location.city)}.json")
+        candidates.append(self.directory / f"{kind}.json")
+
+        for path in candidates:
+            if path.exists():
+                try:
+                    return json.loads(path.read_text(encoding='utf-8'))
+                except (OSError, ValueError) as e:
+                    raise WeatherProviderError(f"Không đọc được {path.name}: {e}") from e
+        raise WeatherProviderError(f"Không có dữ liệu {kind} cho {location.city or location.key()}")
+
+
+# ========== CACHE ==========
+
+def default_weather_cache_path() -> Path:
+    """File cache theo OS (cùng gốc với thumbnail cache của Dashboard)"""
+    if os.name == 'nt':  # Windows
+        base = Path(os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA', '')) / 'DashboardQt'
+    else:  # Linux/Mac
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'dashboard_qt'
+    return base / 'weather_cache.json'
+
+
+class WeatherCache:
+    """
+    Response thời tiết trên đĩa: {key: {"fetched_at": epoch, "payload": {...}}}
+
+    Ghi qua file tạm + os.replace nên không bao giờ để lại file hỏng
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_weather_cache_path()
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+                if not isinstance(self._entries, dict):
+                    self._entries = {}
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Bỏ qua weather cache hỏng {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, payload: Dict[str, Any], fetched_at: float):
+        with self._lock:
+            entries = self._load()
+            entries[key] = {"fetched_at": fetched_at, "payload": payload}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(self.path.name + '.tmp')
+                tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Không ghi được weather cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# ========== SERVICE ==========
+
+class WeatherService:
+    """
+    Cache-first: get() chỉ gọi provider khi cache quá TTL (hoặc force)
+
+    Provider lỗi: trả dữ liệu cũ kèm error (stale-while-revalidate) và không thử lại
+    trước retry_at; mỗi lần lỗi liên tiếp khoảng chờ tăng gấp đôi, tối đa max_backoff_ms.
+    get() có thể chặn (HTTP) - gọi trên worker; peek() chỉ đọc cache, gọi được trên GUI thread.
+    """
+
+    def __init__(self, provider: WeatherProvider, cache: Optional[WeatherCache] = None,
+                 ttl_ms: int = WEATHER_CACHE_TTL, retry_ms: int = WEATHER_RETRY_DELAY,
+                 max_backoff_ms: int = WEATHER_MAX_BACKOFF, clock: Callable[[], float] = None):
+        """
+        Args:
+            provider: Nguồn dữ liệu
+            cache: Cache trên đĩa, mặc định default_weather_cache_path()
+            ttl_ms: Dữ liệu mới hơn khoảng này thì không gọi provider
+            retry_ms: Chờ sau lần lỗi đầu tiên
+            max_backoff_ms: Chờ tối đa giữa hai lần thử khi lỗi liên tiếp
+            clock: Thời gian hiện tại (epoch seconds), mặc định time.time
+        """
+        self.provider = provider
+        self.cache = cache or WeatherCache()
+        self.ttl_ms = ttl_ms
+        self.retry_ms = retry_ms
+        self.max_backoff_ms = max_backoff_ms
+        self._clock = clock or time.time
+
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._last_error: Dict[str, str] = {}
+        self.stats = {"hits": 0, "fetches": 0, "failures": 0, "stale": 0, "skipped": 0}
+
+    @staticmethod
+    def cache_key(kind: str, location: WeatherLocation, unit: str) -> str:
+        return f"{kind}|{location.key()}|{unit}"
+
+    def _result(self, entry: Dict[str, Any], error: Optional[str] = None) -> WeatherResult:
+        fetched_at = float(entry.get("fetched_at", 0))
+        stale = (self._clock() - fetched_at) * 1000 >= self.ttl_ms
+        return WeatherResult(entry.get("payload") or {}, fetched_at, stale, error)
+
+    def peek(self, kind: str, location: WeatherLocation, unit: str) -> Optional[WeatherResult]:
+        """Dữ liệu trong cache (kể cả đã cũ), không gọi provider"""
+        entry = self.cache.get(self.cache_key(kind, location, unit))
+        return self._result(entry) if entry else None
+
+    def retry_delay_ms(self, kind: str, location: WeatherLocation, unit: str) -> int:
+        """Còn bao lâu nữa mới được thử lại provider (0 = thử được ngay)"""
+        key = self.cache_key(kind, location, unit)
+        with self._lock:
+            return max(0, int((self._retry_at.get(key, 0) - self._clock()) * 1000))
+
+    def get(self, kind: str, location: WeatherLocation, unit: str, force: bool = False) -> WeatherResult:
+        """
+        Args:
+            force: Bỏ qua TTL và backoff (người dùng bấm làm mới)
+
+        Raises:
+            WeatherProviderError: Provider lỗi và cache không có gì
+        """
+        key = self.cache_key(kind, location, unit)
+        entry = self.cache.get(key)
+        now = self._clock()
+
+        if entry and not force and (now - float(entry.get("fetched_at", 0))) * 1000 < self.ttl_ms:
+            self.stats["hits"] += 1
+            return self._result(entry)
+
+        with self._lock:
+            waiting = not force and now < self._retry_at.get(key, 0)
+            last_error = self._last_error.get(key)
+        if waiting:
+            # Đang backoff: không gọi provider
+            self.stats["skipped"] += 1
+            if entry:
+                self.stats["stale"] += 1
+                return self._result(entry, last_error)
+            raise WeatherProviderError(last_error or "Đang chờ thử lại")
+
+        try:
+            self.stats["fetches"] += 1
+            payload = self.provider.fetch(kind, location, unit)
+        except Exception as e:
+            error = str(e) if isinstance(e, WeatherProviderError) else f"Error: {e}"
+            delay = self._record_failure(key, error)
+            logger.warning(f"Weather {kind} ({location.key()}) lỗi: {error} - thử lại sau {delay // 1000}s")
+            if entry:
+                self.stats["stale"] += 1
+                return self._result(entry, error)
+            raise WeatherProviderError(error) from e
+
+        with self._lock:
+            self._failures.pop(key, None)
+            self._retry_at.pop(key, None)
+            self._last_error.pop(key, None)
+        fetched_at = self._clock()
+        self.cache.put(key, payload, fetched_at)
+        return WeatherResult(payload, fetched_at)
+
+    def _record_failure(self, key: str, error: str) -> int:
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            delay = min(self.retry_ms * 2 ** (failures - 1), self.max_backoff_ms)
+            self._retry_at[key] = self._clock() + delay / 1000
+            self._last_error[key] = error
+            self.stats["failures"] += 1
+            return delay
+
+
+# ========== FORECAST PROCESSING ==========
+
+def process_forecast_data(data: Dict[str, Any], days: int = 5,
+                          utc_offset: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Gộp forecast 3 giờ/lần (response /forecast) thành từng ngày
+
+    Args:
+        data: Response /forecast ({"list": [...], "city": {"timezone": giây lệch UTC}})
+        days: Số ngày tối đa
+        utc_offset: Giây lệch UTC để chia ngày; mặc định lấy city.timezone,
+            không có thì dùng giờ máy
+
+    Returns:
+        [{'date', 'temp_min', 'temp_max', 'condition', 'humidity', 'wind_speed', 'rain_chance'}]
+        theo thứ tự thời gian. condition = điều kiện gặp nhiều nhất trong ngày
+        (bằng nhau thì lấy cái xuất hiện trước)
+    """
+    if utc_offset is None:
+        utc_offset = (data.get('city') or {}).get('timezone')
+    tz = timezone(timedelta(seconds=utc_offset)) if utc_offset is not None else None
+
+    daily_data: Dict[Any, Dict[str, Any]] = {}
+    for item in data.get('list', []):
+        try:
+            date = datetime.fromtimestamp(item['dt'], tz).date()
+            temp = item['main']['temp']
+        except (KeyError, TypeError, ValueError, OverflowError, OSError):
+            continue
+
+        day = daily_data.setdefault(date, {
+            'temps': [], 'conditions': [], 'humidity': [], 'wind': [], 'rain': 0
+        })
+        day['temps'].append(temp)
+        weather = item.get('weather') or [{}]
+        if weather[0].get('main'):
+            day['conditions'].append(weather[0]['main'])
+        if 'humidity' in item['main']:
+            day['humidity'].append(item['main']['humidity'])
+        if 'speed' in (item.get('wind') or {}):
+            day['wind'].append(item['wind']['speed'])
+        day['rain'] += (item.get('rain') or {}).get('3h', 0)
+
+    forecast_list = []
+    for date in sorted(daily_data):
+        day = daily_data[date]
+        forecast_list.append({
+            'date': date,
+            'temp_min': min(day['temps']),
+            'temp_max': max(day['temps']),
+            'condition': Counter(day['conditions']).most_common(1)[0][0] if day['conditions'] else "",
+            'humidity': sum(day['humidity']) // len(day['humidity']) if day['humidity'] else 0,
+            'wind_speed': sum(day['wind']) / len(day['wind']) if day['wind'] else 0.0,
+            'rain_chance': min(100, day['rain'] * 10)  # Rough estimate
+        })
+
+    return forecast_list[:days]
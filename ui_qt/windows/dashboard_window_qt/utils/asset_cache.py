@@ -0,0 +1,325 @@
+# ui_qt/windows/dashboard_window_qt/utils/asset_cache.py
+"""
+Cache cho AssetsManager
+- ByteLRUCache: LRU giới hạn theo byte (width x height x depth), mỗi loại asset một ngân sách
+  riêng, tự bỏ entry khi file nguồn đổi mtime/size; đếm hit / miss / eviction
+- ThumbnailDiskCache: ảnh đã render/scale lưu PNG (hoặc WebP) trên đĩa, khóa theo hash
+  nội dung file nguồn -> lần khởi động sau khỏi rasterize SVG / decode ảnh lớn
+"""
+
+import os
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+import logging
+
+from PySide6.QtGui import QIcon, QImage, QImageWriter, QPixmap
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# (st_mtime_ns, st_size) của file nguồn
+FileStamp = Tuple[int, int]
+
+# Cost tối thiểu cho object không đo được kích thước (QSvgRenderer, QIcon rỗng...)
+MIN_ENTRY_COST = 1024
+
+
+def file_stamp(path) -> Optional[FileStamp]:
+    """Dấu thời gian + kích thước file, None nếu file không tồn tại"""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def estimate_cost(value: Any) -> int:
+    """Số byte ước tính của một asset đã decode: width x height x depth"""
+    if isinstance(value, QPixmap):
+        return max(MIN_ENTRY_COST, value.width() * value.height() * max(1, value.depth()) // 8)
+    if isinstance(value, QImage):
+        return max(MIN_ENTRY_COST, value.sizeInBytes())
+    if isinstance(value, QIcon):
+        # QIcon dựng từ pixmap: mỗi kích thước có sẵn là một pixmap 32-bit
+        total = sum(s.width() * s.height() * 4 for s in value.availableSizes())
+        return max(MIN_ENTRY_COST, total)
+    return MIN_ENTRY_COST
+
+
+# ========== MEMORY LRU ==========
+
+class _Entry:
+    __slots__ = ("value", "cost", "stamp")
+
+    def __init__(self, value: Any, cost: int, stamp: Optional[FileStamp]):
+        self.value = value
+        self.cost = cost
+        self.stamp = stamp
+
+
+class ByteLRUCache:
+    """
+    LRU theo byte, chia category (icon, pixmap, svg, wallpaper...)
+
+    Mỗi category một OrderedDict + ngân sách byte riêng: put() vượt ngân sách thì bỏ
+    entry dùng lâu nhất của đúng category đó. Entry lớn hơn cả ngân sách không được cache.
+    get(stamp=...) so với stamp lúc put -> file nguồn đã đổi thì entry bị bỏ (tính là miss).
+    """
+
+    def __init__(self, budgets: Dict[str, int]):
+        self._budgets: Dict[str, int] = dict(budgets)
+        self._entries: Dict[str, "OrderedDict[Hashable, _Entry]"] = {}
+        self._bytes: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        for category in self._budgets:
+            self._ensure(category)
+
+    def _ensure(self, category: str):
+        if category not in self._entries:
+            self._entries[category] = OrderedDict()
+            self._bytes[category] = 0
+            self._stats[category] = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+            self._budgets.setdefault(category, 0)
+
+    # ---------- Truy cập ----------
+    def get(self, category: str, key: Hashable, stamp: Optional[FileStamp] = None) -> Any:
+        """Giá trị đã cache hoặc None; stamp khác lúc put -> bỏ entry"""
+        self._ensure(category)
+        entries = self._entries[category]
+        stats = self._stats[category]
+        entry = entries.get(key)
+        if entry is None:
+            stats["misses"] += 1
+            return None
+        if entry.stamp != stamp:
+            self._drop(category, key)
+            stats["invalidations"] += 1
+            stats["misses"] += 1
+            return None
+        entries.move_to_end(key)
+        stats["hits"] += 1
+        return entry.value
+
+    def put(self, category: str, key: Hashable, value: Any, cost: Optional[int] = None,
+            stamp: Optional[FileStamp] = None) -> Any:
+        """Lưu value (trả lại chính value để tiện return)"""
+        self._ensure(category)
+        if key in self._entries[category]:
+            self._drop(category, key)
+        cost = estimate_cost(value) if cost is None else max(1, int(cost))
+        if cost > self._budgets[category]:
+            return value
+        self._entries[category][key] = _Entry(value, cost, stamp)
+        self._bytes[category] += cost
+        self._evict(category)
+        return value
+
+    def remove(self, category: str, key: Hashable) -> bool:
+        if key in self._entries.get(category, {}):
+            self._drop(category, key)
+            return True
+        return False
+
+    def clear(self, category: Optional[str] = None):
+        categories = [category] if category else list(self._entries)
+        for name in categories:
+            if name in self._entries:
+                self._entries[name].clear()
+                self._bytes[name] = 0
+
+    # ---------- Ngân sách ----------
+    def budget(self, category: str) -> int:
+        return self._budgets.get(category, 0)
+
+    def set_budget(self, category: str, max_bytes: int):
+        self._ensure(category)
+        self._budgets[category] = max(0, int(max_bytes))
+        self._evict(category)
+
+    def usage(self, category: Optional[str] = None) -> int:
+        """Số byte đang dùng (một category hoặc tổng)"""
+        if category is not None:
+            return self._bytes.get(category, 0)
+        return sum(self._bytes.values())
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def __contains__(self, item: Tuple[str, Hashable]):
+        category, key = item
+        return key in self._entries.get(category, {})
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """hits / misses / evictions / invalidations + bytes / budget / entries theo category"""
+        return {
+            category: dict(
+                counters,
+                bytes=self._bytes[category],
+                budget=self._budgets[category],
+                entries=len(self._entries[category]),
+            )
+            for category, counters in self._stats.items()
+        }
+
+    # ---------- Nội bộ ----------
+    def _drop(self, category: str, key: Hashable):
+        entry = self._entries[category].pop(key)
+        self._bytes[category] -= entry.cost
+
+    def _evict(self, category: str):
+        entries = self._entries[category]
+        budget = self._budgets[category]
+        while self._bytes[category] > budget and entries:
+            _, entry = entries.popitem(last=False)
+            self._bytes[category] -= entry.cost
+            self._stats[category]["evictions"] += 1
+
+
+# ========== DISK THUMBNAILS ==========
+
+def default_thumbnail_dir() -> Path:
+    """Thư mục cache thumbnail theo OS (cùng gốc với settings của Dashboard)"""
+    if os.name == 'nt':  # Windows
+        base = Path(os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA', '')) / 'DashboardQt'
+    else:  # Linux/Mac
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'dashboard_qt'
+    return base / 'thumbnails'
+
+
+class ThumbnailDiskCache:
+    """
+    Thumbnail trên đĩa: <sha1(hash nội dung nguồn + tham số render)>.png|.webp
+
+    Khóa theo nội dung nên đổi file nguồn (mtime đổi -> hash lại) tự ra khóa mới;
+    file cũ bị dọn dần khi tổng dung lượng vượt max_bytes (xoá file ít dùng nhất trước).
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory) if directory else default_thumbnail_dir()
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._total: Optional[int] = None
+        self._digests: Dict[str, Tuple[FileStamp, str]] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "pruned": 0}
+        self._webp = b"webp" in [bytes(f) for f in QImageWriter.supportedImageFormats()]
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Không tạo được thư mục thumbnail {self.directory}: {e}")
+            self.enabled = False
+
+    # ---------- Khóa ----------
+    def content_hash(self, path, stamp: Optional[FileStamp] = None) -> Optional[str]:
+        """sha1 nội dung file (nhớ theo stamp để không đọc lại file chưa đổi)"""
+        path = str(path)
+        stamp = stamp or file_stamp(path)
+        if stamp is None:
+            return None
+        memo = self._digests.get(path)
+        if memo is not None and memo[0] == stamp:
+            return memo[1]
+        digest = hashlib.sha1()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        self._digests[path] = (stamp, digest.hexdigest())
+        return self._digests[path][1]
+
+    def key(self, path, params: str, stamp: Optional[FileStamp] = None) -> Optional[str]:
+        """Khóa thumbnail cho (nội dung file, tham số render), None nếu không đọc được nguồn"""
+        if not self.enabled:
+            return None
+        content = self.content_hash(path, stamp)
+        if content is None:
+            return None
+        return hashlib.sha1(f"{content}|{params}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, lossy: bool) -> Path:
+        ext = "webp" if lossy and self._webp else "png"
+        return self.directory / f"{key}.{ext}"
+
+    # ---------- Đọc / ghi ----------
+    def load(self, key: Optional[str], lossy: bool = False) -> Optional[QImage]:
+        if key is None:
+            return None
+        path = self._path(key, lossy)
+        image = QImage(str(path)) if path.exists() else QImage()
+        if image.isNull():
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        try:
+            os.utime(path)  # đánh dấu vừa dùng cho prune()
+        except OSError:
+            pass
+        return image
+
+    def save(self, key: Optional[str], image: QImage, lossy: bool = False) -> bool:
+        """Ghi atomically (file tạm rồi os.replace); lossy=True dùng WebP nếu Qt hỗ trợ"""
+        if key is None or image.isNull():
+            return False
+        path = self._path(key, lossy)
+        fmt = path.suffix[1:].upper()
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            if not image.save(str(tmp), fmt, 90 if fmt == "WEBP" else -1):
+                return False
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            self.stats["writes"] += 1
+            if self._total is not None:
+                self._total += path.stat().st_size - old_size
+        except OSError as e:
+            logger.warning(f"Không ghi được thumbnail {path.name}: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+        if self.total_bytes() > self.max_bytes:
+            self.prune()
+        return True
+
+    # ---------- Dung lượng ----------
+    def _scan(self):
+        files = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.startswith('.'):
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            pass
+        return files
+
+    def total_bytes(self) -> int:
+        if self._total is None:
+            self._total = sum(size for _, size, _ in self._scan())
+        return self._total
+
+    def prune(self, target: Optional[int] = None):
+        """Xoá thumbnail cũ nhất tới khi còn <= target (mặc định 80% max_bytes)"""
+        target = int(self.max_bytes * 0.8) if target is None else target
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["pruned"] += 1
+            except OSError:
+                pass
+        self._total = total
+
+    def clear(self):
+        self.prune(target=0)
+        self._digests.clear()
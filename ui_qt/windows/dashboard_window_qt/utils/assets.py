@@ -2,6 +2,7 @@
 """
 Module quản lý assets (icons, images, resources) cho Dashboard Desktop-Style
 Bao gồm: Load, cache, resize icons và images
+Cache: LRU giới hạn byte theo từng loại asset + thumbnail trên đĩa (xem asset_cache.py)
 """
 
 import os
@@ -10,7 +11,6 @@ import json
 import hashlib
 from pathlib import Path
 from typing import Optional, Dict, Tuple, Union, Any
-from functools import lru_cache
 import logging
 
 from PySide6.QtCore import QSize, Qt, QFile, QByteArray, QBuffer, QIODevice
@@ -26,8 +26,11 @@ from .constants import (
     ICON_SIZE_MEDIUM,
     ICON_SIZE_LARGE,
     ICON_SIZE_EXTRA_LARGE,
-    SUPPORTED_IMAGE_FORMATS
+    SUPPORTED_IMAGE_FORMATS,
+    ASSET_CACHE_BUDGETS,
+    THUMBNAIL_CACHE_MAX_BYTES
 )
+from .asset_cache import ByteLRUCache, ThumbnailDiskCache, file_stamp
 
 # Thiết lập logger
 logger = logging.getLogger(__name__)
@@ -54,10 +57,12 @@ class AssetsManager:
             return
 
         self._initialized = True
-        self._icon_cache: Dict[str, QIcon] = {}
-        self._pixmap_cache: Dict[str, QPixmap] = {}
-        self._svg_cache: Dict[str, QSvgRenderer] = {}
-        self._wallpaper_cache: Dict[str, QPixmap] = {}
+        # Một LRU giới hạn byte cho icon / pixmap / svg / wallpaper (mỗi loại một ngân sách)
+        self.cache = ByteLRUCache(ASSET_CACHE_BUDGETS)
+        # Ảnh đã scale / rasterize lưu trên đĩa cho lần khởi động sau
+        self.thumbnails = ThumbnailDiskCache(max_bytes=THUMBNAIL_CACHE_MAX_BYTES)
+        # name -> file icon đã tìm thấy (tránh stat 16 đường dẫn mỗi lần load_icon)
+        self._icon_paths: Dict[str, Path] = {}
 
         # Đường dẫn assets
         self.base_dir = Path(__file__).parent.parent
@@ -183,60 +188,110 @@ class AssetsManager:
             "unknown": "unknown.png"
         }
 
-    def clear_cache(self):
-        """Xóa toàn bộ cache"""
-        self._icon_cache.clear()
-        self._pixmap_cache.clear()
-        self._svg_cache.clear()
-        self._wallpaper_cache.clear()
+    def clear_cache(self, disk: bool = False):
+        """Xóa toàn bộ cache trong bộ nhớ (disk=True: xoá cả thumbnail trên đĩa)"""
+        self.cache.clear()
+        self._icon_paths.clear()
+        if disk:
+            self.thumbnails.clear()
         logger.info("Đã xóa cache assets")
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Thống kê cache: hit / miss / eviction, byte đang dùng theo từng loại + thumbnail"""
+        stats: Dict[str, Any] = self.cache.stats()
+        stats["thumbnails"] = dict(self.thumbnails.stats, bytes=self.thumbnails.total_bytes())
+        return stats
+
+    def find_icon_file(self, name: str) -> Optional[Path]:
+        """Tìm file icon theo tên trong các thư mục icons (theo thứ tự ưu tiên)"""
+        cached = self._icon_paths.get(name)
+        if cached is not None and cached.exists():
+            return cached
+
+        search_dirs = [
+            self.app_icons_dir,  # 1. Tìm trong app icons
+            self.system_icons_dir,  # 2. Tìm trong system icons
+            self.categories_icons_dir,  # 3. Tìm trong categories
+            self.icons_dir  # 4. Tìm trong icons chung
+        ]
+        for dir_path in search_dirs:
+            # Thử với các extension
+            for ext in ['.png', '.svg', '.ico', '.jpg']:
+                test_path = dir_path / f"{name}{ext}"
+                if test_path.exists():
+                    self._icon_paths[name] = test_path
+                    return test_path
+        return None
 
-# ========== ICON UTILITIES ==========
 
-@lru_cache(maxsize=128)
-# Trong utils/assets.py
+# ========== CACHE HELPERS ==========
 
-def load_icon(name: str, size: Optional[QSize] = None) -> QIcon:
-    """Load icon từ tên"""
-    manager = AssetsManager()
+def _size_key(size: Optional[QSize]) -> Tuple[int, int]:
+    if isinstance(size, QSize) and size.isValid():
+        return size.width(), size.height()
+    return 0, 0
 
-    # Kiểm tra trong các thư mục theo thứ tự ưu tiên
-    search_dirs = [
-        manager.app_icons_dir,  # 1. Tìm trong app icons
-        manager.system_icons_dir,  # 2. Tìm trong system icons
-        manager.categories_icons_dir,  # 3. Tìm trong categories
-        manager.icons_dir  # 4. Tìm trong icons chung
-    ]
 
-    icon_path = None
+def _render_with_thumbnail(source_path, params: str, stamp, render, lossy: bool = False) -> QPixmap:
+    """
+    Lấy ảnh đã render từ thumbnail trên đĩa, không có thì gọi render() rồi ghi thumbnail
+
+    Args:
+        source_path: File nguồn (khóa thumbnail = hash nội dung file + params)
+        params: Tham số render (kích thước, màu, mode...)
+        stamp: file_stamp(source_path)
+        render: Hàm không tham số trả về QPixmap
+        lossy: Lưu WebP thay vì PNG (wallpaper)
+    """
+    thumbnails = AssetsManager().thumbnails
+    key = thumbnails.key(source_path, params, stamp)
+    image = thumbnails.load(key, lossy)
+    if image is not None:
+        return QPixmap.fromImage(image)
+    pixmap = render()
+    if not pixmap.isNull():
+        thumbnails.save(key, pixmap.toImage(), lossy)
+    return pixmap
+
 
-    # Tìm file icon
-    for dir_path in search_dirs:
-        # Thử với các extension
-        for ext in ['.png', '.svg', '.ico', '.jpg']:
-            test_path = dir_path / f"{name}{ext}"
-            if test_path.exists():
-                icon_path = test_path
-                break
-        if icon_path:
-            break
+# ========== ICON UTILITIES ==========
+
+def load_icon(name: str, size: Optional[QSize] = None) -> QIcon:
+    """Load icon từ tên (cache theo tên + kích thước, tự load lại khi file icon đổi)"""
+    manager = AssetsManager()
+    icon_path = manager.find_icon_file(name)
 
     # Nếu không tìm thấy, dùng default
     if not icon_path:
         default_path = manager.app_icons_dir / "default.png"
         if default_path.exists():
             icon_path = default_path
-        else:
-            # Tạo icon placeholder
-            return create_placeholder_icon(name, size or QSize(48, 48))
 
-    # Load icon
-    pixmap = QPixmap(str(icon_path))
-    if size:
-        pixmap = pixmap.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    cache_key = (name, *_size_key(size))
+    stamp = file_stamp(icon_path) if icon_path else None
+    icon = manager.cache.get("icon", cache_key, stamp)
+    if icon is not None:
+        return icon
 
-    return QIcon(pixmap)
+    if not icon_path:
+        # Tạo icon placeholder
+        icon = create_placeholder_icon(name, size or QSize(48, 48))
+        return manager.cache.put("icon", cache_key, icon)
+
+    def render() -> QPixmap:
+        pixmap = QPixmap(str(icon_path))
+        if size and not pixmap.isNull():
+            pixmap = pixmap.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return pixmap
+
+    # Thumbnail trên đĩa chỉ đáng khi phải scale hoặc rasterize SVG
+    if size or icon_path.suffix.lower() == '.svg':
+        w, h = _size_key(size)
+        pixmap = _render_with_thumbnail(icon_path, f"icon:{w}x{h}", stamp, render)
+    else:
+        pixmap = render()
+
+    return manager.cache.put("icon", cache_key, QIcon(pixmap), stamp=stamp)
 
 
 def load_svg_pixmap(
@@ -255,6 +310,25 @@ def load_svg_pixmap(
     Returns:
         QPixmap object
     """
+    manager = AssetsManager()
+    color_name = color.name(QColor.HexArgb) if color else ""
+    cache_key = (str(svg_path), size.width(), size.height(), color_name)
+    stamp = file_stamp(svg_path)
+    cached = manager.cache.get("svg", cache_key, stamp)
+    if cached is not None:
+        return cached
+
+    pixmap = _render_with_thumbnail(
+        svg_path, f"svg:{size.width()}x{size.height()}:{color_name}", stamp,
+        lambda: _rasterize_svg(svg_path, size, color)
+    )
+    if stamp is None or pixmap.isNull():
+        return pixmap
+    return manager.cache.put("svg", cache_key, pixmap, stamp=stamp)
+
+
+def _rasterize_svg(svg_path: str, size: QSize, color: Optional[QColor]) -> QPixmap:
+    """Render SVG ra QPixmap (không cache)"""
     try:
         # Đọc và modify SVG nếu cần đổi màu
         if color:
@@ -394,7 +468,6 @@ def get_app_icon(app_id: str, size: QSize = DEFAULT_ICON_SIZE) -> QIcon:
 
 # ========== IMAGE UTILITIES ==========
 
-@lru_cache(maxsize=32)
 def load_image(
         path: str,
         size: Optional[QSize] = None,
@@ -414,35 +487,36 @@ def load_image(
     manager = AssetsManager()
 
     # Check cache
-    cache_key = f"img_{path}_{size}_{keep_aspect}"
-    if cache_key in manager._pixmap_cache:
-        return manager._pixmap_cache[cache_key]
+    cache_key = (str(path), *_size_key(size), keep_aspect)
+    stamp = file_stamp(path)
+    cached = manager.cache.get("pixmap", cache_key, stamp)
+    if cached is not None:
+        return cached
 
-    try:
+    def render() -> QPixmap:
         pixmap = QPixmap(path)
+        # Resize nếu cần
+        if size and not pixmap.isNull():
+            pixmap = pixmap.scaled(
+                size,
+                Qt.KeepAspectRatio if keep_aspect else Qt.IgnoreAspectRatio,
+                Qt.SmoothTransformation
+            )
+        return pixmap
+
+    try:
+        if size and stamp is not None:
+            w, h = _size_key(size)
+            pixmap = _render_with_thumbnail(path, f"image:{w}x{h}:{int(keep_aspect)}", stamp, render)
+        else:
+            pixmap = render()
 
         if pixmap.isNull():
             logger.warning(f"Không thể load image: {path}")
             return QPixmap()
 
-        # Resize nếu cần
-        if size:
-            if keep_aspect:
-                pixmap = pixmap.scaled(
-                    size,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-            else:
-                pixmap = pixmap.scaled(
-                    size,
-                    Qt.IgnoreAspectRatio,
-                    Qt.SmoothTransformation
-                )
-
         # Cache
-        manager._pixmap_cache[cache_key] = pixmap
-        return pixmap
+        return manager.cache.put("pixmap", cache_key, pixmap, stamp=stamp)
 
     except Exception as e:
         logger.error(f"Lỗi load image: {e}")
@@ -471,11 +545,6 @@ def load_wallpaper(
     if size is None and 'size' in kwargs:
         size = kwargs['size']
 
-    # Check cache
-    cache_key = f"wallpaper_{name}_{size}"
-    if cache_key in manager._wallpaper_cache:
-        return manager._wallpaper_cache[cache_key]
-
     try:
         # Xác định path
         if os.path.exists(name):
@@ -494,8 +563,31 @@ def load_wallpaper(
                     default_size = size or QSize(1920, 1080)
                     return create_gradient_wallpaper(default_size)
 
-        # Load wallpaper
-        pixmap = QPixmap(str(wallpaper_path))
+        # Check cache
+        scaled = isinstance(size, QSize) and size.width() > 0 and size.height() > 0
+        w, h = _size_key(size) if scaled else (0, 0)
+        cache_key = (str(wallpaper_path), w, h)
+        stamp = file_stamp(wallpaper_path)
+        cached = manager.cache.get("wallpaper", cache_key, stamp)
+        if cached is not None:
+            return cached
+
+        def render() -> QPixmap:
+            pixmap = QPixmap(str(wallpaper_path))
+            # Scale to screen size nếu được chỉ định
+            if scaled and not pixmap.isNull():
+                pixmap = pixmap.scaled(
+                    size,
+                    Qt.KeepAspectRatioByExpanding,
+                    Qt.SmoothTransformation
+                )
+            return pixmap
+
+        # Bản đã scale lưu WebP trên đĩa -> lần sau khỏi decode ảnh gốc
+        if scaled:
+            pixmap = _render_with_thumbnail(wallpaper_path, f"wallpaper:{w}x{h}", stamp, render, lossy=True)
+        else:
+            pixmap = render()
 
         # Kiểm tra pixmap có hợp lệ không
         if pixmap.isNull():
@@ -503,17 +595,8 @@ def load_wallpaper(
             default_size = size or QSize(1920, 1080)
             return create_gradient_wallpaper(default_size)
 
-        # Scale to screen size nếu được chỉ định
-        if size and isinstance(size, QSize) and size.width() > 0 and size.height() > 0:
-            pixmap = pixmap.scaled(
-                size,
-                Qt.KeepAspectRatioByExpanding,
-                Qt.SmoothTransformation
-            )
-
         # Cache pixmap
-        manager._wallpaper_cache[cache_key] = pixmap
-        return pixmap
+        return manager.cache.put("wallpaper", cache_key, pixmap, stamp=stamp)
 
     except Exception as e:
         logger.error(f"Lỗi load wallpaper: {e}")
@@ -641,9 +724,9 @@ def cache_image(key: str, image: Union[QPixmap, QIcon]) -> None:
     manager = AssetsManager()
 
     if isinstance(image, QPixmap):
-        manager._pixmap_cache[key] = image
+        manager.cache.put("pixmap", key, image)
     elif isinstance(image, QIcon):
-        manager._icon_cache[key] = image
+        manager.cache.put("icon", key, image)
 
 
 def get_cached_image(key: str) -> Optional[Union[QPixmap, QIcon]]:
@@ -658,10 +741,10 @@ def get_cached_image(key: str) -> Optional[Union[QPixmap, QIcon]]:
     """
     manager = AssetsManager()
 
-    if key in manager._pixmap_cache:
-        return manager._pixmap_cache[key]
-    elif key in manager._icon_cache:
-        return manager._icon_cache[key]
+    if ("pixmap", key) in manager.cache:
+        return manager.cache.get("pixmap", key)
+    elif ("icon", key) in manager.cache:
+        return manager.cache.get("icon", key)
 
     return None
 
@@ -137,8 +137,17 @@ HOVER_PREVIEW_DELAY = 500    # ms
 TOOLTIP_DELAY = 1000          # ms
 AUTO_HIDE_DURATION = 5000    # ms cho notifications
 AUTO_SAVE_INTERVAL = 60000   # ms (1 phút)
+NOTES_FLUSH_DELAY = 1000     # ms - gom các lần sửa notes liên tiếp thành một lần ghi
+SEARCH_DEBOUNCE_DELAY = 120  # ms - chờ ngừng gõ rồi mới tìm apps trên taskbar
 CLOCK_UPDATE_INTERVAL = 1000 # ms
 WEATHER_UPDATE_INTERVAL = 1800000  # ms (30 phút)
+WEATHER_CACHE_TTL = 600000         # ms - dữ liệu mới hơn 10 phút thì không gọi lại API
+WEATHER_RETRY_DELAY = 60000        # ms - chờ sau lần lỗi đầu, tăng gấp đôi mỗi lần lỗi tiếp
+WEATHER_MAX_BACKOFF = 1800000      # ms - chờ tối đa giữa hai lần thử khi offline
+WEATHER_REQUEST_TIMEOUT = 10       # seconds
+SYSTEM_STATUS_INTERVAL = 5000      # ms - mạng / pin / CPU trên system tray
+NETWORK_PROBE_TIMEOUT = 1.5        # seconds - thử kết nối ra ngoài (chạy trên worker)
+NETWORK_PROBE_MAX_BACKOFF = 300000  # ms - giãn tối đa giữa các lần thử khi offline
 
 # Session
 SESSION_TIMEOUT = 1800  # seconds (30 phút)
@@ -157,6 +166,15 @@ MAX_OPEN_WINDOWS = 30
 MAX_ICONS_PER_ROW = 10
 MAX_ICONS_PER_COLUMN = 7
 
+# Asset cache: ngân sách bộ nhớ (byte) cho từng loại, tính theo width x height x depth
+ASSET_CACHE_BUDGETS = {
+    "icon": 16 * 1024 * 1024,
+    "pixmap": 32 * 1024 * 1024,
+    "svg": 8 * 1024 * 1024,
+    "wallpaper": 160 * 1024 * 1024,  # đủ cho một ảnh gốc ~40MP
+}
+THUMBNAIL_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Cache thumbnail trên đĩa
+
 # ========== DEFAULT VALUES - Giá trị mặc định ==========
 DEFAULT_THEME = "light"
 DEFAULT_WALLPAPER = "default_wallpaper.jpg"
@@ -194,6 +212,8 @@ TILE_WIDE_SIZE = 264      # 4x2 grid cells (wide rectangle)
 TILE_LARGE_SIZE = 264     # 4x4 grid cells
 TILE_SPACING = 4          # Khoảng cách giữa tiles
 TILE_ANIMATION_DURATION = 250  # ms - thời gian animation
+TILE_ANIMATION_FRAME_MS = 16   # ms - một driver chung cho mọi animation của lưới tiles (~60 fps)
+TILE_DELEGATE_CACHE_SIZE = 48  # Số tile đã vẽ sẵn giữ lại ngoài vùng hiển thị (cuộn qua lại không vẽ lại)
 # ========== APP CATEGORIES - Danh mục ứng dụng ==========
 APP_CATEGORIES = {
     "learning": {
@@ -0,0 +1,332 @@
+# ui_qt/windows/dashboard_window_qt/utils/shadows.py
+"""
+Drop shadow dựng sẵn (nine-patch) thay cho QGraphicsDropShadowEffect
+- QGraphicsDropShadowEffect render widget ra pixmap rồi blur lại ở MỖI lần repaint
+- Ở đây: blur một lần cho mỗi (blur, màu, bo góc, devicePixelRatio), cache nine-patch;
+  bóng theo kích thước hình được ghép sẵn một lần -> mỗi frame chỉ còn một drawPixmap
+- Không widget phụ, không event filter: bóng được vẽ trong paintEvent đã có sẵn
+  - draw_shadow(painter, child.geometry(), spec) trong paintEvent của parent
+  - ShadowFrame: container chừa lề cho bóng, tự vẽ bóng dưới .panel
+- Widgets dashboard vẫn dùng effect: benchmark_shadows.py (offscreen) chưa cho thấy lợi
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import logging
+
+from PySide6.QtCore import Qt, QMargins, QRect, QRectF
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import (
+    QFrame, QGraphicsBlurEffect, QGraphicsPixmapItem, QGraphicsScene, QVBoxLayout, QWidget
+)
+
+from .asset_cache import ByteLRUCache
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Nine-patch rất nhỏ (vài KB) -> 4MB đủ cho hàng trăm kiểu bóng
+SHADOW_CACHE_BUDGET = 4 * 1024 * 1024
+# Bóng ghép sẵn theo kích thước hình (hình cùng cỡ dùng chung một pixmap)
+SHADOW_FRAME_CACHE_BUDGET = 8 * 1024 * 1024
+
+_cache = ByteLRUCache({"shadow": SHADOW_CACHE_BUDGET, "frame": SHADOW_FRAME_CACHE_BUDGET})
+
+# Chiều dài ô lát cạnh (logical px)
+EDGE_TILE = 32
+
+
+@dataclass(frozen=True)
+class ShadowSpec:
+    """Tham số bóng (cùng ý nghĩa với QGraphicsDropShadowEffect)"""
+    blur_radius: int = 20
+    offset: Tuple[int, int] = (0, 5)
+    color: Tuple[int, int, int, int] = (0, 0, 0, 100)  # rgba
+    corner_radius: int = 0
+
+    @classmethod
+    def create(cls, blur_radius: int = 20, offset: Tuple[int, int] = (0, 5),
+               color: QColor = QColor(0, 0, 0, 100), corner_radius: int = 0) -> "ShadowSpec":
+        color = QColor(color)
+        return cls(max(0, int(blur_radius)), (int(offset[0]), int(offset[1])),
+                   (color.red(), color.green(), color.blue(), color.alpha()),
+                   max(0, int(corner_radius)))
+
+    @property
+    def extent(self) -> int:
+        """Bóng lan ra ngoài cạnh hình bao nhiêu px (trước khi cộng offset)"""
+        return self.blur_radius
+
+
+def shadow_margins(spec: ShadowSpec) -> QMargins:
+    """Lề cần chừa quanh hình chữ nhật để bóng không bị cắt"""
+    e = spec.extent
+    dx, dy = spec.offset
+    return QMargins(max(0, e - dx), max(0, e - dy), max(0, e + dx), max(0, e + dy))
+
+
+def shadow_rect(rect: QRect, spec: ShadowSpec) -> QRect:
+    """Vùng bóng của rect chiếm (để parent gọi update() đúng chỗ khi hình di chuyển)"""
+    return QRect(rect).marginsAdded(shadow_margins(spec))
+
+
+# ========== NINE-PATCH ==========
+
+def _corner(spec: ShadowSpec) -> int:
+    """Cạnh một ô góc (logical px): phần bóng ngoài + bo góc + phần bóng mờ dần vào trong"""
+    return 2 * spec.extent + spec.corner_radius
+
+
+def _blur(image: QImage, radius: float) -> QImage:
+    """Blur bằng chính QGraphicsBlurEffect (cùng thuật toán với drop shadow effect)"""
+    if radius <= 0:
+        return image
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(image))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(radius)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+
+    result = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
+    result.fill(Qt.transparent)
+    painter = QPainter(result)
+    bounds = QRectF(0, 0, image.width(), image.height())
+    scene.render(painter, bounds, bounds)
+    painter.end()
+    return result
+
+
+def _build_nine_patch(spec: ShadowSpec, dpr: float) -> QPixmap:
+    corner = _corner(spec)
+    side = 2 * corner + EDGE_TILE  # phần giữa = một ô lát cho cạnh
+    device_side = max(1, round(side * dpr))
+
+    image = QImage(device_side, device_side, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.scale(dpr, dpr)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(*spec.color))
+    inset = spec.extent
+    shape = QRectF(inset, inset, side - 2 * inset, side - 2 * inset)
+    if spec.corner_radius:
+        painter.drawRoundedRect(shape, spec.corner_radius, spec.corner_radius)
+    else:
+        painter.drawRect(shape)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(_blur(image, spec.blur_radius * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+class _ShadowTiles:
+    """Nine-patch đã cắt sẵn: 4 góc vẽ 1:1, 4 cạnh lát bằng drawTiledPixmap, tâm tô màu phẳng"""
+
+    def __init__(self, spec: ShadowSpec, dpr: float):
+        self.corner = _corner(spec)
+        self.patch = _build_nine_patch(spec, dpr)
+        self.center = QColor(*spec.color)
+
+        c, t = self.corner, EDGE_TILE
+        self.scale = self.patch.width() / (2 * c + t)  # device px / logical px
+
+        def piece(x, y, w, h):
+            part = self.patch.copy(QRectF(x * self.scale, y * self.scale,
+                                          w * self.scale, h * self.scale).toRect())
+            part.setDevicePixelRatio(dpr)
+            return part
+
+        # (trên-trái, trên-phải, dưới-trái, dưới-phải), (trên, dưới, trái, phải)
+        self.corners = (piece(0, 0, c, c), piece(c + t, 0, c, c),
+                        piece(0, c + t, c, c), piece(c + t, c + t, c, c))
+        self.edges = (piece(c, 0, t, c), piece(c, c + t, t, c),
+                      piece(0, c, c, t), piece(c + t, c, c, t))
+        self.cost = self.patch.width() * self.patch.height() * 4 * 2
+
+
+def shadow_tiles(spec: ShadowSpec, dpr: float = 1.0) -> _ShadowTiles:
+    """Nine-patch đã blur cho spec (offset không ảnh hưởng -> dùng chung cache)"""
+    key = (spec.blur_radius, spec.color, spec.corner_radius, round(dpr, 2))
+    tiles = _cache.get("shadow", key)
+    if tiles is None:
+        tiles = _ShadowTiles(spec, dpr)
+        _cache.put("shadow", key, tiles, cost=tiles.cost)
+    return tiles
+
+
+def shadow_pixmap(spec: ShadowSpec, width: int, height: int, dpr: float = 1.0) -> QPixmap:
+    """
+    Bóng của hình width x height ghép sẵn thành một pixmap (cỡ hình + shadow_margins)
+
+    Ghép từ nine-patch một lần cho mỗi kích thước; các frame sau chỉ drawPixmap
+    """
+    key = (spec, width, height, round(dpr, 2))
+    pixmap = _cache.get("frame", key)
+    if pixmap is None:
+        margins = shadow_margins(spec)
+        outer_w = width + margins.left() + margins.right()
+        outer_h = height + margins.top() + margins.bottom()
+        pixmap = QPixmap(max(1, round(outer_w * dpr)), max(1, round(outer_h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        paint_shadow(painter, QRect(margins.left(), margins.top(), width, height), spec, dpr)
+        painter.end()
+        _cache.put("frame", key, pixmap, cost=pixmap.width() * pixmap.height() * 4)
+    return pixmap
+
+
+def cache_stats():
+    return _cache.stats()["shadow"]
+
+
+def frame_cache_stats():
+    return _cache.stats()["frame"]
+
+
+def clear_cache():
+    _cache.clear()
+
+
+# ========== PAINT ==========
+
+def _device_dpr(painter: QPainter) -> float:
+    device = painter.device()
+    return device.devicePixelRatioF() if device is not None else 1.0
+
+
+def draw_shadow(painter: QPainter, rect: QRect, spec: ShadowSpec, dpr: Optional[float] = None,
+                exposed: Optional[QRect] = None):
+    """
+    Vẽ bóng của hình chữ nhật rect (tọa độ của painter) bằng pixmap ghép sẵn
+
+    Gọi trong paintEvent của parent trước khi con tự vẽ, vd. với rect = child.geometry();
+    exposed = event.rect() -> chỉ blend phần cần vẽ lại (hover / đổi nội dung của con)
+    """
+    if rect.isEmpty() or spec.color[3] == 0:
+        return
+    target = shadow_rect(rect, spec)
+    if exposed is not None:
+        target = target.intersected(exposed)
+        if target.isEmpty():
+            return
+    if dpr is None:
+        dpr = _device_dpr(painter)
+    pixmap = shadow_pixmap(spec, rect.width(), rect.height(), dpr)
+    margins = shadow_margins(spec)
+    source = target.translated(margins.left() - rect.x(), margins.top() - rect.y())
+    painter.drawPixmap(target, pixmap, QRect(round(source.x() * dpr), round(source.y() * dpr),
+                                             round(source.width() * dpr), round(source.height() * dpr)))
+
+
+def paint_shadow(painter: QPainter, rect: QRect, spec: ShadowSpec, dpr: Optional[float] = None):
+    """
+    Vẽ bóng của rect trực tiếp từ nine-patch (không cache theo kích thước)
+
+    Dùng khi kích thước đổi liên tục (animation resize); phần tâm cũng được tô
+    như effect: nhìn thấy được qua nền bán trong suốt
+    """
+    if rect.isEmpty() or spec.color[3] == 0:
+        return
+    if dpr is None:
+        dpr = _device_dpr(painter)
+
+    tiles = shadow_tiles(spec, dpr)
+    c = tiles.corner
+    e = spec.extent
+    outer = QRect(rect).translated(*spec.offset).adjusted(-e, -e, e, e)
+    x0, y0 = outer.x(), outer.y()
+    mid_w = outer.width() - 2 * c
+    mid_h = outer.height() - 2 * c
+
+    if mid_w < 0 or mid_h < 0:
+        _paint_scaled(painter, tiles, outer)
+        return
+
+    x1, y1 = x0 + c + mid_w, y0 + c + mid_h
+    painter.drawPixmap(x0, y0, tiles.corners[0])
+    painter.drawPixmap(x1, y0, tiles.corners[1])
+    painter.drawPixmap(x0, y1, tiles.corners[2])
+    painter.drawPixmap(x1, y1, tiles.corners[3])
+    if mid_w:
+        painter.drawTiledPixmap(QRect(x0 + c, y0, mid_w, c), tiles.edges[0])
+        painter.drawTiledPixmap(QRect(x0 + c, y1, mid_w, c), tiles.edges[1])
+    if mid_h:
+        painter.drawTiledPixmap(QRect(x0, y0 + c, c, mid_h), tiles.edges[2])
+        painter.drawTiledPixmap(QRect(x1, y0 + c, c, mid_h), tiles.edges[3])
+    if mid_w and mid_h:
+        painter.fillRect(QRect(x0 + c, y0 + c, mid_w, mid_h), tiles.center)
+
+
+def _paint_scaled(painter: QPainter, tiles: _ShadowTiles, outer: QRect):
+    """Hình nhỏ hơn hai góc: co cả patch lại (bóng vẫn liền mạch, chỉ bớt mềm)"""
+    c = tiles.corner
+    cw = min(c, outer.width() // 2)
+    ch = min(c, outer.height() // 2)
+    mid_w = outer.width() - 2 * cw
+    mid_h = outer.height() - 2 * ch
+
+    x0, y0 = outer.x(), outer.y()
+    xs = (x0, x0 + cw, x0 + cw + mid_w)
+    ys = (y0, y0 + ch, y0 + ch + mid_h)
+    ws = (cw, mid_w, cw)
+    hs = (ch, mid_h, ch)
+    # Vùng nguồn (logical px trong patch): góc, 1 px giữa ô lát, góc
+    src_pos = (0, c, c + EDGE_TILE)
+    src_len = (c, 1, c)
+
+    smooth = painter.testRenderHint(QPainter.SmoothPixmapTransform)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+    scale = tiles.scale
+    for row in range(3):
+        if hs[row] <= 0:
+            continue
+        for col in range(3):
+            if ws[col] <= 0:
+                continue
+            source = QRectF(src_pos[col] * scale, src_pos[row] * scale,
+                            src_len[col] * scale, src_len[row] * scale)
+            painter.drawPixmap(QRectF(xs[col], ys[row], ws[col], hs[row]), tiles.patch, source)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform, smooth)
+
+
+# ========== SHADOW FRAME ==========
+
+class ShadowFrame(QWidget):
+    """
+    Container có bóng: chừa lề shadow_margins quanh .panel và vẽ bóng trong lề đó
+
+    Đặt layout / stylesheet vào .panel. Là cửa sổ top-level thì nền trong suốt;
+    là widget con thì di chuyển cả frame (bóng đi theo, không cần theo dõi geometry)
+    """
+
+    def __init__(self, spec: ShadowSpec = ShadowSpec(), parent=None, flags=Qt.WindowType(0)):
+        super().__init__(parent, flags)
+        self.spec = spec
+        if self.isWindow():
+            self.setAttribute(Qt.WA_TranslucentBackground)
+
+        self.panel = QFrame(self)
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(shadow_margins(spec))
+        self._layout.setSpacing(0)
+        self._layout.addWidget(self.panel)
+
+    def shadow_margins(self) -> QMargins:
+        return shadow_margins(self.spec)
+
+    def set_spec(self, spec: ShadowSpec):
+        if spec == self.spec:
+            return
+        self.spec = spec
+        self._layout.setContentsMargins(shadow_margins(spec))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        draw_shadow(painter, self.panel.geometry(), self.spec, exposed=event.rect())
+        painter.end()
@@ -0,0 +1,94 @@
+# ui_qt/windows/dashboard_window_qt/utils/startup_profiler.py
+"""
+Đo thời gian khởi động Dashboard theo từng giai đoạn
+Ghi wall time của mỗi phase vào log và tổng hợp time-to-interactive
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Any
+import logging
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Mục tiêu time-to-interactive trên ổ đĩa "ấm" (ms)
+STARTUP_TARGET_MS = 1000
+
+
+class StartupTimeline:
+    """
+    Timeline khởi động: các phase (có thời lượng) và các mốc (mark)
+    tính từ lúc tạo timeline (hoặc lần reset gần nhất)
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []  # (name, start_ms, duration_ms)
+        self.marks: Dict[str, float] = {}  # name -> ms từ t0
+
+    def reset(self):
+        """Bắt đầu đo lại từ thời điểm hiện tại"""
+        self._t0 = time.perf_counter()
+        self.phases.clear()
+        self.marks.clear()
+
+    def elapsed_ms(self) -> float:
+        """Thời gian từ t0 tới hiện tại (ms)"""
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Đo một giai đoạn khởi động
+
+        Usage:
+            with startup_timeline.phase("database"):
+                db = DatabaseManager()
+        """
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            duration = self.elapsed_ms() - start
+            self.phases.append((name, start, duration))
+            logger.info(f"[startup] {name}: {duration:.1f} ms (t={start + duration:.1f} ms)")
+
+    def mark(self, name: str) -> float:
+        """Ghi lại một mốc (vd: first_frame, interactive), trả về ms từ t0"""
+        at = self.elapsed_ms()
+        self.marks[name] = at
+        logger.info(f"[startup] mark {name} at {at:.1f} ms")
+        return at
+
+    def time_to_interactive(self) -> Optional[float]:
+        """Mốc 'interactive' (ms) nếu đã có"""
+        return self.marks.get("interactive")
+
+    def summary(self) -> Dict[str, Any]:
+        """Tổng hợp timeline dạng dict"""
+        return {
+            'phases': [
+                {'name': name, 'start_ms': round(start, 1), 'duration_ms': round(duration, 1)}
+                for name, start, duration in self.phases
+            ],
+            'marks': {name: round(at, 1) for name, at in self.marks.items()},
+            'time_to_interactive_ms': self.time_to_interactive(),
+            'target_ms': STARTUP_TARGET_MS
+        }
+
+    def log_summary(self):
+        """Ghi toàn bộ timeline vào log, cảnh báo nếu vượt mục tiêu"""
+        logger.info("[startup] ===== Startup timeline =====")
+        for name, start, duration in self.phases:
+            logger.info(f"[startup] {start:8.1f} ms  +{duration:7.1f} ms  {name}")
+        for name, at in sorted(self.marks.items(), key=lambda item: item[1]):
+            logger.info(f"[startup] {at:8.1f} ms  mark        {name}")
+
+        tti = self.time_to_interactive()
+        if tti is not None and tti > STARTUP_TARGET_MS:
+            logger.warning(f"[startup] Time-to-interactive {tti:.0f} ms vượt mục tiêu {STARTUP_TARGET_MS} ms")
+
+
+# Timeline dùng chung cho cả quá trình khởi động
+startup_timeline = StartupTimeline()
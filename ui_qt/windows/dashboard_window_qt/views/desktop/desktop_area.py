@@ -46,6 +46,9 @@ from ...utils.helpers import (
 from ...repositories.app_repository import AppRepository, AppModel
 from ...repositories.settings_repository import SettingsRepository
 
+from .wallpaper_renderer import WallpaperRenderer
+from .icon_grid_index import IconGridIndex
+
 # Logger
 logger = logging.getLogger(__name__)
 
@@ -78,8 +81,10 @@ class DesktopArea(QWidget):
 
         # Desktop state
         self.wallpaper_path = ""
-        self.wallpaper_pixmap = None
+        self.wallpaper_pixmap = None  # ảnh gốc full-resolution
         self.wallpaper_mode = "fill"  # fill, fit, stretch, tile, center
+        self.wallpaper_renderer = WallpaperRenderer(self)
+        self.wallpaper_renderer.updated.connect(self.update)
 
         # Icons management
         self.desktop_icons = {}  # {id: DesktopIcon}
@@ -95,6 +100,9 @@ class DesktopArea(QWidget):
         self.grid_spacing = DESKTOP_GRID_SPACING
         self.auto_arrange = False
 
+        # Spatial index theo vị trí đích của icons (chỗ trống, hit-test, rubber band)
+        self.icon_index = IconGridIndex(self.grid_size, self.grid_spacing)
+
         # Selection
         self.selection_start = None
         self.selection_rect = QRect()
@@ -193,16 +201,11 @@ class DesktopArea(QWidget):
             mode: fill, fit, stretch, tile, center
         """
         try:
-            # Load wallpaper
+            # Load wallpaper (giữ full-resolution, renderer scale theo kích thước widget)
             self.wallpaper_pixmap = load_wallpaper(path)
-            if not self.wallpaper_pixmap.isNull():
-                self.wallpaper_pixmap = self.wallpaper_pixmap.scaled(
-                    self.size(),
-                    Qt.KeepAspectRatioByExpanding,
-                    Qt.SmoothTransformation
-                )
             self.wallpaper_path = path
             self.wallpaper_mode = mode
+            self.wallpaper_renderer.set_source(path, self.wallpaper_pixmap, mode)
 
             # Force repaint
             self.update()
@@ -238,6 +241,9 @@ class DesktopArea(QWidget):
         painter.fillRect(self.wallpaper_pixmap.rect(), QBrush(gradient))
         painter.end()
 
+        self.wallpaper_renderer.set_source("default", self.wallpaper_pixmap, self.wallpaper_mode)
+        self.update()
+
     def change_wallpaper(self):
         """Mở dialog chọn wallpaper"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -257,9 +263,9 @@ class DesktopArea(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        # Draw wallpaper
-        if self.wallpaper_pixmap:
-            self._draw_wallpaper(painter)
+        # Draw wallpaper (chỉ vùng cần vẽ lại)
+        if self.wallpaper_renderer.has_source():
+            self._draw_wallpaper(painter, event.rect())
 
         # Draw grid (if enabled and in design mode)
         if self.grid_enabled and hasattr(self, 'show_grid') and self.show_grid:
@@ -269,49 +275,14 @@ class DesktopArea(QWidget):
         if self.is_selecting and not self.selection_rect.isNull():
             self._draw_selection_rect(painter)
 
-    def _draw_wallpaper(self, painter: QPainter):
-        """Vẽ wallpaper theo mode"""
-        rect = self.rect()
+    def _draw_wallpaper(self, painter: QPainter, rect: QRect):
+        """
+        Vẽ wallpaper theo mode
 
-        if self.wallpaper_mode == "fill":
-            # Scale to fill (keep aspect ratio, crop if needed)
-            scaled = self.wallpaper_pixmap.scaled(
-                rect.size(),
-                Qt.KeepAspectRatioByExpanding,
-                Qt.SmoothTransformation
-            )
-            # Center and draw
-            x = (rect.width() - scaled.width()) // 2
-            y = (rect.height() - scaled.height()) // 2
-            painter.drawPixmap(x, y, scaled)
-
-        elif self.wallpaper_mode == "fit":
-            # Scale to fit (keep aspect ratio, may have borders)
-            scaled = self.wallpaper_pixmap.scaled(
-                rect.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            # Center and draw
-            x = (rect.width() - scaled.width()) // 2
-            y = (rect.height() - scaled.height()) // 2
-            painter.drawPixmap(x, y, scaled)
-
-        elif self.wallpaper_mode == "stretch":
-            # Stretch to fill (ignore aspect ratio)
-            painter.drawPixmap(rect, self.wallpaper_pixmap)
-
-        elif self.wallpaper_mode == "tile":
-            # Tile wallpaper
-            for x in range(0, rect.width(), self.wallpaper_pixmap.width()):
-                for y in range(0, rect.height(), self.wallpaper_pixmap.height()):
-                    painter.drawPixmap(x, y, self.wallpaper_pixmap)
-
-        elif self.wallpaper_mode == "center":
-            # Center without scaling
-            x = (rect.width() - self.wallpaper_pixmap.width()) // 2
-            y = (rect.height() - self.wallpaper_pixmap.height()) // 2
-            painter.drawPixmap(x, y, self.wallpaper_pixmap)
+        Pixmap đã được WallpaperRenderer dựng sẵn đúng kích thước * devicePixelRatio,
+        ở đây chỉ copy vùng rect (không scale trong paintEvent)
+        """
+        self.wallpaper_renderer.paint(painter, rect, self.size(), self.devicePixelRatioF())
 
     def _draw_grid(self, painter: QPainter):
         """Vẽ lưới căn chỉnh"""
@@ -393,19 +364,19 @@ class DesktopArea(QWidget):
 
             # Store reference
             self.desktop_icons[app.id] = icon_widget
-            self.icon_positions[app.id] = position
-
+            self._set_icon_position(app.id, position)
 
         except Exception as e:
             logger.error(f"Error adding desktop icon: {e}")
 
-    def add_file_icon(self, file_path: str, position: QPoint = None):
+    def add_file_icon(self, file_path: str, position: QPoint = None, snap: bool = True):
         """
         Thêm icon file/folder lên desktop
 
         Args:
             file_path: Đường dẫn file
             position: Vị trí
+            snap: Căn position theo lưới (False khi position đã là slot của icon_index)
         """
         try:
             from ..widgets.app_icon_widget import AppIconWidget
@@ -430,7 +401,7 @@ class DesktopArea(QWidget):
             # Set position
             if not position:
                 position = self._find_empty_position()
-            elif self.grid_enabled:
+            elif snap and self.grid_enabled:
                 position = snap_to_grid(position, self.grid_size)
 
             icon_widget.move(position)
@@ -438,11 +409,29 @@ class DesktopArea(QWidget):
 
             # Store reference
             self.desktop_icons[file_path] = icon_widget
-            self.icon_positions[file_path] = position
+            self._set_icon_position(file_path, position)
 
         except Exception as e:
             logger.error(f"Error adding file icon: {e}")
 
+    def add_file_icons(self, file_paths: List[str], position: QPoint = None):
+        """
+        Thêm nhiều file cùng lúc (thả nhiều file)
+
+        Lấy trước len(file_paths) slot trống từ icon_index, bắt đầu gần điểm thả,
+        để mỗi file một chỗ riêng
+
+        Args:
+            file_paths: Danh sách đường dẫn
+            position: Điểm thả (None = các slot trống đầu tiên)
+        """
+        self._sync_grid_bounds()
+        slots = self.icon_index.free_slots(len(file_paths), position)
+        slots += [None] * (len(file_paths) - len(slots))
+
+        for file_path, slot in zip(file_paths, slots):
+            self.add_file_icon(file_path, slot, snap=False)
+
     def remove_desktop_icon(self, icon_id: str):
         """Xóa icon khỏi desktop"""
         if icon_id in self.desktop_icons:
@@ -452,35 +441,31 @@ class DesktopArea(QWidget):
 
             if icon_id in self.icon_positions:
                 del self.icon_positions[icon_id]
+            self.icon_index.remove(icon_id)
 
-    def _find_empty_position(self) -> QPoint:
-        """Tìm vị trí trống cho icon mới"""
-        # Start from top-left
-        x, y = self.grid_spacing, self.grid_spacing
-
-        # Check each grid position
-        while y < self.height() - DESKTOP_ICON_HEIGHT:
-            while x < self.width() - DESKTOP_ICON_WIDTH:
-                pos = QPoint(x, y)
-
-                # Check if position is occupied
-                occupied = False
-                for existing_pos in self.icon_positions.values():
-                    if (abs(existing_pos.x() - x) < DESKTOP_ICON_WIDTH and
-                            abs(existing_pos.y() - y) < DESKTOP_ICON_HEIGHT):
-                        occupied = True
-                        break
+    def icon_at(self, pos: QPoint) -> Optional[str]:
+        """icon_id tại pos (hit-test qua icon_index), None nếu là chỗ trống"""
+        for icon_id in self.icon_index.query_point(pos):
+            if icon_id in self.desktop_icons:
+                return icon_id
+        return None
 
-                if not occupied:
-                    return pos
+    def _set_icon_position(self, icon_id: str, position: QPoint):
+        """Cập nhật icon_positions và icon_index cùng lúc"""
+        self.icon_positions[icon_id] = position
+        self.icon_index.add(icon_id, QRect(position, QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT)))
 
-                x += self.grid_size
+    def _sync_grid_bounds(self):
+        """Lưới slot theo kích thước desktop hiện tại"""
+        self.icon_index.set_bounds(self.width(), self.height())
 
-            x = self.grid_spacing
-            y += self.grid_size
+    def _find_empty_position(self) -> QPoint:
+        """Tìm vị trí trống cho icon mới (con trỏ free-list của icon_index)"""
+        self._sync_grid_bounds()
+        position = self.icon_index.find_free_slot()
 
         # Default position if no space
-        return QPoint(self.grid_spacing, self.grid_spacing)
+        return position or QPoint(self.grid_spacing, self.grid_spacing)
 
     def arrange_icons(self, sort_by: str = "name"):
         """
@@ -517,6 +502,11 @@ class DesktopArea(QWidget):
             # Update position
             self.icon_positions[icon_id] = new_pos
 
+        self.icon_index.rebuild(
+            (icon_id, QRect(pos, QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT)))
+            for icon_id, pos in self.icon_positions.items()
+        )
+
         # Save positions
         self.save_icon_positions()
 
@@ -553,7 +543,7 @@ class DesktopArea(QWidget):
                 if icon_id in saved_positions:
                     x, y = saved_positions[icon_id]
                     widget.move(QPoint(x, y))
-                    self.icon_positions[icon_id] = QPoint(x, y)
+                    self._set_icon_position(icon_id, QPoint(x, y))
 
         except Exception as e:
             logger.error(f"Error restoring icon positions: {e}")
@@ -603,7 +593,7 @@ class DesktopArea(QWidget):
     def mouseDoubleClickEvent(self, event: QMouseEvent):
         """Xử lý double click trên desktop"""
         # Check if clicked on empty area
-        if not self.childAt(event.pos()):
+        if self.icon_at(event.pos()) is None:
             # Could open a launcher or do nothing
             pass
 
@@ -611,15 +601,18 @@ class DesktopArea(QWidget):
 
     def _select_icons_in_rect(self, rect: QRect):
         """Chọn các icon trong vùng chọn"""
-        self.selected_icons.clear()
-
-        for icon_id, widget in self.desktop_icons.items():
-            if rect.intersects(widget.geometry()):
-                widget.set_selected(True)
-                self.selected_icons.append(icon_id)
-            else:
-                widget.set_selected(False)
-
+        # Chỉ xét các ô lưới mà rect phủ, bỏ chọn những icon vừa ra khỏi rect
+        hits = [icon_id for icon_id in self.icon_index.query_rect(rect)
+                if icon_id in self.desktop_icons]
+        hit_set = set(hits)
+
+        for icon_id in self.selected_icons:
+            if icon_id not in hit_set and icon_id in self.desktop_icons:
+                self.desktop_icons[icon_id].set_selected(False)
+        for icon_id in hits:
+            self.desktop_icons[icon_id].set_selected(True)
+
+        self.selected_icons = hits
         self.icon_selected.emit(self.selected_icons)
 
     def clear_selection(self):
@@ -703,17 +696,14 @@ class DesktopArea(QWidget):
     def dropEvent(self, event: QDropEvent):
         """Xử lý drop files"""
         if event.mimeData().hasUrls():
-            file_paths = []
-
-            for url in event.mimeData().urls():
-                if url.isLocalFile():
-                    file_path = url.toLocalFile()
-                    file_paths.append(file_path)
-
-                    # Add icon for dropped file
-                    self.add_file_icon(file_path, event.pos())
+            file_paths = [
+                url.toLocalFile() for url in event.mimeData().urls()
+                if url.isLocalFile()
+            ]
 
             if file_paths:
+                # Mỗi file một slot trống riêng, bắt đầu gần điểm thả
+                self.add_file_icons(file_paths, event.position().toPoint())
                 self.file_dropped.emit(file_paths)
 
             event.acceptProposedAction()
@@ -780,6 +770,8 @@ class DesktopArea(QWidget):
 
         self.desktop_icons.clear()
         self.selected_icons.clear()
+        self.icon_positions.clear()
+        self.icon_index.clear()
 
         # Reload
         self._load_desktop_icons()
@@ -832,13 +824,8 @@ class DesktopArea(QWidget):
         if hasattr(self, 'icon_container'):
             self.icon_container.resize(self.size())
 
-        # Reload wallpaper at new size
-        if self.wallpaper_path:
-            self.wallpaper_pixmap = load_wallpaper(
-                self.wallpaper_path,
-                self.size()
-            )
-            self.update()
+        # Preview nhanh ngay, bản smooth dựng trên thread pool khi resize dừng
+        self.wallpaper_renderer.resize(self.size(), self.devicePixelRatioF(), live=True)
 
     # ========== CLEANUP ==========
 
@@ -868,33 +855,7 @@ class DesktopArea(QWidget):
             test_icon.show()
 
             self.desktop_icons["test"] = test_icon
+            self._set_icon_position("test", QPoint(50, 50))
 
         except Exception as e:
             logger.error(f"Không thể tạo test icon: {e}")
-
-    # Tìm vị trí trống cho icon mới
-    def _find_empty_position(self) -> QPoint:
-        """Tìm vị trí trống cho icon mới"""
-        start_x, start_y = 50, 50
-        cols = 4  # Số cột
-        spacing = 120  # Khoảng cách giữa icons
-
-        for row in range(10):  # Tối đa 10 hàng
-            for col in range(cols):
-                x = start_x + col * spacing
-                y = start_y + row * 100
-                position = QPoint(x, y)
-
-                # Kiểm tra vị trí có bị trùng không
-                occupied = False
-                for existing_pos in self.icon_positions.values():
-                    if (abs(existing_pos.x() - x) < 80 and
-                            abs(existing_pos.y() - y) < 80):
-                        occupied = True
-                        break
-
-                if not occupied:
-                    return position
-
-        # Nếu không tìm được, trả về vị trí mặc định
-        return QPoint(start_x, start_y)
\ No newline at end of file
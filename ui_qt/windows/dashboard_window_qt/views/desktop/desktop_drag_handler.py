@@ -8,7 +8,7 @@ import os
 import shutil
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple, Any, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
@@ -30,6 +30,7 @@ from PySide6.QtGui import (
 
 # Import widgets
 from ..widgets.app_icon_widget import AppIconWidget
+from .icon_grid_index import IconGridIndex
 
 # Import utils
 from ...utils.constants import (
@@ -97,7 +98,7 @@ class DropZone:
     rect: QRect
     widget: Optional[QWidget] = None
     accepts_types: List[DragType] = None
-    highlight_color: QColor = QColor(0, 120, 215, 50)
+    highlight_color: QColor = field(default_factory=lambda: QColor(0, 120, 215, 50))
 
     def __post_init__(self):
         if self.accepts_types is None:
@@ -144,9 +145,12 @@ class DesktopDragHandler(QObject):
         self.drag_preview = DragPreview(self.desktop)
         self.rubber_band: Optional[QRubberBand] = None
 
-        # Drop zones
+        # Drop zones (đánh chỉ mục theo ô lưới; key tăng dần = thứ tự thêm)
         self.drop_zones: List[DropZone] = []
         self.active_drop_zone: Optional[DropZone] = None
+        self._zone_index = IconGridIndex(DESKTOP_GRID_SIZE)
+        self._zone_keys: Dict[int, DropZone] = {}
+        self._next_zone_key = 0
 
         # Selection
         self.selected_items: List[Any] = []
@@ -726,21 +730,25 @@ class DesktopDragHandler(QObject):
         )
 
         self.drop_zones.append(zone)
+        self._zone_keys[self._next_zone_key] = zone
+        self._zone_index.add(self._next_zone_key, rect)
+        self._next_zone_key += 1
         return zone
 
     def remove_drop_zone(self, zone: DropZone):
         """Remove a drop zone"""
         if zone in self.drop_zones:
             self.drop_zones.remove(zone)
+        for key, indexed in list(self._zone_keys.items()):
+            if indexed is zone:
+                del self._zone_keys[key]
+                self._zone_index.remove(key)
 
     def _update_active_drop_zone(self, position: QPoint):
         """Update active drop zone based on position"""
-        new_zone = None
-
-        for zone in self.drop_zones:
-            if zone.rect.contains(position):
-                new_zone = zone
-                break
+        # Zone thêm trước được ưu tiên khi chồng nhau (như duyệt danh sách)
+        keys = self._zone_index.query_point(position)
+        new_zone = self._zone_keys[min(keys)] if keys else None
 
         if new_zone != self.active_drop_zone:
             # Unhighlight old zone
@@ -2,6 +2,7 @@
 """
 Desktop Icon Manager - Quản lý icons trên desktop
 Xử lý thêm, xóa, sắp xếp, lưu/khôi phục vị trí icons
+Vị trí icons được đánh chỉ mục trong IconGridIndex (tìm chỗ trống, hit-test, rubber band)
 """
 
 import os
@@ -28,6 +29,7 @@ from PySide6.QtGui import QIcon, QAction, QPixmap
 from ..widgets.app_icon_widget import (
     AppIconWidget, FileIconWidget, ShortcutIconWidget
 )
+from .icon_grid_index import IconGridIndex
 
 # Import utils
 from ...utils.constants import (
@@ -127,6 +129,9 @@ class DesktopIconManager(QObject):
         self.grid_spacing = DESKTOP_ICON_SPACING
         self.arrange_mode = ArrangeMode.GRID
 
+        # Spatial index theo vị trí đích của icons (cập nhật khi add / move / remove)
+        self.grid_index = IconGridIndex(self.grid_size, self.grid_spacing)
+
         # Animation
         self.animations = []
 
@@ -212,10 +217,7 @@ class DesktopIconManager(QObject):
             self._connect_icon_signals(icon_widget, app.id)
 
             # Determine position
-            if position is None:
-                position = self._find_empty_position()
-            elif self.grid_enabled:
-                position = snap_to_grid(position, self.grid_size)
+            position = self._resolve_position(position)
 
             # Place icon
             icon_widget.move(position)
@@ -223,7 +225,7 @@ class DesktopIconManager(QObject):
 
             # Store references
             self.icons[app.id] = icon_widget
-            self.icon_positions[app.id] = position
+            self._set_icon_position(app.id, position)
             self.icon_types[app.id] = IconType.APP
             self.icon_data[app.id] = {
                 'app_model': app,
@@ -246,7 +248,8 @@ class DesktopIconManager(QObject):
     def add_file_icon(
             self,
             file_path: str,
-            position: QPoint = None
+            position: QPoint = None,
+            snap: bool = True
     ) -> Optional[str]:
         """
         Add file/folder icon to desktop
@@ -254,6 +257,7 @@ class DesktopIconManager(QObject):
         Args:
             file_path: Path to file/folder
             position: Desired position
+            snap: Snap position to grid (False khi position đã là slot trống)
 
         Returns:
             icon_id if successful
@@ -292,10 +296,7 @@ class DesktopIconManager(QObject):
             self._connect_icon_signals(icon_widget, icon_id)
 
             # Determine position
-            if position is None:
-                position = self._find_empty_position()
-            elif self.grid_enabled:
-                position = snap_to_grid(position, self.grid_size)
+            position = self._resolve_position(position, snap)
 
             # Place icon
             icon_widget.move(position)
@@ -303,7 +304,7 @@ class DesktopIconManager(QObject):
 
             # Store references
             self.icons[icon_id] = icon_widget
-            self.icon_positions[icon_id] = position
+            self._set_icon_position(icon_id, position)
             self.icon_types[icon_id] = IconType.FOLDER if path.is_dir() else IconType.FILE
             self.icon_data[icon_id] = {
                 'file_path': file_path,
@@ -324,6 +325,34 @@ class DesktopIconManager(QObject):
             logger.error(f"Error adding file icon: {e}")
             return None
 
+    def add_file_icons(
+            self,
+            file_paths: List[str],
+            position: QPoint = None
+    ) -> List[str]:
+        """
+        Add many file icons at once (thả nhiều file)
+
+        Lấy trước len(file_paths) slot trống từ grid index, bắt đầu gần điểm thả
+
+        Args:
+            file_paths: Paths to files/folders
+            position: Drop position (None = first empty slots)
+
+        Returns:
+            icon_ids added
+        """
+        self._sync_grid_bounds()
+        slots = self.grid_index.free_slots(len(file_paths), position)
+        slots += [None] * (len(file_paths) - len(slots))
+
+        added = []
+        for file_path, slot in zip(file_paths, slots):
+            icon_id = self.add_file_icon(file_path, slot, snap=slot is None)
+            if icon_id:
+                added.append(icon_id)
+        return added
+
     def add_shortcut_icon(
             self,
             target: str,
@@ -376,10 +405,7 @@ class DesktopIconManager(QObject):
             self._connect_icon_signals(icon_widget, icon_id)
 
             # Position
-            if position is None:
-                position = self._find_empty_position()
-            elif self.grid_enabled:
-                position = snap_to_grid(position, self.grid_size)
+            position = self._resolve_position(position)
 
             # Place
             icon_widget.move(position)
@@ -387,7 +413,7 @@ class DesktopIconManager(QObject):
 
             # Store
             self.icons[icon_id] = icon_widget
-            self.icon_positions[icon_id] = position
+            self._set_icon_position(icon_id, position)
             self.icon_types[icon_id] = IconType.SHORTCUT
             self.icon_data[icon_id] = {
                 'target': target,
@@ -447,6 +473,7 @@ class DesktopIconManager(QObject):
             # Remove from storage
             del self.icons[icon_id]
             del self.icon_positions[icon_id]
+            self.grid_index.remove(icon_id)
             del self.icon_types[icon_id]
             if icon_id in self.icon_data:
                 del self.icon_data[icon_id]
@@ -573,7 +600,7 @@ class DesktopIconManager(QObject):
                 animation_group.addAnimation(animation)
 
             # Update position
-            self.icon_positions[icon_id] = new_pos
+            self._set_icon_position(icon_id, new_pos)
 
         # Start animations
         if animation_group.animationCount() > 0:
@@ -617,7 +644,7 @@ class DesktopIconManager(QObject):
             if current_pos != grid_pos:
                 animation = self._create_move_animation(widget, grid_pos)
                 animation_group.addAnimation(animation)
-                self.icon_positions[icon_id] = grid_pos
+                self._set_icon_position(icon_id, grid_pos)
 
         if animation_group.animationCount() > 0:
             animation_group.start()
@@ -651,7 +678,7 @@ class DesktopIconManager(QObject):
                     animation = self._create_move_animation(widget, new_pos)
                     animation_group.addAnimation(animation)
 
-                self.icon_positions[icon_id] = new_pos
+                self._set_icon_position(icon_id, new_pos)
 
         if animation_group.animationCount() > 0:
             animation_group.start()
@@ -710,9 +737,10 @@ class DesktopIconManager(QObject):
         """
         self.clear_selection()
 
-        for icon_id, widget in self.icons.items():
-            if rect.intersects(widget.geometry()):
-                widget.set_selected(True)
+        # Chỉ xét các ô lưới mà rect phủ
+        for icon_id in self.grid_index.query_rect(rect):
+            if icon_id in self.icons:
+                self.icons[icon_id].set_selected(True)
                 self.selected_icons.append(icon_id)
 
         self.selection_changed.emit(self.selected_icons)
@@ -750,7 +778,7 @@ class DesktopIconManager(QObject):
             widget.move(position)
 
         # Update position
-        self.icon_positions[icon_id] = position
+        self._set_icon_position(icon_id, position)
 
         # Emit signal
         self.icon_moved.emit(icon_id, position)
@@ -895,39 +923,36 @@ class DesktopIconManager(QObject):
 
     # ========== HELPER METHODS ==========
 
-    def _find_empty_position(self) -> QPoint:
-        """Find empty position for new icon"""
-        desktop_rect = self.desktop.rect()
-
-        # Start from top-left
-        x = self.grid_spacing
-        y = self.grid_spacing
-
-        while y < desktop_rect.height() - DESKTOP_ICON_HEIGHT:
-            while x < desktop_rect.width() - DESKTOP_ICON_WIDTH:
-                pos = QPoint(x, y)
+    def _set_icon_position(self, icon_id: str, position: QPoint):
+        """Update stored position and grid index together"""
+        self.icon_positions[icon_id] = position
+        self.grid_index.add(icon_id, QRect(position, QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT)))
 
-                # Check if position is occupied
-                if self._is_position_empty(pos):
-                    return pos
+    def _sync_grid_bounds(self):
+        """Slot grid follows current desktop size"""
+        desktop_rect = self.desktop.rect()
+        self.grid_index.set_bounds(desktop_rect.width(), desktop_rect.height())
 
-                x += self.grid_size
+    def _resolve_position(self, position: Optional[QPoint], snap: bool = True) -> QPoint:
+        """None -> first empty slot, otherwise snap to grid if enabled"""
+        if position is None:
+            return self._find_empty_position()
+        if snap and self.grid_enabled:
+            return snap_to_grid(position, self.grid_size)
+        return position
 
-            x = self.grid_spacing
-            y += self.grid_size
+    def _find_empty_position(self) -> QPoint:
+        """Find empty position for new icon (con trỏ free-list của grid index)"""
+        self._sync_grid_bounds()
+        position = self.grid_index.find_free_slot()
 
         # Default if no space
-        return QPoint(self.grid_spacing, self.grid_spacing)
+        return position or QPoint(self.grid_spacing, self.grid_spacing)
 
     def _is_position_empty(self, position: QPoint) -> bool:
         """Check if position is empty"""
         test_rect = QRect(position, QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT))
-
-        for widget in self.icons.values():
-            if test_rect.intersects(widget.geometry()):
-                return False
-
-        return True
+        return self.grid_index.is_free(test_rect)
 
     def _is_valid_position(self, position: QPoint, exclude_id: str = None) -> bool:
         """Check if position is valid for icon"""
@@ -940,13 +965,7 @@ class DesktopIconManager(QObject):
 
         # Check collision with other icons
         test_rect = QRect(position, QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT))
-
-        for icon_id, widget in self.icons.items():
-            if icon_id != exclude_id:
-                if test_rect.intersects(widget.geometry()):
-                    return False
-
-        return True
+        return self.grid_index.is_free(test_rect, exclude=exclude_id)
 
     def _get_valid_grid_positions(self) -> List[QPoint]:
         """Get all valid grid positions"""
@@ -0,0 +1,231 @@
+# ui_qt/windows/dashboard_window_qt/views/desktop/icon_grid_index.py
+"""
+Icon Grid Index - Chỉ mục không gian cho icons trên desktop
+- Spatial hash: ô lưới (cell_size px) -> các key có hình chữ nhật chạm ô đó,
+  cập nhật khi add / move / remove -> hit-test, rubber band chỉ xét vài ô
+- Slot: các vị trí đặt icon (origin + k * cell_size, theo hàng) với con trỏ free-list:
+  mọi slot trước con trỏ đều đã bị chiếm -> tìm chỗ trống O(1) khấu hao
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QPoint, QRect, QSize
+
+from ...utils.constants import (
+    DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT,
+    DESKTOP_ICON_SPACING, DESKTOP_GRID_SIZE
+)
+
+# (left, top, right, bottom) - right/bottom không tính (half-open)
+Box = Tuple[int, int, int, int]
+
+
+def _box(rect: QRect) -> Box:
+    return rect.x(), rect.y(), rect.x() + rect.width(), rect.y() + rect.height()
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class IconGridIndex:
+    """
+    Spatial hash + danh sách slot trống cho desktop
+
+    Key là bất kỳ giá trị hashable nào (icon_id, id drop zone...). Hình chữ nhật được
+    lưu theo vị trí đích (icon_positions), không theo widget.geometry() đang animate.
+    """
+
+    def __init__(
+            self,
+            cell_size: int = DESKTOP_GRID_SIZE,
+            slot_origin: int = DESKTOP_ICON_SPACING,
+            slot_size: QSize = QSize(DESKTOP_ICON_WIDTH, DESKTOP_ICON_HEIGHT)
+    ):
+        self.cell_size = max(1, cell_size)
+        self.slot_origin = slot_origin
+        self.slot_width = slot_size.width()
+        self.slot_height = slot_size.height()
+
+        self._boxes: Dict[Hashable, Box] = {}
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, None]] = {}
+
+        # Lưới slot theo kích thước desktop (set_bounds)
+        self.bounds = QSize()
+        self.cols = 0
+        self.rows = 0
+        self._cursor = 0  # Mọi slot < _cursor đều đã bị chiếm
+
+    # ========== ITEMS ==========
+
+    def add(self, key: Hashable, rect: QRect):
+        """Thêm hoặc di chuyển key tới rect"""
+        if key in self._boxes:
+            self.remove(key)
+        box = _box(rect)
+        self._boxes[key] = box
+        for cell in self._cells_of(box):
+            self._cells.setdefault(cell, {})[key] = None
+
+    move = add
+
+    def remove(self, key: Hashable) -> bool:
+        box = self._boxes.pop(key, None)
+        if box is None:
+            return False
+        for cell in self._cells_of(box):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._cells[cell]
+        self._release(box)
+        return True
+
+    def rebuild(self, items: Iterable[Tuple[Hashable, QRect]]):
+        """Dựng lại toàn bộ (sau arrange / auto-arrange)"""
+        self.clear()
+        for key, rect in items:
+            self.add(key, rect)
+
+    def clear(self):
+        self._boxes.clear()
+        self._cells.clear()
+        self._cursor = 0
+
+    def rect_of(self, key: Hashable) -> Optional[QRect]:
+        box = self._boxes.get(key)
+        if box is None:
+            return None
+        return QRect(box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, key: Hashable):
+        return key in self._boxes
+
+    # ========== QUERIES ==========
+
+    def query_rect(self, rect: QRect, exclude: Hashable = None) -> List[Hashable]:
+        """Các key có hình chữ nhật giao với rect (chỉ duyệt những ô rect phủ)"""
+        return self._query(_box(rect), exclude)
+
+    def query_point(self, point: QPoint) -> List[Hashable]:
+        """Các key có hình chữ nhật chứa point"""
+        x, y = point.x(), point.y()
+        bucket = self._cells.get((x // self.cell_size, y // self.cell_size), {})
+        result = []
+        for key in bucket:
+            box = self._boxes[key]
+            if box[0] <= x < box[2] and box[1] <= y < box[3]:
+                result.append(key)
+        return result
+
+    def is_free(self, rect: QRect, exclude: Hashable = None) -> bool:
+        """rect không giao với key nào (trừ exclude)"""
+        return self._first_hit(_box(rect), exclude) is None
+
+    def _query(self, box: Box, exclude: Hashable) -> List[Hashable]:
+        if box[0] >= box[2] or box[1] >= box[3]:
+            return []
+        seen = {}
+        for cell in self._cells_of(box):
+            for key in self._cells.get(cell, ()):
+                if key != exclude and key not in seen and _intersects(box, self._boxes[key]):
+                    seen[key] = None
+        return list(seen)
+
+    def _first_hit(self, box: Box, exclude: Hashable) -> Optional[Hashable]:
+        for cell in self._cells_of(box):
+            for key in self._cells.get(cell, ()):
+                if key != exclude and _intersects(box, self._boxes[key]):
+                    return key
+        return None
+
+    def _cells_of(self, box: Box):
+        size = self.cell_size
+        for cy in range(box[1] // size, (box[3] - 1) // size + 1):
+            for cx in range(box[0] // size, (box[2] - 1) // size + 1):
+                yield cx, cy
+
+    # ========== SLOTS ==========
+
+    def set_bounds(self, width: int, height: int):
+        """
+        Kích thước desktop -> lưới slot (giống _get_valid_grid_positions:
+        x chạy từ slot_origin tới width - slot_width, bước cell_size)
+        """
+        if self.bounds == QSize(width, height):
+            return
+        self.bounds = QSize(width, height)
+        self.cols = len(range(self.slot_origin, width - self.slot_width, self.cell_size))
+        self.rows = len(range(self.slot_origin, height - self.slot_height, self.cell_size))
+        self._cursor = 0
+
+    def slot_count(self) -> int:
+        return self.cols * self.rows
+
+    def slot_position(self, index: int) -> QPoint:
+        row, col = divmod(index, self.cols)
+        return QPoint(self.slot_origin + col * self.cell_size, self.slot_origin + row * self.cell_size)
+
+    def slot_index(self, point: QPoint) -> int:
+        """Slot gần point nhất (kẹp trong lưới)"""
+        if not self.cols or not self.rows:
+            return 0
+        col = round((point.x() - self.slot_origin) / self.cell_size)
+        row = round((point.y() - self.slot_origin) / self.cell_size)
+        col = min(max(col, 0), self.cols - 1)
+        row = min(max(row, 0), self.rows - 1)
+        return row * self.cols + col
+
+    def is_slot_free(self, index: int) -> bool:
+        x = self.slot_origin + (index % self.cols) * self.cell_size
+        y = self.slot_origin + (index // self.cols) * self.cell_size
+        return self._first_hit((x, y, x + self.slot_width, y + self.slot_height), None) is None
+
+    def find_free_slot(self) -> Optional[QPoint]:
+        """Slot trống đầu tiên theo thứ tự hàng, None nếu desktop đã đầy"""
+        total = self.slot_count()
+        while self._cursor < total and not self.is_slot_free(self._cursor):
+            self._cursor += 1
+        if self._cursor >= total:
+            return None
+        return self.slot_position(self._cursor)
+
+    def free_slots(self, count: int, start: Optional[QPoint] = None) -> List[QPoint]:
+        """
+        count slot trống (khác nhau) cho một lần thả nhiều icon
+
+        start: bắt đầu từ slot gần điểm thả rồi đi tiếp theo hàng, hết thì quay về
+        đầu desktop; None = lấp từ slot trống đầu tiên
+        """
+        total = self.slot_count()
+        if count <= 0 or total == 0:
+            return []
+
+        if start is None:
+            self.find_free_slot()
+            ranges = [range(self._cursor, total)]
+        else:
+            first = self.slot_index(start)
+            ranges = [range(first, total), range(self._cursor, first)]
+
+        result = []
+        for indexes in ranges:
+            for index in indexes:
+                if self.is_slot_free(index):
+                    result.append(self.slot_position(index))
+                    if len(result) == count:
+                        return result
+        return result
+
+    def _release(self, box: Box):
+        """Hình chữ nhật vừa bỏ đi có thể làm trống slot trước con trỏ"""
+        if not self.cols:
+            return
+        pitch = self.cell_size
+        row = max(0, (box[1] - self.slot_origin - self.slot_height) // pitch + 1)
+        col = max(0, (box[0] - self.slot_origin - self.slot_width) // pitch + 1)
+        self._cursor = min(self._cursor, row * self.cols + min(col, self.cols - 1))
@@ -0,0 +1,268 @@
+# ui_qt/windows/dashboard_window_qt/views/desktop/wallpaper_renderer.py
+"""
+Wallpaper Renderer - Dựng sẵn wallpaper đúng kích thước cho DesktopArea
+- Scale/crop/tile một lần cho mỗi (path, mode, size, devicePixelRatio)
+- Pixmap cache khớp đúng từng device pixel -> paintEvent chỉ copy vùng event.rect()
+- Khi resize liên tục: preview FastTransformation ngay, bản SmoothTransformation
+  được dựng trên QThreadPool rồi thay vào khi xong
+"""
+
+from typing import Dict, Optional, Tuple
+import logging
+
+from PySide6.QtCore import (
+    Qt, QObject, QRect, QRectF, QRunnable, QSize, QThreadPool, QTimer, Signal
+)
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+
+# Logger
+logger = logging.getLogger(__name__)
+
+WALLPAPER_MODES = ("fill", "fit", "stretch", "tile", "center")
+
+# Chờ resize dừng một chút rồi mới dựng bản smooth (ms)
+SMOOTH_RESCALE_DELAY = 120
+
+# (path, mode, width, height, devicePixelRatio)
+CacheKey = Tuple[str, str, int, int, float]
+
+
+def render_wallpaper(source: QImage, mode: str, size: QSize, dpr: float,
+                     smooth: bool = True) -> QImage:
+    """
+    Dựng wallpaper cho vùng size (logical px) ở devicePixelRatio dpr
+
+    Returns:
+        QImage kích thước size * dpr device pixel, đã setDevicePixelRatio(dpr)
+    """
+    device_size = QSize(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr)))
+    transform = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+
+    if mode == "fill":
+        # Scale giữ tỉ lệ rồi crop giữa
+        scaled = source.scaled(device_size, Qt.KeepAspectRatioByExpanding, transform)
+        x = (scaled.width() - device_size.width()) // 2
+        y = (scaled.height() - device_size.height()) // 2
+        image = scaled.copy(x, y, device_size.width(), device_size.height())
+
+    elif mode == "stretch":
+        image = source.scaled(device_size, Qt.IgnoreAspectRatio, transform)
+
+    else:
+        image = QImage(device_size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(QColor(0, 0, 0, 0))
+        painter = QPainter(image)
+
+        if mode == "fit":
+            scaled = source.scaled(device_size, Qt.KeepAspectRatio, transform)
+            painter.drawImage(
+                (device_size.width() - scaled.width()) // 2,
+                (device_size.height() - scaled.height()) // 2,
+                scaled
+            )
+
+        elif mode == "tile":
+            # Mỗi ô giữ kích thước logical của ảnh gốc (như bản cũ vẽ pixmap dpr 1)
+            tile = source
+            if dpr != 1:
+                tile = source.scaled(
+                    QSize(max(1, round(source.width() * dpr)), max(1, round(source.height() * dpr))),
+                    Qt.IgnoreAspectRatio, transform
+                )
+            for x in range(0, device_size.width(), tile.width()):
+                for y in range(0, device_size.height(), tile.height()):
+                    painter.drawImage(x, y, tile)
+
+        else:  # center
+            tile = source
+            if dpr != 1:
+                tile = source.scaled(
+                    QSize(max(1, round(source.width() * dpr)), max(1, round(source.height() * dpr))),
+                    Qt.IgnoreAspectRatio, transform
+                )
+            painter.drawImage(
+                (device_size.width() - tile.width()) // 2,
+                (device_size.height() - tile.height()) // 2,
+                tile
+            )
+
+        painter.end()
+
+    image.setDevicePixelRatio(dpr)
+    return image
+
+
+class _RescaleSignals(QObject):
+    """Signal từ worker thread về GUI thread (queued connection)"""
+    finished = Signal(int, object, QImage)  # generation, cache key, image
+
+
+class _RescaleTask(QRunnable):
+    """Dựng bản smooth trên QThreadPool (chỉ dùng QImage - an toàn ngoài GUI thread)"""
+
+    def __init__(self, generation: int, key: CacheKey, source: QImage, mode: str,
+                 size: QSize, dpr: float, signals: _RescaleSignals):
+        super().__init__()
+        self.generation = generation
+        self.key = key
+        self.source = source
+        self.mode = mode
+        self.size = QSize(size)
+        self.dpr = dpr
+        self.signals = signals
+
+    def run(self):
+        try:
+            image = render_wallpaper(self.source, self.mode, self.size, self.dpr, smooth=True)
+        except Exception as e:
+            logger.error(f"Lỗi dựng wallpaper: {e}")
+            return
+        self.signals.finished.emit(self.generation, self.key, image)
+
+
+class WallpaperRenderer(QObject):
+    """
+    Giữ ảnh gốc full-resolution + một pixmap đã dựng cho kích thước hiện tại
+
+    Dùng:
+        renderer.set_source(path, pixmap, mode)
+        renderer.resize(widget.size(), widget.devicePixelRatioF(), live=True)   # resizeEvent
+        renderer.paint(painter, event.rect(), widget.size(), widget.devicePixelRatioF())
+    """
+
+    # Bản smooth vừa thay preview -> widget cần update()
+    updated = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = ""
+        self.mode = "fill"
+        self._source: Optional[QImage] = None
+        self._source_size = QSize()
+
+        self._key: Optional[CacheKey] = None
+        self._pixmap: Optional[QPixmap] = None
+        self._is_preview = False
+
+        # Job smooth đang chờ / chạy; generation tăng mỗi lần yêu cầu -> bỏ kết quả cũ
+        self._generation = 0
+        self._pending: Optional[Tuple[QSize, float]] = None
+        self._signals = _RescaleSignals()
+        self._signals.finished.connect(self._on_rescaled)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SMOOTH_RESCALE_DELAY)
+        self._timer.timeout.connect(self._start_rescale)
+
+        # Thống kê cho benchmark / debug
+        self.stats: Dict[str, int] = {"smooth": 0, "fast": 0, "async": 0}
+
+    # ========== SOURCE ==========
+
+    def set_source(self, path: str, pixmap: QPixmap, mode: str = "fill"):
+        """Đặt ảnh gốc (full-resolution, không scale trước)"""
+        self.path = path or ""
+        self.mode = mode if mode in WALLPAPER_MODES else "fill"
+        self._source = pixmap.toImage() if pixmap is not None and not pixmap.isNull() else None
+        self._source_size = pixmap.size() if self._source is not None else QSize()
+        self.invalidate()
+
+    def set_mode(self, mode: str):
+        if mode in WALLPAPER_MODES and mode != self.mode:
+            self.mode = mode
+            self.invalidate()
+
+    def has_source(self) -> bool:
+        return self._source is not None
+
+    def source_size(self) -> QSize:
+        return QSize(self._source_size)
+
+    def invalidate(self):
+        """Bỏ pixmap đã dựng (đổi ảnh/mode)"""
+        self._generation += 1
+        self._timer.stop()
+        self._pending = None
+        self._key = None
+        self._pixmap = None
+        self._is_preview = False
+
+    # ========== RENDER ==========
+
+    def cache_key(self, size: QSize, dpr: float) -> CacheKey:
+        return self.path, self.mode, size.width(), size.height(), round(float(dpr), 3)
+
+    def resize(self, size: QSize, dpr: float, live: bool = True):
+        """
+        Gọi từ resizeEvent
+
+        live=True và đã có pixmap: dựng preview FastTransformation ngay, hẹn dựng
+        bản smooth trên thread pool khi resize dừng SMOOTH_RESCALE_DELAY ms
+        """
+        if self._source is None or size.isEmpty():
+            return
+        key = self.cache_key(size, dpr)
+        if key == self._key and not self._is_preview:
+            return
+
+        if not live or self._pixmap is None:
+            self._build(size, dpr, smooth=True)
+            return
+
+        if key != self._key:
+            self._build(size, dpr, smooth=False)
+        self._pending = (QSize(size), dpr)
+        self._timer.start()
+
+    def pixmap(self, size: QSize, dpr: float) -> Optional[QPixmap]:
+        """Pixmap cho (size, dpr); chỉ dựng lại khi key đổi"""
+        if self._source is None or size.isEmpty():
+            return None
+        if self.cache_key(size, dpr) != self._key:
+            self._build(size, dpr, smooth=True)
+        return self._pixmap
+
+    def paint(self, painter: QPainter, rect: QRect, size: QSize, dpr: float):
+        """Vẽ đúng vùng rect (logical px) từ pixmap cache, không resample"""
+        pixmap = self.pixmap(size, dpr)
+        if pixmap is None:
+            return
+        ratio = pixmap.devicePixelRatio()
+        source = QRectF(rect.x() * ratio, rect.y() * ratio, rect.width() * ratio, rect.height() * ratio)
+        painter.drawPixmap(QRectF(rect), pixmap, source)
+
+    def _build(self, size: QSize, dpr: float, smooth: bool):
+        self._generation += 1
+        image = render_wallpaper(self._source, self.mode, size, dpr, smooth=smooth)
+        self.stats["smooth" if smooth else "fast"] += 1
+        self._set_pixmap(self.cache_key(size, dpr), image, preview=not smooth)
+
+    def _set_pixmap(self, key: CacheKey, image: QImage, preview: bool):
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(image.devicePixelRatio())
+        self._key = key
+        self._pixmap = pixmap
+        self._is_preview = preview
+
+    # ========== ASYNC SMOOTH RESCALE ==========
+
+    def _start_rescale(self):
+        if self._pending is None or self._source is None:
+            return
+        size, dpr = self._pending
+        self._pending = None
+        self._generation += 1
+        task = _RescaleTask(
+            self._generation, self.cache_key(size, dpr), self._source, self.mode,
+            size, dpr, self._signals
+        )
+        self.stats["async"] += 1
+        QThreadPool.globalInstance().start(task)
+
+    def _on_rescaled(self, generation: int, key: CacheKey, image: QImage):
+        # Bỏ kết quả của lần resize / đổi ảnh cũ hơn
+        if generation != self._generation or key != self._key:
+            return
+        self.stats["smooth"] += 1
+        self._set_pixmap(key, image, preview=False)
+        self.updated.emit()
@@ -40,6 +40,9 @@ try:
     from ui_qt.windows.dashboard_window_qt.services.window_manager_service import (
         WindowManagerService
     )
+    from ui_qt.windows.dashboard_window_qt.services.tick_scheduler import (
+        TickScheduler, CLOCK_TOLERANCE_MS, STATUS_TOLERANCE_MS
+    )
     from ui_qt.windows.dashboard_window_qt.repositories.app_repository import (
         AppRepository, AppModel
     )
@@ -206,6 +209,12 @@ class MainDashboard(QMainWindow):
         # Show window
         self.show_window()
 
+        # Start menu, system tray... không hiện ngay -> dựng sau frame đầu tiên
+        QTimer.singleShot(0, self.build_deferred_widgets)
+
+        # Import trước các app hay dùng khi dashboard đã rảnh
+        self.app_launcher.schedule_prewarm()
+
     # ========== UI SETUP ==========
 
     def setup_ui(self):
@@ -236,11 +245,7 @@ class MainDashboard(QMainWindow):
         # Create taskbar
         self.create_taskbar()
 
-        # Create start menu (hidden initially)
-        self.create_start_menu()
-
-        # Create system tray
-        self.create_system_tray()
+        # Start menu và system tray được dựng trong build_deferred_widgets()
 
         # Setup menu bar
         self.setup_menu_bar()
@@ -357,6 +362,13 @@ class MainDashboard(QMainWindow):
         # Add taskbar to main layout
         self.main_layout.addWidget(self.taskbar)
 
+    def build_deferred_widgets(self):
+        """Dựng các thành phần không hiển thị ngay sau frame đầu tiên"""
+        if self.start_menu is None:
+            self.create_start_menu()
+        if self.system_tray is None:
+            self.create_system_tray()
+
     def create_start_menu(self):
         """Create start menu (hidden by default)"""
         # Tạo start menu đơn giản (không cần import phức tạp)
@@ -390,6 +402,7 @@ class MainDashboard(QMainWindow):
         self.app_list.addItem("👥 Quản lý học sinh")
         self.app_list.addItem("📊 Báo cáo tiến độ")
 
+        self.app_list.itemDoubleClicked.connect(self.on_app_list_double_click)
         menu_layout.addWidget(self.app_list)
 
         # Power buttons
@@ -547,9 +560,7 @@ class MainDashboard(QMainWindow):
         if hasattr(self, 'search_box'):
             self.search_box.returnPressed.connect(self.on_search)
 
-        # App list in start menu
-        if hasattr(self, 'app_list'):
-            self.app_list.itemDoubleClicked.connect(self.on_app_list_double_click)
+        # App list in start menu: kết nối trong create_start_menu (dựng trễ)
 
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
@@ -572,16 +583,17 @@ class MainDashboard(QMainWindow):
         QShortcut(QKeySequence("F5"), self, self.refresh_desktop)
 
     def setup_timers(self):
-        """Setup timers for updates"""
-        # Clock timer
-        self.clock_timer = QTimer()
-        self.clock_timer.timeout.connect(self.update_clock)
-        self.clock_timer.start(1000)  # Update every second
+        """Setup timers for updates (gộp vào TickScheduler dùng chung)"""
+        scheduler = TickScheduler.instance()
+
+        # Clock - dừng khi cửa sổ bị minimize
+        self.clock_tick = scheduler.subscribe(
+            self.update_clock, 1000, CLOCK_TOLERANCE_MS, widget=self, name="DashboardClock")
 
-        # Auto-save timer
-        self.auto_save_timer = QTimer()
-        self.auto_save_timer.timeout.connect(self.auto_save)
-        self.auto_save_timer.start(60000)  # Auto-save every minute
+        # Auto-save every minute (kể cả khi minimize)
+        self.auto_save_tick = scheduler.subscribe(
+            self.auto_save, 60000, STATUS_TOLERANCE_MS, name="DashboardAutoSave")
+        self.destroyed.connect(self.auto_save_tick.cancel)
 
     # ========== WINDOW MANAGEMENT ==========
 
@@ -936,6 +948,9 @@ class MainDashboard(QMainWindow):
 
     def toggle_start_menu(self):
         """Toggle start menu visibility"""
+        if self.start_menu is None:
+            # Người dùng mở start menu trước khi kịp dựng trễ
+            self.create_start_menu()
         if self.start_menu:
             if self.start_menu.isVisible():
                 self.start_menu.hide()
@@ -2,45 +2,57 @@
 """
 Start Menu Tiles - Pinned apps tiles/shortcuts trong Start Menu
 Hỗ trợ nhiều kích thước tile, drag & drop, live tiles
+
+Lưới được vẽ trực tiếp (không có QWidget cho từng tile):
+- TileOccupancyMap: bitmap ô đã chiếm, cập nhật từng phần khi thêm / xoá / đổi cỡ / di chuyển
+- TileDelegate: pixmap vẽ sẵn của một tile, chỉ tạo cho tile đang hiển thị
+- TileAnimator: một timer chung cho mọi animation (vào, ra, di chuyển, đổi cỡ, hover)
 """
 
-import os
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 from enum import Enum
-from datetime import datetime
 import logging
 
-from PySide6.QtWidgets import (
-    QWidget, QGridLayout, QVBoxLayout, QHBoxLayout,
-    QLabel, QFrame, QMenu, QSizePolicy,
-    QGraphicsOpacityEffect, QToolButton
-)
+from PySide6.QtWidgets import QAbstractScrollArea, QFrame, QMenu, QStyle
 from PySide6.QtCore import (
-    Qt, QSize, QPoint, QRect, QTimer,
-    Signal, Property, QPropertyAnimation,
-    QEasingCurve, QEvent, QMimeData,
-    QParallelAnimationGroup
+    Qt, QSize, QPoint, QRect, QRectF, QTimer, QObject,
+    Signal, QEasingCurve, QEvent, QMimeData
 )
 from PySide6.QtGui import (
-    QPainter, QPixmap, QIcon, QFont, QColor,
-    QPen, QBrush, QAction, QPalette,
-    QLinearGradient, QRadialGradient,
-    QMouseEvent, QPaintEvent, QEnterEvent,
-    QDragEnterEvent, QDragMoveEvent, QDropEvent,
-    QDrag, QCursor, QTransform
+    QPainter, QPixmap, QIcon, QFont, QColor, QPen, QAction,
+    QMouseEvent, QPaintEvent, QDragEnterEvent, QDragMoveEvent, QDropEvent, QDrag
 )
 
 # Import utils
 from ...utils.constants import (
-    TILE_SMALL_SIZE, TILE_MEDIUM_SIZE, TILE_WIDE_SIZE, TILE_LARGE_SIZE,
-    TILE_SPACING, TILE_ANIMATION_DURATION
+    TILE_SMALL_SIZE, TILE_SPACING, TILE_ANIMATION_DURATION,
+    TILE_ANIMATION_FRAME_MS, TILE_DELEGATE_CACHE_SIZE
 )
 from ...utils.assets import load_icon, get_app_icon
+from ...services.tick_scheduler import TickScheduler, LIVE_TILE_TOLERANCE_MS
+from .tile_occupancy import TileOccupancyMap
 
 # Logger
 logger = logging.getLogger(__name__)
 
+TILE_MIME_TYPE = "application/x-tile-id"
+
+# Màu mặc định theo app_id
+TILE_COLORS = [
+    "#0078d4",  # Blue
+    "#107c10",  # Green
+    "#5c2d91",  # Purple
+    "#e81123",  # Red
+    "#ff8c00",  # Orange
+    "#00bcf2",  # Light blue
+    "#e3008c",  # Magenta
+    "#00cc6a",  # Mint
+]
+
 
 # ========== ENUMS ==========
 
@@ -60,12 +72,217 @@ class TileStyle(Enum):
     CUSTOM = "custom"  # Custom content
 
 
+# (row_span, col_span)
+TILE_SPANS = {
+    TileSize.SMALL: (1, 1),
+    TileSize.MEDIUM: (2, 2),
+    TileSize.WIDE: (2, 4),
+    TileSize.LARGE: (4, 4),
+}
+
+
+# ========== TILE DATA ==========
+
+@dataclass
+class TileData:
+    """Một tile đã ghim - chỉ dữ liệu, vị trí nằm trong TileOccupancyMap"""
+    app_id: str
+    name: str
+    size: TileSize = TileSize.MEDIUM
+    style: TileStyle = TileStyle.ICON_AND_TEXT
+    icon: Optional[QIcon] = None  # None = get_app_icon(app_id) lúc vẽ
+    color: Optional[QColor] = None
+    live_content: Any = None
+    version: int = 0  # Tăng khi nội dung đổi -> vẽ lại delegate
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return TILE_SPANS.get(self.size, (2, 2))
+
+    def background_color(self) -> QColor:
+        """Màu custom hoặc màu cố định theo app_id (giống nhau giữa các lần chạy)"""
+        if self.color is not None:
+            return QColor(self.color)
+        return QColor(TILE_COLORS[zlib.crc32(self.app_id.encode('utf-8')) % len(TILE_COLORS)])
+
+    def icon_size(self) -> QSize:
+        """Get appropriate icon size for tile"""
+        if self.size == TileSize.SMALL:
+            return QSize(24, 24)
+        elif self.size == TileSize.LARGE:
+            return QSize(96, 96)
+        else:
+            return QSize(48, 48)
+
+
+# ========== DELEGATE ==========
+
+class TileDelegate:
+    """
+    Tile đã vẽ sẵn ra pixmap (nền, icon, tên)
+
+    Chỉ tạo cho tile đang hiển thị; paint() chỉ là một drawPixmap + lớp hover
+    """
+
+    __slots__ = ("app_id", "size", "version", "pixmap")
+
+    def __init__(self, tile: TileData, size: QSize, dpr: float = 1.0):
+        self.app_id = tile.app_id
+        self.size = QSize(size)
+        self.version = tile.version
+        self.pixmap = self._render(tile, size, dpr)
+
+    def matches(self, tile: TileData, size: QSize) -> bool:
+        return self.version == tile.version and self.size == size
+
+    @staticmethod
+    def _render(tile: TileData, size: QSize, dpr: float) -> QPixmap:
+        pixmap = QPixmap(size * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = QRectF(0, 0, size.width(), size.height())
+
+        # Background
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(tile.background_color())
+        painter.drawRoundedRect(rect, 4, 4)
+
+        # Small tile chỉ có icon; các cỡ khác có thêm tên (trừ ICON_ONLY)
+        content = rect.adjusted(10, 10, -10, -10)
+        with_text = tile.style != TileStyle.ICON_ONLY and tile.size != TileSize.SMALL
+        text_height = 0
+        if with_text:
+            font = QFont()
+            font.setPixelSize(11)
+            painter.setFont(font)
+            text_height = painter.fontMetrics().height() * 2
+            text_rect = QRectF(content.left(), content.bottom() - text_height,
+                               content.width(), text_height)
+            painter.setPen(QColor("white"))
+            painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignBottom | Qt.TextWordWrap, tile.name)
+
+        # Icon
+        icon = tile.icon or get_app_icon(tile.app_id)
+        if icon and not icon.isNull():
+            icon_size = tile.icon_size()
+            area = content.adjusted(0, 0, 0, -(text_height + 5 if with_text else 0))
+            icon_rect = QRect(0, 0, icon_size.width(), icon_size.height())
+            icon_rect.moveCenter(area.center().toPoint())
+            icon.paint(painter, icon_rect, Qt.AlignCenter)
+
+        painter.end()
+        return pixmap
+
+    def paint(self, painter: QPainter, rect: QRectF, opacity: float = 1.0, hover: float = 0.0):
+        painter.setOpacity(opacity)
+        painter.drawPixmap(rect, self.pixmap, QRectF(self.pixmap.rect()))
+        if hover > 0:
+            # Hover overlay
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(255, 255, 255, int(30 * hover)))
+            painter.drawRoundedRect(rect, 4, 4)
+        painter.setOpacity(1.0)
+
+
+# ========== ANIMATION DRIVER ==========
+
+class _Tween:
+    __slots__ = ("start", "end", "started", "duration", "easing", "on_finished")
+
+    def __init__(self, start, end, started, duration, easing, on_finished):
+        self.start = start
+        self.end = end
+        self.started = started
+        self.duration = max(1, duration)
+        self.easing = easing
+        self.on_finished = on_finished
+
+    def value_at(self, now: float) -> Tuple[float, ...]:
+        progress = self.easing.valueForProgress(min(1.0, (now - self.started) / self.duration))
+        return tuple(a + (b - a) * progress for a, b in zip(self.start, self.end))
+
+
+class TileAnimator(QObject):
+    """
+    Driver chung cho mọi animation của lưới tiles
+
+    Mỗi tween là một bộ float (hình chữ nhật, opacity, hover) nội suy theo thời gian;
+    một QTimer duy nhất chạy khi còn tween và phát frame() để view vẽ lại một lần.
+    Giá trị được tính khi vẽ (value()), không đẩy vào từng tile.
+    """
+
+    frame = Signal()
+
+    def __init__(self, parent=None, clock: Callable[[], float] = None):
+        super().__init__(parent)
+        self._clock = clock or (lambda: time.monotonic() * 1000)
+        self._tweens: Dict[Hashable, _Tween] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(TILE_ANIMATION_FRAME_MS)
+        self._timer.timeout.connect(self._tick)
+
+        self.frames = 0
+
+    def start(
+            self,
+            key: Hashable,
+            start: Tuple[float, ...],
+            end: Tuple[float, ...],
+            duration: int = TILE_ANIMATION_DURATION,
+            easing: QEasingCurve.Type = QEasingCurve.OutCubic,
+            on_finished: Optional[Callable[[], None]] = None
+    ):
+        """Bắt đầu tween; key đang chạy thì nối tiếp từ giá trị hiện tại"""
+        now = self._clock()
+        running = self._tweens.get(key)
+        if running is not None:
+            start = running.value_at(now)
+        self._tweens[key] = _Tween(tuple(start), tuple(end), now, duration,
+                                   QEasingCurve(easing), on_finished)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self, key: Hashable):
+        """Huỷ tween (không gọi on_finished)"""
+        self._tweens.pop(key, None)
+
+    def value(self, key: Hashable) -> Optional[Tuple[float, ...]]:
+        tween = self._tweens.get(key)
+        return tween.value_at(self._clock()) if tween is not None else None
+
+    def keys(self) -> List[Hashable]:
+        return list(self._tweens)
+
+    def is_running(self) -> bool:
+        return bool(self._tweens)
+
+    def _tick(self):
+        now = self._clock()
+        finished = [key for key, tween in self._tweens.items() if now - tween.started >= tween.duration]
+        for key in finished:
+            tween = self._tweens.pop(key)
+            if tween.on_finished:
+                tween.on_finished()
+        if not self._tweens:
+            self._timer.stop()
+        self.frames += 1
+        self.frame.emit()
+
+
 # ========== MAIN TILES CONTAINER ==========
 
-class StartMenuTiles(QWidget):
+class StartMenuTiles(QAbstractScrollArea):
     """
     Container for Start Menu tiles grid
     Manages pinned apps as tiles with various sizes
+
+    Số cột cố định, số hàng tăng theo số tile, cuộn dọc; chỉ tile nằm trong
+    vùng hiển thị mới có delegate (pixmap vẽ sẵn).
     """
 
     # Signals
@@ -79,18 +296,32 @@ class StartMenuTiles(QWidget):
         super().__init__(parent)
 
         # Tiles storage
-        self.tiles: Dict[str, 'Tile'] = {}
-        self.tile_positions: Dict[str, Tuple[int, int]] = {}
+        self.tiles: Dict[str, TileData] = {}
 
         # Grid settings
         self.columns = 4
-        self.rows = 3
+        self.rows = 3  # Số hàng hiển thị, lưới tự tăng thêm hàng khi cần
         self.grid_size = TILE_SMALL_SIZE + TILE_SPACING
+        self.occupancy = TileOccupancyMap(self.columns)
+
+        # Delegates cho các tile đang / vừa hiển thị (LRU)
+        self._delegates: "OrderedDict[str, TileDelegate]" = OrderedDict()
+        self._leaving: Dict[str, Tuple[TileData, QRectF]] = {}  # Tile đang animate ra
+
+        # Animation
+        self.animator = TileAnimator(self)
+        self.animator.frame.connect(self.viewport().update)
 
-        # Drag & drop state
-        self.drag_tile = None
+        # Hover / drag & drop state
+        self.hovered_id: Optional[str] = None
+        self.press_id: Optional[str] = None
         self.drag_start_pos = None
-        self.drop_indicator = None
+        self.drop_indicator: Optional[QRect] = None
+
+        # Live tiles: một subscription chung, chỉ cập nhật tile đang hiển thị
+        self.live_subscription = None
+
+        self.stats = {"delegates_created": 0, "paints": 0, "tiles_painted": 0}
 
         # Setup UI
         self._setup_ui()
@@ -100,19 +331,19 @@ class StartMenuTiles(QWidget):
     def _setup_ui(self):
         """Setup UI layout"""
         self.setObjectName("StartMenuTiles")
+        self.setFrameShape(QFrame.NoFrame)
 
-        # Set fixed size based on grid
-        width = self.columns * self.grid_size
-        height = self.rows * self.grid_size
-        self.setFixedSize(width, height)
+        # Width theo lưới + thanh cuộn, height theo số hàng hiển thị
+        scrollbar_width = self.style().pixelMetric(QStyle.PM_ScrollBarExtent)
+        self.setFixedSize(self.columns * self.grid_size + scrollbar_width, self.rows * self.grid_size)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.verticalScrollBar().setSingleStep(self.grid_size // 2)
 
-        # Enable drag & drop
+        # Enable drag & drop, hover
         self.setAcceptDrops(True)
-
-        # Create grid layout
-        self.layout = QGridLayout(self)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.layout.setSpacing(TILE_SPACING)
+        self.viewport().setAcceptDrops(True)
+        self.viewport().setMouseTracking(True)
 
         # Style
         self.setStyleSheet("""
@@ -120,6 +351,7 @@ class StartMenuTiles(QWidget):
                 background: transparent;
             }
         """)
+        self.viewport().setAutoFillBackground(False)
 
     # ========== TILE MANAGEMENT ==========
 
@@ -132,116 +364,116 @@ class StartMenuTiles(QWidget):
             position: Optional[Tuple[int, int]] = None,
             style: TileStyle = TileStyle.ICON_AND_TEXT,
             color: Optional[QColor] = None
-    ) -> 'Tile':
+    ) -> Optional[TileData]:
         """
         Add a new tile to the grid
 
         Args:
             app_id: Application ID
             name: Display name
-            icon: App icon
+            icon: App icon (None = icon theo app_id, load khi tile hiển thị)
             size: Tile size
             position: Grid position (row, col) or auto
             style: Visual style
             color: Background color
 
         Returns:
-            Created Tile widget
+            TileData, None nếu tile rộng hơn lưới
         """
         # Check if already exists
         if app_id in self.tiles:
             logger.warning(f"Tile already exists: {app_id}")
             return self.tiles[app_id]
 
-        # Create tile
-        tile = Tile(
-            app_id=app_id,
-            name=name,
-            icon=icon or get_app_icon(app_id),
-            size=size,
-            style=style,
-            parent=self
-        )
-
-        # Set color if provided
-        if color:
-            tile.set_background_color(color)
-
-        # Connect signals
-        tile.clicked.connect(lambda: self.tile_clicked.emit(app_id))
-        tile.remove_requested.connect(lambda: self.remove_tile(app_id))
-        tile.resize_requested.connect(lambda s: self._resize_tile(app_id, s))
+        tile = TileData(app_id=app_id, name=name, size=size, style=style, icon=icon, color=color)
+        row_span, col_span = tile.span
 
         # Find position
+        if position and not self.occupancy.can_place(position[0], position[1], row_span, col_span):
+            logger.warning(f"Position {position} is occupied, placing {name} automatically")
+            position = None
         if not position:
             position = self._find_empty_position(size)
 
-        if position:
-            # Add to grid
-            row, col = position
-            row_span, col_span = self._get_tile_span(size)
-            self.layout.addWidget(tile, row, col, row_span, col_span)
+        if not position:
+            logger.warning(f"No space for tile: {name}")
+            return None
 
-            # Store references
-            self.tiles[app_id] = tile
-            self.tile_positions[app_id] = position
+        # Tile cùng id đang animate ra -> thay bằng tile mới
+        if self._leaving.pop(app_id, None) is not None:
+            self._delegates.pop(app_id, None)
 
-            # Animate entrance
-            tile.animate_in()
+        row, col = position
+        self.occupancy.place(app_id, row, col, row_span, col_span)
+        self.tiles[app_id] = tile
 
-            logger.debug(f"Added tile: {name} at position {position}")
-            return tile
-        else:
-            logger.warning(f"No space for tile: {name}")
-            tile.deleteLater()
-            return None
+        if style == TileStyle.LIVE:
+            self._ensure_live_subscription()
+
+        self._update_scroll_range()
+
+        # Animate entrance (chỉ khi nhìn thấy)
+        rect = self.tile_rect(app_id)
+        if self._is_on_screen(rect):
+            self.animator.start(("opacity", app_id), (0.0,), (1.0,))
+            self.viewport().update()
+
+        logger.debug(f"Added tile: {name} at position {position}")
+        return tile
 
     def remove_tile(self, app_id: str):
         """Remove a tile from the grid"""
-        if app_id not in self.tiles:
+        tile = self.tiles.pop(app_id, None)
+        if tile is None:
             return
 
-        tile = self.tiles[app_id]
-
-        # Animate out
-        tile.animate_out()
+        rect = self._current_rect(app_id)
+        self.occupancy.release(app_id)
+        self.animator.stop(("geometry", app_id))
+        if self.hovered_id == app_id:
+            self.hovered_id = None
+
+        # Animate out, xoá hẳn sau animation
+        if self._is_on_screen(rect):
+            self._leaving[app_id] = (tile, rect)
+            opacity = self.animator.value(("opacity", app_id)) or (1.0,)
+            self.animator.start(("opacity", app_id), opacity, (0.0,), easing=QEasingCurve.InCubic,
+                                on_finished=lambda: self._remove_tile_delegate(app_id))
+        else:
+            self._remove_tile_delegate(app_id)
 
-        # Remove after animation
-        QTimer.singleShot(TILE_ANIMATION_DURATION, lambda: self._remove_tile_widget(app_id))
+        self._update_scroll_range()
+        self.viewport().update()
 
         # Emit signal
         self.tile_removed.emit(app_id)
 
         logger.debug(f"Removed tile: {app_id}")
 
-    def _remove_tile_widget(self, app_id: str):
-        """Actually remove the tile widget"""
-        if app_id in self.tiles:
-            tile = self.tiles[app_id]
-            self.layout.removeWidget(tile)
-            tile.deleteLater()
-
-            del self.tiles[app_id]
-            del self.tile_positions[app_id]
+    def _remove_tile_delegate(self, app_id: str):
+        """Bỏ delegate sau khi tile đã animate ra"""
+        self._leaving.pop(app_id, None)
+        if app_id not in self.tiles:
+            self._delegates.pop(app_id, None)
+        self.viewport().update()
 
     def _resize_tile(self, app_id: str, new_size: TileSize):
         """Resize a tile"""
-        if app_id not in self.tiles:
+        tile = self.tiles.get(app_id)
+        if tile is None:
             return
 
-        tile = self.tiles[app_id]
-        old_size = tile.size_type
+        old_size = tile.size
+        old_rect = self._current_rect(app_id)
 
         # Check if new size fits
-        position = self.tile_positions[app_id]
-        if self._can_fit_tile(position, new_size, exclude_id=app_id):
-            # Update tile
-            tile.set_size(new_size)
-
-            # Update layout
-            row, col = position
-            row_span, col_span = self._get_tile_span(new_size)
-            self.layout.addWidget(tile, row, col, row_span, col_span)
+        row, col = self.tile_position(app_id)
+        row_span, col_span = TILE_SPANS[new_size]
+        if self.occupancy.move(app_id, row, col, row_span, col_span):
+            tile.size = new_size
+            tile.version += 1
+            self._update_scroll_range()
+            self._animate_geometry(app_id, old_rect)
 
             # Emit signal
             self.tile_resized.emit(app_id, new_size)
@@ -250,7 +482,16 @@ class StartMenuTiles(QWidget):
         else:
             logger.warning(f"Cannot resize tile {app_id}: no space")
 
-    def get_tile(self, index: int) -> Optional['Tile']:
+    def set_tile_color(self, app_id: str, color: Optional[QColor]):
+        """Set custom background color (None = màu mặc định)"""
+        tile = self.tiles.get(app_id)
+        if tile is None:
+            return
+        tile.color = color
+        tile.version += 1
+        self.viewport().update()
+
+    def get_tile(self, index: int) -> Optional[TileData]:
         """Get tile by index"""
         tiles_list = list(self.tiles.values())
         if 0 <= index < len(tiles_list):
@@ -268,38 +509,29 @@ class StartMenuTiles(QWidget):
 
     # ========== POSITION MANAGEMENT ==========
 
-    def _find_empty_position(self, size: TileSize) -> Optional[Tuple[int, int]]:
-        """Find empty position for a tile of given size"""
-        row_span, col_span = self._get_tile_span(size)
+    def tile_position(self, app_id: str) -> Optional[Tuple[int, int]]:
+        """Grid position (row, col) của tile"""
+        span = self.occupancy.span_of(app_id)
+        return (span[0], span[1]) if span else None
+
+    def tile_rect(self, app_id: str) -> Optional[QRect]:
+        """Hình chữ nhật đích của tile (toạ độ nội dung, chưa trừ cuộn)"""
+        span = self.occupancy.span_of(app_id)
+        if span is None:
+            return None
+        return self._span_rect(*span)
 
-        # Try each position
-        for row in range(self.rows - row_span + 1):
-            for col in range(self.columns - col_span + 1):
-                if self._is_position_empty(row, col, row_span, col_span):
-                    return (row, col)
+    def _span_rect(self, row: int, col: int, row_span: int, col_span: int) -> QRect:
+        size = self.grid_size
+        return QRect(col * size, row * size, col_span * size - TILE_SPACING, row_span * size - TILE_SPACING)
 
-        return None
+    def _find_empty_position(self, size: TileSize) -> Optional[Tuple[int, int]]:
+        """Find empty position for a tile of given size"""
+        return self.occupancy.find_free(*self._get_tile_span(size))
 
     def _is_position_empty(self, row: int, col: int, row_span: int, col_span: int) -> bool:
         """Check if a grid area is empty"""
-        # Check bounds
-        if row + row_span > self.rows or col + col_span > self.columns:
-            return False
-
-        # Check for overlaps with existing tiles
-        for app_id, position in self.tile_positions.items():
-            tile = self.tiles[app_id]
-            tile_row, tile_col = position
-            tile_row_span, tile_col_span = self._get_tile_span(tile.size_type)
-
-            # Check overlap
-            if not (row + row_span <= tile_row or
-                    row >= tile_row + tile_row_span or
-                    col + col_span <= tile_col or
-                    col >= tile_col + tile_col_span):
-                return False
-
-        return True
+        return self.occupancy.can_place(row, col, row_span, col_span)
 
     def _can_fit_tile(
             self,
@@ -308,447 +540,233 @@ class StartMenuTiles(QWidget):
             exclude_id: Optional[str] = None
     ) -> bool:
         """Check if a tile of given size can fit at position"""
-        row, col = position
         row_span, col_span = self._get_tile_span(size)
-
-        # Check bounds
-        if row + row_span > self.rows or col + col_span > self.columns:
-            return False
-
-        # Check overlaps (excluding the tile being resized)
-        for app_id, other_position in self.tile_positions.items():
-            if app_id == exclude_id:
-                continue
-
-            tile = self.tiles[app_id]
-            tile_row, tile_col = other_position
-            tile_row_span, tile_col_span = self._get_tile_span(tile.size_type)
-
-            # Check overlap
-            if not (row + row_span <= tile_row or
-                    row >= tile_row + tile_row_span or
-                    col + col_span <= tile_col or
-                    col >= tile_col + tile_col_span):
-                return False
-
-        return True
+        return self.occupancy.can_place(position[0], position[1], row_span, col_span, exclude=exclude_id)
 
     def _get_tile_span(self, size: TileSize) -> Tuple[int, int]:
         """Get grid span for tile size"""
-        if size == TileSize.SMALL:
-            return (1, 1)
-        elif size == TileSize.MEDIUM:
-            return (2, 2)
-        elif size == TileSize.WIDE:
-            return (2, 4)
-        elif size == TileSize.LARGE:
-            return (4, 4)
-        else:
-            return (2, 2)
-
-    # ========== DRAG & DROP ==========
-
-    def dragEnterEvent(self, event: QDragEnterEvent):
-        """Handle drag enter"""
-        if event.mimeData().hasFormat("application/x-tile-id"):
-            event.acceptProposedAction()
-        else:
-            event.ignore()
-
-    def dragMoveEvent(self, event: QDragMoveEvent):
-        """Handle drag move"""
-        if event.mimeData().hasFormat("application/x-tile-id"):
-            # Show drop indicator
-            pos = event.pos()
-            grid_pos = self._get_grid_position(pos)
-
-            if grid_pos:
-                self._show_drop_indicator(grid_pos)
-
-            event.acceptProposedAction()
-        else:
-            event.ignore()
-
-    def dropEvent(self, event: QDropEvent):
-        """Handle drop"""
-        if event.mimeData().hasFormat("application/x-tile-id"):
-            tile_id = str(event.mimeData().data("application/x-tile-id"), 'utf-8')
-
-            # Get drop position
-            pos = event.pos()
-            grid_pos = self._get_grid_position(pos)
-
-            if grid_pos and tile_id in self.tiles:
-                # Move tile to new position
-                self._move_tile(tile_id, grid_pos)
-
-            # Hide drop indicator
-            self._hide_drop_indicator()
-
-            event.acceptProposedAction()
-        else:
-            event.ignore()
-
-    def _get_grid_position(self, pos: QPoint) -> Optional[Tuple[int, int]]:
-        """Convert pixel position to grid position"""
-        col = pos.x() // self.grid_size
-        row = pos.y() // self.grid_size
-
-        if 0 <= row < self.rows and 0 <= col < self.columns:
-            return (row, col)
-        return None
+        return TILE_SPANS.get(size, (2, 2))
 
     def _move_tile(self, app_id: str, new_position: Tuple[int, int]):
         """Move tile to new position"""
         if app_id not in self.tiles:
             return
 
-        tile = self.tiles[app_id]
+        old_position = self.tile_position(app_id)
+        old_rect = self._current_rect(app_id)
 
         # Check if new position is valid
-        if self._can_fit_tile(new_position, tile.size_type, exclude_id=app_id):
-            # Update position
-            old_position = self.tile_positions[app_id]
-            self.tile_positions[app_id] = new_position
-
-            # Update layout
-            row, col = new_position
-            row_span, col_span = self._get_tile_span(tile.size_type)
-            self.layout.addWidget(tile, row, col, row_span, col_span)
+        if new_position != old_position and self.occupancy.move(app_id, *new_position):
+            self._update_scroll_range()
+            self._animate_geometry(app_id, old_rect)
 
             # Emit signal
             self.tiles_rearranged.emit()
 
             logger.debug(f"Moved tile {app_id}: {old_position} -> {new_position}")
 
-    def _show_drop_indicator(self, position: Tuple[int, int]):
-        """Show drop position indicator"""
-        # Create indicator if not exists
-        if not self.drop_indicator:
-            self.drop_indicator = QWidget(self)
-            self.drop_indicator.setStyleSheet("""
-                background: rgba(0, 120, 215, 50);
-                border: 2px dashed rgba(0, 120, 215, 150);
-                border-radius: 4px;
-            """)
-
-        # Position indicator
-        row, col = position
-        x = col * self.grid_size
-        y = row * self.grid_size
-
-        self.drop_indicator.move(x, y)
-        self.drop_indicator.resize(self.grid_size - TILE_SPACING, self.grid_size - TILE_SPACING)
-        self.drop_indicator.show()
-
-    def _hide_drop_indicator(self):
-        """Hide drop indicator"""
-        if self.drop_indicator:
-            self.drop_indicator.hide()
-
-
-# ========== INDIVIDUAL TILE WIDGET ==========
-
-class Tile(QFrame):
-    """
-    Individual tile widget for Start Menu
-    Represents a single app with icon and optional text
-    """
-
-    # Signals
-    clicked = Signal()
-    remove_requested = Signal()
-    resize_requested = Signal(TileSize)
-
-    def __init__(
-            self,
-            app_id: str,
-            name: str,
-            icon: Optional[QIcon] = None,
-            size: TileSize = TileSize.MEDIUM,
-            style: TileStyle = TileStyle.ICON_AND_TEXT,
-            parent=None
-    ):
-        """Initialize tile"""
-        super().__init__(parent)
+    # ========== VIEWPORT ==========
 
-        # Properties
-        self.app_id = app_id
-        self.name = name
-        self.app_icon = icon or get_app_icon(app_id)
-        self.size_type = size
-        self.style_type = style
+    def _scroll_offset(self) -> int:
+        return self.verticalScrollBar().value()
 
-        # Visual state
-        self.is_hovered = False
-        self.is_pressed = False
-        self.hover_progress = 0.0
+    def _visible_content_rect(self) -> QRect:
+        return self.viewport().rect().translated(0, self._scroll_offset())
 
-        # Live tile data
-        self.live_content = None
-        self.live_update_timer = None
-
-        # Custom color
-        self.custom_color = None
-
-        # Animations
-        self.hover_animation = None
-        self.press_animation = None
-        self._setup_animations()
-
-        # Setup UI
-        self._setup_ui()
-
-        # Install event filter
-        self.installEventFilter(self)
+    def _is_on_screen(self, rect: Optional[QRectF]) -> bool:
+        if rect is None or not self.isVisible():
+            return False
+        return QRectF(self._visible_content_rect()).intersects(QRectF(rect))
+
+    def _update_scroll_range(self):
+        """Chiều cao nội dung = số hàng đang có tile"""
+        content_height = max(self.occupancy.row_count, self.rows) * self.grid_size
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setPageStep(self.viewport().height())
+        scrollbar.setRange(0, max(0, content_height - self.viewport().height()))
+
+    def scroll_to_tile(self, app_id: str):
+        """Cuộn để tile nằm trong vùng hiển thị"""
+        rect = self.tile_rect(app_id)
+        if rect is None:
+            return
+        visible = self._visible_content_rect()
+        if rect.top() < visible.top():
+            self.verticalScrollBar().setValue(rect.top())
+        elif rect.bottom() > visible.bottom():
+            self.verticalScrollBar().setValue(rect.bottom() - visible.height() + 1)
+
+    def _current_rect(self, app_id: str) -> Optional[QRectF]:
+        """Hình chữ nhật đang vẽ (giữa animation) hoặc vị trí đích"""
+        value = self.animator.value(("geometry", app_id))
+        if value is not None:
+            return QRectF(*value)
+        rect = self.tile_rect(app_id)
+        return QRectF(rect) if rect is not None else None
+
+    def _animate_geometry(self, app_id: str, old_rect: Optional[QRectF]):
+        """Animate từ old_rect tới vị trí đích (bỏ qua nếu cả hai đều ngoài màn hình)"""
+        new_rect = QRectF(self.tile_rect(app_id))
+        if old_rect is not None and (self._is_on_screen(old_rect) or self._is_on_screen(new_rect)):
+            self.animator.start(
+                ("geometry", app_id),
+                (old_rect.x(), old_rect.y(), old_rect.width(), old_rect.height()),
+                (new_rect.x(), new_rect.y(), new_rect.width(), new_rect.height())
+            )
+        self.viewport().update()
+
+    def tile_at(self, pos: QPoint) -> Optional[str]:
+        """app_id của tile dưới pos (toạ độ viewport)"""
+        x, y = pos.x(), pos.y() + self._scroll_offset()
+        if x < 0 or y < 0:
+            return None
+        app_id = self.occupancy.key_at(y // self.grid_size, x // self.grid_size)
+        if app_id is not None and self.tile_rect(app_id).contains(x, y):
+            return app_id
+        return None
 
-    def _setup_ui(self):
-        """Setup tile UI"""
-        self.setObjectName("StartMenuTile")
-
-        # Set size based on type
-        self._update_size()
-
-        # Frame style
-        self.setFrameStyle(QFrame.NoFrame)
-
-        # Enable mouse tracking for hover
-        self.setMouseTracking(True)
-        self.setCursor(Qt.PointingHandCursor)
-
-        # Layout
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(5)
-
-        # Create content based on style
-        if self.style_type == TileStyle.ICON_ONLY:
-            self._create_icon_only_content(layout)
-        elif self.style_type == TileStyle.ICON_AND_TEXT:
-            self._create_icon_text_content(layout)
-        elif self.style_type == TileStyle.LIVE:
-            self._create_live_content(layout)
-
-        # Apply style
-        self._apply_style()
-
-    def _create_icon_only_content(self, layout: QVBoxLayout):
-        """Create icon-only tile content"""
-        # Icon label
-        self.icon_label = QLabel()
-        self.icon_label.setAlignment(Qt.AlignCenter)
-
-        # Set icon
-        if self.app_icon:
-            icon_size = self._get_icon_size()
-            pixmap = self.app_icon.pixmap(icon_size)
-            self.icon_label.setPixmap(pixmap)
-
-        layout.addWidget(self.icon_label, 0, Qt.AlignCenter)
-
-    def _create_icon_text_content(self, layout: QVBoxLayout):
-        """Create icon and text tile content"""
-        # Icon
-        self.icon_label = QLabel()
-        self.icon_label.setAlignment(Qt.AlignCenter)
-
-        if self.app_icon:
-            icon_size = self._get_icon_size()
-            pixmap = self.app_icon.pixmap(icon_size)
-            self.icon_label.setPixmap(pixmap)
-
-        layout.addWidget(self.icon_label, 1, Qt.AlignCenter)
-
-        # Text
-        self.text_label = QLabel(self.name)
-        self.text_label.setAlignment(Qt.AlignCenter)
-        self.text_label.setWordWrap(True)
-        self.text_label.setStyleSheet("""
-            color: white;
-            font-size: 11px;
-        """)
-        layout.addWidget(self.text_label)
-
-    def _create_live_content(self, layout: QVBoxLayout):
-        """Create live tile content"""
-        # Start with icon/text
-        self._create_icon_text_content(layout)
-
-        # Setup live updates
-        self.live_update_timer = QTimer()
-        self.live_update_timer.timeout.connect(self._update_live_content)
-        self.live_update_timer.start(30000)  # Update every 30 seconds
-
-    def _update_size(self):
-        """Update widget size based on tile size"""
-        if self.size_type == TileSize.SMALL:
-            self.setFixedSize(TILE_SMALL_SIZE, TILE_SMALL_SIZE)
-        elif self.size_type == TileSize.MEDIUM:
-            self.setFixedSize(TILE_MEDIUM_SIZE, TILE_MEDIUM_SIZE)
-        elif self.size_type == TileSize.WIDE:
-            self.setFixedSize(TILE_WIDE_SIZE, TILE_MEDIUM_SIZE)
-        elif self.size_type == TileSize.LARGE:
-            self.setFixedSize(TILE_LARGE_SIZE, TILE_LARGE_SIZE)
-
-    def _get_icon_size(self) -> QSize:
-        """Get appropriate icon size for tile"""
-        if self.size_type == TileSize.SMALL:
-            return QSize(24, 24)
-        elif self.size_type == TileSize.MEDIUM:
-            return QSize(48, 48)
-        elif self.size_type == TileSize.WIDE:
-            return QSize(48, 48)
-        elif self.size_type == TileSize.LARGE:
-            return QSize(96, 96)
-        else:
-            return QSize(48, 48)
+    def visible_tile_ids(self) -> List[str]:
+        """Tiles giao với vùng đang hiển thị"""
+        visible = self._visible_content_rect()
+        first = visible.top() // self.grid_size
+        last = visible.bottom() // self.grid_size
+        return list(self.occupancy.keys_in_rows(first, last))
 
-    def _apply_style(self):
-        """Apply visual style"""
-        # Default background color or custom
-        if self.custom_color:
-            bg_color = self.custom_color.name()
-        else:
-            bg_color = self._get_default_color()
-
-        self.setStyleSheet(f"""
-            #StartMenuTile {{
-                background: {bg_color};
-                border-radius: 4px;
-            }}
-            #StartMenuTile:hover {{
-                background: {self._lighten_color(bg_color)};
-            }}
-        """)
+    # ========== PAINT ==========
 
-    def _get_default_color(self) -> str:
-        """Get default tile color based on app"""
-        # Use a hash of app_id to generate consistent color
-        colors = [
-            "#0078d4",  # Blue
-            "#107c10",  # Green
-            "#5c2d91",  # Purple
-            "#e81123",  # Red
-            "#ff8c00",  # Orange
-            "#00bcf2",  # Light blue
-            "#e3008c",  # Magenta
-            "#00cc6a",  # Mint
-        ]
-
-        index = hash(self.app_id) % len(colors)
-        return colors[index]
-
-    def _lighten_color(self, color: str) -> str:
-        """Lighten a color for hover effect"""
-        # Simple lightening by adjusting RGB values
-        qcolor = QColor(color)
-        qcolor = qcolor.lighter(120)
-        return qcolor.name()
-
-    def _setup_animations(self):
-        """Setup animations"""
-        # Hover animation
-        self.hover_animation = QPropertyAnimation(self, b"hover_progress")
-        self.hover_animation.setDuration(150)
-        self.hover_animation.setEasingCurve(QEasingCurve.InOutQuad)
-
-    # ========== PROPERTIES ==========
-
-    def get_hover_progress(self) -> float:
-        """Get hover animation progress"""
-        return self.hover_progress
-
-    def set_hover_progress(self, value: float):
-        """Set hover animation progress"""
-        self.hover_progress = value
-        self.update()
-
-    hover_progress = Property(float, get_hover_progress, set_hover_progress)
-
-    # ========== PAINT EVENT ==========
+    def _delegate_for(self, tile: TileData, size: QSize) -> TileDelegate:
+        delegate = self._delegates.get(tile.app_id)
+        if delegate is None or not delegate.matches(tile, size):
+            delegate = TileDelegate(tile, size, self.devicePixelRatioF())
+            self._delegates[tile.app_id] = delegate
+            self.stats["delegates_created"] += 1
+        self._delegates.move_to_end(tile.app_id)
+        return delegate
 
     def paintEvent(self, event: QPaintEvent):
-        """Custom paint for effects"""
-        super().paintEvent(event)
-
-        if self.hover_progress > 0:
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.Antialiasing)
-
-            # Draw hover overlay
-            overlay_color = QColor(255, 255, 255, int(30 * self.hover_progress))
-            painter.fillRect(self.rect(), overlay_color)
+        """Vẽ các tile giao với vùng cần vẽ"""
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        offset = self._scroll_offset()
+        painter.translate(0, -offset)
+        clip = QRectF(event.rect().translated(0, offset))
+
+        first = int(clip.top()) // self.grid_size
+        last = int(clip.bottom()) // self.grid_size
+        app_ids = dict.fromkeys(self.occupancy.keys_in_rows(first, last))
+        # Tile đang di chuyển có thể đang đi ngang qua vùng hiển thị
+        moving = [key[1] for key in self.animator.keys() if key[0] == "geometry" and key[1] not in app_ids]
+
+        painted = 0
+        for app_id in [*app_ids, *moving]:
+            tile = self.tiles.get(app_id)
+            if tile is None:
+                continue
+            target = self.tile_rect(app_id)
+            rect = self._current_rect(app_id)
+            if not rect.intersects(clip):
+                continue
+            opacity = self.animator.value(("opacity", app_id))
+            hover = self.animator.value(("hover", app_id))
+            self._delegate_for(tile, target.size()).paint(
+                painter, rect,
+                opacity[0] if opacity else 1.0,
+                hover[0] if hover else (1.0 if app_id == self.hovered_id else 0.0)
+            )
+            painted += 1
+
+        # Tiles đang animate ra
+        for app_id, (tile, rect) in self._leaving.items():
+            delegate = self._delegates.get(app_id)
+            opacity = self.animator.value(("opacity", app_id))
+            if delegate is not None and opacity and rect.intersects(clip):
+                delegate.paint(painter, rect, opacity[0])
+
+        # Drop indicator
+        if self.drop_indicator is not None:
+            painter.setPen(QPen(QColor(0, 120, 215, 150), 2, Qt.DashLine))
+            painter.setBrush(QColor(0, 120, 215, 50))
+            painter.drawRoundedRect(QRectF(self.drop_indicator).adjusted(1, 1, -1, -1), 4, 4)
+
+        painter.end()
+
+        # Giữ delegate của tile vừa cuộn qua, bỏ phần cũ nhất
+        excess = len(self._delegates) - max(TILE_DELEGATE_CACHE_SIZE, painted * 2)
+        for app_id in list(self._delegates)[:max(0, excess)]:
+            if app_id not in self._leaving:
+                del self._delegates[app_id]
+
+        self.stats["paints"] += 1
+        self.stats["tiles_painted"] += painted
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        """Dịch phần đã vẽ, chỉ vẽ lại dải vừa lộ ra"""
+        self.viewport().scroll(dx, dy)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_range()
 
     # ========== MOUSE EVENTS ==========
 
-    def enterEvent(self, event: QEnterEvent):
-        """Mouse enter"""
-        self.is_hovered = True
-
-        # Start hover animation
-        self.hover_animation.setStartValue(self.hover_progress)
-        self.hover_animation.setEndValue(1.0)
-        self.hover_animation.start()
-
-        super().enterEvent(event)
-
-    def leaveEvent(self, event):
-        """Mouse leave"""
-        self.is_hovered = False
+    def viewportEvent(self, event: QEvent) -> bool:
+        if event.type() == QEvent.Leave:
+            self._set_hovered(None)
+        return super().viewportEvent(event)
 
-        # Reverse hover animation
-        self.hover_animation.setStartValue(self.hover_progress)
-        self.hover_animation.setEndValue(0.0)
-        self.hover_animation.start()
-
-        super().leaveEvent(event)
+    def _set_hovered(self, app_id: Optional[str]):
+        """Hover animation giữa tile cũ và tile mới"""
+        if app_id == self.hovered_id:
+            return
+        previous, self.hovered_id = self.hovered_id, app_id
+        if previous is not None and previous in self.tiles:
+            self.animator.start(("hover", previous), (1.0,), (0.0,), duration=150,
+                                easing=QEasingCurve.InOutQuad)
+        if app_id is not None:
+            self.animator.start(("hover", app_id), (0.0,), (1.0,), duration=150,
+                                easing=QEasingCurve.InOutQuad)
+        self.viewport().setCursor(Qt.PointingHandCursor if app_id else Qt.ArrowCursor)
 
     def mousePressEvent(self, event: QMouseEvent):
         """Mouse press"""
         if event.button() == Qt.LeftButton:
-            self.is_pressed = True
-
-            # Visual feedback
-            self.setStyleSheet(self.styleSheet() + """
-                #StartMenuTile {
-                    transform: scale(0.95);
-                }
-            """)
-
-            # Start drag if moved
+            self.press_id = self.tile_at(event.pos())
             self.drag_start_pos = event.pos()
-
         super().mousePressEvent(event)
 
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        """Mouse release"""
-        if event.button() == Qt.LeftButton:
-            self.is_pressed = False
-
-            # Reset visual
-            self._apply_style()
-
-            # Emit clicked if not dragged
-            if self.rect().contains(event.pos()):
-                self.clicked.emit()
-
-        super().mouseReleaseEvent(event)
-
     def mouseMoveEvent(self, event: QMouseEvent):
-        """Mouse move - start drag if needed"""
-        if event.buttons() & Qt.LeftButton and self.drag_start_pos:
+        """Hover, bắt đầu drag khi kéo đủ xa"""
+        if event.buttons() & Qt.LeftButton and self.press_id and self.drag_start_pos is not None:
             if (event.pos() - self.drag_start_pos).manhattanLength() >= 10:
-                self._start_drag()
+                self._start_drag(self.press_id)
+                return
+        elif not event.buttons():
+            self._set_hovered(self.tile_at(event.pos()))
 
         super().mouseMoveEvent(event)
 
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        """Mouse release - click nếu thả trên đúng tile đã nhấn"""
+        if event.button() == Qt.LeftButton:
+            app_id, self.press_id = self.press_id, None
+            self.drag_start_pos = None
+            if app_id and self.tile_at(event.pos()) == app_id:
+                self.tile_clicked.emit(app_id)
+
+        super().mouseReleaseEvent(event)
+
     def contextMenuEvent(self, event):
         """Right-click context menu"""
+        app_id = self.tile_at(event.pos())
+        if app_id is None:
+            return
+        tile = self.tiles[app_id]
+
         menu = QMenu(self)
 
         # Unpin from Start
         unpin_action = QAction(load_icon("unpin"), "Unpin from Start", menu)
-        unpin_action.triggered.connect(self.remove_requested.emit)
+        unpin_action.triggered.connect(lambda: self.remove_tile(app_id))
         menu.addAction(unpin_action)
 
         menu.addSeparator()
@@ -759,8 +777,8 @@ class Tile(QFrame):
         for size in TileSize:
             size_action = QAction(size.value.capitalize(), resize_menu)
             size_action.setCheckable(True)
-            size_action.setChecked(size == self.size_type)
-            size_action.triggered.connect(lambda checked, s=size: self.resize_requested.emit(s))
+            size_action.setChecked(size == tile.size)
+            size_action.triggered.connect(lambda checked, s=size: self._resize_tile(app_id, s))
             resize_menu.addAction(size_action)
 
         menu.addSeparator()
@@ -774,71 +792,120 @@ class Tile(QFrame):
 
     # ========== DRAG & DROP ==========
 
-    def _start_drag(self):
+    def _start_drag(self, app_id: str):
         """Start dragging the tile"""
+        tile = self.tiles[app_id]
+        rect = self.tile_rect(app_id)
+        hot_spot = self.drag_start_pos + QPoint(0, self._scroll_offset()) - rect.topLeft()
+        self.press_id = None
+        self.drag_start_pos = None
+
         drag = QDrag(self)
 
         # Set mime data
         mime_data = QMimeData()
-        mime_data.setData("application/x-tile-id", self.app_id.encode('utf-8'))
+        mime_data.setData(TILE_MIME_TYPE, app_id.encode('utf-8'))
         drag.setMimeData(mime_data)
 
-        # Create drag pixmap
-        pixmap = QPixmap(self.size())
-        self.render(pixmap)
-        drag.setPixmap(pixmap)
-        drag.setHotSpot(self.drag_start_pos)
+        # Drag pixmap = delegate đã vẽ sẵn
+        drag.setPixmap(self._delegate_for(tile, rect.size()).pixmap)
+        drag.setHotSpot(hot_spot)
 
         # Execute drag
         drag.exec(Qt.MoveAction)
 
-    # ========== PUBLIC METHODS ==========
-
-    def set_size(self, size: TileSize):
-        """Change tile size"""
-        self.size_type = size
-        self._update_size()
-
-        # Update icon if exists
-        if hasattr(self, 'icon_label') and self.app_icon:
-            icon_size = self._get_icon_size()
-            pixmap = self.app_icon.pixmap(icon_size)
-            self.icon_label.setPixmap(pixmap)
-
-    def set_background_color(self, color: QColor):
-        """Set custom background color"""
-        self.custom_color = color
-        self._apply_style()
-
-    def animate_in(self):
-        """Animate tile appearance"""
-        # Scale and fade in
-        effect = QGraphicsOpacityEffect()
-        self.setGraphicsEffect(effect)
-
-        fade_in = QPropertyAnimation(effect, b"opacity")
-        fade_in.setDuration(TILE_ANIMATION_DURATION)
-        fade_in.setStartValue(0.0)
-        fade_in.setEndValue(1.0)
-        fade_in.setEasingCurve(QEasingCurve.OutCubic)
-        fade_in.start()
-
-    def animate_out(self):
-        """Animate tile removal"""
-        effect = self.graphicsEffect()
-        if not effect:
-            effect = QGraphicsOpacityEffect()
-            self.setGraphicsEffect(effect)
-
-        fade_out = QPropertyAnimation(effect, b"opacity")
-        fade_out.setDuration(TILE_ANIMATION_DURATION)
-        fade_out.setStartValue(1.0)
-        fade_out.setEndValue(0.0)
-        fade_out.setEasingCurve(QEasingCurve.InCubic)
-        fade_out.start()
-
-    def _update_live_content(self):
+    def dragEnterEvent(self, event: QDragEnterEvent):
+        """Handle drag enter"""
+        if event.mimeData().hasFormat(TILE_MIME_TYPE):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event: QDragMoveEvent):
+        """Handle drag move"""
+        if event.mimeData().hasFormat(TILE_MIME_TYPE):
+            # Show drop indicator
+            tile_id = self._drag_tile_id(event)
+            grid_pos = self._get_grid_position(event.position().toPoint(), tile_id)
+
+            if grid_pos and self._can_fit_tile(grid_pos, self.tiles[tile_id].size, exclude_id=tile_id):
+                self._show_drop_indicator(grid_pos, self.tiles[tile_id].size)
+            else:
+                self._hide_drop_indicator()
+
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragLeaveEvent(self, event):
+        self._hide_drop_indicator()
+        super().dragLeaveEvent(event)
+
+    def dropEvent(self, event: QDropEvent):
+        """Handle drop"""
+        if event.mimeData().hasFormat(TILE_MIME_TYPE):
+            tile_id = self._drag_tile_id(event)
+
+            # Get drop position
+            grid_pos = self._get_grid_position(event.position().toPoint(), tile_id)
+
+            if grid_pos and tile_id in self.tiles:
+                # Move tile to new position
+                self._move_tile(tile_id, grid_pos)
+
+            # Hide drop indicator
+            self._hide_drop_indicator()
+
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    @staticmethod
+    def _drag_tile_id(event) -> str:
+        return str(event.mimeData().data(TILE_MIME_TYPE), 'utf-8')
+
+    def _get_grid_position(self, pos: QPoint, app_id: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """Convert pixel position (viewport) to grid position, kẹp để tile vừa lưới"""
+        col = pos.x() // self.grid_size
+        row = (pos.y() + self._scroll_offset()) // self.grid_size
+        if row < 0 or not 0 <= col < self.columns:
+            return None
+
+        if app_id in self.tiles:
+            col = min(col, self.columns - self.tiles[app_id].span[1])
+        return (row, col)
+
+    def _show_drop_indicator(self, position: Tuple[int, int], size: TileSize = TileSize.SMALL):
+        """Show drop position indicator"""
+        rect = self._span_rect(*position, *self._get_tile_span(size))
+        if rect != self.drop_indicator:
+            self.drop_indicator = rect
+            self.viewport().update()
+
+    def _hide_drop_indicator(self):
+        """Hide drop indicator"""
+        if self.drop_indicator is not None:
+            self.drop_indicator = None
+            self.viewport().update()
+
+    # ========== LIVE TILES ==========
+
+    def _ensure_live_subscription(self):
+        # Live update mỗi 30 giây - chỉ khi Start Menu đang mở (ẩn thì tạm dừng)
+        if self.live_subscription is None:
+            self.live_subscription = TickScheduler.instance().subscribe(
+                self._update_live_tiles, 30000, LIVE_TILE_TOLERANCE_MS, widget=self, name="LiveTiles")
+
+    def _update_live_tiles(self):
+        """Cập nhật các live tile đang hiển thị"""
+        for app_id in self.visible_tile_ids():
+            tile = self.tiles.get(app_id)
+            if tile is not None and tile.style == TileStyle.LIVE:
+                self._update_live_content(tile)
+
+    def _update_live_content(self, tile: TileData):
         """Update live tile content (for live tiles)"""
         # This would fetch and display live content
         # For example: weather, news, notifications
-        pass
\ No newline at end of file
+        # Nội dung mới: gán tile.live_content, tăng tile.version rồi viewport().update()
+        pass
@@ -0,0 +1,170 @@
+# ui_qt/windows/dashboard_window_qt/views/start_menu/tile_occupancy.py
+"""
+Tile Occupancy - Bản đồ ô đã chiếm của lưới tiles trong Start Menu
+- Mỗi hàng là một bitmask (bit c = cột c đã có tile), cập nhật từng phần khi
+  place / release / move -> kiểm tra chỗ trống = vài phép AND, không quét từng tile
+- Lưới cố định số cột, số hàng tự tăng khi thêm tile (view cuộn dọc)
+- Con trỏ hàng đầy: mọi hàng trước con trỏ đều kín -> tìm chỗ trống không quét lại từ đầu
+- Chỉ mục theo hàng trên cùng của tile -> lấy tiles trong một dải hàng (vùng đang hiển thị)
+"""
+
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+# (row, col, row_span, col_span)
+Span = Tuple[int, int, int, int]
+
+
+class TileOccupancyMap:
+    """
+    Bitmap 2D các ô lưới đã bị tile chiếm
+
+    Key là app_id (hoặc giá trị hashable bất kỳ). Span lưu vị trí đích của tile,
+    không phải vị trí đang animate.
+    """
+
+    def __init__(self, columns: int):
+        self.columns = max(1, columns)
+        self._full = (1 << self.columns) - 1
+
+        self._rows: List[int] = []  # bitmask mỗi hàng
+        self._spans: Dict[Hashable, Span] = {}
+        self._by_row: Dict[int, Dict[Hashable, None]] = {}  # hàng trên cùng -> keys
+        self._max_row_span = 1
+        self._cursor = 0  # Mọi hàng < _cursor đều đầy
+
+    # ========== ITEMS ==========
+
+    def place(self, key: Hashable, row: int, col: int, row_span: int, col_span: int) -> bool:
+        """Đặt key vào vùng (row, col, span); False nếu ra ngoài lưới hoặc chồng tile khác"""
+        if key in self._spans:
+            return self.move(key, row, col, row_span, col_span)
+        if not self.can_place(row, col, row_span, col_span):
+            return False
+        self._occupy(key, (row, col, row_span, col_span))
+        return True
+
+    def release(self, key: Hashable) -> Optional[Span]:
+        """Bỏ key khỏi lưới, trả về span cũ"""
+        span = self._spans.pop(key, None)
+        if span is None:
+            return None
+        row, col, row_span, col_span = span
+        clear = ~(((1 << col_span) - 1) << col)
+        for r in range(row, row + row_span):
+            self._rows[r] &= clear
+        bucket = self._by_row[row]
+        del bucket[key]
+        if not bucket:
+            del self._by_row[row]
+        while self._rows and not self._rows[-1]:
+            self._rows.pop()
+        self._cursor = min(self._cursor, row)
+        return span
+
+    def move(self, key: Hashable, row: int, col: int,
+             row_span: Optional[int] = None, col_span: Optional[int] = None) -> bool:
+        """Đổi vị trí / kích thước; không hợp lệ thì giữ nguyên span cũ"""
+        old = self._spans.get(key)
+        if old is None:
+            return False
+        row_span = old[2] if row_span is None else row_span
+        col_span = old[3] if col_span is None else col_span
+        if not self.can_place(row, col, row_span, col_span, exclude=key):
+            return False
+        self.release(key)
+        self._occupy(key, (row, col, row_span, col_span))
+        return True
+
+    def clear(self):
+        self._rows.clear()
+        self._spans.clear()
+        self._by_row.clear()
+        self._max_row_span = 1
+        self._cursor = 0
+
+    def span_of(self, key: Hashable) -> Optional[Span]:
+        return self._spans.get(key)
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __contains__(self, key: Hashable):
+        return key in self._spans
+
+    def _occupy(self, key: Hashable, span: Span):
+        row, col, row_span, col_span = span
+        bits = ((1 << col_span) - 1) << col
+        if len(self._rows) < row + row_span:
+            self._rows.extend([0] * (row + row_span - len(self._rows)))
+        for r in range(row, row + row_span):
+            self._rows[r] |= bits
+        self._spans[key] = span
+        self._by_row.setdefault(row, {})[key] = None
+        self._max_row_span = max(self._max_row_span, row_span)
+        while self._cursor < len(self._rows) and self._rows[self._cursor] == self._full:
+            self._cursor += 1
+
+    # ========== QUERIES ==========
+
+    @property
+    def row_count(self) -> int:
+        """Số hàng đang có tile (hàng cuối cùng không trống)"""
+        return len(self._rows)
+
+    def row_mask(self, row: int) -> int:
+        return self._rows[row] if 0 <= row < len(self._rows) else 0
+
+    def can_place(self, row: int, col: int, row_span: int, col_span: int,
+                  exclude: Hashable = None) -> bool:
+        """Vùng nằm trong lưới và chưa có tile nào (trừ exclude)"""
+        if row < 0 or col < 0 or col + col_span > self.columns or row_span < 1 or col_span < 1:
+            return False
+        bits = ((1 << col_span) - 1) << col
+        own = self._spans.get(exclude) if exclude is not None else None
+        for r in range(row, row + row_span):
+            mask = self.row_mask(r)
+            if own is not None and own[0] <= r < own[0] + own[2]:
+                mask &= ~(((1 << own[3]) - 1) << own[1])
+            if mask & bits:
+                return False
+        return True
+
+    def find_free(self, row_span: int, col_span: int, start_row: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Vị trí (row, col) trống đầu tiên theo thứ tự hàng; lưới tự tăng hàng
+        nên luôn tìm được, trừ khi tile rộng hơn số cột (None)
+        """
+        if col_span > self.columns or row_span < 1 or col_span < 1:
+            return None
+        bits = (1 << col_span) - 1
+        row = max(start_row, self._cursor)
+        while True:
+            window = 0
+            for r in range(row, row + row_span):
+                window |= self.row_mask(r)
+            if window != self._full:
+                for col in range(self.columns - col_span + 1):
+                    if not window & (bits << col):
+                        return row, col
+            # Hàng >= row_count luôn trống nên vòng lặp chắc chắn dừng
+            row += 1
+
+    def keys_in_rows(self, first_row: int, last_row: int) -> Iterator[Hashable]:
+        """Các key có span giao với dải hàng [first_row, last_row] (gồm cả hai đầu)"""
+        for top in range(max(0, first_row - self._max_row_span + 1), last_row + 1):
+            bucket = self._by_row.get(top)
+            if not bucket:
+                continue
+            for key in bucket:
+                if top + self._spans[key][2] > first_row:
+                    yield key
+
+    def key_at(self, row: int, col: int) -> Optional[Hashable]:
+        """Tile chiếm ô (row, col)"""
+        if not self.row_mask(row) >> col & 1:
+            return None
+        for key in self.keys_in_rows(row, row):
+            r, c, row_span, col_span = self._spans[key]
+            if c <= col < c + col_span:
+                return key
+        return None
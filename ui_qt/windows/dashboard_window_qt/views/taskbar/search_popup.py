@@ -0,0 +1,180 @@
+# ui_qt/windows/dashboard_window_qt/views/taskbar/search_popup.py
+"""
+Taskbar Search Popup - Danh sách kết quả tìm apps hiện phía trên ô tìm kiếm
+- Model nhẹ (QAbstractListModel) thay cho tạo widget mỗi kết quả
+- Popup không lấy focus: vẫn gõ tiếp trong ô tìm kiếm, Up / Down / Enter điều khiển danh sách
+"""
+
+from typing import Dict, List, Optional
+import logging
+
+from PySide6.QtWidgets import QFrame, QListView, QVBoxLayout, QWidget, QAbstractItemView
+from PySide6.QtCore import Qt, QSize, QPoint, Signal, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QIcon
+
+from ...utils.constants import MAX_SEARCH_RESULTS
+from ...utils.assets import get_app_icon
+from ...repositories.app_repository import AppModel
+
+# Logger
+logger = logging.getLogger(__name__)
+
+APP_ID_ROLE = Qt.UserRole
+
+
+# ========== RESULTS MODEL ==========
+
+class AppSearchResultsModel(QAbstractListModel):
+    """Kết quả tìm kiếm apps (đã xếp hạng)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._apps: List[AppModel] = []
+        self._icons: Dict[str, QIcon] = {}  # Giữ icon qua các lần gõ
+
+    def set_apps(self, apps: List[AppModel]):
+        self.beginResetModel()
+        self._apps = list(apps)
+        self.endResetModel()
+
+    def app_id_at(self, row: int) -> Optional[str]:
+        return self._apps[row].id if 0 <= row < len(self._apps) else None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._apps)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._apps):
+            return None
+        app = self._apps[index.row()]
+
+        if role == Qt.DisplayRole:
+            return app.display_name or app.name
+        if role == Qt.DecorationRole:
+            icon = self._icons.get(app.id)
+            if icon is None:
+                icon = self._icons[app.id] = get_app_icon(app.id)
+            return icon
+        if role == Qt.ToolTipRole:
+            return app.description or None
+        if role == APP_ID_ROLE:
+            return app.id
+        return None
+
+
+# ========== POPUP ==========
+
+class TaskbarSearchPopup(QFrame):
+    """Popup kết quả tìm kiếm, neo vào ô tìm kiếm của taskbar"""
+
+    # Signals
+    app_activated = Signal(str)  # app_id
+
+    ROW_HEIGHT = 40
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Tool | Qt.FramelessWindowHint)
+
+        self.setObjectName("TaskbarSearchPopup")
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setFocusPolicy(Qt.NoFocus)
+
+        self.model = AppSearchResultsModel(self)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(0)
+
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.model)
+        self.list_view.setFocusPolicy(Qt.NoFocus)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setIconSize(QSize(24, 24))
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.list_view.clicked.connect(lambda index: self._activate(index.row()))
+        layout.addWidget(self.list_view)
+
+        self.setStyleSheet(f"""
+            #TaskbarSearchPopup {{
+                background: rgba(32, 32, 32, 245);
+                border: 1px solid rgba(255, 255, 255, 30);
+                border-radius: 8px;
+            }}
+            #TaskbarSearchPopup QListView {{
+                background: transparent;
+                border: none;
+                color: white;
+                font-size: 13px;
+                outline: none;
+            }}
+            #TaskbarSearchPopup QListView::item {{
+                height: {self.ROW_HEIGHT}px;
+                padding: 0 8px;
+                border-radius: 4px;
+            }}
+            #TaskbarSearchPopup QListView::item:hover {{
+                background: rgba(255, 255, 255, 15);
+            }}
+            #TaskbarSearchPopup QListView::item:selected {{
+                background: #0078d4;
+            }}
+        """)
+
+    # ========== RESULTS ==========
+
+    def set_results(self, apps: List[AppModel]):
+        """Thay kết quả, chọn sẵn dòng đầu"""
+        self.model.set_apps(apps[:MAX_SEARCH_RESULTS])
+        if self.model.rowCount():
+            self.list_view.setCurrentIndex(self.model.index(0))
+
+    def result_count(self) -> int:
+        return self.model.rowCount()
+
+    def current_app_id(self) -> Optional[str]:
+        return self.model.app_id_at(self.list_view.currentIndex().row())
+
+    def move_selection(self, delta: int):
+        """Di chuyển dòng đang chọn (vòng lại ở hai đầu)"""
+        count = self.model.rowCount()
+        if not count:
+            return
+        row = (self.list_view.currentIndex().row() + delta) % count
+        index = self.model.index(row)
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index)
+
+    def activate_current(self) -> bool:
+        """Mở app đang chọn; False nếu không có kết quả"""
+        return self._activate(self.list_view.currentIndex().row())
+
+    def _activate(self, row: int) -> bool:
+        app_id = self.model.app_id_at(row)
+        if app_id is None:
+            return False
+        self.app_activated.emit(app_id)
+        return True
+
+    # ========== POSITION ==========
+
+    def show_for(self, anchor: QWidget):
+        """Hiện phía trên anchor (taskbar ở đáy màn hình), thiếu chỗ thì hiện bên dưới"""
+        visible_rows = min(self.model.rowCount(), 10)
+        margins = self.contentsMargins()
+        layout_margins = self.layout().contentsMargins()
+        height = (visible_rows * self.ROW_HEIGHT + 2 * self.list_view.frameWidth()
+                  + layout_margins.top() + layout_margins.bottom() + margins.top() + margins.bottom())
+        width = max(anchor.width(), 360)
+        self.resize(width, height)
+
+        top_left = anchor.mapToGlobal(QPoint(0, 0))
+        y = top_left.y() - height - 4
+        screen = anchor.screen()
+        if screen is not None and y < screen.availableGeometry().top():
+            y = top_left.y() + anchor.height() + 4
+        self.move(top_left.x(), y)
+
+        if not self.isVisible():
+            self.show()
+        self.raise_()
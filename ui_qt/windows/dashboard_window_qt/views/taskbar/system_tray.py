@@ -6,7 +6,6 @@ Hiển thị thông tin hệ thống và điều khiển nhanh
 
 import os
 import sys
-import psutil
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -21,7 +20,7 @@ from PySide6.QtWidgets import (
     QWidgetAction, QCheckBox, QPushButton
 )
 from PySide6.QtCore import (
-    Qt, QSize, QPoint, QRect, QTimer, QTime,
+    Qt, QSize, QPoint, QRect, QTime,
     Signal, Property, QPropertyAnimation,
     QEasingCurve, QEvent, QDate, QDateTime,
     QLocale
@@ -37,6 +36,8 @@ from PySide6.QtMultimedia import QAudioOutput, QMediaDevices
 # Import utils
 from ...utils.constants import TASKBAR_HEIGHT
 from ...utils.assets import load_icon
+from ...services.tick_scheduler import TickScheduler, CLOCK_TOLERANCE_MS
+from ...services.system_status_monitor import SystemStatusMonitor, BatteryInfo
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -96,14 +97,14 @@ class SystemTray(QWidget):
         self.battery_level = 100
         self.battery_status = BatteryStatus.FULL
 
-        # Timers
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_system_info)
-        self.update_timer.start(5000)  # Update every 5 seconds
-
         # Setup UI
         self._setup_ui()
-        self._update_system_info()
+
+        # Mạng / pin đọc trên worker thread, kết quả về qua signal (chỉ khi đổi)
+        self.status_monitor = SystemStatusMonitor(widget=self, parent=self)
+        self.status_monitor.network_changed.connect(self._on_network_changed)
+        self.status_monitor.battery_changed.connect(self._on_battery_changed)
+        self.status_monitor.start()
 
         logger.info("System Tray initialized")
 
@@ -132,11 +133,11 @@ class SystemTray(QWidget):
         self.network_icon.clicked.connect(self.network_clicked.emit)
         layout.addWidget(self.network_icon)
 
-        # Battery (if available)
-        if self._has_battery():
-            self.battery_icon = BatteryIcon(self)
-            self.battery_icon.clicked.connect(self.battery_clicked.emit)
-            layout.addWidget(self.battery_icon)
+        # Battery - ẩn tới khi monitor báo máy có pin
+        self.battery_icon = BatteryIcon(self)
+        self.battery_icon.clicked.connect(self.battery_clicked.emit)
+        self.battery_icon.hide()
+        layout.addWidget(self.battery_icon)
 
         # Notification center
         self.notification_icon = NotificationIcon(self)
@@ -151,52 +152,35 @@ class SystemTray(QWidget):
         layout.addWidget(self.clock_widget)
 
     def _update_system_info(self):
-        """Update system information"""
-        # Update network status
-        self._update_network_status()
-
-        # Update battery status
-        if self.battery_icon:
-            self._update_battery_status()
-
-    def _update_network_status(self):
-        """Check and update network status"""
-        try:
-            # Check network connectivity
-            import socket
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
-            self.network_status = NetworkStatus.CONNECTED
-        except OSError:
-            self.network_status = NetworkStatus.DISCONNECTED
+        """Yêu cầu đọc lại thông tin hệ thống (kết quả về qua signal)"""
+        self.status_monitor.refresh()
 
+    def _on_network_changed(self, status: str):
+        """Network status from monitor"""
+        self.network_status = NetworkStatus(status)
         if self.network_icon:
             self.network_icon.set_status(self.network_status)
 
-    def _update_battery_status(self):
-        """Update battery information"""
-        try:
-            battery = psutil.sensors_battery()
-            if battery:
-                self.battery_level = int(battery.percent)
+    def _on_battery_changed(self, battery: Optional[BatteryInfo]):
+        """Battery information from monitor"""
+        if battery is None:
+            self.battery_status = BatteryStatus.NOT_PRESENT
+            self.battery_icon.hide()
+            return
 
-                if battery.power_plugged:
-                    self.battery_status = BatteryStatus.CHARGING if battery.percent < 100 else BatteryStatus.FULL
-                else:
-                    self.battery_status = BatteryStatus.DISCHARGING
+        self.battery_level = battery.percent
+        if battery.plugged:
+            self.battery_status = BatteryStatus.CHARGING if battery.percent < 100 else BatteryStatus.FULL
+        else:
+            self.battery_status = BatteryStatus.DISCHARGING
 
-                if self.battery_icon:
-                    self.battery_icon.set_level(self.battery_level)
-                    self.battery_icon.set_status(self.battery_status)
-        except Exception as e:
-            logger.error(f"Error updating battery status: {e}")
+        self.battery_icon.set_level(self.battery_level)
+        self.battery_icon.set_status(self.battery_status)
+        self.battery_icon.show()
 
     def _has_battery(self) -> bool:
-        """Check if system has battery"""
-        try:
-            battery = psutil.sensors_battery()
-            return battery is not None
-        except:
-            return False
+        """Check if system has battery (theo lần đọc gần nhất của monitor)"""
+        return self.status_monitor.status.battery is not None
 
     # ========== PUBLIC METHODS ==========
 
@@ -244,10 +228,9 @@ class ClockWidget(QToolButton):
         self.setObjectName("SystemClock")
         self.setCursor(Qt.PointingHandCursor)
 
-        # Timer for updating time
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(1000)  # Update every second
+        # Chỉ hiển thị giờ:phút -> tick đúng đầu mỗi phút
+        self.tick = TickScheduler.instance().subscribe(
+            self.update_time, 60000, CLOCK_TOLERANCE_MS, widget=self, name="SystemClock")
 
         # Initial update
         self.update_time()
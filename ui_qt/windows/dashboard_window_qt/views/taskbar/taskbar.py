@@ -30,11 +30,13 @@ from PySide6.QtGui import (
 # Import taskbar components
 from taskbutton import TaskbarButton
 from .system_tray import SystemTray
+from .search_popup import TaskbarSearchPopup
 
 # Import utils
 from ...utils.constants import (
     TASKBAR_HEIGHT, TASKBAR_BUTTON_WIDTH,
-    TASKBAR_BUTTON_HEIGHT, TASKBAR_ICON_SIZE
+    TASKBAR_BUTTON_HEIGHT, TASKBAR_ICON_SIZE,
+    MAX_SEARCH_RESULTS, SEARCH_DEBOUNCE_DELAY
 )
 from ...utils.assets import load_icon, get_app_icon
 from ...utils.animations import fade_in_animation
@@ -88,13 +90,15 @@ class Taskbar(QFrame):
         # Components
         self.start_button = None
         self.search_box = None
+        self.search_popup = None
         self.apps_container = None
         self.system_tray = None
         self.show_desktop_button = None
 
-        # Timers
-        self.clock_timer = QTimer()
-        self.clock_timer.timeout.connect(self._update_clock)
+        # Tìm apps sau khi ngừng gõ (debounce)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self._perform_search)
 
         # Setup
         self._setup_ui()
@@ -102,8 +106,7 @@ class Taskbar(QFrame):
         self._setup_connections()
         self._load_pinned_apps()
 
-        # Start clock
-        self.clock_timer.start(1000)  # Update every second
+        # Đồng hồ trong system tray tự tick qua TickScheduler
 
         logger.info("Taskbar initialized")
 
@@ -150,10 +153,17 @@ class Taskbar(QFrame):
 
         # Search box
         self.search_box = TaskbarSearchBox(self)
-        self.search_box.textChanged.connect(self.search_text_changed.emit)
+        self.search_box.textChanged.connect(self._on_search_text_changed)
         self.search_box.focus_gained.connect(self.search_focused.emit)
+        self.search_box.focus_lost.connect(self._on_search_focus_lost)
+        self.search_box.navigate.connect(self._on_search_navigate)
+        self.search_box.submitted.connect(self._on_search_submitted)
         layout.addWidget(self.search_box)
 
+        # Popup kết quả
+        self.search_popup = TaskbarSearchPopup(self)
+        self.search_popup.app_activated.connect(self._launch_search_result)
+
         return container
 
     def _create_center_section(self) -> QWidget:
@@ -515,8 +525,56 @@ class Taskbar(QFrame):
         for i, button in enumerate(sorted_buttons):
             self.apps_layout.insertWidget(i, button)
 
+    # ========== SEARCH ==========
+
+    def _on_search_text_changed(self, text: str):
+        """Gõ phím: báo ra ngoài ngay, tìm apps khi ngừng gõ"""
+        self.search_text_changed.emit(text)
+        self.search_timer.stop()
+        if text.strip():
+            self.search_timer.start(SEARCH_DEBOUNCE_DELAY)
+        elif self.search_popup:
+            self.search_popup.hide()
+
+    def _perform_search(self):
+        """Tìm apps theo nội dung ô tìm kiếm, hiện popup kết quả"""
+        if not self.search_box or not self.search_popup:
+            return
+        keyword = self.search_box.text().strip()
+        results = self.app_repo.search_apps(keyword, MAX_SEARCH_RESULTS) if keyword else []
+
+        self.search_popup.set_results(results)
+        if results:
+            self.search_popup.show_for(self.search_box)
+        else:
+            self.search_popup.hide()
+
+    def _on_search_navigate(self, delta: int):
+        if self.search_popup and self.search_popup.isVisible():
+            self.search_popup.move_selection(delta)
+
+    def _on_search_submitted(self):
+        """Enter: mở app đang chọn (tìm ngay nếu debounce chưa chạy)"""
+        if self.search_timer.isActive():
+            self.search_timer.stop()
+            self._perform_search()
+        if self.search_popup:
+            self.search_popup.activate_current()
+
+    def _on_search_focus_lost(self):
+        # Click vào popup thì giữ lại để nhận click
+        if self.search_popup and not self.search_popup.underMouse():
+            self.search_popup.hide()
+
+    def _launch_search_result(self, app_id: str):
+        self.app_launched.emit(app_id)
+        self.clear_search()
+
     def clear_search(self):
         """Clear search box"""
+        self.search_timer.stop()
+        if self.search_popup:
+            self.search_popup.hide()
         if self.search_box:
             self.search_box.clear()
 
@@ -579,6 +637,9 @@ class TaskbarSearchBox(QLineEdit):
 
     # Signals
     focus_gained = Signal()
+    focus_lost = Signal()
+    navigate = Signal(int)  # -1 lên, +1 xuống trong popup kết quả
+    submitted = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -616,11 +677,22 @@ class TaskbarSearchBox(QLineEdit):
         super().focusInEvent(event)
         self.focus_gained.emit()
 
+    def focusOutEvent(self, event):
+        """Handle focus out (bỏ qua khi chỉ đổi cửa sổ active, vd. lúc popup kết quả hiện)"""
+        super().focusOutEvent(event)
+        if event.reason() != Qt.ActiveWindowFocusReason:
+            self.focus_lost.emit()
+
     def keyPressEvent(self, event):
         """Handle key press"""
-        if event.key() == Qt.Key_Escape:
+        key = event.key()
+        if key == Qt.Key_Escape:
             self.clear()
             self.clearFocus()
+        elif key in (Qt.Key_Up, Qt.Key_Down):
+            self.navigate.emit(-1 if key == Qt.Key_Up else 1)
+        elif key in (Qt.Key_Return, Qt.Key_Enter):
+            self.submitted.emit()
         else:
             super().keyPressEvent(event)
 
@@ -17,7 +17,7 @@ from PySide6.QtWidgets import (
     QStyle, QToolTip
 )
 from PySide6.QtCore import (
-    Qt, QSize, QPoint, QRect, QTimer,
+    Qt, QSize, QPoint, QRect,
     Signal, Property, QPropertyAnimation,
     QSequentialAnimationGroup, QParallelAnimationGroup,
     QEasingCurve, QEvent, QObject
@@ -36,6 +36,7 @@ from ...utils.constants import (
     TASKBAR_ICON_SIZE
 )
 from ...utils.assets import load_icon, get_app_icon
+from ...services.tick_scheduler import TickScheduler
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -108,13 +109,9 @@ class TaskbarButton(QToolButton):
         self.jump_list = None
         self.progress_overlay = None
 
-        # Timers
-        self.preview_timer = QTimer()
-        self.preview_timer.timeout.connect(self._show_preview)
-        self.preview_timer.setSingleShot(True)
-
-        self.flash_timer = QTimer()
-        self.flash_timer.timeout.connect(self._flash_step)
+        # Tick đang chờ trong TickScheduler (None = không chạy)
+        self.preview_tick = None
+        self.flash_tick = None
 
         # Animations
         self.hover_animation = None
@@ -421,9 +418,11 @@ class TaskbarButton(QToolButton):
         self.hover_animation.setEndValue(1.0)
         self.hover_animation.start()
 
-        # Start preview timer
+        # Show preview after 500ms
         if self.is_running:
-            self.preview_timer.start(500)  # Show preview after 500ms
+            self._cancel_preview_tick()
+            self.preview_tick = TickScheduler.instance().call_later(
+                500, self._show_preview, 50, widget=self, name="TaskbarPreview")
 
     def leaveEvent(self, event):
         """Mouse leave event"""
@@ -437,7 +436,7 @@ class TaskbarButton(QToolButton):
         self.hover_animation.start()
 
         # Cancel preview
-        self.preview_timer.stop()
+        self._cancel_preview_tick()
         self._hide_preview()
 
     def mousePressEvent(self, event: QMouseEvent):
@@ -629,7 +628,9 @@ class TaskbarButton(QToolButton):
     def flash_attention(self, count: int = 3):
         """Flash button for attention"""
         self.flash_count = count * 2  # Each flash = fade out + fade in
-        self.flash_timer.start(150)
+        if self.flash_tick is None:
+            self.flash_tick = TickScheduler.instance().subscribe(
+                self._flash_step, 150, 20, widget=self, name="TaskbarFlash")
 
     def _flash_step(self):
         """Flash animation step"""
@@ -643,9 +644,16 @@ class TaskbarButton(QToolButton):
             self.flash_count -= 1
         else:
             # Stop flashing
-            self.flash_timer.stop()
+            if self.flash_tick is not None:
+                self.flash_tick.cancel()
+                self.flash_tick = None
             self.setWindowOpacity(1.0)
 
+    def _cancel_preview_tick(self):
+        if self.preview_tick is not None:
+            self.preview_tick.cancel()
+            self.preview_tick = None
+
     def bounce(self):
         """Bounce animation for notification"""
         # Create bounce animation
@@ -18,7 +18,7 @@ from PySide6.QtWidgets import (
     QFrame, QGridLayout, QSpinBox, QCheckBox,QLineEdit
 )
 from PySide6.QtCore import (
-    Qt, QTimer, QTime, QDate, QDateTime, QTimeZone,
+    Qt, QTime, QDate, QDateTime, QTimeZone,
     QPoint, QRect, QSize, QRectF, QPointF,
     Signal, Property, QPropertyAnimation, QEasingCurve,
     QEvent, QSettings, QLocale
@@ -42,6 +42,8 @@ except ImportError:
     def load_icon(name):
         return QIcon()
 
+from ...services.tick_scheduler import TickScheduler, CLOCK_TOLERANCE_MS
+
 # Logger
 logger = logging.getLogger(__name__)
 
@@ -90,10 +92,9 @@ class AnalogClock(QWidget):
         # Size
         self.setMinimumSize(150, 150)
 
-        # Timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(1000)  # Update every second
+        # Tick mỗi giây (scheduler dùng chung, dừng khi bị ẩn)
+        self.tick = TickScheduler.instance().subscribe(
+            self.update, 1000, CLOCK_TOLERANCE_MS, widget=self, name="AnalogClock")
 
         # Enable antialiasing
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -414,10 +415,9 @@ class DigitalClock(QLabel):
             }
         """)
 
-        # Timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(1000)
+        # Tick mỗi giây (scheduler dùng chung, dừng khi bị ẩn)
+        self.tick = TickScheduler.instance().subscribe(
+            self.update_time, 1000, CLOCK_TOLERANCE_MS, widget=self, name="DigitalClock")
 
         # Initial update
         self.update_time()
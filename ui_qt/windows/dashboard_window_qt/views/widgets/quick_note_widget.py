@@ -2,11 +2,10 @@
 """
 Quick Note Widget - Sticky Notes trên Desktop
 Ghi chú nhanh với tính năng: Auto-save, Multiple notes, Rich text, Colors, Pin to desktop
+Lưu trữ: NotesRepository (SQLite) - chỉ ghi các note đã đổi, gom trong một lần flush
 """
 
-import json
 import uuid
-from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -19,7 +18,7 @@ from PySide6.QtWidgets import (
     QGraphicsDropShadowEffect, QRubberBand, QApplication, QGraphicsOpacityEffect
 )
 from PySide6.QtCore import (
-    Qt, QTimer, QPoint, QRect, QSize, QSettings,
+    Qt, QPoint, QRect, QSize, QSettings,
     Signal, Property, QPropertyAnimation, QEasingCurve,
     QEvent, QMimeData, QByteArray, QDataStream, QIODevice,
     QParallelAnimationGroup, QSequentialAnimationGroup
@@ -35,20 +34,23 @@ from PySide6.QtGui import (
 # Import utils
 try:
     from ...utils.constants import (
-        NOTE_WIDGET_SIZE, AUTO_SAVE_INTERVAL,
+        NOTE_WIDGET_SIZE, NOTES_FLUSH_DELAY,
         ANIMATION_DURATION_NORMAL
     )
     from ...utils.assets import load_icon
 except ImportError:
     # Fallback values
     NOTE_WIDGET_SIZE = QSize(200, 250)
-    AUTO_SAVE_INTERVAL = 60000
+    NOTES_FLUSH_DELAY = 1000
     ANIMATION_DURATION_NORMAL = 300
 
 
     def load_icon(name):
         return QIcon()
 
+from ...services.tick_scheduler import TickScheduler, CLOCK_TOLERANCE_MS
+from ...repositories.notes_repository import NotesRepository
+
 # Logger
 logger = logging.getLogger(__name__)
 
@@ -287,14 +289,8 @@ class QuickNoteWidget(QFrame):
         # Data
         self.data = data or NoteData()
         self.style = style
-        self.is_editing = False
         self.is_minimized = False
 
-        # Auto-save timer
-        self.auto_save_timer = QTimer()
-        self.auto_save_timer.timeout.connect(self.auto_save)
-        self.auto_save_timer.setInterval(5000)  # 5 seconds
-
         # Animation
         self.show_animation = None
         self.hide_animation = None
@@ -531,10 +527,8 @@ class QuickNoteWidget(QFrame):
         self.data.modified_at = datetime.now()
 
     def on_text_changed(self):
-        """Handle text change"""
-        if not self.is_editing:
-            self.is_editing = True
-            self.auto_save_timer.start()
+        """Handle text change - manager gom các thay đổi và ghi một lần (NotesRepository)"""
+        self.note_changed.emit(self.data.id)
 
         # Update title from first line
         text = self.text_edit.toPlainText()
@@ -544,14 +538,6 @@ class QuickNoteWidget(QFrame):
                 self.data.title = first_line
                 self.title_bar.set_title(first_line)
 
-    def auto_save(self):
-        """Auto save note"""
-        self.save_data()
-        self.note_changed.emit(self.data.id)
-        self.is_editing = False
-        self.auto_save_timer.stop()
-        logger.debug(f"Auto-saved note: {self.data.id}")
-
     def toggle_minimize(self):
         """Toggle minimize state"""
         if self.is_minimized:
@@ -704,14 +690,16 @@ class QuickNoteWidget(QFrame):
     def moveEvent(self, event):
         """Handle move event"""
         super().moveEvent(event)
-        self.data.position = self.pos()
-        self.position_changed.emit(self.data.id, self.pos())
+        if self.pos() != self.data.position:
+            self.data.position = self.pos()
+            self.position_changed.emit(self.data.id, self.pos())
 
     def resizeEvent(self, event: QResizeEvent):
         """Handle resize event"""
         super().resizeEvent(event)
-        if not self.is_minimized:
+        if not self.is_minimized and self.size() != self.data.size:
             self.data.size = self.size()
+            self.note_changed.emit(self.data.id)
 
         # Position size grip
         self.size_grip.move(self.width() - 16, self.height() - 16)
@@ -732,7 +720,7 @@ class QuickNotesManager(QWidget):
     Manager for all sticky notes
     """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, repository: NotesRepository = None):
         super().__init__(parent)
 
         # Storage
@@ -741,14 +729,14 @@ class QuickNotesManager(QWidget):
 
         # Settings
         self.settings = QSettings("TutorApp", "QuickNotes")
-        self.save_path = Path.home() / ".tutor_app" / "notes.json"
-        self.save_path.parent.mkdir(parents=True, exist_ok=True)
+        self.repository = repository or NotesRepository()
 
-        # Auto-save timer
-        self.auto_save_timer = QTimer()
-        self.auto_save_timer.timeout.connect(self.save_all_notes)
-        self.auto_save_timer.setInterval(AUTO_SAVE_INTERVAL)
-        self.auto_save_timer.start()
+        # Một lần ghi cho mọi thay đổi trong NOTES_FLUSH_DELAY (tính từ thay đổi đầu tiên,
+        # gõ liên tục không đẩy lùi mãi). Manager luôn ẩn nên không gắn widget
+        self.flush_tick = None
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_notes)
 
         # Load existing notes
         self.load_all_notes()
@@ -776,17 +764,7 @@ class QuickNotesManager(QWidget):
             data.position = QPoint(100 + offset, 100 + offset)
 
         # Create widget
-        note_widget = QuickNoteWidget(data)
-
-        # Connect signals
-        note_widget.note_changed.connect(self.on_note_changed)
-        note_widget.note_closed.connect(self.on_note_closed)
-        note_widget.note_focused.connect(self.on_note_focused)
-        note_widget.duplicate_requested.connect(self.duplicate_note)
-
-        # Store
-        self.notes[data.id] = note_widget
-        self.notes_data[data.id] = data
+        note_widget = self._add_note_widget(data)
 
         # Show
         note_widget.show()
@@ -795,7 +773,7 @@ class QuickNotesManager(QWidget):
         self.animate_note_entrance(note_widget)
 
         # Save
-        self.save_all_notes()
+        self.on_note_changed(data.id)
 
         logger.info(f"Created note: {data.id}")
         return data.id
@@ -824,15 +802,31 @@ class QuickNotesManager(QWidget):
         if note_id in self.notes_data:
             del self.notes_data[note_id]
 
-        self.save_all_notes()
+        self.repository.mark_deleted(note_id)
+        self.schedule_flush()
         logger.info(f"Deleted note: {note_id}")
 
+    def _add_note_widget(self, data: NoteData) -> QuickNoteWidget:
+        """Tạo widget cho note và nối signals"""
+        note_widget = QuickNoteWidget(data)
+
+        # Connect signals
+        note_widget.note_changed.connect(self.on_note_changed)
+        note_widget.position_changed.connect(lambda note_id, _pos: self.on_note_changed(note_id))
+        note_widget.note_closed.connect(self.on_note_closed)
+        note_widget.note_focused.connect(self.on_note_focused)
+        note_widget.duplicate_requested.connect(self.duplicate_note)
+
+        # Store
+        self.notes[data.id] = note_widget
+        self.notes_data[data.id] = data
+        return note_widget
+
     def on_note_changed(self, note_id: str):
-        """Handle note change"""
-        if note_id in self.notes:
-            widget = self.notes[note_id]
-            widget.save_data()
-            self.notes_data[note_id] = widget.data
+        """Handle note change - chỉ đánh dấu, dữ liệu được đọc từ widget lúc flush"""
+        if note_id in self.notes_data:
+            self.repository.mark_dirty(note_id)
+            self.schedule_flush()
 
     def on_note_closed(self, note_id: str):
         """Handle note close"""
@@ -857,57 +851,69 @@ class QuickNotesManager(QWidget):
         animation.finished.connect(lambda: note_widget.setGraphicsEffect(None))
         animation.start()
 
+    # ========== PERSISTENCE ==========
+
+    def schedule_flush(self):
+        """Hẹn một lần ghi (nếu chưa có) cho mọi note đã đổi"""
+        if self.flush_tick is None:
+            self.flush_tick = TickScheduler.instance().call_later(
+                NOTES_FLUSH_DELAY, self.flush_notes, CLOCK_TOLERANCE_MS, name="QuickNotesFlush")
+
+    def _note_snapshot(self, note_id: str) -> Optional[dict]:
+        """Dữ liệu hiện tại của note để ghi (None nếu note đã bị xóa)"""
+        widget = self.notes.get(note_id)
+        if widget is not None:
+            widget.save_data()
+            return widget.data.to_dict()
+        data = self.notes_data.get(note_id)
+        return data.to_dict() if data is not None else None
+
+    def flush_notes(self) -> bool:
+        """Ghi ngay các note đã đổi (một transaction)"""
+        if self.flush_tick is not None:
+            self.flush_tick.cancel()
+            self.flush_tick = None
+        pending = self.repository.has_pending_writes()
+        ok = self.repository.flush(self._note_snapshot)
+        if not ok:
+            self.schedule_flush()  # Thử lại lần sau, thay đổi vẫn được giữ
+        elif pending:
+            logger.debug("Flushed quick notes")
+        return ok
+
     def save_all_notes(self):
-        """Save all notes to file"""
-        try:
-            notes_list = []
-            for note_id, data in self.notes_data.items():
-                if note_id in self.notes:
-                    # Update data from widget
-                    self.notes[note_id].save_data()
-                    notes_list.append(self.notes[note_id].data.to_dict())
-                else:
-                    notes_list.append(data.to_dict())
-
-            with open(self.save_path, 'w', encoding='utf-8') as f:
-                json.dump(notes_list, f, indent=2, ensure_ascii=False)
-
-            logger.debug(f"Saved {len(notes_list)} notes")
-        except Exception as e:
-            logger.error(f"Error saving notes: {e}")
+        """Ghi lại toàn bộ notes (bình thường chỉ cần flush_notes)"""
+        for note_id in self.notes_data:
+            self.repository.mark_dirty(note_id)
+        self.flush_notes()
 
     def load_all_notes(self):
-        """Load all notes from file"""
-        if not self.save_path.exists():
-            return
-
+        """Load all notes from repository"""
         try:
-            with open(self.save_path, 'r', encoding='utf-8') as f:
-                notes_list = json.load(f)
+            notes_list = self.repository.load_all()
+        except Exception as e:
+            logger.error(f"Error loading notes: {e}")
+            return
 
-            for note_dict in notes_list:
+        for note_dict in notes_list:
+            try:
                 data = NoteData.from_dict(note_dict)
+            except Exception as e:
+                logger.error(f"Bỏ qua note lỗi {note_dict.get('id')}: {e}")
+                continue
 
-                # Create widget
-                note_widget = QuickNoteWidget(data)
+            note_widget = self._add_note_widget(data)
 
-                # Connect signals
-                note_widget.note_changed.connect(self.on_note_changed)
-                note_widget.note_closed.connect(self.on_note_closed)
-                note_widget.note_focused.connect(self.on_note_focused)
-                note_widget.duplicate_requested.connect(self.duplicate_note)
+            # Show if not minimized
+            if not data.is_minimized:
+                note_widget.show()
 
-                # Store
-                self.notes[data.id] = note_widget
-                self.notes_data[data.id] = data
+        logger.info(f"Loaded {len(self.notes)} notes")
 
-                # Show if not minimized
-                if not data.is_minimized:
-                    note_widget.show()
-
-            logger.info(f"Loaded {len(self.notes)} notes")
-        except Exception as e:
-            logger.error(f"Error loading notes: {e}")
+    def search_notes(self, text: str) -> List[str]:
+        """Tìm notes theo tiêu đề / nội dung, trả về note ids"""
+        self.flush_notes()
+        return [note_id for note_id in self.repository.search(text) if note_id in self.notes_data]
 
     def show_all_notes(self):
         """Show all notes"""
@@ -1,10 +1,12 @@
 # ui_qt/windows/exercise_suggestion_window_qt.py
+import os
+
 from PySide6 import QtCore, QtGui, QtWidgets
 
 class ExerciseSuggestionWindowQt(QtWidgets.QWidget):
     """
     Gợi ý bài tập theo điểm yếu của học sinh (PySide6)
-    - Chọn học sinh -> tìm các chủ đề yếu (AVG < 3 trong student_skills)
+    - Chọn học sinh -> tìm các chủ đề yếu (điểm TB < 3 trong student_topic_profile)
     - Hiển thị danh sách bài tập theo từng chủ đề (text hoặc ảnh)
     """
     def __init__(self, db_manager, parent=None):
@@ -31,7 +33,8 @@ class ExerciseSuggestionWindowQt(QtWidgets.QWidget):
         # nạp danh sách học sinh
         self.student_map = {}  # display -> id
         rows = self.db.execute_query("SELECT id, name FROM students ORDER BY name", fetch='all') or []
-        for sid, name in rows:
+        for r in rows:
+            sid, name = r["id"], r["name"]
             display = f"{name} (ID {sid})"
             self.student_map[display] = sid
             self.student_cb.addItem(display)
@@ -67,15 +70,8 @@ class ExerciseSuggestionWindowQt(QtWidgets.QWidget):
         if not student_id:
             return
 
-        # Chủ đề yếu: AVG(diem) < 3  (giữ logic như bản Tkinter)  :contentReference[oaicite:1]{index=1}
-        weak_topics = self.db.execute_query("""
-            SELECT chu_de, ROUND(AVG(diem), 1)
-            FROM student_skills
-            WHERE student_id = ?
-            GROUP BY chu_de
-            HAVING AVG(diem) < 3
-            ORDER BY AVG(diem) ASC
-        """, (student_id,), fetch='all') or []
+        # Chủ đề yếu: điểm TB < 3 (giữ logic như bản Tkinter), đọc từ bảng tổng hợp
+        weak_topics = self.db.get_student_topic_profile(student_id, max_mean=3)
 
         if not weak_topics:
             ok = QtWidgets.QLabel("🎉 Học sinh không có chủ đề yếu!")
@@ -84,21 +80,31 @@ class ExerciseSuggestionWindowQt(QtWidgets.QWidget):
             self.inner_layout.addStretch(1)
             return
 
-        for chu_de, avg in weak_topics:
+        # bài tập của tất cả chủ đề yếu trong một truy vấn
+        topics = [t["chu_de"] for t in weak_topics]
+        placeholders = ",".join("?" * len(topics))
+        exercise_rows = self.db.execute_query(
+            f"SELECT chu_de, ten_bai, loai_tap, noi_dung FROM exercises WHERE chu_de IN ({placeholders}) ORDER BY id",
+            tuple(topics), fetch='all'
+        ) or []
+        exercises_by_topic = {}
+        for ex in exercise_rows:
+            exercises_by_topic.setdefault(ex["chu_de"], []).append(ex)
+
+        for topic in weak_topics:
+            chu_de, avg = topic["chu_de"], round(topic["mean_score"], 1)
             box = QtWidgets.QGroupBox(f"📉 {chu_de} (Điểm TB: {avg})")
             box_l = QtWidgets.QVBoxLayout(box)
 
-            rows = self.db.execute_query(
-                "SELECT ten_bai, loai_tap, noi_dung FROM exercises WHERE chu_de = ?",
-                (chu_de,), fetch='all'
-            ) or []
+            rows = exercises_by_topic.get(chu_de, [])
 
             if not rows:
                 box_l.addWidget(QtWidgets.QLabel("(Chưa có bài tập nào trong chủ đề này)"))
                 self.inner_layout.addWidget(box)
                 continue
 
-            for ten_bai, loai_tap, noi_dung in rows:
+            for ex in rows:
+                ten_bai, loai_tap, noi_dung = ex["ten_bai"], ex["loai_tap"], ex["noi_dung"]
                 row_w = QtWidgets.QWidget()
                 hl = QtWidgets.QHBoxLayout(row_w)
                 hl.setContentsMargins(0, 2, 0, 2)
@@ -7,6 +7,9 @@ import json
 import os
 from datetime import datetime
 
+from ui_qt.core.models.exercise_tree_model import ExerciseTreeIndex, ExerciseTreeModel, ROOT_ID
+from ui_qt.windows.question_bank.services.tree_codec_service import TreeCodecService
+
 
 class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
     """
@@ -33,8 +36,8 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         # Đảm bảo bảng tồn tại
         self._ensure_table()
 
-        # Dictionary để track nodes
-        self.tree_nodes: Dict[int, QtWidgets.QTreeWidgetItem] = {}
+        # Model cây (index trong bộ nhớ, nạp hàng con khi mở node)
+        self.tree_model = ExerciseTreeModel(self)
 
         # History cho undo/redo
         self.command_history: List[Dict] = []
@@ -341,9 +344,11 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         tree_header.setStyleSheet("font-weight: bold; font-size: 14px; margin-bottom: 5px;")
         tree_layout.addWidget(tree_header)
 
-        # Tree widget với drag & drop
-        self.tree = DragDropTreeWidget()
-        self.tree.setHeaderLabels(["Tên", "Cấp độ", "Trạng thái", "Mô tả"])
+        # Tree view với drag & drop
+        self.tree = DragDropTreeView()
+        self.tree.setModel(self.tree_model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setAlternatingRowColors(True)
         self.tree.setColumnWidth(0, 200)
         self.tree.setColumnWidth(1, 80)
         self.tree.setColumnWidth(2, 80)
@@ -357,7 +362,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         self.tree.customContextMenuRequested.connect(self.show_context_menu)
 
         # Selection changed
-        self.tree.itemSelectionChanged.connect(self.on_tree_selection_changed)
+        self.tree.selectionModel().selectionChanged.connect(self.on_tree_selection_changed)
 
         # Drop event
         self.tree.item_moved.connect(self.on_item_moved)
@@ -485,7 +490,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         ]
 
         for key_sequence, slot in shortcuts:
-            shortcut = QtWidgets.QShortcut(QtGui.QKeySequence(key_sequence), self)
+            shortcut = QtGui.QShortcut(QtGui.QKeySequence(key_sequence), self)
             shortcut.activated.connect(slot)
 
     def _apply_modern_styles(self):
@@ -517,21 +522,21 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
                 border-color: #2E86AB;
                 outline: none;
             }
-            QTreeWidget {
+            QTreeView {
                 border: 1px solid #ddd;
                 border-radius: 8px;
                 background-color: white;
                 alternate-background-color: #f8f9fa;
             }
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 4px;
                 border-bottom: 1px solid #f0f0f0;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #e3f2fd;
                 color: #1976d2;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #f5f5f5;
             }
         """)
@@ -543,63 +548,35 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         self.search_timer.stop()
         self.search_timer.start(300)  # Delay 300ms
 
+    # Kết quả lọc ít hơn ngưỡng này thì mở rộng toàn bộ để thấy ngay các node khớp
+    AUTO_EXPAND_LIMIT = 500
+
     def _perform_search(self):
-        """# Thực hiện tìm kiếm với filters"""
-        search_text = self.search_input.text().lower()
-        level_filter = self.level_filter.currentText()
-        active_filter = self.active_filter.currentText()
-
-        self._filter_tree_recursive(
-            self.tree.invisibleRootItem(),
-            search_text,
-            level_filter,
-            active_filter
+        """# Thực hiện tìm kiếm với filters (không dấu, giữ lại node cha của node khớp)"""
+        level = self.level_filter.currentText()
+        active = {"Đang hoạt động": True, "Đã ẩn": False}.get(self.active_filter.currentText())
+
+        matches, visible = self.tree_model.tree.filter(
+            self.search_input.text(),
+            level=None if level == "Tất cả" else level,
+            active=active,
         )
 
+        if visible is None:
+            self.tree_model.set_visible(None)
+            self.tree.expandToDepth(0)
+            self.status_bar.setText(f"Tìm thấy {len(self.tree_model.tree)} mục")
+            return
+
+        expand = len(visible) <= self.AUTO_EXPAND_LIMIT
+        self.tree_model.set_visible(visible, fetch_all=expand)
+        if expand:
+            self.tree.expandAll()
+        else:
+            self.tree.expandToDepth(0)
+
         # Update status
-        visible_count = self._count_visible_items()
-        self.status_bar.setText(f"Tìm thấy {visible_count} mục")
-
-    def _filter_tree_recursive(self, parent_item, search_text, level_filter, active_filter):
-        """# Đệ quy filter cây"""
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-
-            # Check search text
-            text_match = (search_text == "" or
-                          search_text in child.text(0).lower() or
-                          search_text in child.text(3).lower())
-
-            # Check level filter
-            level_match = (level_filter == "Tất cả" or
-                           child.text(1) == level_filter)
-
-            # Check active filter
-            active_match = (active_filter == "Tất cả" or
-                            (active_filter == "Đang hoạt động" and child.text(2) == "✓") or
-                            (active_filter == "Đã ẩn" and child.text(2) == "✗"))
-
-            # Show/hide item
-            visible = text_match and level_match and active_match
-            child.setHidden(not visible)
-
-            # Recursive call
-            self._filter_tree_recursive(child, search_text, level_filter, active_filter)
-
-    def _count_visible_items(self) -> int:
-        """# Đếm số items visible"""
-        count = 0
-
-        def count_recursive(parent_item):
-            nonlocal count
-            for i in range(parent_item.childCount()):
-                child = parent_item.child(i)
-                if not child.isHidden():
-                    count += 1
-                count_recursive(child)
-
-        count_recursive(self.tree.invisibleRootItem())
-        return count
+        self.status_bar.setText(f"Tìm thấy {len(matches)} mục")
 
     def clear_search(self):
         """# Xóa tìm kiếm"""
@@ -608,10 +585,27 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         self.active_filter.setCurrentText("Tất cả")
         self._perform_search()
 
-    def on_tree_selection_changed(self):
+    def _selected_node_id(self) -> Optional[int]:
+        """# id của node đang chọn (None nếu chưa chọn)"""
+        index = self.tree.currentIndex()
+        if not index.isValid() or not self.tree.selectionModel().isSelected(index.siblingAtColumn(0)):
+            rows = self.tree.selectionModel().selectedRows()
+            if not rows:
+                return None
+            index = rows[0]
+        return self.tree_model.node_id(index)
+
+    def _select_node(self, node_id: Optional[int]):
+        """# Chọn và cuộn tới node"""
+        index = self.tree_model.index_for_id(node_id) if node_id else QtCore.QModelIndex()
+        if index.isValid():
+            self.tree.setCurrentIndex(index)
+            self.tree.scrollTo(index)
+
+    def on_tree_selection_changed(self, *args):
         """# Xử lý khi selection thay đổi"""
-        selected_items = self.tree.selectedItems()
-        has_selection = len(selected_items) > 0
+        node_id = self._selected_node_id()
+        has_selection = node_id is not None
 
         # Enable/disable buttons
         self.edit_btn.setEnabled(has_selection)
@@ -620,37 +614,34 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
         if has_selection:
             # Load node details
-            self._load_node_details(selected_items[0])
+            self._load_node_details(node_id)
             self.set_form_enabled(True)
         else:
             self.set_form_enabled(False)
 
-    def _load_node_details(self, item: QtWidgets.QTreeWidgetItem):
+    def _load_node_details(self, node_id: int):
         """# Load chi tiết node vào form"""
-        node_id = item.data(0, Qt.UserRole)
         if not node_id:
             return
 
         row = self.db.execute_query(
-            """SELECT name, level, description, icon, color, is_active, 
-                      metadata, created_at, updated_at 
-               FROM exercise_tree WHERE id = ?""",
+            "SELECT * FROM exercise_tree WHERE id = ?",
             (node_id,), fetch="one"
         )
 
         if row:
             self.name_edit.setText(row["name"] or "")
             self.level_combo.setCurrentText(row["level"] or "Môn")
-            self.icon_edit.setText(row["icon"] or "")
-            self.current_color = row["color"] or "#2E86AB"
+            self.icon_edit.setText(row.get("icon") or "")
+            self.current_color = row.get("color") or "#2E86AB"
             self._update_color_button()
-            self.active_checkbox.setChecked(bool(row["is_active"]))
-            self.description_edit.setPlainText(row["description"] or "")
-            self.metadata_edit.setPlainText(row["metadata"] or "{}")
+            self.active_checkbox.setChecked(bool(row.get("is_active", 1)))
+            self.description_edit.setPlainText(row.get("description") or "")
+            self.metadata_edit.setPlainText(row.get("metadata") or "{}")
 
             # Format timestamps
-            created = row["created_at"] or ""
-            updated = row["updated_at"] or ""
+            created = row.get("created_at") or ""
+            updated = row.get("updated_at") or ""
             self.created_label.setText(created)
             self.updated_label.setText(updated)
 
@@ -682,10 +673,10 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
             }}
         """)
 
-    def on_item_moved(self, item: QtWidgets.QTreeWidgetItem, new_parent_id: Optional[int]):
+    def on_item_moved(self, node_id: int, new_parent_id: Optional[int]):
         """# Xử lý khi item được di chuyển"""
-        node_id = item.data(0, Qt.UserRole)
-        if not node_id:
+        node = self.tree_model.tree.nodes.get(node_id)
+        if node is None:
             return
 
         # Save command for undo
@@ -705,7 +696,9 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
             (new_parent_id, node_id)
         )
 
-        self.status_bar.setText(f"Đã di chuyển '{item.text(0)}'")
+        self._load_tree()
+        self._select_node(node_id)
+        self.status_bar.setText(f"Đã di chuyển '{node.display_name}'")
 
     def _get_current_parent_id(self, node_id: int) -> Optional[int]:
         """# Lấy parent_id hiện tại"""
@@ -809,11 +802,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def add_node(self):
         """# Thêm node mới"""
-        selected_items = self.tree.selectedItems()
-        parent_id = None
-
-        if selected_items:
-            parent_id = selected_items[0].data(0, Qt.UserRole)
+        parent_id = self._selected_node_id()
 
         dialog = ModernAddNodeDialog(self.db, parent=self)
         if parent_id:
@@ -837,12 +826,10 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def edit_node(self):
         """# Sửa node"""
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        node_id = self._selected_node_id()
+        if node_id is None:
             return
 
-        node_id = selected_items[0].data(0, Qt.UserRole)
-
         # Save old data for undo
         old_data = self._get_node_data(node_id)
 
@@ -865,13 +852,11 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def delete_node(self):
         """# Xóa node với confirmation"""
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        node_id = self._selected_node_id()
+        if node_id is None:
             return
 
-        item = selected_items[0]
-        node_id = item.data(0, Qt.UserRole)
-        node_name = item.text(0)
+        node_name = self.tree_model.tree.nodes[node_id].display_name
 
         # Check for children
         children_count = self._count_children(node_id)
@@ -910,11 +895,10 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def copy_node(self):
         """# Sao chép node vào clipboard"""
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        node_id = self._selected_node_id()
+        if node_id is None:
             return
 
-        node_id = selected_items[0].data(0, Qt.UserRole)
         self.clipboard_data = self._get_node_data(node_id)
         self.paste_btn.setEnabled(True)
         self.status_bar.setText(f"Đã sao chép '{self.clipboard_data['name']}'")
@@ -924,11 +908,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         if not self.clipboard_data:
             return
 
-        selected_items = self.tree.selectedItems()
-        parent_id = None
-
-        if selected_items:
-            parent_id = selected_items[0].data(0, Qt.UserRole)
+        parent_id = self._selected_node_id()
 
         # Create new node
         new_name = f"{self.clipboard_data['name']} (Sao chép)"
@@ -948,12 +928,10 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def save_current_node(self):
         """# Lưu thông tin node hiện tại"""
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        node_id = self._selected_node_id()
+        if node_id is None:
             return
 
-        node_id = selected_items[0].data(0, Qt.UserRole)
-
         # Validate data
         name = self.name_edit.text().strip()
         if not name:
@@ -1000,12 +978,12 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         }
         self._add_command_to_history(command)
 
-        # Update tree item
-        item = selected_items[0]
-        item.setText(0, f"{icon} {name}" if icon else name)
-        item.setText(1, level)
-        item.setText(2, "✓" if is_active else "✗")
-        item.setText(3, description)
+        # Update tree model (không nạp lại cả cây)
+        node = self.tree_model.tree.nodes[node_id]
+        node.name, node.level, node.description = name, level, description
+        node.icon, node.color, node.is_active = icon, self.current_color, is_active
+        node.refresh_search_key()
+        self.tree_model.node_changed(node_id)
 
         self.status_bar.setText(f"Đã lưu '{name}'")
 
@@ -1058,7 +1036,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
             QtWidgets.QMessageBox.critical(self, "Lỗi Export", f"Không thể export file: {e}")
 
     def _import_json(self, file_path: str):
-        """# Import từ JSON file"""
+        """# Import từ JSON file (một transaction, lỗi thì không ghi gì)"""
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
@@ -1069,163 +1047,37 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
         )
 
-        if reply == QtWidgets.QMessageBox.Yes:
-            self.db.execute_query("DELETE FROM exercise_tree")
-
-        # Import data recursively
-        self._import_json_recursive(data, None)
-
-    def _import_json_recursive(self, nodes: List[Dict], parent_id: Optional[int]):
-        """# Import JSON đệ quy"""
-        for node_data in nodes:
-            # Insert node
-            cursor = self.db.execute_query(
-                """INSERT INTO exercise_tree 
-                   (parent_id, name, level, description, icon, color, is_active, metadata) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (parent_id, node_data.get('name', ''), node_data.get('level', 'Môn'),
-                 node_data.get('description', ''), node_data.get('icon', ''),
-                 node_data.get('color', '#2E86AB'), node_data.get('is_active', True),
-                 json.dumps(node_data.get('metadata', {}))),
-                return_cursor=True
-            )
-
-            new_id = cursor.lastrowid
-
-            # Import children
-            children = node_data.get('children', [])
-            if children:
-                self._import_json_recursive(children, new_id)
+        # Xoá (nếu chọn) + import trong cùng transaction
+        TreeCodecService(self.db).import_tree(data, replace=reply == QtWidgets.QMessageBox.Yes)
 
     def _export_json(self, file_path: str):
-        """# Export ra JSON file"""
-        data = self._export_tree_to_dict()
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-    def _export_tree_to_dict(self) -> List[Dict]:
-        """# Export tree thành dictionary"""
-        # Get root nodes
-        root_nodes = self.db.execute_query(
-            """SELECT id, name, level, description, icon, color, is_active, metadata
-               FROM exercise_tree WHERE parent_id IS NULL
-               ORDER BY sort_order, name""",
-            fetch="all"
-        ) or []
-
-        result = []
-        for node in root_nodes:
-            node_dict = {
-                "name": node["name"],
-                "level": node["level"],
-                "description": node["description"] or "",
-                "icon": node["icon"] or "",
-                "color": node["color"] or "#2E86AB",
-                "is_active": bool(node["is_active"]),
-                "metadata": json.loads(node["metadata"] or "{}"),
-                "children": self._export_children_to_dict(node["id"])
-            }
-            result.append(node_dict)
-
-        return result
-
-    def _export_children_to_dict(self, parent_id: int) -> List[Dict]:
-        """# Export children đệ quy"""
-        children = self.db.execute_query(
-            """SELECT id, name, level, description, icon, color, is_active, metadata
-               FROM exercise_tree WHERE parent_id = ?
-               ORDER BY sort_order, name""",
-            (parent_id,), fetch="all"
-        ) or []
-
-        result = []
-        for child in children:
-            child_dict = {
-                "name": child["name"],
-                "level": child["level"],
-                "description": child["description"] or "",
-                "icon": child["icon"] or "",
-                "color": child["color"] or "#2E86AB",
-                "is_active": bool(child["is_active"]),
-                "metadata": json.loads(child["metadata"] or "{}"),
-                "children": self._export_children_to_dict(child["id"])
-            }
-            result.append(child_dict)
-
-        return result
+        """# Export ra JSON file (một truy vấn, ghi dạng stream)"""
+        TreeCodecService(self.db).export_json(file_path)
 
     # ======================= UTILITY METHODS =======================
 
     def _load_tree(self):
-        """# Tải cây từ database"""
-        self.tree.clear()
-        self.tree_nodes.clear()
-
-        # Lấy tất cả nodes
+        """# Tải cây từ database vào ExerciseTreeIndex (không tạo widget cho từng node)"""
+        # exercise_tree cũ không có sort_order/icon/color/is_active -> SELECT * và dùng mặc định
+        order = "sort_order, level, name" if self.db.column_exists("exercise_tree", "sort_order") else "level, name"
         rows = self.db.execute_query(
-            """SELECT id, parent_id, name, level, description, icon, color, is_active
-               FROM exercise_tree ORDER BY sort_order, level, name""",
+            f"SELECT * FROM exercise_tree ORDER BY {order}",
             fetch="all"
         ) or []
 
-        # Tạo dictionary để nhóm theo parent
-        children_map: Dict[Optional[int], List[dict]] = {}
-        for row in rows:
-            parent_id = row["parent_id"]
-            if parent_id not in children_map:
-                children_map[parent_id] = []
-            children_map[parent_id].append(row)
-
-        # Build tree recursively
-        self._build_tree_recursive(None, children_map)
+        self.tree_model.set_tree(ExerciseTreeIndex(rows))
 
-        # Expand first level
-        self.tree.expandToDepth(0)
+        # Giữ bộ lọc đang áp dụng
+        if self.search_input.text() or self.level_filter.currentIndex() or self.active_filter.currentIndex():
+            self._perform_search()
+        else:
+            # Expand first level
+            self.tree.expandToDepth(0)
 
         # Update status
         total_count = len(rows)
         self.status_bar.setText(f"Tải {total_count} mục")
 
-    def _build_tree_recursive(self, parent_id: Optional[int],
-                              children_map: Dict[Optional[int], List[dict]],
-                              parent_item: Optional[QtWidgets.QTreeWidgetItem] = None):
-        """# Xây dựng cây đệ quy"""
-        if parent_id not in children_map:
-            return
-
-        for row in children_map[parent_id]:
-            # Create tree item
-            icon = row["icon"] or ""
-            name = row["name"]
-            display_name = f"{icon} {name}" if icon else name
-
-            item = QtWidgets.QTreeWidgetItem([
-                display_name,
-                row["level"],
-                "✓" if row["is_active"] else "✗",
-                row["description"] or ""
-            ])
-
-            # Store node ID
-            item.setData(0, Qt.UserRole, row["id"])
-
-            # Set color
-            color = QtGui.QColor(row["color"] or "#2E86AB")
-            item.setForeground(0, color)
-
-            # Add to parent
-            if parent_item:
-                parent_item.addChild(item)
-            else:
-                self.tree.addTopLevelItem(item)
-
-            # Store in nodes map
-            self.tree_nodes[row["id"]] = item
-
-            # Build children
-            self._build_tree_recursive(row["id"], children_map, item)
-
     def refresh_tree(self):
         """# Làm mới cây"""
         self._load_tree()
@@ -1233,6 +1085,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def expand_all(self):
         """# Mở rộng tất cả"""
+        self.tree_model.fetch_all()
         self.tree.expandAll()
         self.status_bar.setText("Đã mở rộng tất cả")
 
@@ -1243,15 +1096,16 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
     def show_context_menu(self, position):
         """# Hiển thị context menu"""
-        item = self.tree.itemAt(position)
-        if not item:
+        index = self.tree.indexAt(position)
+        if not index.isValid():
             return
+        node_id = self.tree_model.node_id(index)
 
         menu = QtWidgets.QMenu(self)
 
         # Add child
         add_child_action = menu.addAction("➕ Thêm node con")
-        add_child_action.triggered.connect(lambda: self.add_child_node(item))
+        add_child_action.triggered.connect(lambda: self.add_child_node(node_id))
 
         menu.addSeparator()
 
@@ -1266,7 +1120,7 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         # Paste (if clipboard has data)
         if self.clipboard_data:
             paste_action = menu.addAction("📄 Dán vào đây")
-            paste_action.triggered.connect(lambda: self.paste_to_node(item))
+            paste_action.triggered.connect(lambda: self.paste_to_node(node_id))
 
         menu.addSeparator()
 
@@ -1274,11 +1128,10 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         delete_action = menu.addAction("🗑️ Xóa")
         delete_action.triggered.connect(self.delete_node)
 
-        menu.exec(self.tree.mapToGlobal(position))
+        menu.exec(self.tree.viewport().mapToGlobal(position))
 
-    def add_child_node(self, parent_item):
+    def add_child_node(self, parent_id: int):
         """# Thêm node con"""
-        parent_id = parent_item.data(0, Qt.UserRole)
 
         dialog = ModernAddNodeDialog(self.db, parent=self)
         dialog.set_parent(parent_id)
@@ -1286,15 +1139,13 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         if dialog.exec() == QtWidgets.QDialog.Accepted:
             self.refresh_tree()
             # Expand parent để thấy node mới
-            parent_item.setExpanded(True)
+            self.tree.expand(self.tree_model.index_for_id(parent_id))
 
-    def paste_to_node(self, parent_item):
+    def paste_to_node(self, parent_id: int):
         """# Dán vào node cụ thể"""
         if not self.clipboard_data:
             return
 
-        parent_id = parent_item.data(0, Qt.UserRole)
-
         # Create new node
         new_name = f"{self.clipboard_data['name']} (Sao chép)"
 
@@ -1309,8 +1160,9 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
         )
 
         self.refresh_tree()
-        parent_item.setExpanded(True)
-        self.status_bar.setText(f"Đã dán '{new_name}' vào '{parent_item.text(0)}'")
+        self.tree.expand(self.tree_model.index_for_id(parent_id))
+        parent_name = self.tree_model.tree.nodes[parent_id].display_name if parent_id in self.tree_model.tree.nodes else ""
+        self.status_bar.setText(f"Đã dán '{new_name}' vào '{parent_name}'")
 
     # ======================= HELPER METHODS =======================
 
@@ -1402,66 +1254,59 @@ class ModernExerciseTreeManagerQt(QtWidgets.QDialog):
 
 # ======================= DRAG & DROP TREE WIDGET =======================
 
-class DragDropTreeWidget(QtWidgets.QTreeWidget):
-    """Tree widget với drag & drop support"""
+class DragDropTreeView(QtWidgets.QTreeView):
+    """Tree view (ExerciseTreeModel) với drag & drop support"""
 
-    item_moved = QtCore.Signal(QtWidgets.QTreeWidgetItem, object)  # item, new_parent_id
+    item_moved = QtCore.Signal(int, object)  # node_id, new_parent_id
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
         self.setDragDropMode(QtWidgets.QAbstractItemView.InternalMove)
         self.setDefaultDropAction(Qt.MoveAction)
 
     def dropEvent(self, event):
-        """# Xử lý drop event"""
+        """# Xử lý drop event: chỉ báo node_id + parent mới, DB/model do dialog cập nhật"""
         if event.source() != self:
             return
 
-        # Get dropped item
-        drop_item = self.currentItem()
-        if not drop_item:
+        model = self.model()
+        drop_index = self.currentIndex()
+        if not drop_index.isValid():
             return
+        node_id = model.node_id(drop_index)
 
         # Get drop position
         drop_indicator = self.dropIndicatorPosition()
-        target_item = self.itemAt(event.pos())
+        target_index = self.indexAt(event.position().toPoint())
 
         # Determine new parent
         new_parent_id = None
 
-        if target_item:
+        if target_index.isValid():
+            target_id = model.node_id(target_index)
             if drop_indicator == QtWidgets.QAbstractItemView.OnItem:
                 # Drop on item - make it a child
-                new_parent_id = target_item.data(0, Qt.UserRole)
+                new_parent_id = target_id
             elif drop_indicator in [QtWidgets.QAbstractItemView.AboveItem,
                                     QtWidgets.QAbstractItemView.BelowItem]:
                 # Drop above/below item - same parent as target
-                parent = target_item.parent()
-                new_parent_id = parent.data(0, Qt.UserRole) if parent else None
+                parent_id = model.tree.nodes[target_id].parent_id
+                new_parent_id = parent_id if parent_id != ROOT_ID else None
 
-        # Validate move (prevent moving to descendant)
-        if self._is_descendant(drop_item, target_item):
-            event.ignore()
-            return
+            # Validate move (prevent moving to itself / descendant)
+            if new_parent_id is not None and model.tree.is_ancestor(node_id, new_parent_id):
+                event.ignore()
+                return
 
-        # Accept the drop
-        super().dropEvent(event)
+        # Model không tự xoá/chèn hàng - dialog ghi DB rồi nạp lại cây
+        event.setDropAction(Qt.IgnoreAction)
+        event.accept()
 
         # Emit signal
-        self.item_moved.emit(drop_item, new_parent_id)
-
-    def _is_descendant(self, ancestor: QtWidgets.QTreeWidgetItem,
-                       potential_descendant: QtWidgets.QTreeWidgetItem) -> bool:
-        """# Kiểm tra xem item có phải là descendant không"""
-        if not potential_descendant:
-            return False
-
-        current = potential_descendant.parent()
-        while current:
-            if current == ancestor:
-                return True
-            current = current.parent()
-        return False
+        self.item_moved.emit(node_id, new_parent_id)
 
 
 # ======================= MODERN DIALOGS =======================
@@ -1928,4 +1773,8 @@ class ModernEditNodeDialog(QtWidgets.QDialog):
             super().accept()
 
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Lỗi", f"Không thể cập nhật node: {e}")
\ No newline at end of file
+            QtWidgets.QMessageBox.critical(self, "Lỗi", f"Không thể cập nhật node: {e}")
+
+
+# Tên lớp mà danh mục ứng dụng (app_repository) dùng để mở cửa sổ này
+ExerciseTreeManagerQt = ModernExerciseTreeManagerQt
@@ -4,6 +4,8 @@ from __future__ import annotations
 from PySide6 import QtWidgets, QtCore
 from PySide6.QtCore import Qt
 
+from ui_qt.core.group_fit_engine import GroupFitEngine
+
 
 class GroupSuggestionWindowQt(QtWidgets.QWidget):
     """
@@ -13,6 +15,7 @@ class GroupSuggestionWindowQt(QtWidgets.QWidget):
     def __init__(self, db_manager, parent=None):
         super().__init__(parent)
         self.db = db_manager
+        self.engine = GroupFitEngine(db_manager)
         self.setObjectName("GroupSuggestionWindowQt")
         self.setWindowTitle("Gợi ý nhóm học phù hợp")
         self.resize(850, 600)
@@ -40,6 +43,10 @@ class GroupSuggestionWindowQt(QtWidgets.QWidget):
         self.btn_analyze.clicked.connect(self.analyze)
         form_l.addWidget(self.btn_analyze, 2, 0, 1, 2)
 
+        self.btn_regroup = QtWidgets.QPushButton("Gợi ý xếp lại nhóm cho toàn trung tâm")
+        self.btn_regroup.clicked.connect(self.suggest_regrouping)
+        form_l.addWidget(self.btn_regroup, 3, 0, 1, 2)
+
         # Kết quả
         self.table = QtWidgets.QTableWidget(0, 2)
         self.table.setHorizontalHeaderLabels(["Nhóm", "Lệch điểm trung bình"])
@@ -58,7 +65,8 @@ class GroupSuggestionWindowQt(QtWidgets.QWidget):
         ) or []
         self._student_map = {}  # display -> id
         self.student_cb.clear()
-        for sid, name in rows:
+        for row in rows:
+            sid, name = row["id"], row["name"]
             disp = f"{name} (ID {sid})"
             self._student_map[disp] = sid
             self.student_cb.addItem(disp)
@@ -79,47 +87,16 @@ class GroupSuggestionWindowQt(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "Thiếu chủ đề", "Vui lòng nhập ít nhất 1 chủ đề.")
             return
 
-        # Lấy điểm TB của học sinh theo từng chủ đề
-        student_scores = {}
-        for topic in topics:
-            row = self.db.execute_query(
-                "SELECT ROUND(AVG(diem), 1) FROM student_skills WHERE student_id = ? AND chu_de = ?",
-                (student_id, topic), fetch='one'
-            )
-            if row and row[0] is not None:
-                student_scores[topic] = float(row[0])
-
-        if not student_scores:
+        # Một truy vấn tổng hợp, tính độ lệch với mọi nhóm cùng lúc
+        self.engine.load()
+        if not self.engine.student_scores(student_id, topics):
             QtWidgets.QMessageBox.information(
                 self, "Không có dữ liệu",
                 "Học sinh này chưa được đánh giá các chủ đề đã chọn."
             )
             return
 
-        groups = self.db.execute_query("SELECT id, name FROM groups ORDER BY name", fetch='all') or []
-
-        results = []
-        for gid, gname in groups:
-            total_diff, count = 0.0, 0
-            for topic, st_score in student_scores.items():
-                g_row = self.db.execute_query(
-                    """
-                    SELECT ROUND(AVG(diem), 1)
-                    FROM student_skills
-                    WHERE student_id IN (SELECT id FROM students WHERE group_id = ?)
-                      AND chu_de = ?
-                    """,
-                    (gid, topic), fetch='one'
-                )
-                if g_row and g_row[0] is not None:
-                    diff = abs(st_score - float(g_row[0]))
-                    total_diff += diff
-                    count += 1
-            if count > 0:
-                results.append((gname, round(total_diff / count, 2)))
-
-        # sắp xếp tăng dần theo độ lệch
-        results.sort(key=lambda x: x[1])
+        results = [(fit.group_name, fit.diff) for fit in self.engine.rank_student(student_id, topics)]
 
         # đổ ra bảng
         self.table.setRowCount(len(results))
@@ -128,3 +105,46 @@ class GroupSuggestionWindowQt(QtWidgets.QWidget):
             item = QtWidgets.QTableWidgetItem(f"{diff:.2f}")
             item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.table.setItem(r, 1, item)
+
+    def suggest_regrouping(self):
+        """Báo cáo: học sinh nào nên chuyển sang nhóm khác (theo các chủ đề đã nhập, trống = tất cả)."""
+        topics = [t.strip() for t in self.topic_edit.text().split(",") if t.strip()]
+        suggestions = self.engine.load().suggest_regrouping(topics or None)
+        if not suggestions:
+            QtWidgets.QMessageBox.information(
+                self, "Gợi ý xếp nhóm", "Không có học sinh nào cần chuyển nhóm."
+            )
+            return
+
+        dlg = QtWidgets.QDialog(self)
+        dlg.setWindowTitle("Gợi ý xếp lại nhóm toàn trung tâm")
+        dlg.resize(900, 520)
+        lay = QtWidgets.QVBoxLayout(dlg)
+
+        headers = ["Học sinh", "Nhóm hiện tại", "Lệch hiện tại", "Nhóm gợi ý", "Lệch gợi ý", "Cải thiện"]
+        table = QtWidgets.QTableWidget(len(suggestions), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        def fmt(value):
+            return "-" if value is None else f"{value:.2f}"
+
+        for r, sug in enumerate(suggestions):
+            values = [
+                sug.student_name, sug.current_group_name or "(chưa có nhóm)", fmt(sug.current_diff),
+                sug.best_group_name, fmt(sug.best_diff), fmt(sug.improvement)
+            ]
+            for c, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                if c in (2, 4, 5):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(r, c, item)
+        table.resizeColumnsToContents()
+        lay.addWidget(table)
+
+        btn_close = QtWidgets.QPushButton("Đóng")
+        btn_close.clicked.connect(dlg.accept)
+        lay.addWidget(btn_close, 0, Qt.AlignRight)
+        dlg.exec()
@@ -1,16 +1,150 @@
 # ui_qt/windows/progress_report_window_qt.py
-from PySide6 import QtWidgets, QtCore
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from PySide6 import QtWidgets, QtCore, QtGui
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtWidgets import (
     QDialog, QLabel, QComboBox, QPushButton,
-    QHBoxLayout, QVBoxLayout, QTableWidget, QTableWidgetItem,
+    QHBoxLayout, QVBoxLayout, QTableView, QHeaderView, QStyledItemDelegate,
     QMessageBox
 )
 
+CELL_ROLE = Qt.UserRole + 1   # (first_date, session_count) hoặc None
+
+
+@dataclass
+class ProgressMatrix:
+    """
+    Ma trận tiến độ thưa: hàng = chủ đề, cột = nhóm
+
+    Chỉ lưu các ô đã học: cells[(row, col)] = (ngày học đầu tiên, số buổi)
+    """
+    topics: List[str] = field(default_factory=list)
+    group_ids: List[int] = field(default_factory=list)
+    group_names: List[str] = field(default_factory=list)
+    cells: Dict[Tuple[int, int], Tuple[str, int]] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.topics or not self.group_ids
+
+
+def load_progress_matrix(db, grade: str) -> ProgressMatrix:
+    """
+    Dựng ma trận tiến độ của một khối bằng một truy vấn GROUP BY
+
+    Chỉ đọc session_logs của các nhóm thuộc khối (JOIN groups theo grade, dùng
+    UNIQUE(group_id, session_date) của session_logs), chủ đề sắp theo ngày học đầu tiên.
+    """
+    groups = db.execute_query(
+        "SELECT id, name FROM groups WHERE grade = ? ORDER BY name",
+        (grade,), fetch='all'
+    ) or []
+    rows = db.execute_query(
+        """
+        SELECT sl.topic, sl.group_id, MIN(sl.session_date) AS first_date, COUNT(*) AS sessions
+        FROM groups g
+        JOIN session_logs sl ON sl.group_id = g.id
+        WHERE g.grade = ?
+          AND sl.topic IS NOT NULL
+          AND sl.topic != ''
+        GROUP BY sl.topic, sl.group_id
+        """,
+        (grade,), fetch='all'
+    ) or []
+
+    matrix = ProgressMatrix(
+        group_ids=[int(g["id"]) for g in groups],
+        group_names=[str(g["name"]) for g in groups],
+    )
+    col_of = {gid: col for col, gid in enumerate(matrix.group_ids)}
+
+    topic_first: Dict[str, str] = {}
+    for r in rows:
+        topic = r["topic"]
+        if topic not in topic_first or r["first_date"] < topic_first[topic]:
+            topic_first[topic] = r["first_date"]
+    matrix.topics = sorted(topic_first, key=lambda t: (topic_first[t], t))
+    row_of = {topic: idx for idx, topic in enumerate(matrix.topics)}
+
+    for r in rows:
+        matrix.cells[(row_of[r["topic"]], col_of[int(r["group_id"])])] = (r["first_date"], int(r["sessions"]))
+    return matrix
+
+
+class ProgressMatrixModel(QAbstractTableModel):
+    """Model chỉ đọc trên ProgressMatrix: cột 0 = chủ đề, cột 1.. = nhóm"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matrix = ProgressMatrix()
+
+    def set_matrix(self, matrix: ProgressMatrix):
+        self.beginResetModel()
+        self._matrix = matrix
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._matrix.topics)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self._matrix.is_empty else 1 + len(self._matrix.group_ids)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal or role != Qt.DisplayRole:
+            return None
+        return "Chủ đề" if section == 0 else self._matrix.group_names[section - 1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == 0:
+            return self._matrix.topics[row] if role in (Qt.DisplayRole, Qt.ToolTipRole) else None
+
+        cell = self._matrix.cells.get((row, col - 1))
+        if role == CELL_ROLE:
+            return cell
+        if role == Qt.ToolTipRole and cell:
+            return f"Học lần đầu: {cell[0]} ({cell[1]} buổi)"
+        return None
+
+
+class ProgressCellDelegate(QStyledItemDelegate):
+    """Vẽ ô đã học (chấm xanh + số buổi) - view chỉ gọi paint cho các ô đang hiển thị"""
+    FILL = QtGui.QColor("#4caf50")
+    TEXT = QtGui.QColor("#ffffff")
+
+    def paint(self, painter, option, index):
+        if index.column() == 0:
+            super().paint(painter, option, index)
+            return
+        cell = index.data(CELL_ROLE)
+        if not cell:
+            return
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        size = min(option.rect.width(), option.rect.height()) - 8
+        rect = QtCore.QRect(0, 0, size, size)
+        rect.moveCenter(option.rect.center())
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.FILL)
+        painter.drawEllipse(rect)
+        if cell[1] > 1:
+            painter.setPen(self.TEXT)
+            painter.drawText(rect, Qt.AlignCenter, str(cell[1]))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(48, 26)
+
+
 class ProgressReportWindowQt(QDialog):
     """
     Báo cáo Tiến độ Giảng dạy (PySide6)
     - Chọn khối lớp
-    - Bảng: Hàng = Chủ đề, Cột = Nhóm trong khối => đánh dấu ✅ nếu nhóm đã học chủ đề
+    - Bảng: Hàng = Chủ đề, Cột = Nhóm trong khối => chấm xanh (kèm số buổi) nếu nhóm đã học chủ đề
     """
     def __init__(self,db_manager, parent=None ):
         super().__init__(parent)
@@ -38,18 +172,30 @@ class ProgressReportWindowQt(QDialog):
         filter_row.addStretch()
         filter_row.addWidget(self.refresh_btn)
 
-        # bảng
-        self.table = QTableWidget()
+        # bảng (model + delegate, không tạo item cho từng ô)
+        self.model = ProgressMatrixModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(ProgressCellDelegate(self.table))
         self.table.setAlternatingRowColors(True)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
         self.table.verticalHeader().setVisible(False)
-        self.table.setSortingEnabled(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(26)
+        self.table.horizontalHeader().setDefaultSectionSize(72)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        self.empty_label = QLabel("Không có dữ liệu tiến độ cho khối lớp này.")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setStyleSheet("color:#888; padding:20px;")
+        self.empty_label.hide()
 
         layout = QVBoxLayout(self)
         layout.addWidget(title)
         layout.addLayout(filter_row)
         layout.addWidget(self.table, 1)
+        layout.addWidget(self.empty_label)
 
     # -------- DATA --------
     def _load_grades(self):
@@ -71,73 +217,17 @@ class ProgressReportWindowQt(QDialog):
     def _load_report(self):
         """Dựng bảng tiến độ theo khối đã chọn."""
         grade = self.grade_cb.currentText().strip()
-        if not grade:
-            self.table.clear()
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
-            return
-
-        # 1) Lấy groups thuộc khối
-        groups = self.db.execute_query(
-            "SELECT id, name FROM groups WHERE grade = ? ORDER BY name",
-            (grade,), fetch='all'
-        ) or []
-
-        # 2) Lấy danh sách chủ đề thuộc các buổi của khối (loại rỗng)
-        topics = self.db.execute_query(
-            """
-            SELECT DISTINCT sl.topic
-            FROM session_logs sl
-            JOIN groups g ON sl.group_id = g.id
-            WHERE g.grade = ?
-              AND sl.topic IS NOT NULL
-              AND sl.topic != ''
-            ORDER BY sl.session_date
-            """,
-            (grade,), fetch='all'
-        ) or []
-
-        if not groups or not topics:
-            self.table.clear()
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
-            self.table.setColumnCount(1)
-            self.table.setHorizontalHeaderLabels(["Chủ đề"])
-            self.table.setRowCount(1)
-            self.table.setItem(0, 0, QTableWidgetItem("Không có dữ liệu tiến độ cho khối lớp này."))
-            return
-
-        g_ids = [int(r[0] if not isinstance(r, dict) else r["id"]) for r in groups]
-        g_names = [str(r[1] if not isinstance(r, dict) else r["name"]) for r in groups]
-        topic_list = [str(r[0] if not isinstance(r, dict) else r["topic"]) for r in topics]
-
-        # 3) Tạo map topic đã học: {(group_id, topic): True}
-        learned = {}
-        # Cẩn thận số lượng placeholder '?'
-        placeholders = ",".join("?" for _ in topic_list)
-        query = f"SELECT group_id, topic FROM session_logs WHERE topic IN ({placeholders})"
-        res = self.db.execute_query(query, topic_list, fetch='all') or []
-        for row in res:
-            gid = row[0] if not isinstance(row, dict) else row["group_id"]
-            tpc = row[1] if not isinstance(row, dict) else row["topic"]
-            learned[(int(gid), str(tpc))] = True
-
-        # 4) Lấp bảng: cột 0 = Chủ đề, các cột sau là tên nhóm
-        self.table.clear()
-        self.table.setRowCount(len(topic_list))
-        self.table.setColumnCount(1 + len(g_names))
-        headers = ["Chủ đề"] + g_names
-        self.table.setHorizontalHeaderLabels(headers)
-
-        for r, topic in enumerate(topic_list):
-            # chủ đề
-            self.table.setItem(r, 0, QTableWidgetItem(topic))
-            # từng nhóm
-            for c, gid in enumerate(g_ids, start=1):
-                mark = "✅" if learned.get((gid, topic)) else ""
-                item = QTableWidgetItem(mark)
-                item.setTextAlignment(QtCore.Qt.AlignCenter)
-                self.table.setItem(r, c, item)
-
-        self.table.resizeColumnsToContents()
-        self.table.horizontalHeader().setStretchLastSection(True)
+        matrix = ProgressMatrix()
+        if grade:
+            try:
+                matrix = load_progress_matrix(self.db, grade)
+            except Exception as e:
+                QMessageBox.critical(self, "Lỗi", f"Không thể tải báo cáo tiến độ:\n{e}")
+
+        self.model.set_matrix(matrix)
+        self.table.setVisible(not matrix.is_empty)
+        self.empty_label.setVisible(bool(grade) and matrix.is_empty)
+        if not matrix.is_empty:
+            header = self.table.horizontalHeader()
+            header.setSectionResizeMode(0, QHeaderView.Interactive)
+            header.resizeSection(0, 260)
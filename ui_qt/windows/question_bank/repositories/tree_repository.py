@@ -90,99 +90,12 @@ class TreeRepository:
         self._ensure_tables()
 
     def _ensure_tables(self):
-        """Đảm bảo các bảng cần thiết tồn tại"""
+        """Đảm bảo các bảng cần thiết tồn tại (bảng phụ trợ + indexes nằm trong schema_migrations)"""
         try:
-            # Upgrade exercise_tree schema
-            self.db.upgrade_exercise_tree_schema()
-
-            # Create supporting tables
-            self._create_supporting_tables()
-
-            # Create indexes
-            self._create_indexes()
-
+            self.db.ensure_schema()
         except Exception as e:
             print(f"❌ Lỗi ensure tree tables: {e}")
 
-    def _create_supporting_tables(self):
-        """Tạo các bảng phụ trợ cho tree management"""
-        tables_sql = [
-            # Bảng tree statistics cache
-            """
-            CREATE TABLE IF NOT EXISTS tree_node_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                node_id INTEGER UNIQUE NOT NULL,
-                question_count INTEGER DEFAULT 0,
-                child_count INTEGER DEFAULT 0,
-                descendant_count INTEGER DEFAULT 0,
-                depth_level INTEGER DEFAULT 0,
-                last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (node_id) REFERENCES exercise_tree(id) ON DELETE CASCADE
-            )
-            """,
-
-            # Bảng tree path cache cho performance
-            """
-            CREATE TABLE IF NOT EXISTS tree_paths (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                node_id INTEGER NOT NULL,
-                ancestor_id INTEGER NOT NULL,
-                path_level INTEGER NOT NULL,
-                UNIQUE(node_id, ancestor_id),
-                FOREIGN KEY (node_id) REFERENCES exercise_tree(id) ON DELETE CASCADE,
-                FOREIGN KEY (ancestor_id) REFERENCES exercise_tree(id) ON DELETE CASCADE
-            )
-            """,
-
-            # Bảng tree history cho tracking changes
-            """
-            CREATE TABLE IF NOT EXISTS tree_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                node_id INTEGER NOT NULL,
-                action_type TEXT NOT NULL,
-                old_parent_id INTEGER,
-                new_parent_id INTEGER,
-                old_name TEXT,
-                new_name TEXT,
-                old_level TEXT,
-                new_level TEXT,
-                changed_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                changed_by TEXT DEFAULT 'system',
-                reason TEXT,
-                FOREIGN KEY (node_id) REFERENCES exercise_tree(id) ON DELETE CASCADE
-            )
-            """
-        ]
-
-        for sql in tables_sql:
-            try:
-                self.db.execute_query(sql)
-            except Exception as e:
-                print(f"⚠️ Lỗi tạo supporting table: {e}")
-
-    def _create_indexes(self):
-        """Tạo indexes để tối ưu performance"""
-        indexes_sql = [
-            # Main table indexes
-            "CREATE INDEX IF NOT EXISTS idx_tree_parent_id ON exercise_tree(parent_id)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_level ON exercise_tree(level)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_name ON exercise_tree(name)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_created_at ON exercise_tree(created_at)",
-
-            # Supporting table indexes
-            "CREATE INDEX IF NOT EXISTS idx_tree_stats_node_id ON tree_node_stats(node_id)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_paths_node_id ON tree_paths(node_id)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_paths_ancestor_id ON tree_paths(ancestor_id)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_history_node_id ON tree_history(node_id)",
-            "CREATE INDEX IF NOT EXISTS idx_tree_history_date ON tree_history(changed_date)"
-        ]
-
-        for sql in indexes_sql:
-            try:
-                self.db.execute_query(sql)
-            except Exception as e:
-                print(f"⚠️ Lỗi tạo index: {e}")
-
     # ========== BASIC CRUD OPERATIONS ==========
 
     def create_node(self, node_data: Dict[str, Any]) -> Optional[int]:
@@ -1265,7 +1178,7 @@ if __name__ == "__main__":
                 }]
             return 1  # Return ID for INSERT
 
-        def upgrade_exercise_tree_schema(self):
+        def ensure_schema(self):
             pass
 
 
@@ -0,0 +1,258 @@
+"""
+Test Assembly Service - Chọn câu hỏi ngẫu nhiên theo ràng buộc để tạo đề
+File: ui_qt/windows/question_bank/services/assembly_service.py
+
+Chức năng:
+- Giới hạn trong một nhánh exercise_tree (node + toàn bộ con cháu)
+- Chia tầng theo độ khó (vd: 40% dễ / 40% trung bình / 20% khó)
+- Loại câu hỏi đã dùng trong N ngày gần đây (question_statistics.last_used_date)
+- Tổng estimated_time không vượt quá thời gian làm bài
+- Lấy mẫu phân tầng trên index: mỗi tầng chỉ đọc (id, estimated_time) từ covering
+  index idx_question_assembly, không nạp toàn bộ ngân hàng rồi lọc
+- Seed tái lập được: cùng seed + cùng dữ liệu -> cùng đề
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Nhóm độ khó -> các giá trị difficulty_level đang có trong DB (tiếng Anh + tiếng Việt)
+DIFFICULTY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "easy": ("easy", "Dễ"),
+    "medium": ("medium", "Trung bình"),
+    "hard": ("hard", "Khó", "expert"),
+}
+
+DIFFICULTY_LABELS = {"easy": "Dễ", "medium": "Trung bình", "hard": "Khó"}
+
+DEFAULT_ESTIMATED_TIME = 2  # phút, giống DEFAULT của cột estimated_time
+
+
+class TestAssemblyError(ValueError):
+    """Không thể chọn đủ câu hỏi thoả ràng buộc"""
+
+
+@dataclass
+class AssemblyConstraints:
+    """Ràng buộc khi tạo đề"""
+    total: int = 30
+    tree_id: Optional[int] = None                  # None = cả ngân hàng
+    difficulty_mix: Dict[str, float] = field(
+        default_factory=lambda: {"easy": 0.4, "medium": 0.4, "hard": 0.2}
+    )
+    exclude_used_within_days: int = 0              # 0 = không loại
+    max_total_minutes: Optional[int] = None        # None = không giới hạn
+    seed: Optional[int] = None                     # None = sinh seed mới
+
+
+@dataclass
+class AssemblyResult:
+    """Kết quả chọn đề"""
+    question_ids: List[int]
+    seed: int
+    counts: Dict[str, int]            # số câu theo độ khó
+    candidates: Dict[str, int]        # số câu hợp lệ theo độ khó
+    total_minutes: int
+
+
+class TestAssemblyService:
+    """Business Logic Service cho tạo đề ngẫu nhiên theo ràng buộc"""
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    # ========== PUBLIC API ==========
+
+    def assemble(self, constraints: AssemblyConstraints) -> AssemblyResult:
+        """
+        Chọn câu hỏi theo ràng buộc
+
+        Raises:
+            TestAssemblyError: Thiếu câu hỏi ở một tầng hoặc không thể đáp ứng thời gian
+        """
+        if constraints.total <= 0:
+            raise TestAssemblyError("Số câu hỏi phải lớn hơn 0")
+
+        seed = constraints.seed
+        if seed is None:
+            seed = random.SystemRandom().randrange(1, 2 ** 31)
+        rng = random.Random(seed)
+
+        quotas = self.compute_quotas(constraints.total, constraints.difficulty_mix)
+        used_since = None
+        if constraints.exclude_used_within_days > 0:
+            used_since = (datetime.now() - timedelta(days=constraints.exclude_used_within_days)).strftime("%Y-%m-%d")
+
+        chosen: Dict[str, List[Tuple[int, int]]] = {}
+        pools: Dict[str, List[Tuple[int, int]]] = {}
+        candidate_counts: Dict[str, int] = {}
+        shortages = []
+
+        # Tầng theo thứ tự cố định -> cùng seed cho cùng kết quả
+        for bucket in sorted(quotas):
+            quota = quotas[bucket]
+            candidates = self._fetch_stratum(bucket, constraints.tree_id, used_since)
+            candidate_counts[bucket] = len(candidates)
+            if quota == 0:
+                continue
+            if len(candidates) < quota:
+                shortages.append(f"{DIFFICULTY_LABELS.get(bucket, bucket)}: cần {quota}, chỉ có {len(candidates)}")
+                continue
+            rng.shuffle(candidates)
+            chosen[bucket] = candidates[:quota]
+            pools[bucket] = candidates[quota:]
+
+        if shortages:
+            raise TestAssemblyError("Không đủ câu hỏi thoả điều kiện:\n" + "\n".join(shortages))
+
+        if constraints.max_total_minutes is not None:
+            self._fit_time_budget(chosen, pools, constraints.max_total_minutes)
+
+        # Trộn thứ tự cuối cùng (vẫn theo seed)
+        picked = [item for bucket in sorted(chosen) for item in chosen[bucket]]
+        rng.shuffle(picked)
+
+        return AssemblyResult(
+            question_ids=[qid for qid, _ in picked],
+            seed=seed,
+            counts={bucket: len(items) for bucket, items in chosen.items()},
+            candidates=candidate_counts,
+            total_minutes=sum(minutes for _, minutes in picked),
+        )
+
+    def mark_used(self, question_ids: Sequence[int], used_date: Optional[str] = None):
+        """Ghi nhận các câu hỏi vừa được dùng trong một đề (last_used_date, usage_count)"""
+        ids = [int(qid) for qid in question_ids]
+        if not ids:
+            return
+        used_date = used_date or datetime.now().strftime("%Y-%m-%d")
+        placeholders = ",".join("?" * len(ids))
+        conn = self.db.conn
+        try:
+            conn.execute(
+                f"UPDATE question_statistics SET last_used_date = ? WHERE question_id IN ({placeholders})",
+                (used_date, *ids)
+            )
+            conn.execute(
+                f"""
+                INSERT INTO question_statistics (question_id, last_used_date)
+                SELECT q.id, ? FROM question_bank q
+                WHERE q.id IN ({placeholders})
+                  AND NOT EXISTS (SELECT 1 FROM question_statistics s WHERE s.question_id = q.id)
+                """,
+                (used_date, *ids)
+            )
+            conn.execute(
+                f"UPDATE question_bank SET usage_count = COALESCE(usage_count, 0) + 1 WHERE id IN ({placeholders})",
+                tuple(ids)
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Lỗi mark used: {e}")
+
+    @staticmethod
+    def compute_quotas(total: int, mix: Dict[str, float]) -> Dict[str, int]:
+        """
+        Chia số câu theo tỉ lệ (phương pháp phần dư lớn nhất)
+
+        Example:
+            compute_quotas(30, {"easy": .4, "medium": .4, "hard": .2}) -> {easy: 12, medium: 12, hard: 6}
+        """
+        weights = {bucket: max(0.0, float(w)) for bucket, w in mix.items() if bucket in DIFFICULTY_ALIASES}
+        weight_sum = sum(weights.values())
+        if weight_sum <= 0:
+            raise TestAssemblyError("Tỉ lệ độ khó không hợp lệ")
+
+        exact = {bucket: total * w / weight_sum for bucket, w in weights.items()}
+        quotas = {bucket: int(value) for bucket, value in exact.items()}
+        remaining = total - sum(quotas.values())
+        by_remainder = sorted(exact, key=lambda b: (-(exact[b] - quotas[b]), b))
+        for bucket in by_remainder[:remaining]:
+            quotas[bucket] += 1
+        return quotas
+
+    # ========== PRIVATE HELPERS ==========
+
+    def _fetch_stratum(self, bucket: str, tree_id: Optional[int],
+                       used_since: Optional[str]) -> List[Tuple[int, int]]:
+        """
+        (id, estimated_time) của các câu hợp lệ trong một tầng độ khó, sắp theo id
+
+        Chỉ đọc cột có trong idx_question_assembly -> quét index, không đọc bảng
+        """
+        aliases = DIFFICULTY_ALIASES[bucket]
+        params: List = []
+        sql = ""
+        if tree_id is not None:
+            sql += """
+                WITH RECURSIVE subtree(id) AS (
+                    SELECT ?
+                    UNION ALL
+                    SELECT t.id FROM exercise_tree t JOIN subtree s ON t.parent_id = s.id
+                )
+            """
+            params.append(tree_id)
+
+        sql += f"""
+            SELECT q.id, COALESCE(q.estimated_time, {DEFAULT_ESTIMATED_TIME}) AS minutes
+            FROM question_bank q
+            WHERE q.difficulty_level IN ({",".join("?" * len(aliases))})
+              AND COALESCE(q.status, 'active') = 'active'
+        """
+        params.extend(aliases)
+        if tree_id is not None:
+            sql += " AND q.tree_id IN subtree"
+        if used_since:
+            sql += """
+              AND NOT EXISTS (
+                  SELECT 1 FROM question_statistics s
+                  WHERE s.question_id = q.id AND s.last_used_date >= ?
+              )
+            """
+            params.append(used_since)
+        sql += " ORDER BY q.id"
+
+        rows = self.db.conn.execute(sql, tuple(params)).fetchall()
+        return [(row[0], int(row[1])) for row in rows]
+
+    @staticmethod
+    def _fit_time_budget(chosen: Dict[str, List[Tuple[int, int]]],
+                         pools: Dict[str, List[Tuple[int, int]]], budget: int):
+        """
+        Đổi câu dài nhất lấy câu ngắn hơn trong cùng tầng (giữ nguyên tỉ lệ độ khó)
+        cho tới khi tổng thời gian <= budget
+        """
+        total = sum(m for items in chosen.values() for _, m in items)
+        if total <= budget:
+            return
+
+        # pool của mỗi tầng sắp theo thời gian tăng dần (ổn định theo thứ tự đã shuffle)
+        for bucket in pools:
+            pools[bucket].sort(key=lambda item: item[1])
+
+        while total > budget:
+            best = None  # (gain, bucket, chosen_index)
+            for bucket, items in chosen.items():
+                pool = pools.get(bucket)
+                if not pool:
+                    continue
+                idx = max(range(len(items)), key=lambda i: items[i][1])
+                gain = items[idx][1] - pool[0][1]
+                if gain > 0 and (best is None or gain > best[0]):
+                    best = (gain, bucket, idx)
+            if best is None:
+                raise TestAssemblyError(
+                    f"Không thể chọn đề có tổng thời gian ≤ {budget} phút (tối thiểu {total} phút)"
+                )
+
+            gain, bucket, idx = best
+            replacement = pools[bucket].pop(0)
+            removed = chosen[bucket][idx]
+            chosen[bucket][idx] = replacement
+            # trả câu bị thay về pool, giữ pool sắp theo thời gian
+            pool = pools[bucket]
+            pos = next((i for i, item in enumerate(pool) if item[1] > removed[1]), len(pool))
+            pool.insert(pos, removed)
+            total -= gain
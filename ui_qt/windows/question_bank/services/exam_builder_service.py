@@ -0,0 +1,374 @@
+"""
+Exam Builder Service - Xuất đề thi PDF (nhiều mã đề) từ ngân hàng câu hỏi
+File: ui_qt/windows/question_bank/services/exam_builder_service.py
+
+Chức năng:
+- Đăng ký font DejaVu một lần cho mỗi process (cache)
+- Nạp toàn bộ câu hỏi đã chọn bằng một truy vấn
+- Tạo N mã đề: đảo thứ tự câu hỏi và phương án theo seed (mỗi lần xuất một seed mới,
+  ghi vào PDF / CSV đáp án) -> cùng seed tái lập đúng bộ đề
+- Render các mã đề song song bằng process pool, báo tiến độ qua callback
+- Ghi bảng đáp án tổng hợp (CSV) cho tất cả mã đề
+- Không phụ thuộc Qt: dùng được từ CreateTestWindowQt và từ dòng lệnh (build_exams.py)
+"""
+
+import csv
+import json
+import os
+import random
+import re
+import string
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# ReportLab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+
+# ui_qt/windows/question_bank/services -> project root
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+FONT_DIR = os.path.join(PROJECT_DIR, "assets", "fonts")
+FONT_REGULAR = "DejaVu"
+FONT_BOLD = "DejaVu-Bold"
+
+# SQLite giới hạn số tham số trong một câu lệnh
+SQL_PARAM_CHUNK = 900
+
+# Mã đề bắt đầu từ 101 như đề thi thông thường
+FIRST_VARIANT_CODE = 101
+
+OPTION_LABELS = string.ascii_uppercase
+
+ProgressCallback = Callable[[int, int, str], None]  # (đã xong, tổng, đường dẫn file vừa xong)
+
+
+# ========== DATA CLASSES ==========
+
+@dataclass
+class ExamOption:
+    """Một phương án trả lời"""
+    text: str = ""
+    image_path: str = ""
+    is_correct: bool = False
+
+
+@dataclass
+class ExamQuestion:
+    """Câu hỏi đã chuẩn hoá để render (không giữ sqlite Row -> pickle được)"""
+    id: int
+    text: str = ""
+    image_path: str = ""
+    options: List[ExamOption] = field(default_factory=list)
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "ExamQuestion":
+        try:
+            raw_options = json.loads(row.get("options") or "[]")
+        except (TypeError, ValueError):
+            raw_options = []
+        options = [
+            ExamOption(
+                text=(opt.get("text") or "").strip(),
+                image_path=opt.get("image_path") or "",
+                is_correct=bool(opt.get("is_correct")),
+            )
+            for opt in raw_options if isinstance(opt, dict)
+        ]
+        return cls(
+            id=row["id"],
+            text=row.get("content_text") or "",
+            image_path=row.get("content_image") or "",
+            options=options,
+        )
+
+
+@dataclass
+class ExamSpec:
+    """Thông tin một bộ đề"""
+    title: str = "BÀI KIỂM TRA"
+    duration: str = "45 phút"
+    variants: int = 1
+    shuffle_questions: bool = True
+    shuffle_options: bool = True
+    seed: Optional[int] = None  # None = sinh seed mới khi xuất
+
+    def with_seed(self) -> "ExamSpec":
+        """Bản sao có seed cụ thể (sinh ngẫu nhiên nếu chưa có) để hiển thị / lưu lại"""
+        if self.seed is not None:
+            return self
+        return replace(self, seed=random.SystemRandom().randrange(1, 2 ** 31))
+
+
+@dataclass
+class ExamVariant:
+    """Một mã đề: câu hỏi theo thứ tự đã đảo + đáp án"""
+    code: int
+    questions: List[ExamQuestion]
+    answer_key: List[Tuple[int, str]]  # (số câu, nhãn đáp án)
+
+
+# ========== FONT CACHE ==========
+
+_fonts_registered = False
+
+
+def register_fonts(font_dir: str = FONT_DIR):
+    """Đăng ký font DejaVu một lần cho process hiện tại"""
+    global _fonts_registered
+    if _fonts_registered:
+        return
+    font_reg = os.path.join(font_dir, "DejaVuSans.ttf")
+    font_bold = os.path.join(font_dir, "DejaVuSans-Bold.ttf")
+    if not (os.path.exists(font_reg) and os.path.exists(font_bold)):
+        raise FileNotFoundError(f"Không tìm thấy font tại: {font_dir}")
+
+    registered = set(pdfmetrics.getRegisteredFontNames())
+    if FONT_REGULAR not in registered:
+        pdfmetrics.registerFont(TTFont(FONT_REGULAR, font_reg))
+    if FONT_BOLD not in registered:
+        pdfmetrics.registerFont(TTFont(FONT_BOLD, font_bold))
+    _fonts_registered = True
+
+
+_styles = None
+
+
+def _get_styles():
+    """Style sheet dùng chung (tạo một lần cho mỗi process)"""
+    global _styles
+    if _styles is None:
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(
+            name="ExamTitle", fontName=FONT_BOLD, fontSize=18, alignment=1, spaceAfter=12
+        ))
+        styles.add(ParagraphStyle(
+            name="Normal_DejaVu", fontName=FONT_REGULAR, fontSize=12, leading=15
+        ))
+        styles.add(ParagraphStyle(
+            name="QuestionNum", fontName=FONT_BOLD, fontSize=12, spaceBefore=8, leading=14
+        ))
+        _styles = styles
+    return _styles
+
+
+# ========== LOADING ==========
+
+def load_questions(db, question_ids: Sequence) -> List[ExamQuestion]:
+    """
+    Nạp các câu hỏi theo đúng thứ tự question_ids bằng một truy vấn
+    (chia lô nếu vượt giới hạn tham số của SQLite)
+    """
+    ids = [int(qid) for qid in question_ids]
+    rows_by_id: Dict[int, Dict] = {}
+    for start in range(0, len(ids), SQL_PARAM_CHUNK):
+        chunk = ids[start:start + SQL_PARAM_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute_query(
+            f"SELECT * FROM question_bank WHERE id IN ({placeholders})", tuple(chunk), fetch='all'
+        ) or []
+        for row in rows:
+            rows_by_id[row["id"]] = row
+    return [ExamQuestion.from_row(rows_by_id[qid]) for qid in ids if qid in rows_by_id]
+
+
+# ========== VARIANTS ==========
+
+def make_variant(questions: Sequence[ExamQuestion], code: int, spec: ExamSpec) -> ExamVariant:
+    """
+    Tạo một mã đề; cùng (seed, code) luôn cho cùng thứ tự câu hỏi/phương án
+    """
+    spec = spec.with_seed()
+    rng = random.Random(f"{spec.seed}:{code}")
+    ordered = list(questions)
+    if spec.shuffle_questions:
+        rng.shuffle(ordered)
+
+    variant_questions = []
+    answer_key = []
+    for number, question in enumerate(ordered, start=1):
+        options = list(question.options)
+        if spec.shuffle_options:
+            rng.shuffle(options)
+        variant_questions.append(ExamQuestion(question.id, question.text, question.image_path, options))
+        for j, opt in enumerate(options):
+            if opt.is_correct:
+                answer_key.append((number, OPTION_LABELS[j]))
+
+    return ExamVariant(code=code, questions=variant_questions, answer_key=answer_key)
+
+
+def make_variants(questions: Sequence[ExamQuestion], spec: ExamSpec) -> List[ExamVariant]:
+    """Tạo spec.variants mã đề: 101, 102, ..."""
+    spec = spec.with_seed()
+    return [make_variant(questions, FIRST_VARIANT_CODE + i, spec) for i in range(max(1, spec.variants))]
+
+
+# ========== RENDERING ==========
+
+def render_variant_pdf(variant: ExamVariant, title: str, duration: str, path: str,
+                       show_code: bool = True, seed: Optional[int] = None) -> str:
+    """
+    Render một mã đề ra file PDF (đề + trang đáp án). Chạy được trong process con.
+
+    seed được ghi ở trang đáp án và trong metadata (Subject / Keywords) của PDF
+    """
+    register_fonts()
+    styles = _get_styles()
+
+    doc = SimpleDocTemplate(
+        path, pagesize=A4,
+        rightMargin=40, leftMargin=40, topMargin=60, bottomMargin=40,
+        title=title,
+        subject=f"Mã đề {variant.code}" + (f" - seed {seed}" if seed is not None else ""),
+        keywords=[f"seed={seed}", f"ma_de={variant.code}"] if seed is not None else [],
+    )
+
+    flowables = [Paragraph(title, styles["ExamTitle"])]
+    flowables.append(Paragraph(f"Thời gian làm bài: {duration}", styles["Normal_DejaVu"]))
+    if show_code:
+        flowables.append(Paragraph(f"<b>Mã đề: {variant.code}</b>", styles["Normal_DejaVu"]))
+    flowables.append(Spacer(1, 12))
+
+    for number, question in enumerate(variant.questions, start=1):
+        # Nội dung câu hỏi (text hoặc ảnh)
+        if question.text.strip():
+            body = re.sub(r"^Câu\s*\d+\s*:\s*", "", question.text).strip()
+            flowables.append(Paragraph(f"<b>Câu {number}:</b> {body}", styles["Normal_DejaVu"]))
+            flowables.append(Spacer(1, 6))
+        elif question.image_path and os.path.exists(question.image_path):
+            flowables.append(Image(question.image_path, width=400, height=0))
+
+        # Phương án
+        table_data = []
+        for j, opt in enumerate(question.options):
+            cell_label = Paragraph(f"<b>{OPTION_LABELS[j]}.</b>", styles["Normal_DejaVu"])
+            if opt.text:
+                cell_content = Paragraph(opt.text, styles["Normal_DejaVu"])
+            elif opt.image_path and os.path.exists(opt.image_path):
+                cell_content = Image(opt.image_path, width=200, height=0)
+            else:
+                cell_content = Paragraph("(Không có nội dung)", styles["Normal_DejaVu"])
+            table_data.append([cell_label, cell_content])
+
+        if table_data:
+            tbl = Table(table_data, colWidths=[20, 420])
+            tbl.setStyle(TableStyle([
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+            ]))
+            flowables.append(tbl)
+        flowables.append(Spacer(1, 12))
+
+    # Trang ĐÁP ÁN
+    flowables.append(PageBreak())
+    answer_title = f"ĐÁP ÁN - MÃ ĐỀ {variant.code}" if show_code else "ĐÁP ÁN"
+    flowables.append(Paragraph(answer_title, styles["ExamTitle"]))
+    ans_cells = [Paragraph(f"{num}-{lbl}", styles["Normal_DejaVu"]) for num, lbl in variant.answer_key]
+    rows = [ans_cells[i:i + 5] for i in range(0, len(ans_cells), 5)]
+    if not rows:
+        rows = [[Paragraph("(Chưa có đáp án)", styles["Normal_DejaVu"])]]
+    ans_tbl = Table(rows, colWidths=[80] * max(1, len(rows[0])))
+    ans_tbl.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ]))
+    flowables.append(ans_tbl)
+    if seed is not None:
+        flowables.append(Spacer(1, 12))
+        flowables.append(Paragraph(f"Seed đảo đề: {seed}", styles["Normal_DejaVu"]))
+
+    doc.build(flowables)
+    return path
+
+
+def variant_path(output_path: str, code: int, variant_count: int) -> str:
+    """de_thi.pdf -> de_thi.pdf (1 mã đề) hoặc de_thi_101.pdf, de_thi_102.pdf, ..."""
+    if variant_count <= 1:
+        return output_path
+    base, ext = os.path.splitext(output_path)
+    return f"{base}_{code}{ext or '.pdf'}"
+
+
+def write_answer_keys(variants: Sequence[ExamVariant], path: str, seed: Optional[int] = None) -> str:
+    """Bảng đáp án tổng hợp mọi mã đề: mã đề, câu, đáp án, ID câu hỏi gốc, seed"""
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ma_de", "cau", "dap_an", "question_id", "seed"])
+        for variant in variants:
+            question_ids = {number: q.id for number, q in enumerate(variant.questions, start=1)}
+            for number, label in variant.answer_key:
+                writer.writerow([variant.code, number, label, question_ids[number],
+                                 "" if seed is None else seed])
+    return path
+
+
+def build_exam_set(db, question_ids: Sequence, spec: ExamSpec, output_path: str,
+                   progress: Optional[ProgressCallback] = None,
+                   max_workers: Optional[int] = None) -> List[str]:
+    """
+    Xuất bộ đề: nạp câu hỏi bằng một truy vấn rồi render (xem render_exam_set)
+
+    Args:
+        db: DatabaseManager
+        question_ids: ID câu hỏi theo thứ tự gốc
+        spec: Thông tin bộ đề (số mã đề, đảo câu/phương án, seed)
+        output_path: File PDF đích (nhiều mã đề -> thêm hậu tố _101, _102, ...)
+        progress: callback(đã xong, tổng, file vừa xong)
+        max_workers: Số process render (None = theo số CPU, 1 = render tuần tự)
+
+    Returns:
+        Danh sách file đã tạo (các PDF, cuối cùng là CSV đáp án nếu nhiều mã đề)
+    """
+    questions = load_questions(db, question_ids)
+    return render_exam_set(questions, spec, output_path, progress, max_workers)
+
+
+def render_exam_set(questions: Sequence[ExamQuestion], spec: ExamSpec, output_path: str,
+                    progress: Optional[ProgressCallback] = None,
+                    max_workers: Optional[int] = None) -> List[str]:
+    """
+    Tạo các mã đề và render song song bằng process pool
+
+    Không đụng tới database -> gọi được từ QThread (kết nối sqlite gắn với thread GUI).
+    spec.seed = None thì sinh seed mới; muốn biết seed đã dùng thì gọi spec.with_seed() trước.
+    """
+    if not questions:
+        raise ValueError("Không tìm thấy câu hỏi nào trong ngân hàng")
+
+    register_fonts()  # báo lỗi font sớm, trước khi mở process pool
+
+    spec = spec.with_seed()
+    variants = make_variants(questions, spec)
+    total = len(variants)
+    show_code = total > 1
+    jobs = [(variant, variant_path(output_path, variant.code, total)) for variant in variants]
+    paths: List[str] = []
+
+    if total == 1 or max_workers == 1:
+        for variant, path in jobs:
+            paths.append(render_variant_pdf(variant, spec.title, spec.duration, path, show_code, spec.seed))
+            if progress:
+                progress(len(paths), total, path)
+    else:
+        workers = min(total, max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=register_fonts) as pool:
+            futures = [
+                pool.submit(render_variant_pdf, variant, spec.title, spec.duration, path, show_code, spec.seed)
+                for variant, path in jobs
+            ]
+            for future in as_completed(futures):
+                paths.append(future.result())
+                if progress:
+                    progress(len(paths), total, paths[-1])
+        paths.sort()
+
+    if total > 1:
+        base, _ = os.path.splitext(output_path)
+        paths.append(write_answer_keys(variants, f"{base}_dap_an.csv", spec.seed))
+    return paths
@@ -603,45 +603,21 @@ class SearchService:
     # ========== PRIVATE HELPER METHODS ==========
 
     def _init_full_text_search(self):
-        """Khởi tạo Full-Text Search nếu có thể"""
+        """Khởi tạo Full-Text Search nếu có thể (bảng question_fts tạo trong schema_migrations)"""
+        self._fts_available = False
         try:
-            # Check if FTS is available
+            self.db.ensure_schema()
             result = self.db.execute_query(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name='question_fts'",
                 fetch="one"
             )
-
-            if not result:
-                # Try to create FTS table
-                try:
-                    self.db.execute_query("""
-                        CREATE VIRTUAL TABLE question_fts USING fts5(
-                            content_text, 
-                            answer_text,
-                            tags,
-                            content='question_bank'
-                        )
-                    """)
-
-                    # Populate FTS table
-                    self._rebuild_fts_index()
-
-                except Exception as e:
-                    print(f"FTS không khả dụng: {e}")
-
+            self._fts_available = result is not None
         except Exception as e:
             print(f"Lỗi init FTS: {e}")
 
     def _has_fts_support(self) -> bool:
-        """Kiểm tra có hỗ trợ FTS không"""
-        try:
-            result = self.db.execute_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='question_fts'",
-                fetch="one"
-            )
-            return result is not None
-        except:
-            return False
+        """Kiểm tra có hỗ trợ FTS không (đã kiểm tra một lần khi khởi tạo)"""
+        return self._fts_available
 
     def _rebuild_fts_index(self):
         """Rebuild FTS index"""
@@ -0,0 +1,343 @@
+"""
+Tree Codec Service - Import/Export/Copy exercise_tree theo lô
+File: ui_qt/windows/question_bank/services/tree_codec_service.py
+
+Chức năng:
+- Export: một truy vấn CTE đệ quy trả về toàn bộ cây theo thứ tự duyệt sâu (preorder),
+  kèm depth -> ghi JSON lồng nhau dạng stream, không dựng cây trong bộ nhớ
+- Import: làm phẳng JSON lồng nhau (không đệ quy), cấp id tạm 1..n rồi ánh xạ sang id
+  thật = base + id tạm, ghi bằng executemany trong một transaction duy nhất
+- Copy subtree: export nhánh nguồn rồi import lại dưới node đích (cùng đường ghi)
+- Cập nhật luôn tree_node_stats / tree_paths (nếu có) như TreeRepository.create_node
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Thuộc tính node trong file JSON -> giá trị mặc định khi bảng không có cột tương ứng
+NODE_FIELDS: Dict[str, Any] = {
+    "name": "",
+    "level": "Môn",
+    "description": "",
+    "icon": "",
+    "color": "#2E86AB",
+    "is_active": True,
+    "metadata": {},
+}
+
+MAX_DEPTH = 64  # chặn vòng lặp nếu parent_id bị hỏng tạo chu trình
+
+# (id tạm, id tạm của cha hoặc None, depth tương đối, dữ liệu node)
+FlatNode = Tuple[int, Optional[int], int, Dict[str, Any]]
+
+
+class TreeCodecError(ValueError):
+    """Dữ liệu cây không hợp lệ hoặc không ghi được"""
+
+
+@dataclass
+class TreeImportResult:
+    """Kết quả import"""
+    root_ids: List[int]      # id thật của các node cấp cao nhất vừa tạo
+    count: int               # tổng số node đã tạo
+
+
+class TreeCodecService:
+    """Business Logic Service cho import/export/copy cây theo lô"""
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    # ========== EXPORT ==========
+
+    def iter_nodes(self, root_id: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        (depth, node) theo thứ tự preorder, anh em sắp theo sort_order (nếu có) rồi name
+
+        root_id=None: cả cây (gốc = parent_id NULL hoặc cha không còn tồn tại)
+        """
+        columns = self._table_columns()
+        fields = [f for f in NODE_FIELDS if f in columns]
+        order = "sort_order, name, id" if "sort_order" in columns else "name, id"
+
+        if root_id is None:
+            anchor = "parent_id IS NULL OR parent_id NOT IN (SELECT id FROM exercise_tree)"
+            params: Tuple = ()
+        else:
+            anchor = "id = ?"
+            params = (root_id,)
+
+        # Mỗi đoạn path = thứ hạng trong anh em + id -> duy nhất, sắp chuỗi = duyệt sâu
+        cursor = self.db.conn.execute(f"""
+            WITH RECURSIVE ranked AS (
+                SELECT id, parent_id,
+                       printf('%08d%010d', ROW_NUMBER() OVER (PARTITION BY parent_id ORDER BY {order}), id) AS seg
+                FROM exercise_tree
+            ),
+            walk(id, depth, path) AS (
+                SELECT id, 0, seg FROM ranked WHERE {anchor}
+                UNION ALL
+                SELECT r.id, w.depth + 1, w.path || r.seg
+                FROM ranked r JOIN walk w ON r.parent_id = w.id
+                WHERE w.depth < {MAX_DEPTH}
+            )
+            SELECT w.depth, {", ".join("t." + f for f in fields)}
+            FROM walk w JOIN exercise_tree t ON t.id = w.id
+            ORDER BY w.path
+        """, params)
+
+        for row in cursor:
+            node = dict(NODE_FIELDS)
+            node.update(zip(fields, row[1:]))
+            yield row[0], self._decode_node(node)
+
+    def export_tree(self, root_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Cây lồng nhau [{..., "children": [...]}] dựng từ iter_nodes (một truy vấn)"""
+        roots: List[Dict[str, Any]] = []
+        stack: List[List[Dict[str, Any]]] = [roots]   # stack[d] = danh sách con ở depth d
+        for depth, node in self.iter_nodes(root_id):
+            del stack[depth + 1:]
+            node["children"] = []
+            stack[depth].append(node)
+            stack.append(node["children"])
+        return roots
+
+    def export_json(self, target: Union[str, IO[str]], root_id: Optional[int] = None) -> int:
+        """
+        Ghi cây ra JSON theo dạng stream (bộ nhớ không tăng theo kích thước cây)
+
+        Returns:
+            Số node đã ghi
+        """
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8") as f:
+                return self.export_json(f, root_id)
+
+        write = target.write
+        write("[")
+        open_nodes = 0        # số node đang mở danh sách "children"
+        need_comma = False
+        count = 0
+        for depth, node in self.iter_nodes(root_id):
+            while open_nodes > depth:
+                open_nodes -= 1
+                write("\n" + "  " * (open_nodes + 1) + "]}")
+                need_comma = True
+            if need_comma:
+                write(",")
+            header = json.dumps(node, ensure_ascii=False)[:-1]
+            write("\n" + "  " * (depth + 1) + header + ', "children": [')
+            open_nodes = depth + 1
+            need_comma = False
+            count += 1
+        while open_nodes > 0:
+            open_nodes -= 1
+            write("\n" + "  " * (open_nodes + 1) + "]}")
+        write("\n]\n")
+        return count
+
+    # ========== IMPORT ==========
+
+    def import_tree(self, nodes: Union[Sequence[Dict[str, Any]], Dict[str, Any]],
+                    parent_id: Optional[int] = None, replace: bool = False,
+                    validate: Optional[Callable[[Optional[str], Dict[str, Any]], None]] = None
+                    ) -> TreeImportResult:
+        """
+        Import cây lồng nhau dưới parent_id trong một transaction
+
+        Args:
+            nodes: danh sách node (hoặc một node) dạng {"name", "level", ..., "children": [...]}
+            replace: xoá toàn bộ exercise_tree trước khi import (cùng transaction)
+            validate: validate(level_cha, node) -> raise ValueError nếu không hợp lệ
+
+        Raises:
+            TreeCodecError: dữ liệu không hợp lệ hoặc lỗi ghi (đã rollback, không ghi gì)
+        """
+        if isinstance(nodes, dict):
+            nodes = [nodes]
+        flat = self.flatten(nodes)
+        return self._write_flat(flat, parent_id, replace=replace, validate=validate)
+
+    def copy_subtree(self, source_id: int, target_parent_id: Optional[int],
+                     new_name: Optional[str] = None) -> Optional[int]:
+        """Sao chép nhánh source_id vào target_parent_id, trả về id node gốc mới"""
+        flat: List[FlatNode] = []
+        parents: List[int] = []   # parents[d] = id tạm của node gần nhất ở depth d
+        for temp_id, (depth, node) in enumerate(self.iter_nodes(source_id), start=1):
+            del parents[depth:]
+            flat.append((temp_id, parents[-1] if parents else None, depth, node))
+            parents.append(temp_id)
+        if not flat:
+            return None
+        if new_name:
+            flat[0][3]["name"] = new_name
+        result = self._write_flat(flat, target_parent_id)
+        return result.root_ids[0] if result.root_ids else None
+
+    @staticmethod
+    def flatten(nodes: Sequence[Dict[str, Any]]) -> List[FlatNode]:
+        """Làm phẳng cây lồng nhau theo preorder bằng stack (không giới hạn độ sâu đệ quy)"""
+        flat: List[FlatNode] = []
+        stack = [(node, None, 0) for node in reversed(list(nodes))]
+        while stack:
+            node, parent_temp, depth = stack.pop()
+            if not isinstance(node, dict):
+                raise TreeCodecError(f"Node không hợp lệ: {node!r}")
+            temp_id = len(flat) + 1
+            flat.append((temp_id, parent_temp, depth, node))
+            children = node.get("children") or []
+            stack.extend((child, temp_id, depth + 1) for child in reversed(children))
+        return flat
+
+    # ========== PRIVATE HELPERS ==========
+
+    def _write_flat(self, flat: List[FlatNode], parent_id: Optional[int], replace: bool = False,
+                    validate: Optional[Callable[[Optional[str], Dict[str, Any]], None]] = None
+                    ) -> TreeImportResult:
+        """
+        Ghi các node đã làm phẳng: id thật = base + id tạm (base = id lớn nhất đã cấp),
+        cha luôn đứng trước con nên chỉ cần một lượt executemany
+        """
+        columns = self._table_columns()
+        insert_fields = [f for f in NODE_FIELDS if f in columns]
+        stamp = ["created_at"] if "created_at" in columns else []
+        now = datetime.now().isoformat()
+
+        conn = self.db.conn
+        try:
+            with conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                if replace:
+                    conn.execute("DELETE FROM exercise_tree")
+                    parent_id = None
+
+                parent_level, parent_chain = None, []
+                if parent_id is not None:
+                    parent_chain = self._ancestor_chain(parent_id)
+                    if not parent_chain:
+                        raise TreeCodecError(f"Node cha {parent_id} không tồn tại")
+                    row = conn.execute("SELECT level FROM exercise_tree WHERE id = ?", (parent_id,)).fetchone()
+                    parent_level = row[0]
+
+                base = self._max_assigned_id()
+                levels: Dict[int, str] = {}
+                rows = []
+                for temp_id, parent_temp, _, node in flat:
+                    name = str(node.get("name") or "").strip()
+                    if not name:
+                        raise TreeCodecError("Tên node không được để trống")
+                    level = node.get("level") or NODE_FIELDS["level"]
+                    if validate is not None:
+                        validate(levels[parent_temp] if parent_temp else parent_level, node)
+                    levels[temp_id] = level
+
+                    values = {**NODE_FIELDS, **node, "name": name, "level": level}
+                    rows.append((
+                        base + temp_id,
+                        base + parent_temp if parent_temp else parent_id,
+                        *(self._encode_value(f, values[f]) for f in insert_fields),
+                        *([now] if stamp else []),
+                    ))
+
+                all_fields = ["id", "parent_id", *insert_fields, *stamp]
+                conn.executemany(
+                    f"INSERT INTO exercise_tree ({', '.join(all_fields)}) "
+                    f"VALUES ({', '.join('?' * len(all_fields))})",
+                    rows
+                )
+                self._write_tree_caches(flat, base, parent_chain)
+        except ValueError as e:
+            raise TreeCodecError(str(e)) from e
+        except Exception as e:
+            raise TreeCodecError(f"Không thể ghi cây: {e}") from e
+
+        root_ids = [base + temp_id for temp_id, parent_temp, _, _ in flat if parent_temp is None]
+        return TreeImportResult(root_ids=root_ids, count=len(flat))
+
+    def _write_tree_caches(self, flat: List[FlatNode], base: int, parent_chain: List[int]):
+        """tree_node_stats (depth) + tree_paths (tổ tiên từ gốc xuống) cho các node mới"""
+        tables = {row[0] for row in self.db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('tree_node_stats', 'tree_paths')"
+        )}
+        if not tables:
+            return
+
+        chains: Dict[int, List[int]] = {}
+        stats, paths = [], []
+        for temp_id, parent_temp, _, _ in flat:
+            if parent_temp:
+                chain = chains[parent_temp] + [base + parent_temp]
+            else:
+                chain = parent_chain
+            chains[temp_id] = chain
+            node_id = base + temp_id
+            stats.append((node_id, len(chain)))
+            paths.extend((node_id, ancestor_id, i) for i, ancestor_id in enumerate(chain))
+
+        conn = self.db.conn
+        if "tree_node_stats" in tables:
+            conn.executemany("""
+                INSERT OR REPLACE INTO tree_node_stats
+                (node_id, question_count, child_count, descendant_count, depth_level)
+                VALUES (?, 0, 0, 0, ?)
+            """, stats)
+        if "tree_paths" in tables:
+            conn.executemany(
+                "INSERT OR REPLACE INTO tree_paths (node_id, ancestor_id, path_level) VALUES (?, ?, ?)",
+                paths
+            )
+
+    def _ancestor_chain(self, node_id: int) -> List[int]:
+        """Tổ tiên từ gốc xuống tới node_id (gồm node_id), rỗng nếu node không tồn tại"""
+        rows = self.db.conn.execute(f"""
+            WITH RECURSIVE up(id, parent_id, depth) AS (
+                SELECT id, parent_id, 0 FROM exercise_tree WHERE id = ?
+                UNION ALL
+                SELECT t.id, t.parent_id, u.depth + 1
+                FROM exercise_tree t JOIN up u ON t.id = u.parent_id
+                WHERE u.depth < {MAX_DEPTH}
+            )
+            SELECT id FROM up ORDER BY depth DESC
+        """, (node_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def _max_assigned_id(self) -> int:
+        """Id lớn nhất đã từng cấp (tính cả sqlite_sequence để không dùng lại id đã xoá)"""
+        conn = self.db.conn
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM exercise_tree").fetchone()[0]
+        has_sequence = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'"
+        ).fetchone()
+        if has_sequence:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'exercise_tree'").fetchone()
+            if row and row[0]:
+                max_id = max(max_id, int(row[0]))
+        return max_id
+
+    def _table_columns(self) -> set:
+        return {row[1] for row in self.db.conn.execute("PRAGMA table_info(exercise_tree)")}
+
+    @staticmethod
+    def _decode_node(node: Dict[str, Any]) -> Dict[str, Any]:
+        node["description"] = node["description"] or ""
+        node["icon"] = node["icon"] or ""
+        node["color"] = node["color"] or NODE_FIELDS["color"]
+        node["is_active"] = bool(node["is_active"])
+        metadata = node["metadata"]
+        if isinstance(metadata, str):
+            try:
+                node["metadata"] = json.loads(metadata or "{}")
+            except ValueError:
+                node["metadata"] = {}
+        return node
+
+    @staticmethod
+    def _encode_value(field: str, value: Any) -> Any:
+        if field == "metadata":
+            return value if isinstance(value, str) else json.dumps(value or {}, ensure_ascii=False)
+        if field == "is_active":
+            return 1 if value else 0
+        return value
@@ -17,6 +17,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 from ..repositories.tree_repository import TreeRepository
+from .tree_codec_service import TreeCodecService
 
 
 @dataclass
@@ -61,6 +62,7 @@ class TreeService:
     def __init__(self, db_manager):
         self.db = db_manager
         self.repository = TreeRepository(db_manager)
+        self.codec = TreeCodecService(db_manager)
 
         # Valid tree levels
         self.valid_levels = [
@@ -350,21 +352,12 @@ class TreeService:
                 if not self._validate_parent_child_relationship(target_parent_id, source_node.level):
                     raise ValueError("Vị trí đích không phù hợp với level của node")
 
-            # Create new root node
             copy_name = new_name or f"{source_node.name} (Copy)"
-            new_root_id = self.create_node(
-                name=copy_name,
-                level=source_node.level,
-                parent_id=target_parent_id,
-                description=source_node.description
-            )
-
-            if new_root_id:
-                # Copy children recursively
-                self._copy_children_recursive(source_node_id, new_root_id)
-                return new_root_id
+            if self._check_duplicate_name(copy_name, target_parent_id, source_node.level):
+                raise ValueError(f"Đã tồn tại node '{copy_name}' ở cùng cấp")
 
-            return None
+            # Đọc cả nhánh bằng một truy vấn, ghi lại bằng executemany trong một transaction
+            return self.codec.copy_subtree(source_node_id, target_parent_id, copy_name)
 
         except Exception as e:
             raise Exception(f"Lỗi copy subtree: {str(e)}")
@@ -626,7 +619,16 @@ class TreeService:
             else:
                 tree_data = data
 
-            return self._import_tree_recursive(tree_data, parent_id)
+            if isinstance(tree_data, dict):
+                tree_data = [tree_data]
+
+            for node_data in tree_data:
+                if self._check_duplicate_name(node_data.get('name', ''), parent_id, node_data.get('level')):
+                    raise ValueError(f"Đã tồn tại node '{node_data.get('name')}' ở cùng cấp")
+
+            # Một transaction: node không hợp lệ -> không ghi node nào
+            self.codec.import_tree(tree_data, parent_id, validate=self._validate_import_node)
+            return True
 
         except Exception as e:
             print(f"Lỗi import tree: {e}")
@@ -866,23 +868,6 @@ class TreeService:
             self._collect_descendants(child.id, result)
             result.append(child.id)
 
-    def _copy_children_recursive(self, source_parent_id: int, target_parent_id: int):
-        """Copy children recursively"""
-        children = self.get_children(source_parent_id)
-
-        for child in children:
-            # Create copy of child
-            new_child_id = self.create_node(
-                name=child.name,
-                level=child.level,
-                parent_id=target_parent_id,
-                description=child.description
-            )
-
-            if new_child_id:
-                # Recursively copy grandchildren
-                self._copy_children_recursive(child.id, new_child_id)
-
     def _sort_tree_nodes(self, nodes: List[TreeNode]):
         """Sort nodes và children recursively"""
         nodes.sort(key=lambda x: (x.level, x.name))
@@ -932,27 +917,14 @@ class TreeService:
 
         return result
 
-    def _import_tree_recursive(self, tree_data: List[Dict], parent_id: Optional[int]) -> bool:
-        """Import tree structure recursively"""
-        try:
-            for node_data in tree_data:
-                # Create node
-                node_id = self.create_node(
-                    name=node_data['name'],
-                    level=node_data['level'],
-                    parent_id=parent_id,
-                    description=node_data.get('description', '')
-                )
+    def _validate_import_node(self, parent_level: Optional[str], node_data: Dict):
+        """Validate level của node khi import (cùng luật với create_node)"""
+        level = node_data.get('level')
+        if level not in self.valid_levels:
+            raise ValueError(f"Level không hợp lệ: {level}")
 
-                # Import children
-                if node_id and 'children' in node_data:
-                    self._import_tree_recursive(node_data['children'], node_id)
-
-            return True
-
-        except Exception as e:
-            print(f"Lỗi import recursive: {e}")
-            return False
+        if parent_level is not None and not self._validate_parent_child_relationship_by_levels(parent_level, level):
+            raise ValueError(f"Không thể tạo node level '{level}' trong parent level '{parent_level}'")
 
     def _apply_template_recursive(self, template: List[Dict], parent_id: Optional[int]) -> bool:
         """Apply template recursively"""
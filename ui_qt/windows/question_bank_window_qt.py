@@ -656,8 +656,7 @@ class QuestionBankWindowQt(QtWidgets.QWidget):
 
     def _ensure_tables(self):
         """Đảm bảo các bảng tồn tại với schema mới"""
-        self.db.upgrade_question_bank_schema()
-        print("✅ Đã đảm bảo schema ngân hàng câu hỏi")
+        self.db.ensure_schema()
 
     def _insert_sample_tree_data(self):
         """Thêm dữ liệu mẫu cho cây thư mục"""
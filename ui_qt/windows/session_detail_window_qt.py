@@ -1,6 +1,6 @@
 # ui_qt/windows/session_detail_window_qt.py
 from __future__ import annotations
-import os, re, time, platform, shutil, subprocess, json
+import os, re, time, platform, shutil, sqlite3, subprocess, json
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -26,36 +26,90 @@ def _to_date_str(d) -> str:
 class SessionController:
     """Controller quản lý logic nghiệp vụ cho session"""
 
+    # RETURNING có từ SQLite 3.35 - bản cũ hơn thì SELECT lại id
+    SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
     def __init__(self, db_manager):
         self.db = db_manager
 
+    def save_session(self, group_id: Optional[int], session_date: str, statuses: Dict[int, str],
+                     makeups: List[Dict[str, Any]], topic: str = "", homework: str = "",
+                     is_makeup_session: bool = False) -> Optional[int]:
+        """
+        Lưu cả buổi học trong MỘT transaction (một lần commit / fsync)
+
+        Args:
+            statuses: student_id -> trạng thái đã chọn ("✅ Có mặt", "📝 Nghỉ có phép", ...)
+            makeups: các em học bù (attendance_id / att_id, student_id) - xử lý riêng, không ghi điểm danh nhóm
+
+        Returns:
+            id của session_logs (None với buổi bù)
+
+        Raises:
+            sqlite3.Error: Lỗi ở bất kỳ bước nào -> rollback toàn bộ, không để lại nửa bảng điểm danh
+        """
+        conn = self.db.conn
+        with conn:
+            self._save_makeups(conn, statuses, makeups)
+            if is_makeup_session:
+                return None
+            self._save_attendance(conn, group_id, session_date, statuses, makeups)
+            return self._save_session_log(conn, group_id, session_date, topic, homework)
+
+    # Xử lý học bù: cập nhật trạng thái bù cho buổi nghỉ gốc và xoá lịch bù
+    def _save_makeups(self, conn, statuses: Dict[int, str], makeups: List[Dict[str, Any]]):
+        updates = []
+        for mk in makeups:
+            status = statuses.get(mk["student_id"], "Có mặt")
+            new_status = "Đã dạy bù" if "Có mặt" in status else "Vắng buổi bù"
+            updates.append((new_status, mk.get("att_id") or mk.get("attendance_id")))
+        if not updates:
+            return
+        conn.executemany("UPDATE attendance SET make_up_status=? WHERE id=?", updates)
+        conn.executemany("DELETE FROM makeup_sessions WHERE attendance_id=?", [(att_id,) for _, att_id in updates])
+
     # Xử lý lưu điểm danh học sinh
-    def save_attendance_data(self, students_status: Dict, group_id: int, session_date: str, makeup_joiners: List):
-        """Lưu dữ liệu điểm danh học sinh"""
-        for sid, widget in students_status.items():
-            # Bỏ qua các em đã xử lý học bù
-            if any(s["student_id"] == sid for s in makeup_joiners):
-                continue
-
-            status = widget.currentText()
-            make_up_status = "Chưa sắp xếp" if "Nghỉ" in status else ""
-
-            self.db.execute_query(
-                "INSERT INTO attendance (student_id, group_id, session_date, status, make_up_status) "
-                "VALUES (?, ?, ?, ?, ?) "
-                "ON CONFLICT(student_id, group_id, session_date) DO UPDATE SET "
-                "status = excluded.status, make_up_status = excluded.make_up_status",
-                (sid, group_id, session_date, status, make_up_status)
-            )
+    def _save_attendance(self, conn, group_id: int, session_date: str, statuses: Dict[int, str],
+                         makeups: List[Dict[str, Any]]):
+        """Upsert điểm danh cho học sinh của nhóm (bỏ qua các em học bù)"""
+        makeup_ids = {mk["student_id"] for mk in makeups}
+        rows = [
+            (sid, group_id, session_date, status, "Chưa sắp xếp" if "Nghỉ" in status else "")
+            for sid, status in statuses.items()
+            if sid not in makeup_ids
+        ]
+        conn.executemany(
+            "INSERT INTO attendance (student_id, group_id, session_date, status, make_up_status) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(student_id, group_id, session_date) DO UPDATE SET "
+            "status = excluded.status, make_up_status = excluded.make_up_status",
+            rows
+        )
 
     # Xử lý lưu nhật ký buổi học
-    def save_session_log_data(self, group_id: int, session_date: str, topic: str, homework: str):
-        """Lưu nhật ký buổi học"""
-        self.db.execute_query(
-            "INSERT OR REPLACE INTO session_logs (group_id, session_date, topic, homework) "
-            "VALUES (?, ?, ?, ?)",
-            (group_id, session_date, topic, homework)
+    def _save_session_log(self, conn, group_id: int, session_date: str, topic: str, homework: str) -> Optional[int]:
+        """
+        Upsert nhật ký buổi học, giữ nguyên id
+
+        (INSERT OR REPLACE cũ xoá dòng cũ -> id mới, lesson_files gắn với id cũ bị xoá theo ON DELETE CASCADE)
+        """
+        upsert = (
+            "INSERT INTO session_logs (group_id, session_date, topic, homework) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(group_id, session_date) DO UPDATE SET "
+            "topic = excluded.topic, homework = excluded.homework"
         )
+        params = (group_id, session_date, topic, homework)
+        if self.SUPPORTS_RETURNING:
+            row = conn.execute(upsert + " RETURNING id", params).fetchone()
+        else:
+            conn.execute(upsert, params)
+            row = conn.execute(
+                "SELECT id FROM session_logs WHERE group_id=? AND session_date=?",
+                (group_id, session_date)
+            ).fetchone()
+        return row[0] if row else None
+
+
 class SessionDetailWindowQt(QDialog):
     """
     PySide6 port của SessionDetailWindow (Tkinter)
@@ -164,8 +218,8 @@ class SessionDetailWindowQt(QDialog):
                 self.att_rows.addWidget(no_student_label)
             else:
                 # Hiển thị học sinh chính
-                for sid, sname in students:
-                    self._add_attendance_row(sid, sname)
+                for st in students:
+                    self._add_attendance_row(st["id"], st["name"])
 
                 # Separator và học sinh học bù
                 if self.makeup_joiners:
@@ -432,53 +486,20 @@ class SessionDetailWindowQt(QDialog):
             # Validate dữ liệu trước khi lưu
             if not self._validate_session_data():
                 return False
-            # 1) Xử lý danh sách học bù (nếu là buổi bù hoặc buổi thường có học sinh học bù)
-            list_to_process = self.makeup_list if self.is_makeup_session else self.makeup_joiners
-            for mk in list_to_process:
-                sid = mk["student_id"]
-                status = self.student_status.get(sid).currentText() if sid in self.student_status else "Có mặt"
-                original_att_id = mk.get("att_id") or mk.get("attendance_id")
-                new_status = "Đã dạy bù" if status == "Có mặt" else "Vắng buổi bù"
-                self.db.execute_query(
-                    "UPDATE attendance SET make_up_status=? WHERE id=?",
-                    (new_status, original_att_id)
-                )
-                self.db.execute_query(
-                    "DELETE FROM makeup_sessions WHERE attendance_id=?",
-                    (original_att_id,)
-                )
-
-            # 2) Điểm danh & ghi log cho buổi THƯỜNG
-            if not self.is_makeup_session:
-                for sid, widget in self.student_status.items():
-                    # Bỏ qua các em đã xử lý học bù ở trên
-                    if any(s["student_id"] == sid for s in self.makeup_joiners):
-                        continue
-                    status = widget.currentText()
-                    make_up_status = "Chưa sắp xếp" if "Nghỉ" in status else ""
-                    self.db.execute_query(
-                        "INSERT INTO attendance (student_id, group_id, session_date, status, make_up_status) "
-                        "VALUES (?, ?, ?, ?, ?) "
-                        "ON CONFLICT(student_id, group_id, session_date) DO UPDATE SET "
-                        "status = excluded.status, make_up_status = excluded.make_up_status",
-                        (sid, self.group_id, self.session_date, status, make_up_status)
-                    )
-
-                topic = self.topic_text.toPlainText().strip()
-                homework = self.homework_text.toPlainText().strip()
-                self.db.execute_query(
-                    "INSERT OR REPLACE INTO session_logs (group_id, session_date, topic, homework) "
-                    "VALUES (?, ?, ?, ?)",
-                    (self.group_id, self.session_date, topic, homework)
-                )
-
-                # Lấy/ cập nhật session_id ngay sau khi lưu để gắn file/bảng vẽ
-                row = self.db.execute_query(
-                    "SELECT id FROM session_logs WHERE group_id=? AND session_date=?",
-                    (self.group_id, self.session_date), fetch="one"
-                )
-                if row:
-                    self.session_id = row["id"] if isinstance(row, dict) else row[0]
+            # 1) Học bù + 2) điểm danh & nhật ký: một transaction, lỗi giữa chừng -> rollback hết
+            statuses = {sid: widget.currentText() for sid, widget in self.student_status.items()}
+            session_id = self.controller.save_session(
+                self.group_id,
+                self.session_date,
+                statuses,
+                self.makeup_list if self.is_makeup_session else self.makeup_joiners,
+                topic=self.topic_text.toPlainText().strip(),
+                homework=self.homework_text.toPlainText().strip(),
+                is_makeup_session=self.is_makeup_session,
+            )
+            # session_id dùng để gắn file/bảng vẽ
+            if session_id is not None:
+                self.session_id = session_id
 
             # 3) Thông báo & refresh các màn hình liên quan
             QtWidgets.QMessageBox.information(self, "Thành công", "Đã lưu thông tin buổi học.")
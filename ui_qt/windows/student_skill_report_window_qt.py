@@ -16,7 +16,7 @@ class StudentSkillReportWindowQt(QWidget):
     """
     Hồ sơ năng lực học sinh (PySide6)
     - Chọn học sinh
-    - Bảng tổng hợp theo chủ đề: (Chủ đề | Điểm TB | Lần cuối đánh giá | Xếp loại)
+    - Bảng tổng hợp theo chủ đề: (Chủ đề | Điểm TB | Lần cuối đánh giá | Xếp loại | Xu hướng)
     - Double-click 1 chủ đề để mở chi tiết: xem các lần đánh giá, thêm/sửa/xoá
     """
     def __init__(self, db_manager, parent=None):
@@ -43,8 +43,8 @@ class StudentSkillReportWindowQt(QWidget):
 
         # ---- Bảng tổng hợp ----
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Chủ đề", "Điểm TB", "Lần cuối đánh giá", "Xếp loại"])
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Chủ đề", "Điểm TB", "Lần cuối đánh giá", "Xếp loại", "Xu hướng"])
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
@@ -90,25 +90,19 @@ class StudentSkillReportWindowQt(QWidget):
         if not sid:
             return
         try:
-            query = """
-                SELECT chu_de, ROUND(AVG(diem),1) AS avg_score, MAX(ngay_danh_gia) AS last_date
-                FROM student_skills
-                WHERE student_id = ?
-                GROUP BY chu_de
-                ORDER BY chu_de
-            """
-            rows = self.db.execute_query(query, (sid,), fetch='all') or []
+            # đọc từ bảng tổng hợp student_topic_profile (trigger cập nhật khi đánh giá thay đổi)
+            rows = self.db.get_student_topic_profile(sid)
             self.table.setRowCount(len(rows))
             for i, r in enumerate(rows):
-                topic = r["chu_de"] if isinstance(r, dict) else r[0]
-                avg = r["avg_score"] if isinstance(r, dict) else r[1]
-                last_date = r["last_date"] if isinstance(r, dict) else r[2]
-                rating = self.get_rating_label(avg)
+                avg = r["mean_score"]
+                rating = self.get_rating_label(round(avg, 1) if avg is not None else None)
 
-                self._set_item(i, 0, topic)
+                self._set_item(i, 0, r["chu_de"])
                 self._set_item(i, 1, f"{avg:.1f}" if avg is not None else "", align=Qt.AlignCenter)
-                self._set_item(i, 2, str(last_date or ""), align=Qt.AlignCenter)
+                self._set_item(i, 2, str(r["latest_date"] or ""), align=Qt.AlignCenter)
                 self._set_item(i, 3, rating, align=Qt.AlignCenter)
+                self._set_item(i, 4, self.get_trend_label(r["trend_slope"], r["assessment_count"]),
+                               align=Qt.AlignCenter)
 
             self.table.resizeColumnsToContents()
             self.table.horizontalHeader().setStretchLastSection(True)
@@ -139,6 +133,17 @@ class StudentSkillReportWindowQt(QWidget):
         else:
             return "Yếu"
 
+    @staticmethod
+    def get_trend_label(slope, count):
+        """Xu hướng điểm (điểm / 30 ngày) -> nhãn ngắn"""
+        if not count or count < 2 or slope is None:
+            return ""
+        if slope >= 0.1:
+            return f"↑ +{slope:.1f}/tháng"
+        if slope <= -0.1:
+            return f"↓ {slope:.1f}/tháng"
+        return "→ Ổn định"
+
     # ---------------- Detail dialog ----------------
     def open_detail_dialog(self, item: QTableWidgetItem):
         row = item.row()